@@ -6,6 +6,7 @@ from .agent_adapter import (
     StubAgentAdapter,
     get_agent_adapter,
     reset_agent_adapter,
+    set_agent_adapter,
 )
 from .calendar_adapter import CalendarAdapter, ensure_calendar_dir, get_calendar_adapter, reset_calendar_adapter
 from .client_gui_adapter import ClientGUIAdapter
@@ -16,6 +17,7 @@ __all__ = [
     "StubAgentAdapter",
     "get_agent_adapter",
     "reset_agent_adapter",
+    "set_agent_adapter",
     "CalendarAdapter",
     "get_calendar_adapter",
     "reset_calendar_adapter",
@@ -10,12 +10,12 @@ import logging
 import os
 import re
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 from domain import IntentLabel
-from llm.client import get_openai_client
+from llm.client import get_openai_client, provider_slot, record_llm_usage, run_concurrently
 
 import warnings
 
@@ -85,6 +85,26 @@ class AgentAdapter:
         """
         raise NotImplementedError("complete must be implemented by subclasses.")
 
+    def stream_complete(
+        self,
+        prompt: str,
+        *,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.1,
+        max_tokens: int = 1000,
+    ) -> Iterator[str]:
+        """Run a prose completion, yielding text pieces as they arrive.
+
+        Concatenating the pieces gives the same text as ``complete``. Adapters
+        without a streaming API yield the whole completion once.
+        """
+        yield self.complete(
+            prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
 
 class StubAgentAdapter(AgentAdapter):
     """Deterministic heuristic stub replicating the pre-agent workflow behaviour."""
@@ -466,7 +486,9 @@ class OpenAIAgentAdapter(AgentAdapter):
         # O-series models (o1, o3, etc.) don't support temperature parameter
         if not model_name.startswith("o"):
             kwargs["temperature"] = 0
-        response = self._client.chat.completions.create(**kwargs)
+        with provider_slot("openai"):
+            response = self._client.chat.completions.create(**kwargs)
+            record_llm_usage("openai", response)
         try:
             return json.loads(response.choices[0].message.content or "{}")
         except Exception:
@@ -530,9 +552,14 @@ class OpenAIAgentAdapter(AgentAdapter):
         return self.extract_entities(msg)
 
     def analyze_message(self, msg: Dict[str, Any]) -> Dict[str, Any]:
-        """Combine intent classification and entity extraction into a single response."""
-        intent, confidence = self.route_intent(msg)
-        fields = self.extract_entities(msg)
+        """Combine intent classification and entity extraction into a single response.
+
+        The two requests are independent, so they run concurrently.
+        """
+        (intent, confidence), fields = run_concurrently(
+            lambda: self.route_intent(msg),
+            lambda: self.extract_entities(msg),
+        )
         return {"intent": intent, "confidence": confidence, "fields": fields}
 
     def complete(
@@ -549,15 +576,52 @@ class OpenAIAgentAdapter(AgentAdapter):
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
-        response = self._client.chat.completions.create(
-            model=self._intent_model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            #response_format={"type": "json_object"} if json_mode else None,
-        )
+        with provider_slot("openai"):
+            response = self._client.chat.completions.create(
+                model=self._intent_model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                #response_format={"type": "json_object"} if json_mode else None,
+            )
+            record_llm_usage("openai", response)
         return response.choices[0].message.content or ""
 
+    def stream_complete(
+        self,
+        prompt: str,
+        *,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.1,
+        max_tokens: int = 1000,
+    ) -> Iterator[str]:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        # The slot is held until the stream is drained or closed
+        with provider_slot("openai"):
+            stream = self._client.chat.completions.create(
+                model=self._intent_model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            last = None
+            for chunk in stream:
+                last = chunk
+                if not chunk.choices:
+                    continue
+                piece = chunk.choices[0].delta.content
+                if piece:
+                    yield piece
+            # With include_usage the final chunk carries the token counts
+            if last is not None:
+                record_llm_usage("openai", last)
+
 
 class GeminiAgentAdapter(AgentAdapter):
     """Adapter backed by Google Gemini for intent/entity tasks.
@@ -624,14 +688,16 @@ class GeminiAgentAdapter(AgentAdapter):
         safe_body = sanitize_email_body(body)
         message = f"Subject: {safe_subject}\n\nBody:\n{safe_body}"
 
-        response = self._client.models.generate_content(
-            model=model_name,
-            contents=f"{prompt}\n\n{message}",
-            config=types.GenerateContentConfig(
-                temperature=0,
-                response_mime_type="application/json",
-            ),
-        )
+        with provider_slot("gemini"):
+            response = self._client.models.generate_content(
+                model=model_name,
+                contents=f"{prompt}\n\n{message}",
+                config=types.GenerateContentConfig(
+                    temperature=0,
+                    response_mime_type="application/json",
+                ),
+            )
+            record_llm_usage("gemini", response)
 
         try:
             return json.loads(response.text or "{}")
@@ -705,9 +771,14 @@ class GeminiAgentAdapter(AgentAdapter):
             raise
 
     def analyze_message(self, msg: Dict[str, Any]) -> Dict[str, Any]:
-        """Combine intent classification and entity extraction into a single response."""
-        intent, confidence = self.route_intent(msg)
-        fields = self.extract_entities(msg)
+        """Combine intent classification and entity extraction into a single response.
+
+        The two requests are independent, so they run concurrently.
+        """
+        (intent, confidence), fields = run_concurrently(
+            lambda: self.route_intent(msg),
+            lambda: self.extract_entities(msg),
+        )
         return {"intent": intent, "confidence": confidence, "fields": fields}
 
     def complete(
@@ -737,11 +808,13 @@ class GeminiAgentAdapter(AgentAdapter):
                 config_kwargs["response_mime_type"] = "application/json"
 
             # Use client.models.generate_content (new SDK style)
-            response = self._client.models.generate_content(
-                model=self._intent_model,
-                contents=full_prompt,
-                config=types.GenerateContentConfig(**config_kwargs),
-            )
+            with provider_slot("gemini"):
+                response = self._client.models.generate_content(
+                    model=self._intent_model,
+                    contents=full_prompt,
+                    config=types.GenerateContentConfig(**config_kwargs),
+                )
+                record_llm_usage("gemini", response)
 
             return response.text if response else "{}"
         except Exception as e:
@@ -750,6 +823,47 @@ class GeminiAgentAdapter(AgentAdapter):
                 return self._fallback.complete(prompt, system_prompt=system_prompt, json_mode=json_mode)
             raise
 
+    def stream_complete(
+        self,
+        prompt: str,
+        *,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.1,
+        max_tokens: int = 1000,
+    ) -> Iterator[str]:
+        """Stream a prose completion with Gemini."""
+        from google.genai import types
+
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        config = types.GenerateContentConfig(temperature=temperature, max_output_tokens=max_tokens)
+        started = False
+        try:
+            with provider_slot("gemini"):
+                last = None
+                for chunk in self._client.models.generate_content_stream(
+                    model=self._intent_model,
+                    contents=full_prompt,
+                    config=config,
+                ):
+                    last = chunk
+                    piece = getattr(chunk, "text", None)
+                    if piece:
+                        started = True
+                        yield piece
+                # The final chunk's usage metadata covers the whole completion
+                if last is not None:
+                    record_llm_usage("gemini", last)
+        except Exception as e:
+            # Text already sent cannot be taken back; only fall back before it
+            if started:
+                raise
+            strategy = self._select_fallback_strategy(e, "complete")
+            if strategy == "stub":
+                yield self._fallback.complete(prompt, system_prompt=system_prompt)
+                return
+            raise
+
+
 _AGENT_SINGLETON: Optional[AgentAdapter] = None
 
 # Per-provider singletons for hybrid mode
@@ -817,3 +931,17 @@ def reset_agent_adapter() -> None:
 
     global _AGENT_SINGLETON
     _AGENT_SINGLETON = None
+
+
+def set_agent_adapter(adapter: Optional[AgentAdapter]) -> None:
+    """Serve ``adapter`` for AGENT_MODE and every provider lookup (None restores the factories).
+
+    Used by harnesses that replay conversations against a deterministic adapter.
+    """
+
+    global _AGENT_SINGLETON
+    _AGENT_SINGLETON = adapter
+    _PROVIDER_ADAPTERS.clear()
+    if adapter is not None:
+        for provider in ("openai", "gemini", "stub"):
+            _PROVIDER_ADAPTERS[provider] = adapter
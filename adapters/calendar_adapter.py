@@ -1,26 +1,109 @@
 """Adapters for reading calendar fixtures to support availability checks.
 
+Each calendar is parsed once into a ``BusyTimeline`` (busy slots sorted by
+epoch start, with a running maximum of the ends), so range queries and
+overlap checks are bisects instead of re-parsing every ISO string per room,
+per day and per time shift.
+
 The shared singleton can be reset in tests via `reset_calendar_adapter()`.
 """
 
 from __future__ import annotations
 
 import json
+import threading
+from bisect import bisect_left
+from datetime import datetime, timezone
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from utils import json_io
 
 _CALENDAR_SINGLETON: Optional["CalendarAdapter"] = None
 
 
+def parse_busy_instant(value: str) -> datetime:
+    """Parse an ISO timestamp (trailing Z allowed); naive values are UTC."""
+
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+class BusyTimeline:
+    """Busy slots of one calendar, parsed once and sorted by start.
+
+    ``starts``/``ends`` are epoch seconds; ``max_end[i]`` is the latest end
+    among the first ``i + 1`` slots, which answers "does anything overlap?"
+    with a single bisect. Slots without start/end or with unparsable times
+    are dropped.
+    """
+
+    __slots__ = ("slots", "starts", "ends", "max_end", "utc_starts", "utc_ends", "max_span")
+
+    def __init__(self, busy: Iterable[Dict[str, Any]]) -> None:
+        parsed: List[Tuple[float, float, datetime, datetime, Dict[str, Any]]] = []
+        for item in busy:
+            start = item.get("start")
+            end = item.get("end")
+            if not start or not end:
+                continue
+            try:
+                start_dt = parse_busy_instant(start).astimezone(timezone.utc)
+                end_dt = parse_busy_instant(end).astimezone(timezone.utc)
+            except (TypeError, ValueError):
+                continue
+            parsed.append((start_dt.timestamp(), end_dt.timestamp(), start_dt, end_dt, {"start": start, "end": end}))
+        parsed.sort(key=lambda row: row[0])
+        self.starts = [row[0] for row in parsed]
+        self.ends = [row[1] for row in parsed]
+        self.utc_starts = [row[2] for row in parsed]
+        self.utc_ends = [row[3] for row in parsed]
+        self.slots = [row[4] for row in parsed]
+        self.max_end: List[float] = []
+        running = float("-inf")
+        for end_ts in self.ends:
+            running = max(running, end_ts)
+            self.max_end.append(running)
+        self.max_span = max((e - s for s, e in zip(self.starts, self.ends)), default=0.0)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def indices(self, start_ts: float, end_ts: float) -> List[int]:
+        """Slots with ``start < end_ts`` and ``end > start_ts``, in start order."""
+
+        hi = bisect_left(self.starts, end_ts)
+        lo = bisect_left(self.starts, start_ts - self.max_span, 0, hi)
+        return [i for i in range(lo, hi) if self.ends[i] > start_ts]
+
+    def overlaps(self, start_ts: float, end_ts: float) -> bool:
+        """True if any slot overlaps ``[start_ts, end_ts)``; touching ends do not overlap."""
+
+        hi = bisect_left(self.starts, end_ts)
+        return hi > 0 and self.max_end[hi - 1] > start_ts
+
+    def overlaps_many(self, windows: Sequence[Tuple[float, float]]) -> List[bool]:
+        """``overlaps`` for a batch of windows (e.g. every time shift of a request)."""
+
+        starts, max_end = self.starts, self.max_end
+        results: List[bool] = []
+        for start_ts, end_ts in windows:
+            hi = bisect_left(starts, end_ts)
+            results.append(hi > 0 and max_end[hi - 1] > start_ts)
+        return results
+
+
 class CalendarAdapter:
     """Condition (purple): provide busy slot lookups for availability checks."""
 
     def __init__(self, data_dir: Path | None = None) -> None:
         self.data_dir = data_dir or Path(__file__).with_name("calendar_data")
         self._load_cached = lru_cache(maxsize=32)(self._load_calendar_unmemoized)
+        self._timelines: Dict[str, BusyTimeline] = {}
+        self._timeline_lock = threading.Lock()
 
     def _load_calendar_unmemoized(self, calendar_id: str) -> Dict[str, Any]:
         if not calendar_id:
@@ -43,20 +126,35 @@ class CalendarAdapter:
         """Drop memoized calendar files (tests call this when mutating fixtures)."""
 
         self._load_cached.cache_clear()
+        with self._timeline_lock:
+            self._timelines.clear()
 
-    def get_busy(self, calendar_id: str, start_iso: str, end_iso: str) -> List[Dict[str, Any]]:
-        """Return busy intervals as ISO strings from static fixtures."""
+    def busy_timeline(self, calendar_id: str) -> BusyTimeline:
+        """Parsed, sorted busy slots of ``calendar_id`` (built once per calendar)."""
 
+        with self._timeline_lock:
+            timeline = self._timelines.get(calendar_id)
+        if timeline is not None:
+            return timeline
         payload = self._load_cached(calendar_id)
         intervals = payload.get("busy", []) if isinstance(payload, dict) else []
-        cleaned: List[Dict[str, Any]] = []
-        for item in intervals:
-            start = item.get("start")
-            end = item.get("end")
-            if not start or not end:
-                continue
-            cleaned.append({"start": start, "end": end})
-        return cleaned
+        timeline = BusyTimeline(intervals)
+        with self._timeline_lock:
+            return self._timelines.setdefault(calendar_id, timeline)
+
+    def get_busy(self, calendar_id: str, start_iso: str, end_iso: str) -> List[Dict[str, Any]]:
+        """Return busy intervals (ISO strings) overlapping ``start_iso``..``end_iso``.
+
+        Without a parsable range every busy interval of the calendar is returned.
+        """
+
+        timeline = self.busy_timeline(calendar_id)
+        try:
+            start_ts = parse_busy_instant(start_iso).timestamp()
+            end_ts = parse_busy_instant(end_iso).timestamp()
+        except (AttributeError, TypeError, ValueError):
+            return [dict(slot) for slot in timeline.slots]
+        return [dict(timeline.slots[i]) for i in timeline.indices(start_ts, end_ts)]
 
 
 def ensure_calendar_dir() -> None:
@@ -4,8 +4,9 @@ import asyncio
 import json
 import logging
 import os
+import re
 from dataclasses import dataclass, field
-from typing import Any, AsyncGenerator, Callable, Dict, Iterable, List, Optional, Set
+from typing import Any, AsyncGenerator, Callable, Dict, FrozenSet, Iterable, List, Optional, Set
 
 from pydantic import ValidationError
 
@@ -414,19 +415,26 @@ class ToolExecutionError(RuntimeError):
         self.detail = detail
 
 
+# Allow-lists resolved once per step; step=None allows every engine tool.
+_STEP_ALLOWED_TOOLS: Dict[str, FrozenSet[str]] = {
+    step: frozenset(tools) for step, tools in ENGINE_TOOL_ALLOWLIST.items()
+}
+_ALL_ENGINE_TOOLS: FrozenSet[str] = frozenset().union(*_STEP_ALLOWED_TOOLS.values())
+
+
 @dataclass
 class StepToolPolicy:
     current_step: Optional[int]
-    allowed_tools: Set[str] = field(init=False)
+    allowed_tools: FrozenSet[str] = field(init=False)
 
     def __post_init__(self) -> None:
         self.allowed_tools = self.allowed_tools_for(self.current_step)
 
     @staticmethod
-    def allowed_tools_for(step: Optional[int]) -> Set[str]:
+    def allowed_tools_for(step: Optional[int]) -> FrozenSet[str]:
         if step is None:
-            return set().union(*ENGINE_TOOL_ALLOWLIST.values()) if ENGINE_TOOL_ALLOWLIST else set()
-        return set(ENGINE_TOOL_ALLOWLIST.get(str(step), set()))
+            return _ALL_ENGINE_TOOLS
+        return _STEP_ALLOWED_TOOLS.get(str(step), frozenset())
 
     def ensure_allowed(self, tool_name: str) -> None:
         if tool_name in CLIENT_STOP_AT_TOOLS:
@@ -454,114 +462,153 @@ def _type_matches(value: Any, expected: str) -> bool:
     return True
 
 
-def _validate_json_schema(schema: Dict[str, Any], value: Any, path: str = "root") -> List[str]:
-    errors: List[str] = []
-    expected_type = schema.get("type")
+# A compiled validator appends the errors for ``value`` at ``path`` to ``errors``.
+SchemaValidator = Callable[[Any, str, List[str]], None]
 
-    def _validate(value: Any, schema: Dict[str, Any], current_path: str) -> None:
-        expected = schema.get("type")
-        if isinstance(expected, list):
-            if value is None and "null" in expected:
-                return
-            if not any(_type_matches(value, candidate) for candidate in expected if candidate != "null"):
-                errors.append(f"{current_path}: expected one of {expected}, received {type(value).__name__}")
-                return
-            # Determine dominant type for recursive validation
-            for candidate in expected:
-                if candidate == "null":
-                    continue
-                if _type_matches(value, candidate):
-                    candidate_schema = dict(schema)
-                    candidate_schema["type"] = candidate
-                    _validate(value, candidate_schema, current_path)
-                    return
-            return
 
-        if expected == "object":
-            if not isinstance(value, dict):
-                errors.append(f"{current_path}: expected object, received {type(value).__name__}")
-                return
-            required = schema.get("required", [])
-            for field in required:
-                if field not in value:
-                    errors.append(f"{current_path}.{field}: missing required property")
-            properties = schema.get("properties", {})
-            for key, val in value.items():
-                next_path = f"{current_path}.{key}"
-                if key in properties:
-                    _validate(val, properties[key], next_path)
-                elif schema.get("additionalProperties", True) is False:
-                    errors.append(f"{next_path}: additional property not allowed")
-            return
+def _pass_through(value: Any, path: str, errors: List[str]) -> None:
+    return None
 
-        if expected == "array":
-            if not isinstance(value, list):
-                errors.append(f"{current_path}: expected array, received {type(value).__name__}")
-                return
-            item_schema = schema.get("items")
-            if item_schema:
-                for idx, item in enumerate(value):
-                    _validate(item, item_schema, f"{current_path}[{idx}]")
+
+def _compile_bounds(schema: Dict[str, Any], type_name: str) -> SchemaValidator:
+    minimum = schema.get("minimum")
+    maximum = schema.get("maximum")
+
+    def _validate(value: Any, path: str, errors: List[str]) -> None:
+        if not _type_matches(value, type_name):
+            errors.append(f"{path}: expected {type_name}, received {type(value).__name__}")
             return
+        if minimum is not None and value < minimum:
+            errors.append(f"{path}: value {value} < minimum {minimum}")
+        if maximum is not None and value > maximum:
+            errors.append(f"{path}: value {value} > maximum {maximum}")
 
-        if expected == "integer":
-            if not _type_matches(value, "integer"):
-                errors.append(f"{current_path}: expected integer, received {type(value).__name__}")
-                return
-            minimum = schema.get("minimum")
-            maximum = schema.get("maximum")
-            if minimum is not None and value < minimum:
-                errors.append(f"{current_path}: value {value} < minimum {minimum}")
-            if maximum is not None and value > maximum:
-                errors.append(f"{current_path}: value {value} > maximum {maximum}")
+    return _validate
+
+
+def _compile_string(schema: Dict[str, Any]) -> SchemaValidator:
+    enum = schema.get("enum")
+    pattern = schema.get("pattern")
+    fullmatch = re.compile(pattern).fullmatch if pattern else None
+
+    def _validate(value: Any, path: str, errors: List[str]) -> None:
+        if not isinstance(value, str):
+            errors.append(f"{path}: expected string, received {type(value).__name__}")
             return
+        if enum and value not in enum:
+            errors.append(f"{path}: expected one of {enum}, received {value!r}")
+        if fullmatch is not None and fullmatch(value) is None:
+            errors.append(f"{path}: value {value!r} does not match pattern {pattern!r}")
 
-        if expected == "number":
-            if not _type_matches(value, "number"):
-                errors.append(f"{current_path}: expected number, received {type(value).__name__}")
-                return
-            minimum = schema.get("minimum")
-            maximum = schema.get("maximum")
-            if minimum is not None and value < minimum:
-                errors.append(f"{current_path}: value {value} < minimum {minimum}")
-            if maximum is not None and value > maximum:
-                errors.append(f"{current_path}: value {value} > maximum {maximum}")
+    return _validate
+
+
+def _compile_object(schema: Dict[str, Any]) -> SchemaValidator:
+    required = tuple(schema.get("required", []))
+    properties = {key: _compile_schema(sub) for key, sub in schema.get("properties", {}).items()}
+    closed = schema.get("additionalProperties", True) is False
+
+    def _validate(value: Any, path: str, errors: List[str]) -> None:
+        if not isinstance(value, dict):
+            errors.append(f"{path}: expected object, received {type(value).__name__}")
             return
+        for name in required:
+            if name not in value:
+                errors.append(f"{path}.{name}: missing required property")
+        for key, val in value.items():
+            validator = properties.get(key)
+            if validator is not None:
+                validator(val, f"{path}.{key}", errors)
+            elif closed:
+                errors.append(f"{path}.{key}: additional property not allowed")
+
+    return _validate
+
+
+def _compile_array(schema: Dict[str, Any]) -> SchemaValidator:
+    item_schema = schema.get("items")
+    items = _compile_schema(item_schema) if item_schema else None
+
+    def _validate(value: Any, path: str, errors: List[str]) -> None:
+        if not isinstance(value, list):
+            errors.append(f"{path}: expected array, received {type(value).__name__}")
+            return
+        if items is not None:
+            for idx, item in enumerate(value):
+                items(item, f"{path}[{idx}]", errors)
 
-        if expected == "string":
-            if not isinstance(value, str):
-                errors.append(f"{current_path}: expected string, received {type(value).__name__}")
-                return
-            enum = schema.get("enum")
-            if enum and value not in enum:
-                errors.append(f"{current_path}: expected one of {enum}, received {value!r}")
-            pattern = schema.get("pattern")
-            if pattern:
-                import re
-
-                if re.fullmatch(pattern, value) is None:
-                    errors.append(f"{current_path}: value {value!r} does not match pattern {pattern!r}")
+    return _validate
+
+
+def _compile_union(schema: Dict[str, Any]) -> SchemaValidator:
+    expected = schema["type"]
+    nullable = "null" in expected
+    # First matching non-null type wins, as in declaration order
+    candidates = [
+        (candidate, _compile_schema({**schema, "type": candidate}))
+        for candidate in expected
+        if candidate != "null"
+    ]
+
+    def _validate(value: Any, path: str, errors: List[str]) -> None:
+        if value is None and nullable:
             return
+        for candidate, validator in candidates:
+            if _type_matches(value, candidate):
+                validator(value, path, errors)
+                return
+        errors.append(f"{path}: expected one of {expected}, received {type(value).__name__}")
+
+    return _validate
+
+
+def _compile_schema(schema: Dict[str, Any]) -> SchemaValidator:
+    """Turn a JSON schema (the subset used by the tool schemas) into a validator closure."""
+
+    expected = schema.get("type")
+    if isinstance(expected, list):
+        return _compile_union(schema)
+    if expected == "object":
+        return _compile_object(schema)
+    if expected == "array":
+        return _compile_array(schema)
+    if expected in ("integer", "number"):
+        return _compile_bounds(schema, expected)
+    if expected == "string":
+        return _compile_string(schema)
+    if expected == "boolean":
 
-        if expected == "boolean":
+        def _validate_boolean(value: Any, path: str, errors: List[str]) -> None:
             if not isinstance(value, bool):
-                errors.append(f"{current_path}: expected boolean, received {type(value).__name__}")
-            return
+                errors.append(f"{path}: expected boolean, received {type(value).__name__}")
+
+        return _validate_boolean
+    if expected == "null":
 
-        if expected == "null":
+        def _validate_null(value: Any, path: str, errors: List[str]) -> None:
             if value is not None:
-                errors.append(f"{current_path}: expected null, received {type(value).__name__}")
-            return
+                errors.append(f"{path}: expected null, received {type(value).__name__}")
+
+        return _validate_null
+    # Unknown type is treated as pass-through
+    return _pass_through
 
-        # Unknown type is treated as pass-through
 
-    _validate(value, schema, path)
+def _validate_json_schema(schema: Dict[str, Any], value: Any, path: str = "root") -> List[str]:
+    errors: List[str] = []
+    _compile_schema(schema)(value, path, errors)
     return errors
 
 
+# Tool argument validators, compiled once at import (empty schemas are not validated)
+_TOOL_VALIDATORS: Dict[str, SchemaValidator] = {
+    name: _compile_schema(schema) for name, schema in TOOL_SCHEMAS.items() if schema
+}
+
+
 def _validate_tool_schema(tool_name: str, payload: Optional[Dict[str, Any]], step: Optional[int]) -> None:
-    schema = TOOL_SCHEMAS.get(tool_name)
-    if not schema:
+    validator = _TOOL_VALIDATORS.get(tool_name)
+    if validator is None:
         return
     arguments = payload or {}
     if not isinstance(arguments, dict):
@@ -571,7 +618,8 @@ def _validate_tool_schema(tool_name: str, payload: Optional[Dict[str, Any]], ste
             reason="schema_validation_failed",
             extra={"errors": ["root: expected object arguments"]},
         )
-    errors = _validate_json_schema(schema, arguments)
+    errors: List[str] = []
+    validator(arguments, "root", errors)
     if errors:
         raise ToolExecutionError(
             tool_name,
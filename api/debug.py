@@ -15,8 +15,9 @@ def debug_get_trace(
     granularity: str = "logic",
     kinds: Optional[List[str]] = None,
     as_of_ts: Optional[float] = None,
+    since: Optional[int] = None,
 ) -> Dict[str, Any]:
-    return collect_trace_payload(thread_id, granularity=granularity, kinds=kinds, as_of_ts=as_of_ts)
+    return collect_trace_payload(thread_id, granularity=granularity, kinds=kinds, as_of_ts=as_of_ts, since_seq=since)
 
 
 def debug_get_timeline(
@@ -25,9 +26,10 @@ def debug_get_timeline(
     granularity: str = "logic",
     kinds: Optional[List[str]] = None,
     as_of_ts: Optional[float] = None,
+    since: Optional[int] = None,
 ) -> Dict[str, Any]:
-    payload = collect_trace_payload(thread_id, granularity=granularity, kinds=kinds, as_of_ts=as_of_ts)
-    return {
+    payload = collect_trace_payload(thread_id, granularity=granularity, kinds=kinds, as_of_ts=as_of_ts, since_seq=since)
+    result = {
         "thread_id": thread_id,
         "confirmed": payload["confirmed"],
         "trace": payload["trace"],
@@ -35,6 +37,9 @@ def debug_get_timeline(
         "summary": payload["summary"],
         "time_travel": payload.get("time_travel"),
     }
+    if "cursor" in payload:
+        result["cursor"] = payload["cursor"]
+    return result
 
 
 def resolve_timeline_path(thread_id: str) -> str:
@@ -21,9 +21,9 @@ import os
 from contextvars import ContextVar
 from typing import Optional, Tuple
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import Headers
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
@@ -132,9 +132,13 @@ def _validate_supabase_jwt(token: Optional[str]) -> Tuple[bool, str, dict]:
     return False, "supabase_jwt_not_implemented", {}
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
+def _unauthorized(error: str) -> JSONResponse:
+    return JSONResponse({"error": "unauthorized", "detail": error}, status_code=401)
+
+
+class AuthMiddleware:
     """
-    Authentication middleware with production toggle.
+    Pure ASGI authentication middleware with production toggle.
 
     When AUTH_ENABLED=0 (default):
         - No authentication checks
@@ -145,68 +149,72 @@ class AuthMiddleware(BaseHTTPMiddleware):
         - Enforces authentication on non-allowlisted routes
         - Supports API key and Supabase JWT modes
         - Returns 401 for unauthorized requests
+
+    Only headers are inspected; the body stream is passed through untouched.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        # Check if auth is enabled
-        if os.getenv("AUTH_ENABLED", "0") != "1":
-            # Auth disabled - pass through without checks
-            return await call_next(request)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        path = request.url.path
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Check if auth is enabled (non-HTTP scopes pass through as before)
+        if scope["type"] != "http" or os.getenv("AUTH_ENABLED", "0") != "1":
+            # Auth disabled - pass through without checks
+            await self.app(scope, receive, send)
+            return
 
-        # Check allowlist prefixes
-        if path.startswith(ALLOWLIST_PREFIXES):
-            return await call_next(request)
+        path = scope["path"]
 
-        # Check exact allowlist matches
-        if path in ALLOWLIST_EXACT:
-            return await call_next(request)
+        # Check allowlist prefixes and exact matches
+        if path.startswith(ALLOWLIST_PREFIXES) or path in ALLOWLIST_EXACT:
+            await self.app(scope, receive, send)
+            return
 
         # Get auth mode and token
         auth_mode = os.getenv("AUTH_MODE", "api_key")
-        auth_header = request.headers.get("Authorization", "")
-        token = _extract_bearer_token(auth_header)
+        headers = Headers(scope=scope)
+        token = _extract_bearer_token(headers.get("authorization", ""))
 
         # Also check X-Api-Key header as fallback for internal tools
         if not token:
-            token = request.headers.get("X-Api-Key", "").strip()
+            token = headers.get("x-api-key", "").strip()
 
         # Validate based on mode
         if auth_mode == "api_key":
             is_valid, error = _validate_api_key(token)
             if not is_valid:
-                return JSONResponse(
-                    {"error": "unauthorized", "detail": error},
-                    status_code=401,
-                )
-            return await call_next(request)
+                await _unauthorized(error)(scope, receive, send)
+                return
+            await self.app(scope, receive, send)
 
         elif auth_mode == "supabase_jwt":
             is_valid, error, claims = _validate_supabase_jwt(token)
             if not is_valid:
-                return JSONResponse(
-                    {"error": "unauthorized", "detail": error},
-                    status_code=401,
-                )
+                await _unauthorized(error)(scope, receive, send)
+                return
 
             # Set auth context for downstream use
+            tokens = []
             if claims.get("user_id"):
-                CURRENT_USER_ID.set(claims["user_id"])
+                tokens.append((CURRENT_USER_ID, CURRENT_USER_ID.set(claims["user_id"])))
             if claims.get("role"):
-                CURRENT_USER_ROLE.set(claims["role"])
+                tokens.append((CURRENT_USER_ROLE, CURRENT_USER_ROLE.set(claims["role"])))
 
             # In Supabase JWT mode, also set tenant context from claims
             # This integrates with multi-tenancy (overrides X-Team-Id header)
             if claims.get("team_id"):
                 from api.middleware.tenant_context import CURRENT_TEAM_ID
-                CURRENT_TEAM_ID.set(claims["team_id"])
+                tokens.append((CURRENT_TEAM_ID, CURRENT_TEAM_ID.set(claims["team_id"])))
 
-            return await call_next(request)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                for var, var_token in reversed(tokens):
+                    var.reset(var_token)
 
         else:
             logger.error("Invalid AUTH_MODE: %s", auth_mode)
-            return JSONResponse(
+            await JSONResponse(
                 {"error": "server_error", "detail": "invalid_auth_mode"},
                 status_code=500,
-            )
+            )(scope, receive, send)
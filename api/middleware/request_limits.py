@@ -13,10 +13,11 @@ from __future__ import annotations
 
 import logging
 import os
+from typing import Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import Headers
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
@@ -24,35 +25,93 @@ logger = logging.getLogger(__name__)
 DEFAULT_LIMIT_KB = 1024
 MAX_REQUEST_BODY_SIZE = int(os.getenv("REQUEST_SIZE_LIMIT_KB", DEFAULT_LIMIT_KB)) * 1024
 
+# Methods that carry no body - skipped entirely
+_BODYLESS_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
 
-class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
+
+class RequestBodyTooLarge(Exception):
+    """Raised from ``receive()`` once a streamed body passes the limit."""
+
+
+def _too_large_response(limit: int) -> JSONResponse:
+    return JSONResponse(
+        {"error": "request_too_large", "detail": f"Request body exceeds {limit // 1024}KB limit"},
+        status_code=413,
+    )
+
+
+class RequestSizeLimitMiddleware:
     """
-    Middleware to limit request body size for DoS protection.
+    Pure ASGI middleware to limit request body size for DoS protection.
 
-    Rejects requests with Content-Length header exceeding the configured limit.
-    For requests without Content-Length, reads the body and checks size.
+    Rejects requests whose Content-Length exceeds the configured limit before
+    the app runs. Bodies without a (truthful) Content-Length are counted as
+    they stream through ``receive()``; once the limit is passed the read is
+    aborted and a 413 is sent in place of whatever the app would have replied.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        # Skip size check for GET/HEAD/OPTIONS (no body)
-        if request.method in {"GET", "HEAD", "OPTIONS"}:
-            return await call_next(request)
+    def __init__(self, app: ASGIApp, max_body_size: Optional[int] = None) -> None:
+        self.app = app
+        self.max_body_size = MAX_REQUEST_BODY_SIZE if max_body_size is None else max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip size check for non-HTTP scopes and GET/HEAD/OPTIONS (no body)
+        if scope["type"] != "http" or scope["method"] in _BODYLESS_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.max_body_size
 
         # Check Content-Length header first (fast path)
-        content_length = request.headers.get("content-length")
+        content_length = Headers(scope=scope).get("content-length")
         if content_length:
             try:
                 length = int(content_length)
-                if length > MAX_REQUEST_BODY_SIZE:
+            except ValueError:
+                length = None  # Invalid Content-Length, enforce while streaming
+            if length is not None and length > limit:
+                logger.warning(
+                    "Request rejected: Content-Length %d exceeds limit %d (path=%s)",
+                    length, limit, scope["path"]
+                )
+                await _too_large_response(limit)(scope, receive, send)
+                return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
                     logger.warning(
-                        "Request rejected: Content-Length %d exceeds limit %d (path=%s)",
-                        length, MAX_REQUEST_BODY_SIZE, request.url.path
+                        "Request rejected: body exceeds limit %d while streaming (path=%s)",
+                        limit, scope["path"]
                     )
-                    return JSONResponse(
-                        {"error": "request_too_large", "detail": f"Request body exceeds {MAX_REQUEST_BODY_SIZE // 1024}KB limit"},
-                        status_code=413,
-                    )
-            except ValueError:
-                pass  # Invalid Content-Length, proceed with request
+                    raise RequestBodyTooLarge()
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if exceeded:
+                # Replace the app's error response for the aborted read with our 413
+                if message["type"] == "http.response.start" and not response_started:
+                    response_started = True
+                    await _too_large_response(limit)(scope, receive, send)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
-        return await call_next(request)
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            # RequestBodyTooLarge, or whatever the app wrapped it in
+            if not exceeded or response_started:
+                raise
+            response_started = True
+            await _too_large_response(limit)(scope, receive, send)
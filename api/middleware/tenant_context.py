@@ -16,8 +16,8 @@ import os
 from contextvars import ContextVar
 from typing import Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 # Request-scoped tenant context
 CURRENT_TEAM_ID: ContextVar[Optional[str]] = ContextVar("CURRENT_TEAM_ID", default=None)
@@ -39,25 +39,37 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class TenantContextMiddleware(BaseHTTPMiddleware):
+class TenantContextMiddleware:
     """
-    Middleware to extract tenant context from request headers.
+    Pure ASGI middleware to extract tenant context from request headers.
 
     Only active when TENANT_HEADER_ENABLED=1 (test/dev environments).
     In production, tenant context comes from authenticated identity (JWT claims).
+    The contextvars are set in the request's own task and reset when the
+    downstream app returns.
     """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Only allow header overrides in explicitly enabled environments
-        if os.getenv("TENANT_HEADER_ENABLED", "0") == "1":
-            team_id = request.headers.get("X-Team-Id")
-            manager_id = request.headers.get("X-Manager-Id")
-
-            if team_id:
-                CURRENT_TEAM_ID.set(team_id)
-                logger.debug("Set team_id=%s for request %s", team_id, request.url.path)
-            if manager_id:
-                CURRENT_MANAGER_ID.set(manager_id)
-
-        response = await call_next(request)
-        return response
+        if scope["type"] != "http" or os.getenv("TENANT_HEADER_ENABLED", "0") != "1":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        team_id = headers.get("x-team-id")
+        manager_id = headers.get("x-manager-id")
+
+        team_token = CURRENT_TEAM_ID.set(team_id) if team_id else None
+        manager_token = CURRENT_MANAGER_ID.set(manager_id) if manager_id else None
+        if team_id:
+            logger.debug("Set team_id=%s for request %s", team_id, scope["path"])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if manager_token is not None:
+                CURRENT_MANAGER_ID.reset(manager_token)
+            if team_token is not None:
+                CURRENT_TEAM_ID.reset(team_token)
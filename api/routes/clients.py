@@ -20,7 +20,7 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from api.utils.errors import raise_safe_error
+from api.utils.errors import busy_error, raise_safe_error
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +29,7 @@ from workflow_email import (
     save_db as wf_save_db,
     process_msg as wf_process_msg,
 )
+from workflows.runtime.turn_executor import TurnQueueFull, run_turn
 
 
 router = APIRouter(prefix="/api/client", tags=["clients"])
@@ -188,7 +189,9 @@ async def continue_workflow(request: ClientContinueRequest):
         msg["session_id"] = request.session_id
 
     try:
-        result = wf_process_msg(msg)
+        result = await run_turn(request.session_id or email, wf_process_msg, msg)
+    except TurnQueueFull:
+        raise busy_error()
     except Exception as exc:
         raise_safe_error(500, "continue workflow", exc, logger)
 
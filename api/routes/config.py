@@ -49,6 +49,8 @@ from workflow_email import (
     load_db as wf_load_db,
     save_db as wf_save_db,
 )
+from workflows.io.config_store import invalidate_config_cache
+from workflows.io.integration.read_cache import invalidate_read_cache
 from ux.universal_verbalizer import (
     UNIVERSAL_SYSTEM_PROMPT,
     STEP_PROMPTS as DEFAULT_STEP_PROMPTS,
@@ -185,6 +187,14 @@ class PromptHistoryResponse(BaseModel):
 
 # --- Helper Functions ---
 
+def _save_config(db: Dict) -> None:
+    """Persist db["config"] changes and drop the config_store and Supabase reference caches."""
+    wf_save_db(db)
+    invalidate_config_cache()
+    invalidate_read_cache(kind="rooms")
+    invalidate_read_cache(kind="products")
+
+
 def _now_iso() -> str:
     """Return current UTC time in ISO format."""
     return datetime.utcnow().isoformat() + "Z"
@@ -243,7 +253,7 @@ async def set_global_deposit_config(config: GlobalDepositConfig):
             "deposit_deadline_days": config.deposit_deadline_days,
             "updated_at": _now_iso(),
         }
-        wf_save_db(db)
+        _save_config(db)
         logger.info("Global deposit updated: enabled=%s type=%s", config.deposit_enabled, config.deposit_type)
         return {"status": "ok", "config": db["config"]["global_deposit"]}
     except Exception as exc:
@@ -324,7 +334,7 @@ async def set_hil_mode(config: HILModeConfig):
             "enabled": config.enabled,
             "updated_at": _now_iso(),
         }
-        wf_save_db(db)
+        _save_config(db)
 
         # Notify the integration config module to refresh
         from workflows.io.integration.config import refresh_hil_setting
@@ -506,7 +516,7 @@ async def set_llm_provider_config(config: LLMProviderConfig):
             "verbalization_provider": config.verbalization_provider.lower(),
             "updated_at": _now_iso(),
         }
-        wf_save_db(db)
+        _save_config(db)
 
         # Update environment variables for current process
         # (takes effect on next adapter instantiation)
@@ -648,7 +658,7 @@ async def set_hybrid_enforcement_config(config: HybridEnforcementConfig):
             "enabled": config.enabled,
             "updated_at": _now_iso(),
         }
-        wf_save_db(db)
+        _save_config(db)
 
         # Check current hybrid status
         settings = get_llm_providers(force_reload=True)
@@ -778,7 +788,7 @@ async def set_pre_filter_config(config: PreFilterConfig):
             "mode": config.mode.lower(),
             "updated_at": _now_iso(),
         }
-        wf_save_db(db)
+        _save_config(db)
 
         # Update environment variable for current process
         os.environ["PRE_FILTER_MODE"] = config.mode.lower()
@@ -881,7 +891,7 @@ async def set_detection_mode_config(config: DetectionModeConfig):
             "mode": config.mode.lower(),
             "updated_at": _now_iso(),
         }
-        wf_save_db(db)
+        _save_config(db)
 
         # Update environment variable for current process
         os.environ["DETECTION_MODE"] = config.mode.lower()
@@ -968,7 +978,7 @@ async def set_prompts_config(config: PromptConfig):
             "step_prompts": {str(k): v for k, v in config.step_prompts.items()},
             "updated_at": _now_iso()
         }
-        wf_save_db(db)
+        _save_config(db)
         logger.info("Prompts updated and persisted")
         return {"status": "ok"}
     except Exception as exc:
@@ -1022,7 +1032,7 @@ async def revert_prompts_config(index: int):
         # Update history
         db["config"]["prompts_history"] = history[:50]
         
-        wf_save_db(db)
+        _save_config(db)
         logger.info("Reverted prompts to version from %s", target_entry.get('ts'))
         return {"status": "ok"}
     except HTTPException:
@@ -1096,7 +1106,7 @@ async def set_room_deposit_config(room_id: str, deposit_required: bool, deposit_
             "deposit_percent": deposit_percent,
             "updated_at": _now_iso(),
         }
-        wf_save_db(db)
+        _save_config(db)
         logger.info("Room deposit updated: room=%s required=%s percent=%s", room_id, deposit_required, deposit_percent)
         return {"status": "ok", "room_id": room_id, "config": db["config"]["room_deposits"][room_id]}
     except Exception as exc:
@@ -1199,7 +1209,7 @@ async def set_hil_email_config(config: HILEmailConfig):
             hil_email_data["from_email"] = config.from_email
 
         db["config"]["hil_email"] = hil_email_data
-        wf_save_db(db)
+        _save_config(db)
 
         status = "enabled" if config.enabled else "disabled"
         logger.info("HIL email %s - notifications to %s", status, config.manager_email)
@@ -1245,6 +1255,7 @@ async def test_hil_email():
                 "locked_room": "Test Room",
                 "offer_total": 1500.00,
             },
+            immediate=True,
         )
 
         return result
@@ -1372,7 +1383,7 @@ async def set_venue_config(config: VenueConfig):
 
         current["updated_at"] = _now_iso()
         db["config"]["venue"] = current
-        wf_save_db(db)
+        _save_config(db)
 
         logger.info("Venue updated: name=%s city=%s", current.get('name'), current.get('city'))
 
@@ -1461,7 +1472,7 @@ async def set_site_visit_config(config: SiteVisitConfig):
 
         current["updated_at"] = _now_iso()
         db["config"]["site_visit"] = current
-        wf_save_db(db)
+        _save_config(db)
 
         logger.info("Site visit updated: slots=%s weekdays_only=%s",
                     current.get('default_slots'), current.get('weekdays_only'))
@@ -1531,7 +1542,7 @@ async def set_manager_config(config: ManagerConfig):
 
         current["updated_at"] = _now_iso()
         db["config"]["managers"] = current
-        wf_save_db(db)
+        _save_config(db)
 
         logger.info("Managers updated: names=%s", current.get('names'))
 
@@ -1609,7 +1620,7 @@ async def set_product_config(config: ProductConfig):
 
         current["updated_at"] = _now_iso()
         db["config"]["products"] = current
-        wf_save_db(db)
+        _save_config(db)
 
         logger.info("Products updated: autofill_min_score=%s", current.get('autofill_min_score'))
 
@@ -1725,7 +1736,7 @@ async def set_menus_config(config: MenusConfig):
 
         current["updated_at"] = _now_iso()
         db["config"]["menus"] = current
-        wf_save_db(db)
+        _save_config(db)
 
         count = len(current.get("dinner_options", []))
         logger.info("Menus updated: %d dinner options", count)
@@ -1816,7 +1827,7 @@ async def set_catalog_config(config: CatalogConfig):
 
         current["updated_at"] = _now_iso()
         db["config"]["catalog"] = current
-        wf_save_db(db)
+        _save_config(db)
 
         count = len(current.get("product_room_map", []))
         logger.info("Catalog updated: %d product-room mappings", count)
@@ -1912,7 +1923,7 @@ async def set_faq_config(config: FAQConfig):
 
         current["updated_at"] = _now_iso()
         db["config"]["faq"] = current
-        wf_save_db(db)
+        _save_config(db)
 
         count = len(current.get("items", []))
         logger.info("FAQ updated: %d items", count)
@@ -3,8 +3,8 @@ MODULE: backend/api/routes/debug.py
 PURPOSE: Debug and tracing API endpoints.
 
 ROUTES:
-    GET  /api/debug/threads/{thread_id}              - Get full trace for thread
-    GET  /api/debug/threads/{thread_id}/timeline     - Get timeline events only
+    GET  /api/debug/threads/{thread_id}              - Get full trace for thread (?since=<seq> for new events only)
+    GET  /api/debug/threads/{thread_id}/timeline     - Get timeline events only (?since=<seq>)
     GET  /api/debug/threads/{thread_id}/timeline/download - Download timeline JSON
     GET  /api/debug/threads/{thread_id}/timeline/text    - Download timeline as text
     GET  /api/debug/threads/{thread_id}/report       - Generate debug report
@@ -52,13 +52,15 @@ if DEBUG_TRACE_ENABLED:
         granularity: str = Query("logic"),
         kinds: Optional[str] = Query(None),
         as_of_ts: Optional[float] = Query(None),
+        since: Optional[int] = Query(None, ge=0),
     ):
-        """Get full debug trace for a thread."""
+        """Get full debug trace for a thread, or only events after sequence ``since``."""
         return debug_get_trace(
             thread_id,
             granularity=granularity,
             kinds=_parse_kind_filter(kinds),
             as_of_ts=as_of_ts,
+            since=since,
         )
 
     @router.get("/api/debug/threads/{thread_id}/timeline")
@@ -67,13 +69,15 @@ if DEBUG_TRACE_ENABLED:
         granularity: str = Query("logic"),
         kinds: Optional[str] = Query(None),
         as_of_ts: Optional[float] = Query(None),
+        since: Optional[int] = Query(None, ge=0),
     ):
-        """Get timeline events for a thread."""
+        """Get timeline events for a thread, or only those after sequence ``since``."""
         return debug_get_timeline(
             thread_id,
             granularity=granularity,
             kinds=_parse_kind_filter(kinds),
             as_of_ts=as_of_ts,
+            since=since,
         )
 
     @router.get("/api/debug/threads/{thread_id}/timeline/download")
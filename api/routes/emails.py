@@ -25,6 +25,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from api.utils.errors import raise_safe_error
+from services.mail_queue import add_delivery_listener, mail_queue_enabled, new_job_id
 
 logger = logging.getLogger(__name__)
 
@@ -108,6 +109,20 @@ async def send_email_to_client(request: SendClientEmailRequest):
                 "subject": request.subject,
             }
 
+        job_id = None
+        if mail_queue_enabled():
+            # Record the queued email first: the sender may deliver it (and
+            # _mark_email_delivery look for its entry) before we get it back
+            job_id = new_job_id()
+            _log_sent_email(
+                to_email=request.to_email,
+                subject=request.subject,
+                body=body_text,
+                event_id=request.event_id,
+                task_id=request.task_id,
+                job_id=job_id,
+            )
+
         result = send_client_email(
             to_email=request.to_email,
             to_name=request.to_name,
@@ -115,16 +130,26 @@ async def send_email_to_client(request: SendClientEmailRequest):
             body_text=body_text,
             body_html=request.body_html,
             event_id=request.event_id,
+            job_id=job_id,
         )
 
-        if result["success"]:
-            # Log the sent email for tracking (use processed body)
-            _log_sent_email(
-                to_email=request.to_email,
-                subject=request.subject,
-                body=body_text,
-                event_id=request.event_id,
-                task_id=request.task_id,
+        if job_id is None:
+            if result["success"]:
+                # Log the email for tracking (use processed body)
+                _log_sent_email(
+                    to_email=request.to_email,
+                    subject=request.subject,
+                    body=body_text,
+                    event_id=request.event_id,
+                    task_id=request.task_id,
+                )
+        elif not result.get("queued"):
+            # Never reached the queue: settle the entry recorded above
+            _mark_email_delivery(
+                job_id,
+                {"event_id": request.event_id},
+                "sent" if result["success"] else "failed",
+                result.get("error"),
             )
 
         return result
@@ -284,6 +309,7 @@ async def send_test_email(request: TestEmailRequest):
             to_name=request.to_name,
             subject="[OpenEvent] Test Email",
             body_text="This is a test email from OpenEvent.\n\nIf you received this, email sending is configured correctly!",
+            immediate=True,
         )
 
         return result
@@ -300,14 +326,24 @@ def _log_sent_email(
     body: str,
     event_id: Optional[str] = None,
     task_id: Optional[str] = None,
+    job_id: Optional[str] = None,
 ) -> None:
     """
-    Log sent email for tracking.
+    Log a sent or queued email for tracking.
 
     In production with Supabase, this would insert into the emails table.
-    For now, we just log to console and could add to event history.
+    For now, we just log to console and add it to the event's email history.
+    With a mail queue ``job_id`` the entry starts as ``queued`` (written
+    before the job is enqueued) and ``_mark_email_delivery`` records the
+    outcome.
     """
-    logger.info("Email sent: to=%s subject=%s", to_email, subject)
+    now = datetime.utcnow().isoformat() + "Z"
+    if job_id:
+        logger.info("Email queued: to=%s subject=%s job=%s", to_email, subject, job_id)
+        entry = {"status": "queued", "job_id": job_id, "queued_at": now, "sent_at": None}
+    else:
+        logger.info("Email sent: to=%s subject=%s", to_email, subject)
+        entry = {"status": "sent", "sent_at": now}
 
     if event_id:
         try:
@@ -319,10 +355,36 @@ def _log_sent_email(
                     event.setdefault("email_history", []).append({
                         "to_email": to_email,
                         "subject": subject,
-                        "sent_at": datetime.utcnow().isoformat() + "Z",
                         "task_id": task_id,
+                        **entry,
                     })
                     save_db(db)
                     break
         except Exception as e:
             logger.warning("Failed to log email to event: %s", e)
+
+
+def _mark_email_delivery(job_id: str, meta: dict, status: str, error: Optional[str]) -> None:
+    """Mail queue listener: record the outcome of a queued email in its event's history."""
+    event_id = meta.get("event_id")
+    if not event_id:
+        return
+    from workflow_email import load_db, save_db
+
+    db = load_db()
+    for event in db.get("events", []):
+        if event.get("event_id") != event_id:
+            continue
+        for entry in event.get("email_history", []):
+            if entry.get("job_id") == job_id:
+                entry["status"] = status
+                if status == "sent":
+                    entry["sent_at"] = datetime.utcnow().isoformat() + "Z"
+                else:
+                    entry["error"] = error
+                save_db(db)
+                return
+        return
+
+
+add_delivery_listener(_mark_email_delivery)
@@ -5,6 +5,7 @@ PURPOSE: Message and conversation API endpoints.
 ROUTES:
     POST /api/start-conversation              - Start a new conversation
     POST /api/send-message                    - Send message in conversation
+    POST /api/send-message/stream             - Same, as SSE with verbalizer chunks
     POST /api/conversation/{id}/confirm-date  - Confirm date selection
     POST /api/accept-booking/{id}             - Accept booking
     POST /api/reject-booking/{id}             - Reject booking
@@ -13,6 +14,8 @@ ROUTES:
 MIGRATION: Extracted from main.py in Phase C refactoring (2025-12-18).
 """
 
+import asyncio
+import json
 import logging
 import os
 import re
@@ -24,8 +27,10 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from api.utils.errors import busy_error
 from domain import ConversationState, EventInformation
 from legacy.session_store import (
     active_conversations,
@@ -47,6 +52,9 @@ from workflow_email import (
     DB_PATH as WF_DB_PATH,
 )
 from activity.progress import get_progress_summary
+from workflows.runtime.turn_executor import TurnQueueFull, run_turn
+from workflows.io.integration.config import is_hil_all_replies_enabled
+from ux.universal_verbalizer import VerbalizerChunk, verbalizer_stream
 
 router = APIRouter(tags=["messages"])
 
@@ -380,16 +388,12 @@ def _trigger_room_availability(event_id: Optional[str], chosen_date: str) -> Opt
         return "Room availability check encountered an issue. I'll follow up with availability options shortly."
 
 
-def _persist_confirmed_date(conversation_state: ConversationState, chosen_date: str) -> Dict[str, Any]:
-    """Persist confirmed date and trigger availability workflow."""
-    # Note: create_fallback_context imported at module level from core.fallback
-
-    conversation_state.event_info.event_date = chosen_date
-    conversation_state.event_info.status = "Date Confirmed"
+def _confirmed_date_message(conversation_state: ConversationState, chosen_date: str) -> Dict[str, Any]:
+    """Synthetic client message that records the confirmed date in the workflow."""
 
     # NOTE: AGENT_MODE is now set at startup in main.py with smart defaults
     # (hybrid if Gemini key present, openai-only otherwise)
-    synthetic_msg = {
+    return {
         "msg_id": str(uuid.uuid4()),
         "from_name": "Client (GUI)",
         "from_email": conversation_state.event_info.email,
@@ -398,28 +402,18 @@ def _persist_confirmed_date(conversation_state: ConversationState, chosen_date:
         "body": f"The client confirms the preferred event date is {chosen_date}.",
     }
 
-    # Track any fallback messages to append to the response
-    fallback_notices: List[str] = []
 
-    wf_res = {}
-    try:
-        wf_res = wf_process_msg(synthetic_msg)
-        logger.info(
-            "confirm_date action=%s event_id=%s intent=%s",
-            wf_res.get('action'), wf_res.get('event_id'), wf_res.get('intent')
-        )
-    except Exception as exc:
-        ctx = create_fallback_context(
-            source="api.routes.messages.persist_confirmed_date",
-            trigger="persistence_failed",
-            event_id=conversation_state.event_id,
-            error=exc,
-        )
-        logger.error("Fallback: %s | %s | %s", ctx.source, ctx.trigger, exc)
-        fallback_notices.append(
-            "I logged your confirmation, but our booking system didn't save the update. "
-            "I've escalated it for manual follow-up."
-        )
+def _persist_confirmed_date(
+    conversation_state: ConversationState,
+    chosen_date: str,
+    wf_res: Dict[str, Any],
+    fallback_notices: List[str],
+) -> Dict[str, Any]:
+    """Record the confirmed date (``wf_res`` is its workflow turn) and trigger the availability workflow."""
+    # Note: create_fallback_context imported at module level from core.fallback
+
+    conversation_state.event_info.event_date = chosen_date
+    conversation_state.event_info.status = "Date Confirmed"
 
     event_id = wf_res.get("event_id") or conversation_state.event_id
     conversation_state.event_id = event_id
@@ -495,10 +489,12 @@ async def start_conversation(request: StartConversationRequest):
     wf_res = None
     wf_action = None
     try:
-        wf_res = wf_process_msg(msg)
+        wf_res = await run_turn(session_id, wf_process_msg, msg)
         wf_action = wf_res.get("action")
         logger.info("start action=%s client=%s event_id=%s task_id=%s",
                     wf_action, request.client_email, wf_res.get('event_id'), wf_res.get('task_id'))
+    except TurnQueueFull:
+        raise busy_error()
     except Exception as e:
         logger.exception("start_conversation workflow failed: %s", e)
     if not wf_res:
@@ -696,7 +692,9 @@ async def send_message(request: SendMessageRequest):
     }
 
     try:
-        wf_res = wf_process_msg(payload)
+        wf_res = await run_turn(request.session_id, wf_process_msg, payload)
+    except TurnQueueFull:
+        raise busy_error()
     except Exception as exc:
         logger.exception("send_message workflow failed: %s", exc)
 
@@ -899,6 +897,68 @@ async def send_message(request: SendMessageRequest):
     }
 
 
+@router.post("/api/send-message/stream")
+async def send_message_stream(request: SendMessageRequest):
+    """Send a message and stream the reply as server-sent events.
+
+    Verbalized replies are forwarded sentence by sentence as they pass fact
+    verification (``{"type": "verbalizer", "kind": "delta" | "replace" |
+    "done", ...}``). The last event is ``{"type": "reply", ...}`` with the
+    same body as ``/api/send-message``; it is authoritative, so clients
+    replace the streamed text with its ``response``. A turn may verbalize
+    more than one draft; each ends with its own "done" chunk.
+
+    When every reply needs manager approval (HIL all-replies mode) nothing is
+    streamed before the final event.
+    """
+    if request.session_id not in active_conversations:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stream_chunks = not is_hil_all_replies_enabled()
+
+    def sink(chunk: VerbalizerChunk) -> None:
+        # Called on the turn's worker thread
+        loop.call_soon_threadsafe(queue.put_nowait, chunk)
+
+    async def run() -> Dict[str, Any]:
+        if not stream_chunks:
+            return await send_message(request)
+        # run_turn copies this context (and the sink) into the worker
+        with verbalizer_stream(sink):
+            return await send_message(request)
+
+    turn = asyncio.create_task(run())
+
+    async def event_stream():
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, turn}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                chunk = getter.result()
+                yield f"data: {json.dumps({'type': 'verbalizer', **chunk.to_payload()})}\n\n"
+                continue
+            getter.cancel()
+            break
+        while not queue.empty():
+            chunk = queue.get_nowait()
+            yield f"data: {json.dumps({'type': 'verbalizer', **chunk.to_payload()})}\n\n"
+        try:
+            result = turn.result()
+        except HTTPException as exc:
+            yield f"data: {json.dumps({'type': 'error', 'status': exc.status_code, 'detail': exc.detail})}\n\n"
+            return
+        except Exception as exc:
+            # The response has already started; report the failure in-band
+            logger.exception("send_message_stream turn failed: %s", exc)
+            yield f"data: {json.dumps({'type': 'error', 'status': 500, 'detail': 'Workflow processing failed'})}\n\n"
+            return
+        yield f"data: {json.dumps({'type': 'reply', **result}, default=str)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.post("/api/conversation/{session_id}/confirm-date")
 async def confirm_date(session_id: str, request: ConfirmDateRequest):
     """Confirm the selected date for an event."""
@@ -915,7 +975,38 @@ async def confirm_date(session_id: str, request: ConfirmDateRequest):
     except ValueError as exc:
         raise HTTPException(status_code=400, detail="Invalid or missing date. Use YYYY-MM-DD.") from exc
 
-    assistant_payload = _persist_confirmed_date(conversation_state, chosen_date)
+    # Track any fallback messages to append to the response
+    fallback_notices: List[str] = []
+
+    wf_res: Dict[str, Any] = {}
+    try:
+        wf_res = await run_turn(session_id, wf_process_msg, _confirmed_date_message(conversation_state, chosen_date))
+        logger.info(
+            "confirm_date action=%s event_id=%s intent=%s",
+            wf_res.get('action'), wf_res.get('event_id'), wf_res.get('intent')
+        )
+    except TurnQueueFull:
+        raise busy_error()
+    except Exception as exc:
+        ctx = create_fallback_context(
+            source="api.routes.messages.persist_confirmed_date",
+            trigger="persistence_failed",
+            event_id=conversation_state.event_id,
+            error=exc,
+        )
+        logger.error("Fallback: %s | %s | %s", ctx.source, ctx.trigger, exc)
+        fallback_notices.append(
+            "I logged your confirmation, but our booking system didn't save the update. "
+            "I've escalated it for manual follow-up."
+        )
+
+    try:
+        # The availability workflow blocks too; same session queue as the turn
+        assistant_payload = await run_turn(
+            session_id, _persist_confirmed_date, conversation_state, chosen_date, wf_res, fallback_notices
+        )
+    except TurnQueueFull:
+        raise busy_error()
     assistant_reply = assistant_payload.get("body") or ""
     actions = assistant_payload.get("actions") or []
     conversation_state.conversation_history.append({"role": "assistant", "content": assistant_reply})
@@ -5,6 +5,13 @@ PURPOSE: Workflow status and configuration API endpoints.
 ROUTES:
     GET  /api/workflow/health      - Health check for workflow integration
     GET  /api/workflow/hil-status  - Get HIL toggle status
+    GET  /api/workflow/executor    - Turn executor queue depth / latency metrics
+    GET  /api/workflow/storage     - DB save/merge counters and lock contention
+    GET  /api/workflow/llm-cache   - LLM response cache hit rate and bytes saved
+    GET  /api/workflow/read-cache  - Supabase rooms/products/client cache counters
+    GET  /api/workflow/supabase-breakers - Circuit breaker states and JSON fallback backlog
+    GET  /api/workflow/mail-queue  - Outbound email queue backlog and SMTP connection reuse
+    GET  /api/metrics              - Span latency percentiles and counters (Prometheus text)
 
 MIGRATION: Extracted from main.py in Phase C refactoring (2025-12-18).
 """
@@ -12,9 +19,17 @@ MIGRATION: Extracted from main.py in Phase C refactoring (2025-12-18).
 import os
 
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 
+from llm.response_cache import llm_cache_stats
+from services.mail_queue import mail_queue_stats
+from utils.profiler import render_prometheus
 from workflow_email import DB_PATH as WF_DB_PATH
+from workflows.io.integration.adapter import get_database_adapter
 from workflows.io.integration.config import is_hil_all_replies_enabled
+from workflows.io.integration.read_cache import read_cache_stats
+from workflows.io.revisions import get_write_stats
+from workflows.runtime.turn_executor import turn_executor_stats
 
 router = APIRouter(tags=["workflow"])
 
@@ -50,3 +65,49 @@ async def get_hil_status():
     return {
         "hil_all_replies_enabled": is_hil_all_replies_enabled(),
     }
+
+
+@router.get("/api/workflow/executor")
+async def get_executor_stats():
+    """Queue depth, rejections and wait/run latency percentiles of the turn executor."""
+    return turn_executor_stats()
+
+
+@router.get("/api/workflow/storage")
+async def get_storage_stats():
+    """Compare-and-swap save counters and DB lock wait percentiles."""
+    return get_write_stats()
+
+
+@router.get("/api/workflow/llm-cache")
+async def get_llm_cache_stats():
+    """Hit rate, bytes saved and size of the persistent LLM response cache."""
+    return llm_cache_stats()
+
+
+@router.get("/api/workflow/read-cache")
+async def get_read_cache_stats():
+    """Entries, TTLs and per-kind hit/miss counters of the Supabase read cache."""
+    return read_cache_stats()
+
+
+@router.get("/api/workflow/supabase-breakers")
+async def get_supabase_breaker_stats():
+    """Breaker states/transitions, fallback counts and writes awaiting reconcile."""
+    stats = getattr(get_database_adapter(), "breaker_stats", None)
+    return stats() if stats else {"enabled": False}
+
+
+@router.get("/api/workflow/mail-queue")
+async def get_mail_queue_stats():
+    """Pending/failed outbound emails, send counters and pooled SMTP connections."""
+    return mail_queue_stats()
+
+
+@router.get("/api/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Profiler span latencies and counters in the Prometheus text format.
+
+    Spans are only collected with OE_PERF=1; otherwise the summary is empty.
+    """
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
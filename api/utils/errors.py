@@ -48,3 +48,12 @@ def safe_error_detail(context: str) -> str:
     For cases where you need the message string without raising.
     """
     return f"Failed to {context}. Please try again or contact support."
+
+
+def busy_error() -> HTTPException:
+    """503 for a saturated turn executor; clients should retry shortly."""
+    return HTTPException(
+        status_code=503,
+        detail="Too many messages in progress. Please retry in a moment.",
+        headers={"Retry-After": "2"},
+    )
@@ -65,7 +65,18 @@ async def lifespan(app: FastAPI):
         logger.warning("[SECURITY] Set AUTH_ENABLED=1 and configure API_KEY for production")
 
     yield
-    # Shutdown logic (if any) goes here
+
+    # Drain in-flight workflow turns before the worker exits
+    from workflows.runtime.turn_executor import shutdown_turn_executor
+    shutdown_turn_executor(wait=True)
+
+    # Write out queued debug trace lines
+    from debug.log_sink import shutdown_log_sink
+    shutdown_log_sink()
+
+    # Stop the outbound mail sender; unsent emails stay queued for the next start
+    from services.mail_queue import shutdown_mail_queue
+    shutdown_mail_queue()
 
 
 def create_app() -> FastAPI:
@@ -116,6 +127,9 @@ def create_app() -> FastAPI:
     from api.middleware import TenantContextMiddleware, AuthMiddleware, setup_rate_limiting
     from api.middleware.request_limits import RequestSizeLimitMiddleware
 
+    # Pure ASGI middleware chain (auth -> tenant -> size limit, outermost first):
+    # header-only checks, no per-layer task or response buffering
+
     # Request size limit middleware (DoS protection)
     app.add_middleware(RequestSizeLimitMiddleware)
 
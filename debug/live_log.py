@@ -8,7 +8,9 @@ understand workflow activity.
 Usage:
     tail -f tmp-debug/live/{thread_id}.log
 
-The log file is deleted when the thread is closed.
+The log file is deleted when the thread is closed. Lines are written by the
+background log sink (debug/log_sink.py), so they reach the file shortly
+after the event rather than inside the workflow turn.
 """
 
 from __future__ import annotations
@@ -16,9 +18,11 @@ from __future__ import annotations
 import os
 import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from .log_sink import flush_logs, get_log_sink
 from .settings import is_trace_enabled
 
 
@@ -35,17 +39,18 @@ ROOT = _root_dir()
 _INITIALIZED: set[str] = set()
 
 
-def _ensure_dir() -> None:
-    ROOT.mkdir(parents=True, exist_ok=True)
-
-
 def _sanitise(thread_id: str) -> str:
     cleaned = thread_id.replace(os.sep, "_").replace("..", "_")
     return cleaned or "unknown-thread"
 
 
+@lru_cache(maxsize=1024)
+def _path_in(root: Path, thread_id: str) -> Path:
+    return root / f"{_sanitise(thread_id)}.log"
+
+
 def _log_path(thread_id: str) -> Path:
-    return ROOT / f"{_sanitise(thread_id)}.log"
+    return _path_in(ROOT, thread_id)
 
 
 def _format_timestamp() -> str:
@@ -180,22 +185,13 @@ def append_log(thread_id: str, event: Dict[str, Any]) -> None:
     if granularity != "logic":
         return
 
-    _ensure_dir()
-
     # Auto-initialize on first event for this thread
     if thread_id not in _INITIALIZED:
         write_header(thread_id)
         _INITIALIZED.add(thread_id)
 
-    line = _format_event(event)
-    path = _log_path(thread_id)
-
-    try:
-        with path.open("a", encoding="utf-8") as f:
-            f.write(line + "\n")
-            f.flush()
-    except Exception:
-        pass  # Don't fail the workflow if logging fails
+    # The sink never raises, so logging cannot fail the workflow
+    get_log_sink().write(_log_path(thread_id), _format_event(event) + "\n")
 
 
 def write_header(thread_id: str) -> None:
@@ -203,7 +199,6 @@ def write_header(thread_id: str) -> None:
     if not is_trace_enabled():
         return
 
-    _ensure_dir()
     path = _log_path(thread_id)
     now = datetime.now(timezone.utc).isoformat()
 
@@ -217,12 +212,7 @@ API endpoint: /api/debug/threads/{thread_id}/llm-diagnosis
 ================================================================================
 
 """
-    try:
-        with path.open("w", encoding="utf-8") as f:
-            f.write(header)
-            f.flush()
-    except Exception:
-        pass
+    get_log_sink().write(path, header, truncate=True)
 
 
 def close_log(thread_id: str, reason: str = "closed") -> Optional[Path]:
@@ -231,6 +221,7 @@ def close_log(thread_id: str, reason: str = "closed") -> Optional[Path]:
     _INITIALIZED.discard(thread_id)
 
     path = _log_path(thread_id)
+    flush_logs(path, close=True)
     if not path.exists():
         return None
 
@@ -251,11 +242,13 @@ def close_log(thread_id: str, reason: str = "closed") -> Optional[Path]:
 def get_log_path(thread_id: str) -> Optional[Path]:
     """Get the path to the live log file if it exists."""
     path = _log_path(thread_id)
+    flush_logs(path)
     return path if path.exists() else None
 
 
 def list_active_logs() -> list[str]:
     """List all active thread IDs with live logs."""
+    flush_logs()
     if not ROOT.exists():
         return []
     return [p.stem for p in ROOT.glob("*.log")]
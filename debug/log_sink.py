@@ -0,0 +1,280 @@
+"""Background writer for the debug trace files (timeline JSONL and live logs).
+
+Trace events are emitted inside workflow turns. Writing each one directly
+costs an open/write/flush/close per event on the request path, so callers
+hand finished text to this sink instead:
+
+- ``write(path, text)`` queues an append; ``write(path, text, truncate=True)``
+  replaces the file (live log headers). Callers serialize before queueing,
+  so the writer never touches live workflow objects.
+- A daemon thread drains the bounded queue in batches, joins the appends
+  per file into one write, and keeps recently used files open (LRU).
+- ``flush(path)`` blocks until everything queued so far is on disk and, with
+  ``close=True``, closes the cached handle (before a file is read, moved or
+  deleted). ``shutdown_log_sink()`` drains and closes everything; it also
+  runs at interpreter exit.
+- When the queue is full, ``write`` waits briefly and then drops the line
+  (counted in ``stats()``): a debug log never stalls a turn for long.
+
+Environment:
+    DEBUG_LOG_ASYNC=1|0          background writer (default) or write inline
+    DEBUG_LOG_QUEUE_MAX=<n>      max queued writes (default: 10000)
+    DEBUG_LOG_OPEN_FILES=<n>     file handles kept open (default: 32)
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_MAX = 10000
+DEFAULT_OPEN_FILES = 32
+_BATCH_MAX = 512
+_PUT_TIMEOUT_S = 0.05
+
+# Queue items: (kind, path, text, barrier) with kind "append", "truncate", "flush" or "stop"
+_Item = Tuple[str, Optional[Path], str, Optional[threading.Event]]
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        logger.warning("[LOG_SINK] Ignoring invalid %s=%r", name, raw)
+        return default
+
+
+def async_mode_enabled() -> bool:
+    return os.getenv("DEBUG_LOG_ASYNC", "1").strip() != "0"
+
+
+class LogSink:
+    """Bounded write queue drained by one background thread."""
+
+    def __init__(
+        self,
+        *,
+        background: bool = True,
+        max_queue: int = DEFAULT_QUEUE_MAX,
+        max_open_files: int = DEFAULT_OPEN_FILES,
+    ) -> None:
+        self.background = background
+        self.max_open_files = max_open_files
+        self._queue: "queue.Queue[_Item]" = queue.Queue(maxsize=max_queue)
+        self._handles: "OrderedDict[Path, IO[str]]" = OrderedDict()
+        # Serializes file access between the writer thread and inline callers
+        self._io_lock = threading.Lock()
+        self._counters: Dict[str, int] = {"written": 0, "batches": 0, "dropped": 0, "errors": 0}
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        if background:
+            self._thread = threading.Thread(target=self._run, name="debug-log-sink", daemon=True)
+            self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def write(self, path: Path, text: str, *, truncate: bool = False) -> None:
+        """Queue ``text`` for ``path`` (never raises)."""
+
+        item: _Item = ("truncate" if truncate else "append", path, text, None)
+        if not self.background or self._closed:
+            with self._io_lock:
+                self._write_batch([item])
+            return
+        try:
+            self._queue.put(item, timeout=_PUT_TIMEOUT_S)
+        except queue.Full:
+            self._counters["dropped"] += 1
+            if self._counters["dropped"] == 1:
+                logger.warning("[LOG_SINK] Queue full, dropping debug log lines")
+
+    def flush(self, path: Optional[Path] = None, *, close: bool = False, timeout: float = 5.0) -> bool:
+        """Wait until earlier writes are on disk; ``close`` also closes the handle(s).
+
+        Returns False if the writer did not catch up within ``timeout``.
+        """
+
+        done = True
+        if self.background and not self._closed and self._thread is not None and self._thread.is_alive():
+            barrier = threading.Event()
+            deadline = time.monotonic() + timeout
+            try:
+                self._queue.put(("flush", None, "", barrier), timeout=timeout)
+            except queue.Full:
+                done = False
+            else:
+                done = barrier.wait(max(0.0, deadline - time.monotonic()))
+        if close:
+            with self._io_lock:
+                if path is None:
+                    self._close_all()
+                else:
+                    self._close(path)
+        return done
+
+    # ------------------------------------------------------------------
+    # Writer side
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            batch: List[_Item] = [self._queue.get()]
+            while len(batch) < _BATCH_MAX:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            with self._io_lock:
+                pending: List[_Item] = []
+                for item in batch:
+                    kind, _path, _text, barrier = item
+                    if barrier is None:
+                        pending.append(item)
+                        continue
+                    self._write_batch(pending)
+                    pending = []
+                    stop = stop or kind == "stop"
+                    barrier.set()
+                self._write_batch(pending)
+            if stop:
+                return
+
+    def _write_batch(self, items: List[_Item]) -> None:
+        """Write queued items in order, one ``write`` per run of appends to a file."""
+
+        if not items:
+            return
+        chunks: "OrderedDict[Path, List[str]]" = OrderedDict()
+        for kind, path, text, _barrier in items:
+            if path is None:
+                continue
+            if kind == "truncate":
+                self._flush_chunks(chunks)
+                chunks = OrderedDict()
+                self._close(path)
+                self._append(path, [text], mode="w")
+                continue
+            chunks.setdefault(path, []).append(text)
+        self._flush_chunks(chunks)
+        self._counters["batches"] += 1
+
+    def _flush_chunks(self, chunks: "OrderedDict[Path, List[str]]") -> None:
+        for path, texts in chunks.items():
+            self._append(path, texts, mode="a")
+
+    def _append(self, path: Path, texts: List[str], *, mode: str) -> None:
+        try:
+            handle = self._handle(path, mode)
+            handle.write("".join(texts))
+            handle.flush()
+            self._counters["written"] += len(texts)
+        except Exception:
+            self._counters["errors"] += 1
+            self._close(path)
+
+    def _handle(self, path: Path, mode: str) -> IO[str]:
+        handle = self._handles.get(path)
+        if handle is not None and not handle.closed:
+            self._handles.move_to_end(path)
+            return handle
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle = path.open(mode, encoding="utf-8")
+        self._handles[path] = handle
+        while len(self._handles) > self.max_open_files:
+            _, oldest = self._handles.popitem(last=False)
+            oldest.close()
+        return handle
+
+    def _close(self, path: Path) -> None:
+        handle = self._handles.pop(path, None)
+        if handle is not None:
+            try:
+                handle.close()
+            except Exception:
+                pass
+
+    def _close_all(self) -> None:
+        for path in list(self._handles):
+            self._close(path)
+
+    # ------------------------------------------------------------------
+    # Metrics / lifecycle
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "background": self.background,
+            "queue_depth": self._queue.qsize(),
+            "open_files": len(self._handles),
+            **self._counters,
+        }
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Drain the queue, stop the writer and close every file."""
+
+        if self._closed:
+            return
+        if self.background and self._thread is not None and self._thread.is_alive():
+            barrier = threading.Event()
+            self._queue.put(("stop", None, "", barrier))
+            barrier.wait(timeout)
+            self._thread.join(timeout)
+        self._closed = True
+        with self._io_lock:
+            self._close_all()
+
+
+_SINK: Optional[LogSink] = None
+_SINK_LOCK = threading.Lock()
+
+
+def get_log_sink() -> LogSink:
+    """Return the process-wide sink, starting its writer thread on first use."""
+
+    global _SINK
+    with _SINK_LOCK:
+        if _SINK is None:
+            _SINK = LogSink(
+                background=async_mode_enabled(),
+                max_queue=_env_int("DEBUG_LOG_QUEUE_MAX", DEFAULT_QUEUE_MAX),
+                max_open_files=_env_int("DEBUG_LOG_OPEN_FILES", DEFAULT_OPEN_FILES),
+            )
+        return _SINK
+
+
+def flush_logs(path: Optional[Path] = None, *, close: bool = False) -> None:
+    """Flush the process-wide sink if it was started."""
+
+    sink = _SINK
+    if sink is not None:
+        sink.flush(path, close=close)
+
+
+def shutdown_log_sink() -> None:
+    """Drain and stop the process-wide sink (no-op if it was never started)."""
+
+    global _SINK
+    with _SINK_LOCK:
+        sink, _SINK = _SINK, None
+    if sink is not None:
+        sink.shutdown()
+
+
+atexit.register(shutdown_log_sink)
+
+
+__all__ = ["LogSink", "async_mode_enabled", "flush_logs", "get_log_sink", "shutdown_log_sink"]
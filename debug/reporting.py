@@ -362,14 +362,28 @@ def collect_trace_payload(
     granularity: str = "logic",
     kinds: Optional[Sequence[str]] = None,
     as_of_ts: Optional[float] = None,
+    since_seq: Optional[int] = None,
 ) -> Dict[str, Any]:
-    raw_events = BUS.get(thread_id)
+    """Trace payload for the debug UI.
+
+    With ``since_seq`` only events after that sequence are returned (plus a
+    ``cursor`` for the next poll) instead of the whole buffered history. The
+    timeline then comes from the in-memory buffer too; the JSONL file is only
+    parsed when the buffer has trimmed or lost events the client has not seen.
+    """
+
+    cursor: Optional[Dict[str, Any]] = None
+    if since_seq is not None and as_of_ts is None:
+        window = BUS.read(thread_id, since_seq)
+        raw_events = window.pop("events")
+        cursor = window
+    else:
+        raw_events = BUS.get(thread_id)
     live_state = get_thread_state(thread_id) or {}
     if not live_state:
-        for event in reversed(raw_events):
-            if event.get("kind") == "STATE_SNAPSHOT":
-                live_state = dict(event.get("data") or {})
-                break
+        latest = BUS.latest(thread_id, "STATE_SNAPSHOT")
+        if latest is not None:
+            live_state = dict(latest.get("data") or {})
 
     historical_state = _state_snapshot_as_of(raw_events, as_of_ts) if as_of_ts is not None else None
     if as_of_ts is not None:
@@ -387,15 +401,25 @@ def collect_trace_payload(
         time_travel_meta = {"enabled": False}
 
     filtered_events = filter_trace_events(raw_events, granularity, kinds)
-    return {
+    if cursor is not None and not cursor["reset"] and not cursor["dropped"]:
+        # The buffer still holds every event the timeline file gained since the cursor
+        timeline_entries = list(raw_events)
+    else:
+        timeline_entries = timeline.snapshot(thread_id)
+        if cursor is not None and not cursor["reset"]:
+            timeline_entries = [entry for entry in timeline_entries if (entry.get("seq") or 0) > since_seq]
+    payload = {
         "thread_id": thread_id,
         "state": state_snapshot,
         "confirmed": confirmed,
         "trace": filtered_events,
-        "timeline": timeline.snapshot(thread_id),
+        "timeline": timeline_entries,
         "summary": summary,
         "time_travel": time_travel_meta,
     }
+    if cursor is not None:
+        payload["cursor"] = cursor
+    return payload
 
 
 def compose_debug_report(payload: Dict[str, Any]) -> str:
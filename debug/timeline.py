@@ -4,9 +4,12 @@ import json
 import os
 import shutil
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from .log_sink import flush_logs, get_log_sink
+
 
 def _root_dir() -> Path:
     custom = os.getenv("DEBUG_TRACE_DIR")
@@ -29,8 +32,13 @@ def _sanitise(thread_id: str) -> str:
     return cleaned or "unknown-thread"
 
 
+@lru_cache(maxsize=1024)
+def _path_in(root: Path, thread_id: str) -> Path:
+    return root / f"{_sanitise(thread_id)}.jsonl"
+
+
 def _live_path(thread_id: str) -> Path:
-    return ROOT / f"{_sanitise(thread_id)}.jsonl"
+    return _path_in(ROOT, thread_id)
 
 
 def _archived_paths(thread_id: str) -> List[Path]:
@@ -46,16 +54,17 @@ def _archived_paths(thread_id: str) -> List[Path]:
 
 
 def append(thread_id: str, event: Dict) -> None:
-    _ensure_dirs()
-    path = _live_path(thread_id)
-    line = json.dumps(event, ensure_ascii=False)
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(line + "\n")
-        handle.flush()
+    append_line(thread_id, json.dumps(event, ensure_ascii=False))
+
+
+def append_line(thread_id: str, line: str) -> None:
+    """Queue one serialized event; the log sink writes it off the request path."""
+    get_log_sink().write(_live_path(thread_id), line + "\n")
 
 
 def snapshot(thread_id: str) -> List[Dict]:
     live = _live_path(thread_id)
+    flush_logs(live)
     source: Optional[Path]
     if live.exists():
         source = live
@@ -82,6 +91,7 @@ def snapshot(thread_id: str) -> List[Dict]:
 
 def mark_closed(thread_id: str, reason: str = "closed") -> str:
     live = _live_path(thread_id)
+    flush_logs(live, close=True)
     if not live.exists():
         return ""
     _ensure_dirs()
@@ -106,6 +116,7 @@ def mark_closed(thread_id: str, reason: str = "closed") -> str:
 
 def resolve_path(thread_id: str) -> Optional[Path]:
     live = _live_path(thread_id)
+    flush_logs(live)
     if live.exists():
         return live
     archived = _archived_paths(thread_id)
@@ -114,4 +125,4 @@ def resolve_path(thread_id: str) -> Optional[Path]:
     return None
 
 
-__all__ = ["append", "snapshot", "mark_closed", "resolve_path"]
+__all__ = ["append", "append_line", "snapshot", "mark_closed", "resolve_path"]
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import json
+import os
+import sys
 import threading
 import time
-from dataclasses import asdict, dataclass, field
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
 from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from .settings import is_trace_enabled
@@ -58,6 +63,16 @@ _SUBLOOP_CONTEXT: Dict[str, Optional[str]] = {}
 REQUIREMENTS_MATCH_HELP = "Deterministic digest of date, pax, and constraints. 'Match' means inputs didn’t change since the last evaluation."
 
 
+def _with_slots(cls: type) -> type:
+    """Rebuild a dataclass with ``__slots__`` (``slots=True`` needs Python 3.10)."""
+
+    names = tuple(f.name for f in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items() if key not in names + ("__dict__", "__weakref__")}
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_with_slots
 @dataclass
 class TraceEvent:
     thread_id: str
@@ -80,8 +95,8 @@ class TraceEvent:
     summary: Optional[str] = None
     payload: Dict[str, Any] = field(default_factory=dict)
     data: Dict[str, Any] = field(default_factory=dict)
-    captured_additions: List[str] = field(default_factory=list)
-    confirmed_now: List[str] = field(default_factory=list)
+    captured_additions: Tuple[str, ...] = ()
+    confirmed_now: Tuple[str, ...] = ()
     loop: bool = False
     detour_to_step: Optional[int] = None
     wait_state: Optional[str] = None
@@ -97,6 +112,74 @@ class TraceEvent:
     draft: Optional[Dict[str, Any]] = None
     subloop: Optional[str] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready view; nested dicts are shared with the stored event (read-only)."""
+
+        result = {name: getattr(self, name) for name in _EVENT_FIELDS}
+        result["captured_additions"] = list(self.captured_additions)
+        result["confirmed_now"] = list(self.confirmed_now)
+        return result
+
+
+_EVENT_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(TraceEvent))
+_EVENT_BASE_BYTES = sys.getsizeof(TraceEvent(thread_id="", ts=0.0, seq=0, row_id="", kind="STEP_ENTER", lane="step"))
+# Fields that can hold strings or containers; ``data`` and ``db`` usually
+# repeat ``payload`` and ``io`` and are only counted when they differ
+_SIZED_FIELDS: Tuple[str, ...] = tuple(
+    name
+    for name in _EVENT_FIELDS
+    if name not in {"ts", "seq", "loop", "step_major", "step_minor", "detour_to_step", "data", "db"}
+)
+
+
+_ALIASED_FIELDS = frozenset({"payload", "data", "io", "db"})
+
+
+def _approx_size(value: Any, depth: int = 0) -> int:
+    """Rough retained size of a trace value (containers walked 4 levels deep)."""
+
+    if value is None or isinstance(value, (bool, int, float)):
+        return 0
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    size = sys.getsizeof(value)
+    if depth >= 4:
+        return size
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += _approx_size(key, depth + 1) + _approx_size(item, depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += _approx_size(item, depth + 1)
+    return size
+
+
+def _event_size(ev: TraceEvent) -> int:
+    size = _EVENT_BASE_BYTES
+    for name in _SIZED_FIELDS:
+        value = getattr(ev, name)
+        if value is not None:
+            size += _approx_size(value)
+    if ev.data is not ev.payload:
+        size += _approx_size(ev.data)
+    if ev.db is not ev.io:
+        size += _approx_size(ev.db)
+    return size
+
+
+def _event_line(record: Dict[str, Any]) -> Tuple[str, int]:
+    """Timeline JSON line for an emitted event, and its size with aliases counted once.
+
+    ``data`` and ``db`` are the same objects as ``payload`` and ``io``; each
+    pair is serialized once and spliced into the line twice.
+    """
+
+    body = json.dumps({k: v for k, v in record.items() if k not in _ALIASED_FIELDS}, ensure_ascii=False)
+    payload = json.dumps(record["payload"], ensure_ascii=False)
+    io = json.dumps(record["io"], ensure_ascii=False)
+    line = f'{body[:-1]}, "payload": {payload}, "data": {payload}, "io": {io}, "db": {io}}}'
+    return line, len(body) + len(payload) + len(io)
+
 
 def _next_sequence(thread_id: str) -> int:
     seq = _SEQ_COUNTER.get(thread_id, 0) + 1
@@ -199,27 +282,155 @@ def get_subloop_context(thread_id: str) -> Optional[str]:
     return _SUBLOOP_CONTEXT.get(thread_id)
 
 
+def _forget_thread(thread_id: str) -> None:
+    """Drop the per-thread trace bookkeeping of an evicted thread."""
+
+    _SEQ_COUNTER.pop(thread_id, None)
+    _STEP_MINOR_STATE.pop(thread_id, None)
+    _LAST_ENTITY_LABEL.pop(thread_id, None)
+    with _SUMMARY_LOCK:
+        _TRACE_SUMMARY.pop(thread_id, None)
+
+
+class _ThreadTrace:
+    __slots__ = ("events", "seqs", "sizes", "bytes")
+
+    def __init__(self) -> None:
+        self.events: List[TraceEvent] = []
+        # Parallel to ``events`` for bisecting by sequence number
+        self.seqs: List[int] = []
+        self.sizes: List[int] = []
+        self.bytes = 0
+
+    def drop_oldest(self, count: int) -> int:
+        freed = sum(self.sizes[:count])
+        del self.events[:count]
+        del self.seqs[:count]
+        del self.sizes[:count]
+        self.bytes -= freed
+        return freed
+
+
 class TraceBus:
-    def __init__(self, max_events: int = 2000) -> None:
-        self._buf: Dict[str, List[TraceEvent]] = {}
+    """In-memory trace events per thread, bounded per thread and in total.
+
+    Threads are kept in least-recently-used order (emits and reads both count
+    as use). When the estimated size of all buffers exceeds ``max_bytes``, the
+    idlest threads are evicted whole; a single thread over the budget loses
+    its oldest events instead.
+    """
+
+    def __init__(self, max_events: int = 2000, max_bytes: Optional[int] = None) -> None:
+        self._buf: "OrderedDict[str, _ThreadTrace]" = OrderedDict()
         self._lock = threading.Lock()
         self._max = max_events
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("DEBUG_TRACE_MAX_MB", "64")) * 1024 * 1024)
+        self._max_bytes = max_bytes
+        self._bytes = 0
+
+    def emit(self, ev: TraceEvent, size: Optional[int] = None) -> None:
+        if size is None:
+            size = _event_size(ev)
+        evicted: List[str] = []
+        with self._lock:
+            trace = self._buf.get(ev.thread_id)
+            if trace is None:
+                trace = self._buf[ev.thread_id] = _ThreadTrace()
+            else:
+                self._buf.move_to_end(ev.thread_id)
+            trace.events.append(ev)
+            trace.seqs.append(ev.seq)
+            trace.sizes.append(size)
+            trace.bytes += size
+            self._bytes += size
+            if len(trace.events) > self._max:
+                self._bytes -= trace.drop_oldest(len(trace.events) - self._max)
+            while self._bytes > self._max_bytes and len(self._buf) > 1:
+                thread_id, idle = self._buf.popitem(last=False)
+                self._bytes -= idle.bytes
+                evicted.append(thread_id)
+            if self._bytes > self._max_bytes and len(trace.events) > 1:
+                over, count = self._bytes - self._max_bytes, 0
+                while over > 0 and count < len(trace.events) - 1:
+                    over -= trace.sizes[count]
+                    count += 1
+                self._bytes -= trace.drop_oldest(count)
+        for thread_id in evicted:
+            _forget_thread(thread_id)
+
+    def get(self, thread_id: str, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Events of a thread as dicts, only those after sequence ``since`` when given."""
+
+        with self._lock:
+            events = self._slice(thread_id, since)
+        return [ev.to_dict() for ev in events]
+
+    def read(self, thread_id: str, since: int = 0) -> Dict[str, Any]:
+        """Incremental read: events after ``since`` plus the cursor for the next poll.
+
+        ``reset`` is set when ``since`` lies beyond the buffer (the thread was
+        evicted and started over); all buffered events are returned then.
+        ``dropped`` counts events after ``since`` that were already trimmed.
+        """
 
-    def emit(self, ev: TraceEvent) -> None:
         with self._lock:
-            buf = self._buf.setdefault(ev.thread_id, [])
-            buf.append(ev)
-            if len(buf) > self._max:
-                del buf[: len(buf) - self._max]
+            trace = self._buf.get(thread_id)
+            last_seq = trace.events[-1].seq if trace and trace.events else 0
+            first_seq = trace.events[0].seq if trace and trace.events else 0
+            reset = since > last_seq
+            events = self._slice(thread_id, 0 if reset else since)
+        dropped = max(0, first_seq - max(since, 0) - 1) if events and not reset else 0
+        return {
+            "events": [ev.to_dict() for ev in events],
+            "last_seq": last_seq,
+            "reset": reset,
+            "dropped": dropped,
+        }
+
+    def latest(self, thread_id: str, kind: TraceKind) -> Optional[Dict[str, Any]]:
+        """Most recent event of ``kind`` for a thread, without copying the buffer."""
 
-    def get(self, thread_id: str) -> List[Dict[str, Any]]:
         with self._lock:
-            return [asdict(ev) for ev in self._buf.get(thread_id, [])]
+            trace = self._buf.get(thread_id)
+            for ev in reversed(trace.events if trace else ()):
+                if ev.kind == kind:
+                    return ev.to_dict()
+        return None
+
+    def _slice(self, thread_id: str, since: Optional[int]) -> List[TraceEvent]:
+        trace = self._buf.get(thread_id)
+        if trace is None:
+            return []
+        self._buf.move_to_end(thread_id)
+        if not since:
+            return list(trace.events)
+        return trace.events[bisect_right(trace.seqs, since):]
+
+    def drop(self, thread_id: str) -> None:
+        with self._lock:
+            trace = self._buf.pop(thread_id, None)
+            if trace is not None:
+                self._bytes -= trace.bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buf.clear()
+            self._bytes = 0
 
     def list_threads(self) -> List[str]:
         with self._lock:
             return list(self._buf.keys())
 
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "threads": len(self._buf),
+                "events": sum(len(trace.events) for trace in self._buf.values()),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+            }
+
 
 BUS = TraceBus()
 
@@ -332,8 +543,8 @@ def emit(
         summary=summary_text,
         payload=payload,
         data=payload,
-        captured_additions=list(captured_additions or []),
-        confirmed_now=list(confirmed_now or []),
+        captured_additions=tuple(captured_additions or ()),
+        confirmed_now=tuple(confirmed_now or ()),
         loop=loop,
         detour_to_step=detour_to_step,
         wait_state=wait_state,
@@ -351,25 +562,32 @@ def emit(
     )
     if event.entity and event.entity != "Waiting":
         _LAST_ENTITY_LABEL[thread_id] = event.entity
-    BUS.emit(event)
+    record = event.to_dict()
+    try:
+        line, size = _event_line(record)
+    except (TypeError, ValueError):
+        line, size = None, None
+    # The timeline line is serialized anyway; its length doubles as the size estimate
+    BUS.emit(event, _EVENT_BASE_BYTES + size if size is not None else None)
     _record_summary(
         thread_id,
         step_major=event.step_major if (event.step_major and (event.entity or "") != "Waiting") else None,
         wait_state=wait_state,
         hash_status=event.hash_status,
     )
-    try:
-        from . import timeline  # pylint: disable=import-outside-toplevel
+    if line is not None:
+        try:
+            from . import timeline  # pylint: disable=import-outside-toplevel
 
-        timeline.append(thread_id, asdict(event))
-    except Exception:
-        pass
+            timeline.append_line(thread_id, line)
+        except Exception:
+            pass
 
     # Also write to human-readable live log
     try:
         from . import live_log  # pylint: disable=import-outside-toplevel
 
-        live_log.append_log(thread_id, asdict(event))
+        live_log.append_log(thread_id, record)
     except Exception:
         pass
 
@@ -52,6 +52,7 @@ from detection.keywords.buckets import (
     ENHANCED_CONFIRMATION_KEYWORDS,
     AVAILABILITY_KEYWORDS,
 )
+from detection.keywords.matcher import PatternSet, compile_patterns
 
 # Use imports with local aliases for backward compatibility
 _RESUME_PHRASES = RESUME_PHRASES
@@ -361,7 +362,7 @@ def _matches_any(text: str, tokens: Iterable[str]) -> bool:
 
 def _matches_any_regex(text: str, patterns: List[str]) -> bool:
     """Match text against regex patterns (more flexible than substring matching)."""
-    return any(re.search(pattern, text, re.IGNORECASE) for pattern in patterns)
+    return compile_patterns(tuple(patterns), re.IGNORECASE).search(text)
 
 
 def _detect_room_mentions(text: str) -> bool:
@@ -387,38 +388,48 @@ _QNA_REGEX_PATTERNS: Dict[str, List[str]] = {
         r"\bwäre\s+(?:frei|verfügbar)\s+.*\b(?:januar|februar|märz|maerz|april|mai|juni|juli|august|september|oktober|november|dezember)",
     ],
 }
+# All Q&A regex buckets in one set: a single scan yields every matching type
+_QNA_REGEX_SET = PatternSet.from_groups(_QNA_REGEX_PATTERNS, re.IGNORECASE)
 
-
-def _is_acknowledgment(text: str) -> bool:
-    """Check if text is acknowledging previous Q&A, not asking a new question.
-
-    Messages like "thanks for the parking info" should not trigger parking Q&A again.
-    """
-    acknowledgment_patterns = (
+_ACKNOWLEDGMENT_SET = PatternSet.from_patterns(
+    (
         r"\bthanks?\s+(for|about)\s+(the\s+)?",  # "thanks for the parking info"
         r"\bthank\s+you\s+(for|about)\s+(the\s+)?",  # "thank you for the parking info"
         r"\bgot\s+it\s+(about|on|regarding)\s+",  # "got it about parking"
         r"\bgreat\s+(info|information)\s+(on|about)\s+",  # "great info on parking"
         r"\bgood\s+to\s+know\s+(about|regarding)\s+",  # "good to know about parking"
         r"\bnoted\s+(on|about|regarding)\s+",  # "noted on parking"
-    )
-    return any(re.search(pattern, text, re.IGNORECASE) for pattern in acknowledgment_patterns)
-
-
-def _is_confirmation_request(text: str) -> bool:
-    """Check if text is a confirmation request, not a Q&A question.
+    ),
+    re.IGNORECASE,
+)
 
-    "Can you please confirm Room A?" is an action request, not a question.
-    """
-    confirmation_patterns = (
+_CONFIRMATION_REQUEST_SET = PatternSet.from_patterns(
+    (
         r"\b(?:please\s+)?confirm\b",  # "please confirm", "confirm"
         r"\bcan\s+(?:you\s+)?(?:please\s+)?confirm\b",  # "can you confirm"
         r"\bcould\s+(?:you\s+)?(?:please\s+)?confirm\b",  # "could you confirm"
         r"\b(?:please\s+)?book\s+(?:it|the\s+room|the\s+venue)\b",  # "please book it"
         r"\blet'?s?\s+(?:go\s+(?:with|for|ahead)|proceed|book)\b",  # "let's go with", "let's proceed"
         r"\bi(?:'d|\s+would)\s+like\s+to\s+(?:book|confirm|proceed)\b",  # "I'd like to book"
-    )
-    return any(re.search(pattern, text, re.IGNORECASE) for pattern in confirmation_patterns)
+    ),
+    re.IGNORECASE,
+)
+
+
+def _is_acknowledgment(text: str) -> bool:
+    """Check if text is acknowledging previous Q&A, not asking a new question.
+
+    Messages like "thanks for the parking info" should not trigger parking Q&A again.
+    """
+    return _ACKNOWLEDGMENT_SET.search(text)
+
+
+def _is_confirmation_request(text: str) -> bool:
+    """Check if text is a confirmation request, not a Q&A question.
+
+    "Can you please confirm Room A?" is an action request, not a question.
+    """
+    return _CONFIRMATION_REQUEST_SET.search(text)
 
 
 def _detect_qna_types(text: str) -> List[str]:
@@ -428,12 +439,8 @@ def _detect_qna_types(text: str) -> List[str]:
     if _is_acknowledgment(text):
         return []
 
-    matches: List[str] = []
-
     # First check regex patterns (more flexible, handles variations)
-    for qna_type, patterns in _QNA_REGEX_PATTERNS.items():
-        if patterns and _matches_any_regex(text, patterns):
-            matches.append(qna_type)
+    matches: List[str] = _QNA_REGEX_SET.matched_labels(text)
 
     # Then check simple substring keywords (for existing types)
     for qna_type, keywords in _QNA_KEYWORDS.items():
@@ -484,22 +491,20 @@ def get_qna_steps(qna_types: List[str]) -> List[int]:
     return sorted(steps - {0})
 
 
+_DATE_ANCHOR_SET = PatternSet.from_patterns(
+    _DATE_PATTERNS
+    + (
+        r"\b(?:next|following)\s+(?:week|month)\b",
+        r"\bweek\s+of\b",
+        r"\b(?:on|for)\s+\d{1,2}(?:st|nd|rd|th)?\b",
+        r"\b(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
+        r"\b\d{1,2}\s*(?:am|pm|:)\b",
+    )
+)
+
+
 def _has_date_anchor(text: str) -> bool:
-    if any(re.search(pattern, text) for pattern in _DATE_PATTERNS):
-        return True
-    if _matches_any(text, _MONTH_TOKENS):
-        return True
-    if re.search(r"\b(?:next|following)\s+(?:week|month)\b", text):
-        return True
-    if re.search(r"\bweek\s+of\b", text):
-        return True
-    if re.search(r"\b(?:on|for)\s+\d{1,2}(?:st|nd|rd|th)?\b", text):
-        return True
-    if re.search(r"\b(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b", text):
-        return True
-    if re.search(r"\b\d{1,2}\s*(?:am|pm|:)\b", text):
-        return True
-    return False
+    return _matches_any(text, _MONTH_TOKENS) or _DATE_ANCHOR_SET.search(text)
 
 
 def _has_availability_ask(text: str) -> bool:
@@ -519,13 +524,17 @@ _MANAGER_PATTERNS = (
 )
 
 
+_MANAGER_SET = PatternSet.from_patterns(_MANAGER_PATTERNS)
+_ACTION_SET = PatternSet.from_patterns(_ACTION_PATTERNS)
+
+
 def _looks_like_manager_request(text: str) -> bool:
-    return any(re.search(pattern, text) for pattern in _MANAGER_PATTERNS)
+    return _MANAGER_SET.search(text)
 
 
 def is_action_request(text: str) -> bool:
     """Check if message is requesting an action vs asking a question."""
-    return any(re.search(pattern, text) for pattern in _ACTION_PATTERNS)
+    return _ACTION_SET.search(text)
 
 
 _EVENT_INTENTS = {
@@ -7,6 +7,7 @@ modules import from here. DO NOT define keyword patterns elsewhere.
 
 CONTAINS:
     - buckets.py  All keyword buckets, patterns, and enums
+    - matcher.py  PatternSet: buckets precompiled once, matched in one scan
 
 KEYWORD CATEGORIES:
 
@@ -6,7 +6,7 @@ This is THE authoritative location for all keyword patterns. All detection
 modules import from here. DO NOT define keyword patterns elsewhere.
 
 DEPENDS ON:
-    - (none - this is the foundation)
+    - backend/detection/keywords/matcher.py  # PatternSet (buckets precompiled at import)
 
 USED BY:
     - backend/detection/intent/classifier.py
@@ -70,6 +70,9 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+from detection.keywords.matcher import PatternSet, compile_patterns
+from workflows.common.message_features import message_features
+
 
 # =============================================================================
 # DETOUR MODE (how the change was initiated)
@@ -486,6 +489,109 @@ ANAPHORIC_REFERENCES = {
     ],
 }
 
+# Language markers used by detect_language (matched case-insensitively)
+LANGUAGE_MARKERS = {
+    "de": [
+        r"\b(und|oder|aber|für|mit|bei|können|möchten|gerne|bitte)\b",
+        r"\b(der|die|das|den|dem|des)\b",
+        r"\b(ich|wir|Sie|uns|Ihnen)\b",
+    ],
+    "en": [
+        r"\b(and|or|but|for|with|can|could|would|please)\b",
+        r"\b(the|a|an)\b",
+        r"\b(I|we|you|us|them)\b",
+    ],
+    "fr": [
+        r"\b(et|ou|mais|pour|avec|pouvez|voulez|merci)\b",
+        r"\b(le|la|les|un|une|des|du)\b",
+        r"\b(je|nous|vous|ils|elles)\b",
+        r"\b(s'il\s+vous\s+plaît|svp)\b",
+    ],
+    "it": [
+        r"\b(e|o|ma|per|con|potete|voglio|grazie|prego)\b",
+        r"\b(il|la|lo|gli|le|un|una)\b",
+        r"\b(io|noi|voi|loro)\b",
+    ],
+    "es": [
+        r"\b(y|o|pero|para|con|pueden|quiero|gracias)\b",
+        r"\b(el|la|los|las|un|una)\b",
+        r"\b(yo|nosotros|ustedes|ellos)\b",
+        r"\b(por\s+favor)\b",
+    ],
+}
+
+
+# =============================================================================
+# PRECOMPILED PATTERN SETS
+# =============================================================================
+# Built once at import (see detection/keywords/matcher.py); each set answers
+# "which patterns matched" in one scan of the lowercased message.
+
+_CHANGE_VERB_SETS = {
+    "en": PatternSet.from_groups(CHANGE_VERBS_EN),
+    "de": PatternSet.from_groups(CHANGE_VERBS_DE),
+}
+_VERB_GROUP_BOOST = {
+    "strong": 0.3,
+    "reschedule": 0.25,
+    "booking": 0.2,
+    "product_mod": 0.25,  # Product modifications are clear change signals
+}
+_REVISION_MARKER_SETS = {
+    "en": PatternSet.from_patterns(REVISION_MARKERS_EN),
+    "de": PatternSet.from_patterns(REVISION_MARKERS_DE),
+}
+_REQUEST_MODIFIER_SETS = {
+    "en": PatternSet.from_patterns(REQUEST_MODIFIERS_EN),
+    "de": PatternSet.from_patterns(REQUEST_MODIFIERS_DE),
+}
+_PURE_QA_SETS = {
+    "en": PatternSet.from_patterns(PURE_QA_SIGNALS_EN),
+    "de": PatternSet.from_patterns(PURE_QA_SIGNALS_DE),
+}
+_CONFIRMATION_SETS = {
+    "en": PatternSet.from_patterns(CONFIRMATION_SIGNALS_EN),
+    "de": PatternSet.from_patterns(CONFIRMATION_SIGNALS_DE),
+    "fr": PatternSet.from_patterns(CONFIRMATION_SIGNALS_FR),
+    "it": PatternSet.from_patterns(CONFIRMATION_SIGNALS_IT),
+    "es": PatternSet.from_patterns(CONFIRMATION_SIGNALS_ES),
+}
+_DECLINE_SETS = {
+    "en": PatternSet.from_patterns(DECLINE_SIGNALS_EN),
+    "de": PatternSet.from_patterns(DECLINE_SIGNALS_DE),
+    "fr": PatternSet.from_patterns(DECLINE_SIGNALS_FR),
+    "it": PatternSet.from_patterns(DECLINE_SIGNALS_IT),
+    "es": PatternSet.from_patterns(DECLINE_SIGNALS_ES),
+}
+# Targets always check both EN and DE (mixed-language messages are common)
+_TARGET_SETS = {
+    target_type: PatternSet.from_patterns(lang_patterns.get("en", []) + lang_patterns.get("de", []))
+    for target_type, lang_patterns in TARGET_PATTERNS.items()
+}
+_ANAPHORIC_SETS = {
+    "en": PatternSet.from_patterns(ANAPHORIC_REFERENCES.get("en", [])),
+    "de": PatternSet.from_patterns(ANAPHORIC_REFERENCES.get("de", [])),
+}
+_LANGUAGE_MARKER_SET = PatternSet(
+    ((pattern, lang) for lang, patterns in LANGUAGE_MARKERS.items() for pattern in patterns),
+    re.IGNORECASE,
+)
+
+# Explicit new-value patterns used to pick the detour mode
+_FAST_DATE_SET = PatternSet.from_patterns([
+    r"\d{4}[-./]\d{1,2}[-./]\d{1,2}",  # ISO date
+    r"\d{1,2}[-./]\d{1,2}[-./]\d{4}",  # DD.MM.YYYY
+    r"\d{1,2}[-./]\d{1,2}\b",          # DD.MM
+])
+_FAST_ROOM_RE = re.compile(r"\broom\s+[a-z]\b")
+_FAST_PARTICIPANTS_RE = re.compile(r"\b\d+\s+(people|persons?|guests?|pax)\b")
+_EXPLICIT_SWAP_RE = re.compile(r"(instead\s+of|not|rather\s+than)\s+.{1,30}\s+(but|,)\s+")
+
+
+def _languages(language: str, *codes: str) -> List[str]:
+    """Languages of ``codes`` active for ``language`` ("mixed" enables all)."""
+    return [code for code in codes if language in (code, "mixed")]
+
 
 # =============================================================================
 # DETECTION RESULT
@@ -517,41 +623,10 @@ def detect_language(text: str) -> str:
     """Detect if text is primarily English, German, French, Italian, Spanish or mixed."""
     text_lower = text.lower()
 
-    # Language-specific markers
-    lang_markers = {
-        "de": [
-            r"\b(und|oder|aber|für|mit|bei|können|möchten|gerne|bitte)\b",
-            r"\b(der|die|das|den|dem|des)\b",
-            r"\b(ich|wir|Sie|uns|Ihnen)\b",
-        ],
-        "en": [
-            r"\b(and|or|but|for|with|can|could|would|please)\b",
-            r"\b(the|a|an)\b",
-            r"\b(I|we|you|us|them)\b",
-        ],
-        "fr": [
-            r"\b(et|ou|mais|pour|avec|pouvez|voulez|merci)\b",
-            r"\b(le|la|les|un|une|des|du)\b",
-            r"\b(je|nous|vous|ils|elles)\b",
-            r"\b(s'il\s+vous\s+plaît|svp)\b",
-        ],
-        "it": [
-            r"\b(e|o|ma|per|con|potete|voglio|grazie|prego)\b",
-            r"\b(il|la|lo|gli|le|un|una)\b",
-            r"\b(io|noi|voi|loro)\b",
-        ],
-        "es": [
-            r"\b(y|o|pero|para|con|pueden|quiero|gracias)\b",
-            r"\b(el|la|los|las|un|una)\b",
-            r"\b(yo|nosotros|ustedes|ellos)\b",
-            r"\b(por\s+favor)\b",
-        ],
-    }
-
-    # Count matches for each language
-    counts = {}
-    for lang, patterns in lang_markers.items():
-        counts[lang] = sum(1 for p in patterns if re.search(p, text_lower, re.IGNORECASE))
+    # Count matched language markers for each language (one scan)
+    counts = {lang: 0 for lang in LANGUAGE_MARKERS}
+    for _pattern, lang in _LANGUAGE_MARKER_SET.matches(text_lower):
+        counts[lang] += 1
 
     # Find best match
     max_count = max(counts.values()) if counts else 0
@@ -572,28 +647,23 @@ def detect_language(text: str) -> str:
 
 def _match_patterns(text: str, patterns: List[str]) -> List[str]:
     """Return list of patterns that matched."""
-    text_lower = text.lower()
-    return [p for p in patterns if re.search(p, text_lower)]
+    return compile_patterns(tuple(patterns)).matched_patterns(text.lower())
 
 
 def _match_verb_groups(text: str, verb_groups: Dict[str, List[str]]) -> Tuple[List[str], float]:
     """Match change verbs and return matches with confidence boost."""
-    text_lower = text.lower()
+    if verb_groups is CHANGE_VERBS_EN:
+        verb_set = _CHANGE_VERB_SETS["en"]
+    elif verb_groups is CHANGE_VERBS_DE:
+        verb_set = _CHANGE_VERB_SETS["de"]
+    else:
+        verb_set = PatternSet.from_groups(verb_groups)
+
     matches = []
     boost = 0.0
-
-    for group, patterns in verb_groups.items():
-        for pattern in patterns:
-            if re.search(pattern, text_lower):
-                matches.append(pattern)
-                if group == "strong":
-                    boost = max(boost, 0.3)
-                elif group == "reschedule":
-                    boost = max(boost, 0.25)
-                elif group == "booking":
-                    boost = max(boost, 0.2)
-                elif group == "product_mod":
-                    boost = max(boost, 0.25)  # Product modifications are clear change signals
+    for pattern, group in verb_set.matches(text.lower()):
+        matches.append(pattern)
+        boost = max(boost, _VERB_GROUP_BOOST.get(group, 0.0))
 
     return matches, boost
 
@@ -605,40 +675,26 @@ def has_revision_signal(text: str, language: str = "mixed") -> Tuple[bool, List[
     Returns:
         (has_signal, matched_patterns, confidence_score)
     """
+    text_lower = text.lower()
+    langs = _languages(language, "en", "de")
     matches = []
     score = 0.0
 
     # Check change verbs
-    if language in ("en", "mixed"):
-        verb_matches, boost = _match_verb_groups(text, CHANGE_VERBS_EN)
-        matches.extend(verb_matches)
-        score += boost
-
-    if language in ("de", "mixed"):
-        verb_matches, boost = _match_verb_groups(text, CHANGE_VERBS_DE)
+    for lang in langs:
+        verb_matches, boost = _match_verb_groups(text_lower, CHANGE_VERBS_EN if lang == "en" else CHANGE_VERBS_DE)
         matches.extend(verb_matches)
         score += boost
 
     # Check revision markers
-    if language in ("en", "mixed"):
-        rev_matches = _match_patterns(text, REVISION_MARKERS_EN)
+    for lang in langs:
+        rev_matches = _REVISION_MARKER_SETS[lang].matched_patterns(text_lower)
         matches.extend(rev_matches)
         score += 0.2 * min(len(rev_matches), 2)  # Up to 0.4 for markers
 
-    if language in ("de", "mixed"):
-        rev_matches = _match_patterns(text, REVISION_MARKERS_DE)
-        matches.extend(rev_matches)
-        score += 0.2 * min(len(rev_matches), 2)
-
     # Check request modifiers (boosters)
-    if language in ("en", "mixed"):
-        req_matches = _match_patterns(text, REQUEST_MODIFIERS_EN)
-        if req_matches:
-            score += 0.15
-            matches.extend(req_matches)
-
-    if language in ("de", "mixed"):
-        req_matches = _match_patterns(text, REQUEST_MODIFIERS_DE)
+    for lang in langs:
+        req_matches = _REQUEST_MODIFIER_SETS[lang].matched_patterns(text_lower)
         if req_matches:
             score += 0.15
             matches.extend(req_matches)
@@ -665,24 +721,16 @@ def has_bound_target(
 
     # Check each target type - ALWAYS check both EN and DE patterns
     # Mixed-language usage is common in business contexts
-    for target_type, lang_patterns in TARGET_PATTERNS.items():
-        patterns = []
-        # Always include both languages for target detection
-        patterns.extend(lang_patterns.get("en", []))
-        patterns.extend(lang_patterns.get("de", []))
-
-        matches = _match_patterns(text, patterns)
+    for target_type, target_set in _TARGET_SETS.items():
+        matches = target_set.matched_patterns(text_lower)
         if matches:
             return True, target_type, matches
 
     # Check anaphoric references
-    anaphoric_patterns = []
-    if language in ("en", "mixed"):
-        anaphoric_patterns.extend(ANAPHORIC_REFERENCES.get("en", []))
-    if language in ("de", "mixed"):
-        anaphoric_patterns.extend(ANAPHORIC_REFERENCES.get("de", []))
+    anaphoric_matches = []
+    for lang in _languages(language, "en", "de"):
+        anaphoric_matches.extend(_ANAPHORIC_SETS[lang].matched_patterns(text_lower))
 
-    anaphoric_matches = _match_patterns(text, anaphoric_patterns)
     if anaphoric_matches:
         # Try to infer target type from anaphoric reference
         if any("date" in m or "day" in m or "termin" in m or "tag" in m for m in anaphoric_matches):
@@ -715,27 +763,14 @@ def is_pure_qa(text: str, language: str = "mixed") -> bool:
     """
     text_lower = text.lower()
 
-    qa_patterns = []
-    if language in ("en", "mixed"):
-        qa_patterns.extend(PURE_QA_SIGNALS_EN)
-    if language in ("de", "mixed"):
-        qa_patterns.extend(PURE_QA_SIGNALS_DE)
-
-    has_qa_signal = any(re.search(p, text_lower) for p in qa_patterns)
+    langs = _languages(language, "en", "de")
+    has_qa_signal = any(_PURE_QA_SETS[lang].search(text_lower) for lang in langs)
 
     if not has_qa_signal:
         return False
 
     # Check if there's also a change verb - if so, not pure Q&A
-    change_patterns = []
-    if language in ("en", "mixed"):
-        for group in CHANGE_VERBS_EN.values():
-            change_patterns.extend(group)
-    if language in ("de", "mixed"):
-        for group in CHANGE_VERBS_DE.values():
-            change_patterns.extend(group)
-
-    has_change_verb = any(re.search(p, text_lower) for p in change_patterns)
+    has_change_verb = any(_CHANGE_VERB_SETS[lang].search(text_lower) for lang in langs)
 
     # Pure Q&A = has Q&A signal but no change verb
     return has_qa_signal and not has_change_verb
@@ -743,36 +778,20 @@ def is_pure_qa(text: str, language: str = "mixed") -> bool:
 
 def is_confirmation(text: str, language: str = "mixed") -> bool:
     """Check if text is a confirmation/acceptance (multilingual: EN/DE/FR/IT/ES)."""
-    patterns = []
-    if language in ("en", "mixed"):
-        patterns.extend(CONFIRMATION_SIGNALS_EN)
-    if language in ("de", "mixed"):
-        patterns.extend(CONFIRMATION_SIGNALS_DE)
-    if language in ("fr", "mixed"):
-        patterns.extend(CONFIRMATION_SIGNALS_FR)
-    if language in ("it", "mixed"):
-        patterns.extend(CONFIRMATION_SIGNALS_IT)
-    if language in ("es", "mixed"):
-        patterns.extend(CONFIRMATION_SIGNALS_ES)
-
-    return any(re.search(p, text.lower()) for p in patterns)
+    text_lower = text.lower()
+    return any(
+        _CONFIRMATION_SETS[lang].search(text_lower)
+        for lang in _languages(language, "en", "de", "fr", "it", "es")
+    )
 
 
 def is_decline(text: str, language: str = "mixed") -> bool:
     """Check if text is a decline/cancellation (multilingual: EN/DE/FR/IT/ES)."""
-    patterns = []
-    if language in ("en", "mixed"):
-        patterns.extend(DECLINE_SIGNALS_EN)
-    if language in ("de", "mixed"):
-        patterns.extend(DECLINE_SIGNALS_DE)
-    if language in ("fr", "mixed"):
-        patterns.extend(DECLINE_SIGNALS_FR)
-    if language in ("it", "mixed"):
-        patterns.extend(DECLINE_SIGNALS_IT)
-    if language in ("es", "mixed"):
-        patterns.extend(DECLINE_SIGNALS_ES)
-
-    return any(re.search(p, text.lower()) for p in patterns)
+    text_lower = text.lower()
+    return any(
+        _DECLINE_SETS[lang].search(text_lower)
+        for lang in _languages(language, "en", "de", "fr", "it", "es")
+    )
 
 
 def compute_change_intent_score(
@@ -793,7 +812,7 @@ def compute_change_intent_score(
     Returns:
         ChangeIntentResult with all detection details
     """
-    language = detect_language(text)
+    language = message_features(text).language
 
     # Quick filters first
     if is_pure_qa(text, language):
@@ -837,26 +856,21 @@ def compute_change_intent_score(
         # Check for explicit new value patterns
         # Date patterns
         if target_type == "date":
-            date_patterns = [
-                r"\d{4}[-./]\d{1,2}[-./]\d{1,2}",  # ISO date
-                r"\d{1,2}[-./]\d{1,2}[-./]\d{4}",  # DD.MM.YYYY
-                r"\d{1,2}[-./]\d{1,2}\b",          # DD.MM
-            ]
-            if any(re.search(p, text) for p in date_patterns):
+            if _FAST_DATE_SET.search(text):
                 mode = DetourMode.FAST
 
         # Room name patterns
         elif target_type == "room":
-            if re.search(r"\broom\s+[a-z]\b", text.lower()):
+            if _FAST_ROOM_RE.search(text.lower()):
                 mode = DetourMode.FAST
 
         # Number patterns for requirements
         elif target_type == "requirements":
-            if re.search(r"\b\d+\s+(people|persons?|guests?|pax)\b", text.lower()):
+            if _FAST_PARTICIPANTS_RE.search(text.lower()):
                 mode = DetourMode.FAST
 
         # Check for explicit old+new pattern (explicit mode)
-        if re.search(r"(instead\s+of|not|rather\s+than)\s+.{1,30}\s+(but|,)\s+", text.lower()):
+        if _EXPLICIT_SWAP_RE.search(text.lower()):
             mode = DetourMode.EXPLICIT
 
         return ChangeIntentResult(
@@ -0,0 +1,168 @@
+"""
+MODULE: backend/detection/keywords/matcher.py
+PURPOSE: Precompiled multi-pattern matcher for the keyword buckets.
+
+Detection used to call ``re.search(pattern_string, text)`` once per pattern,
+per message: hundreds of searches (and ``re`` cache lookups/recompiles) for
+a single ``compute_change_intent_score``. A ``PatternSet`` compiles a bucket
+once at import and answers "which patterns/labels match?" in one scan:
+
+- Word patterns (``\\bword\\b``, ``\\b(a|b|c)\\b``, ``\\bstem\\w*\\b``) are
+  answered from the message's word-token set, tokenised once per text and
+  shared by every set.
+- Remaining regexes are joined into one alternation used as a gate: a message
+  that matches none of them costs a single search. When the gate hits, only
+  the individual patterns are checked, starting at the gate position.
+
+Results are identical to running ``re.search`` on each pattern in order.
+
+USAGE:
+    from detection.keywords.matcher import PatternSet
+
+    verbs = PatternSet.from_groups({"strong": [r"\\bchange\\b"], "booking": [r"\\bre-?book\\b"]})
+    verbs.matched_patterns("please change it")   # [r"\\bchange\\b"]
+    verbs.matched_labels("please change it")     # ["strong"]
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+_WORD_RUN = re.compile(r"\w+")
+# \bword\b | \b(a|b)\b | \b(?:a|b)\b  with plain word-character alternatives
+_WORDS_FORM = re.compile(r"^\\b(?:\((?:\?:)?)?((?:\w+\|)*\w+)\)?\\b$")
+# \bstem\w*\b
+_STEM_FORM = re.compile(r"^\\b(\w+)\\w\*\\b$")
+_BACKREF = re.compile(r"\\[1-9]|\(\?P=")
+
+_KIND_WORDS = 0
+_KIND_STEM = 1
+_KIND_REGEX = 2
+
+
+@lru_cache(maxsize=256)
+def _tokens(text: str) -> FrozenSet[str]:
+    """Maximal word-character runs of ``text`` (what ``\\bword\\b`` can match)."""
+    return frozenset(_WORD_RUN.findall(text))
+
+
+@lru_cache(maxsize=256)
+def _tokens_lower(text: str) -> FrozenSet[str]:
+    return frozenset(token.lower() for token in _tokens(text))
+
+
+def _classify(pattern: str, ignore_case: bool) -> Tuple[int, object]:
+    form = _WORDS_FORM.match(pattern)
+    if form and (not ignore_case or form.group(1).isascii()):
+        words = form.group(1).split("|")
+        # A wrapping group must be balanced: "\b(a|b)\b" or bare "\ba\b"
+        if pattern.count("(") == pattern.count(")") and pattern.count("(") <= 1:
+            if ignore_case:
+                words = [word.lower() for word in words]
+            return _KIND_WORDS, frozenset(words)
+    stem = _STEM_FORM.match(pattern)
+    if stem and (not ignore_case or stem.group(1).isascii()):
+        prefix = stem.group(1)
+        return _KIND_STEM, prefix.lower() if ignore_case else prefix
+    return _KIND_REGEX, None
+
+
+class PatternSet:
+    """Labelled regex patterns compiled once and matched in a single scan."""
+
+    __slots__ = ("patterns", "labels", "flags", "_kinds", "_compiled", "_gate", "_ungated", "_ignore_case")
+
+    def __init__(self, entries: Iterable[Tuple[str, str]], flags: int = 0) -> None:
+        pairs = list(entries)
+        self.patterns: Tuple[str, ...] = tuple(pattern for pattern, _ in pairs)
+        self.labels: Tuple[str, ...] = tuple(label for _, label in pairs)
+        self.flags = flags
+        self._ignore_case = bool(flags & re.IGNORECASE)
+        self._kinds: List[Tuple[int, object]] = [_classify(p, self._ignore_case) for p in self.patterns]
+        self._compiled: List[Optional[re.Pattern[str]]] = [
+            re.compile(p, flags) if kind == _KIND_REGEX else None
+            for p, (kind, _) in zip(self.patterns, self._kinds)
+        ]
+        regex_idx = [i for i, (kind, _) in enumerate(self._kinds) if kind == _KIND_REGEX]
+        gated = [i for i in regex_idx if not _BACKREF.search(self.patterns[i])]
+        self._ungated = frozenset(i for i in regex_idx if i not in set(gated))
+        self._gate: Optional[re.Pattern[str]] = None
+        if gated:
+            try:
+                self._gate = re.compile("|".join(f"(?:{self.patterns[i]})" for i in gated), flags)
+            except re.error:
+                self._ungated = frozenset(regex_idx)
+
+    @classmethod
+    def from_patterns(cls, patterns: Iterable[str], flags: int = 0) -> "PatternSet":
+        """Unlabelled set; each pattern is its own label."""
+        return cls(((p, p) for p in patterns), flags)
+
+    @classmethod
+    def from_groups(cls, groups: Mapping[str, Sequence[str]], flags: int = 0) -> "PatternSet":
+        """Set labelled by group name (e.g. ``CHANGE_VERBS_EN``)."""
+        return cls(((p, group) for group, patterns in groups.items() for p in patterns), flags)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def _indices(self, text: str, stop_at_first: bool = False) -> List[int]:
+        tokens = _tokens_lower(text) if self._ignore_case else _tokens(text)
+        gate_pos: Optional[int] = -1  # -1: gate not evaluated yet
+        hits: List[int] = []
+        for idx, (kind, data) in enumerate(self._kinds):
+            if kind == _KIND_WORDS:
+                matched = not tokens.isdisjoint(data)  # type: ignore[arg-type]
+            elif kind == _KIND_STEM:
+                matched = any(token.startswith(data) for token in tokens)  # type: ignore[arg-type]
+            elif idx in self._ungated:
+                matched = self._compiled[idx].search(text) is not None  # type: ignore[union-attr]
+            else:
+                if gate_pos == -1:
+                    gate = self._gate.search(text)  # type: ignore[union-attr]
+                    gate_pos = gate.start() if gate else None
+                matched = gate_pos is not None and self._compiled[idx].search(text, gate_pos) is not None  # type: ignore[union-attr]
+            if matched:
+                hits.append(idx)
+                if stop_at_first:
+                    break
+        return hits
+
+    def search(self, text: str) -> bool:
+        """True if any pattern matches (``any(re.search(p, text) ...)``)."""
+        return bool(self._indices(text, stop_at_first=True))
+
+    def first(self, text: str) -> Optional[str]:
+        """First matching pattern in declaration order."""
+        hits = self._indices(text, stop_at_first=True)
+        return self.patterns[hits[0]] if hits else None
+
+    def matched_patterns(self, text: str) -> List[str]:
+        """All matching patterns, in declaration order."""
+        return [self.patterns[i] for i in self._indices(text)]
+
+    def matched_labels(self, text: str) -> List[str]:
+        """Distinct labels of the matching patterns, in declaration order."""
+        seen: Dict[str, None] = {}
+        for i in self._indices(text):
+            seen.setdefault(self.labels[i], None)
+        return list(seen)
+
+    def matches(self, text: str) -> List[Tuple[str, str]]:
+        """All ``(pattern, label)`` pairs that match, in declaration order."""
+        return [(self.patterns[i], self.labels[i]) for i in self._indices(text)]
+
+
+@lru_cache(maxsize=128)
+def compile_patterns(patterns: Tuple[str, ...], flags: int = 0) -> PatternSet:
+    """Cached ``PatternSet`` for an ad-hoc pattern tuple."""
+    return PatternSet.from_patterns(patterns, flags)
+
+
+__all__ = ["PatternSet", "compile_patterns"]
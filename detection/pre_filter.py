@@ -19,6 +19,9 @@ import re
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 
+from detection.keywords.matcher import PatternSet
+from workflows.common.message_features import message_features
+
 
 # =============================================================================
 # CONFIGURATION
@@ -217,6 +220,7 @@ BILLING_PATTERNS = [
     # Country mentions
     r'\b(?:switzerland|schweiz|suisse|germany|deutschland|france|usa|uk|united\s*(?:states|kingdom))\b',
 ]
+_BILLING_SET = PatternSet.from_patterns(BILLING_PATTERNS, re.IGNORECASE)
 
 
 # =============================================================================
@@ -245,7 +249,8 @@ def run_pre_filter(
         PreFilterResult with all detection flags set
     """
     result = PreFilterResult()
-    text_lower = message.lower().strip()
+    features = message_features(message)
+    text_lower = features.normalized
 
     # -------------------------------------------------------------------------
     # 1. Duplicate Detection
@@ -270,7 +275,7 @@ def run_pre_filter(
     # -------------------------------------------------------------------------
     # 2. Language Detection
     # -------------------------------------------------------------------------
-    german_count = sum(1 for word in GERMAN_UNIQUE_WORDS if f" {word} " in f" {text_lower} ")
+    german_count = sum(1 for word in GERMAN_UNIQUE_WORDS if word in features.spaced_words)
     if german_count >= 2:
         result.language = "de"
         result.detected_language_confidence = min(0.5 + german_count * 0.1, 0.95)
@@ -376,11 +381,10 @@ def run_pre_filter(
     # -------------------------------------------------------------------------
     # 10. Billing Address Signals (Regex)
     # -------------------------------------------------------------------------
-    for pattern in BILLING_PATTERNS:
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            result.has_billing_signal = True
-            result.matched_patterns.append(f"billing:{pattern[:20]}...")
-            break
+    pattern = _BILLING_SET.first(text_lower)
+    if pattern is not None:
+        result.has_billing_signal = True
+        result.matched_patterns.append(f"billing:{pattern[:20]}...")
 
     # -------------------------------------------------------------------------
     # 11. Determine Skip Flags
@@ -433,7 +437,7 @@ def detect_manager_escalation(
             "matched_signals": [str]
         }
     """
-    text_lower = message.lower().strip()
+    text_lower = message_features(message).normalized
     result = {
         "is_escalation": False,
         "confidence": 0.0,
@@ -42,6 +42,7 @@ from functools import lru_cache
 from typing import Dict, List, Optional, Sequence, Tuple
 
 from services.rooms import load_room_catalog
+from workflows.common.message_features import message_features
 
 # Import comprehensive keyword buckets for enhanced detection
 from detection.keywords.buckets import (
@@ -56,7 +57,6 @@ from detection.keywords.buckets import (
     DECLINE_SIGNALS_EN,
     DECLINE_SIGNALS_DE,
     TARGET_PATTERNS,
-    detect_language,
     has_revision_signal,
     has_bound_target,
     is_pure_qa,
@@ -307,7 +307,7 @@ def is_pure_qa_message(text: str) -> bool:
     - "Can we change the date?"
     - "Sorry, I meant February 28th"
     """
-    language = detect_language(text)
+    language = message_features(text).language
     return is_pure_qa(text, language)
 
 
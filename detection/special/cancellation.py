@@ -14,7 +14,8 @@ from __future__ import annotations
 import re
 from typing import Optional, Tuple
 
-from detection.keywords.buckets import is_decline, detect_language
+from detection.keywords.buckets import is_decline
+from workflows.common.message_features import message_features
 
 
 # Strong cancellation signals - explicit intent to cancel the EVENT (not just decline an offer)
@@ -80,7 +81,7 @@ def detect_cancellation_intent(text: str) -> Tuple[bool, float, str]:
         return False, 0.0, "en"
 
     text_lower = text.lower()
-    language = detect_language(text)
+    language = message_features(text).language
 
     # Check strong cancellation signals first
     patterns = []
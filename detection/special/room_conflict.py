@@ -4,6 +4,7 @@ PURPOSE: Room conflict detection and resolution for the booking workflow.
 
 DEPENDS ON:
     - backend/workflows/io/database.py  # Database operations
+    - backend/workflows/common/occupancy.py  # Cached windows, batch occupancy index
 
 USED BY:
     - backend/workflows/groups/room_availability/trigger/process.py
@@ -57,7 +58,9 @@ from enum import Enum
 import logging
 
 from services.rooms import get_room
+from workflows.common.occupancy import active_index, event_items, event_window, note_event_changed
 from workflows.common.time_window import TimeWindow, windows_overlap
+from workflows.io.config_store import get_timezone
 
 logger = logging.getLogger(__name__)
 
@@ -103,21 +106,22 @@ def detect_room_conflict(
             "status": str  # "Option" or "Confirmed"
         }
     """
-    events = db.get("events") or []
-
-    # Support both list (production) and dict (tests) formats
-    if isinstance(events, dict):
-        event_items = events.items()
-    else:
-        # List format: each event has "event_id" key
-        event_items = [(e.get("event_id"), e) for e in events if isinstance(e, dict)]
-
     # Build TimeWindow for current event (if event_entry provided)
     current_window: Optional[TimeWindow] = None
     if event_entry:
         current_window = TimeWindow.from_event(event_entry)
 
-    for other_event_id, other_event in event_items:
+    index = active_index(db)
+    if index is not None:
+        booking = index.first_conflict(
+            room_id, exclude_event_id=event_id, window=current_window, date=event_date
+        )
+        if booking is None:
+            return None
+        return _conflict_info(db, booking.event_id, booking.event, room_id, event_date, booking.status)
+
+    timezone = get_timezone()
+    for other_event_id, other_event in event_items(db.get("events")):
         # Skip self
         if other_event_id == event_id:
             continue
@@ -134,9 +138,8 @@ def detect_room_conflict(
         if other_status.lower() not in ("option", "confirmed"):
             continue
 
-        # TIME-AWARE OVERLAP DETECTION
-        # Build TimeWindow for other event
-        other_window = TimeWindow.from_event(other_event)
+        # TIME-AWARE OVERLAP DETECTION (window parsed once per booking, see occupancy.py)
+        other_window = event_window(other_event, timezone)
 
         if current_window is not None and other_window is not None:
             # Both have time info - use proper overlap detection
@@ -151,24 +154,35 @@ def detect_room_conflict(
                 continue
 
         # Found a conflict!
-        other_client_id = other_event.get("client_id")
-        other_client = {}
-        if other_client_id:
-            clients = db.get("clients") or {}
-            other_client = clients.get(other_client_id) or {}
-
-        return {
-            "conflicting_event_id": other_event_id,
-            "conflicting_client_email": other_client.get("email") or other_event.get("client_email"),
-            "conflicting_client_name": other_client.get("name") or other_event.get("client_name"),
-            "room_id": room_id,
-            "event_date": event_date,
-            "status": other_status,
-        }
+        return _conflict_info(db, other_event_id, other_event, room_id, event_date, other_status)
 
     return None
 
 
+def _conflict_info(
+    db: Dict[str, Any],
+    other_event_id: Any,
+    other_event: Dict[str, Any],
+    room_id: str,
+    event_date: str,
+    other_status: str,
+) -> Dict[str, Any]:
+    other_client_id = other_event.get("client_id")
+    other_client = {}
+    if other_client_id:
+        clients = db.get("clients") or {}
+        other_client = clients.get(other_client_id) or {}
+
+    return {
+        "conflicting_event_id": other_event_id,
+        "conflicting_client_email": other_client.get("email") or other_event.get("client_email"),
+        "conflicting_client_name": other_client.get("name") or other_event.get("client_name"),
+        "room_id": room_id,
+        "event_date": event_date,
+        "status": other_status,
+    }
+
+
 def get_available_rooms_on_date(
     db: Dict[str, Any],
     event_id: str,
@@ -201,39 +215,41 @@ def get_available_rooms_on_date(
     all_rooms = set(rooms_data.keys())
 
     # Find rooms locked by other events during the query time window
-    events = db.get("events") or []
-    locked_rooms = set()
-
-    # Support both list (production) and dict (tests) formats
-    if isinstance(events, dict):
-        event_items = events.items()
+    index = active_index(db)
+    if index is not None:
+        locked_rooms = index.locked_rooms(
+            exclude_event_id=event_id, window=query_window, date=event_date, statuses=exclude_statuses
+        )
     else:
-        event_items = [(e.get("event_id"), e) for e in events if isinstance(e, dict)]
+        locked_rooms = set()
+        timezone = get_timezone()
+        for other_event_id, other_event in event_items(db.get("events")):
+            if other_event_id == event_id:
+                continue
 
-    for other_event_id, other_event in event_items:
-        if other_event_id == event_id:
-            continue
+            other_status = (other_event.get("status") or other_event.get("Status") or "").lower()
+            if other_status not in exclude_statuses:
+                continue
 
-        other_status = (other_event.get("status") or other_event.get("Status") or "").lower()
-        if other_status not in exclude_statuses:
-            continue
+            # Only events holding a room can lock one
+            other_room = other_event.get("locked_room_id")
+            if not other_room:
+                continue
 
-        # TIME-AWARE OVERLAP DETECTION
-        other_window = TimeWindow.from_event(other_event)
+            # TIME-AWARE OVERLAP DETECTION
+            other_window = event_window(other_event, timezone)
 
-        if query_window is not None and other_window is not None:
-            # Both have time info - use proper overlap detection
-            if not query_window.overlaps(other_window):
-                continue  # No time overlap = room is available for this time
-        else:
-            # Fallback to date-only comparison if no time info
-            other_date = other_event.get("chosen_date") or other_event.get("Event Date")
-            if str(other_date) != str(event_date):
-                continue
+            if query_window is not None and other_window is not None:
+                # Both have time info - use proper overlap detection
+                if not query_window.overlaps(other_window):
+                    continue  # No time overlap = room is available for this time
+            else:
+                # Fallback to date-only comparison if no time info
+                other_date = other_event.get("chosen_date") or other_event.get("Event Date")
+                if str(other_date) != str(event_date):
+                    continue
 
-        # This event overlaps - mark its room as locked
-        other_room = other_event.get("locked_room_id")
-        if other_room:
+            # This event overlaps - mark its room as locked
             locked_rooms.add(str(other_room).lower())
 
     # Return rooms not locked
@@ -403,6 +419,7 @@ def handle_loser_event(
             "available_rooms": available_rooms,
             "resolved_at": datetime.now().isoformat(),
         }
+        note_event_changed(loser_event, db)
 
         return {
             "action": "choose_another_room",
@@ -426,6 +443,7 @@ def handle_loser_event(
             "action": "choose_another_date",
             "resolved_at": datetime.now().isoformat(),
         }
+        note_event_changed(loser_event, db)
 
         return {
             "action": "choose_another_date",
@@ -223,6 +223,9 @@ IMPORTANT:
 # DETECTION FUNCTION
 # =============================================================================
 
+_DETECTION_SYSTEM_PROMPT = "You are a precise JSON extraction assistant. Return only valid JSON."
+
+
 def _merge_signal_flags(
     signals: Dict[str, Any],
     pre_filter_result: "PreFilterResult",
@@ -264,6 +267,53 @@ def _merge_signal_flags(
     }
 
 
+def _strip_code_fence(text: str) -> str:
+    json_text = text.strip()
+    if json_text.startswith("```"):
+        json_text = re.sub(r"```(?:json)?\n?", "", json_text)
+        json_text = json_text.rstrip("`").strip()
+    return json_text
+
+
+def _complete_cached(adapter: Any, provider: str, prompt: str) -> str:
+    """Run the detection completion through the shared LLM response cache.
+
+    Only real provider adapters are cached, and only responses that parse as
+    JSON are stored, so a malformed answer is retried on the next call.
+    """
+    from adapters.agent_adapter import GeminiAgentAdapter, OpenAIAgentAdapter
+    from llm.response_cache import get_llm_cache
+
+    cacheable = isinstance(adapter, (OpenAIAgentAdapter, GeminiAgentAdapter))
+    if cacheable:
+        cache = get_llm_cache()
+        key = cache.make_key(
+            "unified_detection",
+            provider,
+            getattr(adapter, "_intent_model", ""),
+            f"{_DETECTION_SYSTEM_PROMPT}\n{prompt}",
+        )
+        cached = cache.get(key, namespace="unified_detection")
+        if cached is not None:
+            return cached
+
+    response_text = adapter.complete(
+        prompt=prompt,
+        system_prompt=_DETECTION_SYSTEM_PROMPT,
+        temperature=0.1,  # Low temperature for consistent extraction
+        max_tokens=2000,
+    )
+
+    if cacheable and isinstance(response_text, str):
+        try:
+            json.loads(_strip_code_fence(response_text))
+        except ValueError:
+            pass
+        else:
+            cache.put(key, response_text, namespace="unified_detection")
+    return response_text
+
+
 def _create_blocked_detection_result() -> UnifiedDetectionResult:
     """Create a neutral detection result for blocked messages (attacks)."""
     return UnifiedDetectionResult(
@@ -366,22 +416,12 @@ def run_unified_detection(
     adapter = get_adapter_for_provider(intent_provider)
 
     try:
-        # Make the LLM call
-        response_text = adapter.complete(
-            prompt=prompt,
-            system_prompt="You are a precise JSON extraction assistant. Return only valid JSON.",
-            temperature=0.1,  # Low temperature for consistent extraction
-            max_tokens=2000,
-        )
+        # Make the LLM call (identical prompts are served from the response cache)
+        response_text = _complete_cached(adapter, intent_provider, prompt)
 
         # Parse JSON response
         # Handle potential markdown code blocks
-        json_text = response_text.strip()
-        if json_text.startswith("```"):
-            json_text = re.sub(r"```(?:json)?\n?", "", json_text)
-            json_text = json_text.rstrip("`").strip()
-
-        data = json.loads(json_text)
+        data = json.loads(_strip_code_fence(response_text))
 
         # Build result from parsed data
         signals = data.get("signals", {})
@@ -470,17 +510,8 @@ def run_unified_detection(
             try:
                 logger.info("[UNIFIED_DETECTION] Trying fallback provider: %s", fallback)
                 fallback_adapter = get_adapter_for_provider(fallback)
-                response_text = fallback_adapter.complete(
-                    prompt=prompt,
-                    system_prompt="You are a precise JSON extraction assistant. Return only valid JSON.",
-                    temperature=0.1,
-                    max_tokens=2000,
-                )
-                json_text = response_text.strip()
-                if json_text.startswith("```"):
-                    json_text = re.sub(r"```(?:json)?\n?", "", json_text)
-                    json_text = json_text.rstrip("`").strip()
-                data = json.loads(json_text)
+                response_text = _complete_cached(fallback_adapter, fallback, prompt)
+                data = json.loads(_strip_code_fence(response_text))
                 # Success with fallback - build result
                 signals = data.get("signals", {})
                 entities = data.get("entities", {})
@@ -549,12 +580,7 @@ def run_unified_detection(
             try:
                 logger.info("[UNIFIED_DETECTION] Trying fallback provider: %s", fallback)
                 fallback_adapter = get_adapter_for_provider(fallback)
-                response_text = fallback_adapter.complete(
-                    prompt=prompt,
-                    system_prompt="You are a precise JSON extraction assistant. Return only valid JSON.",
-                    temperature=0.1,
-                    max_tokens=2000,
-                )
+                response_text = _complete_cached(fallback_adapter, fallback, prompt)
                 data = json.loads(response_text.strip())
                 signals = data.get("signals", {})
                 entities = data.get("entities", {})
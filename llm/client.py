@@ -8,6 +8,8 @@ This ensures:
 2. Automatic retry with exponential backoff
 3. Single point for API key configuration
 4. Easier testing and mocking
+5. Pooled keep-alive HTTP connections (no TLS handshake per turn)
+6. Per-provider concurrency limits shared by sync and async callers
 
 USAGE:
     from llm.client import get_openai_client, is_llm_available
@@ -15,13 +17,29 @@ USAGE:
     if is_llm_available():
         client = get_openai_client()
         response = client.chat.completions.create(...)
+
+    # Independent calls in one turn: overlap instead of adding latencies
+    intent, entities = run_concurrently(classify, extract)
+
+    # Async callers
+    text = await achat_completion(messages)
+    texts = await abatch_chat_completion([{"messages": m1}, {"messages": m2}])
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import logging
 import os
-from typing import Optional
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Mapping, Optional, Sequence
+
+from utils.profiler import count, current_span, profiling_enabled, span
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +47,20 @@ logger = logging.getLogger(__name__)
 DEFAULT_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "30"))
 DEFAULT_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "3"))
 
+# Connection pool: keep connections warm between turns (httpx drops idle
+# connections after 5s by default, which means a fresh TLS handshake per turn).
+POOL_MAX_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "32"))
+POOL_MAX_KEEPALIVE = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "16"))
+POOL_KEEPALIVE_EXPIRY = float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "60"))
+
+# In-flight request cap per provider (LLM_MAX_CONCURRENCY_<PROVIDER> overrides)
+DEFAULT_PROVIDER_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+FANOUT_WORKERS = int(os.getenv("LLM_FANOUT_WORKERS", "8"))
+
 # Singleton client instance
 _client: Optional["OpenAI"] = None  # type: ignore
+# Async clients are bound to the event loop their connections were opened on
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
 
 
 def is_llm_available() -> bool:
@@ -69,12 +99,59 @@ def get_openai_client() -> "OpenAI":  # type: ignore
         return _client
 
     try:
-        from openai import OpenAI
+        from openai import DefaultHttpxClient, OpenAI
     except ImportError as exc:
         raise RuntimeError(
             "OpenAI SDK not installed. Run: pip install openai"
         ) from exc
 
+    _client = OpenAI(
+        api_key=_resolve_api_key(),
+        timeout=DEFAULT_TIMEOUT,
+        max_retries=DEFAULT_MAX_RETRIES,
+        http_client=DefaultHttpxClient(limits=_http_limits(), timeout=DEFAULT_TIMEOUT),
+    )
+    logger.debug("OpenAI client initialized (timeout=%s, retries=%s, pool=%s/%s)",
+                 DEFAULT_TIMEOUT, DEFAULT_MAX_RETRIES, POOL_MAX_KEEPALIVE, POOL_MAX_CONNECTIONS)
+
+    return _client
+
+
+def get_async_openai_client() -> "AsyncOpenAI":  # type: ignore
+    """
+    Get the AsyncOpenAI client for the running event loop.
+
+    Same timeout/retry/pool settings as get_openai_client(). One client is
+    kept per event loop because pooled connections cannot be shared across
+    loops.
+
+    Raises:
+        RuntimeError: If called outside an event loop or the SDK is missing
+        ValueError: If OPENAI_API_KEY is not set
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is not None:
+        return client
+
+    try:
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+    except ImportError as exc:
+        raise RuntimeError(
+            "OpenAI SDK not installed. Run: pip install openai"
+        ) from exc
+
+    client = AsyncOpenAI(
+        api_key=_resolve_api_key(),
+        timeout=DEFAULT_TIMEOUT,
+        max_retries=DEFAULT_MAX_RETRIES,
+        http_client=DefaultAsyncHttpxClient(limits=_http_limits(), timeout=DEFAULT_TIMEOUT),
+    )
+    _async_clients[loop] = client
+    return client
+
+
+def _resolve_api_key() -> str:
     api_key = os.getenv("OPENAI_API_KEY", "").strip()
     if not api_key:
         # Fallback for custom Vercel environment variable
@@ -85,22 +162,232 @@ def get_openai_client() -> "OpenAI":  # type: ignore
             "OPENAI_API_KEY (or openai_key_openevent) environment variable not set. "
             "Set it or use AGENT_MODE=stub for testing."
         )
+    return api_key
 
-    _client = OpenAI(
-        api_key=api_key,
-        timeout=DEFAULT_TIMEOUT,
-        max_retries=DEFAULT_MAX_RETRIES,
-    )
-    logger.debug("OpenAI client initialized (timeout=%s, retries=%s)",
-                 DEFAULT_TIMEOUT, DEFAULT_MAX_RETRIES)
 
-    return _client
+def _http_limits() -> Any:
+    import httpx
+
+    return httpx.Limits(
+        max_connections=POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=POOL_MAX_KEEPALIVE,
+        keepalive_expiry=POOL_KEEPALIVE_EXPIRY,
+    )
 
 
 def reset_client() -> None:
-    """Reset the client singleton (for testing)."""
+    """Reset the client singletons (for testing)."""
     global _client
     _client = None
+    _async_clients.clear()
+
+
+# Per-provider concurrency limits
+
+class ProviderLimiter:
+    """Caps in-flight requests to one provider across threads and event loops."""
+
+    def __init__(self, provider: str, limit: int) -> None:
+        self.provider = provider
+        self.limit = max(1, limit)
+        self._span_name = f"llm.{provider}"
+        self._sem = threading.BoundedSemaphore(self.limit)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, float] = {
+            "calls": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "throttled": 0,
+            "wait_ms_total": 0.0,
+        }
+
+    def _enter(self, waited_ms: Optional[float]) -> None:
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["in_flight"] += 1
+            self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._stats["in_flight"])
+            if waited_ms is not None:
+                self._stats["throttled"] += 1
+                self._stats["wait_ms_total"] += waited_ms
+
+    def _exit(self) -> None:
+        with self._lock:
+            self._stats["in_flight"] -= 1
+        self._sem.release()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        with span(self._span_name) as call:
+            waited_ms = None
+            if not self._sem.acquire(blocking=False):
+                started = time.perf_counter()
+                self._sem.acquire()
+                waited_ms = (time.perf_counter() - started) * 1000.0
+                call.set(slot_wait_ms=round(waited_ms, 1))
+            self._enter(waited_ms)
+            try:
+                yield
+            finally:
+                self._exit()
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        with span(self._span_name) as call:
+            async with self._aslot(call):
+                yield
+
+    @asynccontextmanager
+    async def _aslot(self, call: Any) -> AsyncIterator[None]:
+        waited_ms = None
+        if not self._sem.acquire(blocking=False):
+            started = time.perf_counter()
+            waiter = asyncio.ensure_future(asyncio.to_thread(self._sem.acquire))
+            try:
+                await asyncio.shield(waiter)
+            except asyncio.CancelledError:
+                # The helper thread may still get the slot; hand it back.
+                waiter.add_done_callback(
+                    lambda fut: self._sem.release() if not fut.cancelled() and fut.exception() is None else None
+                )
+                raise
+            waited_ms = (time.perf_counter() - started) * 1000.0
+            call.set(slot_wait_ms=round(waited_ms, 1))
+        self._enter(waited_ms)
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        stats["limit"] = self.limit
+        stats["wait_ms_total"] = round(stats["wait_ms_total"], 2)
+        return stats
+
+
+_LIMITERS: Dict[str, ProviderLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_provider_limiter(provider: str) -> ProviderLimiter:
+    """Return the shared limiter for a provider ("openai", "gemini", ...)."""
+    key = (provider or "default").lower()
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            raw = os.getenv(f"LLM_MAX_CONCURRENCY_{key.upper()}", "").strip()
+            limit = int(raw) if raw.isdigit() else DEFAULT_PROVIDER_CONCURRENCY
+            limiter = ProviderLimiter(key, limit)
+            _LIMITERS[key] = limiter
+        return limiter
+
+
+def provider_slot(provider: str):
+    """Context manager holding one in-flight slot for ``provider``."""
+    return get_provider_limiter(provider).slot()
+
+
+def record_llm_usage(provider: str, response: Any) -> None:
+    """Attach the token counts of an OpenAI or Gemini response to the current LLM span."""
+    if not profiling_enabled():
+        return
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        completion_tokens = getattr(usage, "completion_tokens", None)
+    else:
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", None)
+        completion_tokens = getattr(usage, "candidates_token_count", None)
+    if not isinstance(prompt_tokens, int) or not isinstance(completion_tokens, int):
+        return
+    current_span().set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    count("llm_tokens", prompt_tokens, provider=provider, kind="prompt")
+    count("llm_tokens", completion_tokens, provider=provider, kind="completion")
+
+
+def llm_pool_stats() -> Dict[str, Any]:
+    """Per-provider call counts, in-flight peaks and throttling waits."""
+    with _LIMITERS_LOCK:
+        limiters = list(_LIMITERS.values())
+    return {limiter.provider: limiter.stats() for limiter in limiters}
+
+
+# Fan-out of independent blocking calls
+
+_fanout_pool: Optional[ThreadPoolExecutor] = None
+_fanout_lock = threading.Lock()
+_fanout_local = threading.local()
+
+
+def _get_fanout_pool() -> ThreadPoolExecutor:
+    global _fanout_pool
+    with _fanout_lock:
+        if _fanout_pool is None:
+            _fanout_pool = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="llm-fanout")
+        return _fanout_pool
+
+
+def _run_in_fanout(call: Callable[[], Any]) -> Any:
+    _fanout_local.active = True
+    try:
+        return call()
+    finally:
+        _fanout_local.active = False
+
+
+def run_concurrently(*calls: Callable[[], Any], return_exceptions: bool = False) -> List[Any]:
+    """
+    Run independent blocking calls (typically LLM requests) concurrently.
+
+    The first call runs on the caller's thread, the rest on a shared pool;
+    contextvars are copied so tenant/trace context is preserved. Results
+    come back in call order. All calls finish before an error is raised.
+
+    Falls back to sequential execution when LLM_FANOUT=0 or when already
+    running inside a fan-out worker (avoids pool self-deadlock).
+
+    Example:
+        intent, entities = run_concurrently(
+            lambda: adapter.route_intent(msg),
+            lambda: adapter.extract_entities(msg),
+        )
+    """
+    sequential = (
+        len(calls) < 2
+        or os.getenv("LLM_FANOUT", "1") == "0"
+        or getattr(_fanout_local, "active", False)
+    )
+    outcomes: List[tuple] = []
+    if sequential:
+        for call in calls:
+            try:
+                outcomes.append((True, call()))
+            except Exception as exc:
+                outcomes.append((False, exc))
+    else:
+        pool = _get_fanout_pool()
+        futures = [
+            pool.submit(contextvars.copy_context().run, _run_in_fanout, call)
+            for call in calls[1:]
+        ]
+        try:
+            outcomes.append((True, calls[0]()))
+        except Exception as exc:
+            outcomes.append((False, exc))
+        for future in futures:
+            try:
+                outcomes.append((True, future.result()))
+            except Exception as exc:
+                outcomes.append((False, exc))
+
+    results: List[Any] = []
+    for ok, value in outcomes:
+        if not ok and not return_exceptions:
+            raise value
+        results.append(value)
+    return results
 
 
 # Convenience wrappers for common operations
@@ -133,10 +420,22 @@ def chat_completion(
         ])
     """
     client = get_openai_client()
-    model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    kwargs = _completion_kwargs(messages, model, temperature, max_tokens, json_mode)
+    with provider_slot("openai"):
+        response = client.chat.completions.create(**kwargs)
+        record_llm_usage("openai", response)
+    return response.choices[0].message.content or ""
 
+
+def _completion_kwargs(
+    messages: list,
+    model: Optional[str],
+    temperature: float,
+    max_tokens: int,
+    json_mode: bool,
+) -> dict:
     kwargs: dict = {
-        "model": model,
+        "model": model or os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
         "messages": messages,
         "temperature": temperature,
         "max_tokens": max_tokens,
@@ -144,16 +443,73 @@ def chat_completion(
 
     if json_mode:
         kwargs["response_format"] = {"type": "json_object"}
+    return kwargs
 
-    response = client.chat.completions.create(**kwargs)
+
+async def achat_completion(
+    messages: list,
+    *,
+    model: Optional[str] = None,
+    temperature: float = 0.1,
+    max_tokens: int = 1000,
+    json_mode: bool = False,
+) -> str:
+    """
+    Async variant of chat_completion() on the pooled AsyncOpenAI client.
+
+    Shares the "openai" concurrency limit with synchronous callers.
+    """
+    client = get_async_openai_client()
+    kwargs = _completion_kwargs(messages, model, temperature, max_tokens, json_mode)
+    async with get_provider_limiter("openai").aslot():
+        response = await client.chat.completions.create(**kwargs)
+        record_llm_usage("openai", response)
     return response.choices[0].message.content or ""
 
 
+async def abatch_chat_completion(
+    requests: Sequence[Mapping[str, Any]],
+    *,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Run several chat completions concurrently; results keep request order.
+
+    Each request is a dict of achat_completion() keyword arguments
+    (``messages`` required). In-flight calls are capped by the provider limit.
+    """
+    return await asyncio.gather(
+        *(achat_completion(**dict(request)) for request in requests),
+        return_exceptions=return_exceptions,
+    )
+
+
+def batch_chat_completion(
+    requests: Sequence[Mapping[str, Any]],
+    *,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """Blocking counterpart of abatch_chat_completion() for worker threads."""
+    return run_concurrently(
+        *(lambda request=request: chat_completion(**dict(request)) for request in requests),
+        return_exceptions=return_exceptions,
+    )
+
+
 __all__ = [
     "get_openai_client",
+    "get_async_openai_client",
     "is_llm_available",
     "reset_client",
     "chat_completion",
+    "achat_completion",
+    "batch_chat_completion",
+    "abatch_chat_completion",
+    "run_concurrently",
+    "provider_slot",
+    "get_provider_limiter",
+    "llm_pool_stats",
+    "record_llm_usage",
     "DEFAULT_TIMEOUT",
     "DEFAULT_MAX_RETRIES",
 ]
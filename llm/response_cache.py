@@ -0,0 +1,393 @@
+"""
+MODULE: backend/llm/response_cache.py
+PURPOSE: Persistent, cross-process cache for LLM responses.
+
+Identical prompts (same message analysed again after a restart, by another
+uvicorn worker, or twice within one turn) should not be paid for twice. The
+cache has two tiers:
+
+1. In-process LRU (``LLM_CACHE_MAX_SIZE`` entries) for repeats within a turn
+2. SQLite file in WAL mode, shared by every worker process on the host
+
+Entries are keyed by sha256(namespace, provider, model, prompt) and expire
+after a TTL. The SQLite tier is trimmed to ``LLM_CACHE_MAX_MB`` by evicting
+least recently used entries. Only responses from real providers should be
+persisted; callers pass ``persist=False`` for stub/fallback output.
+
+ENVIRONMENT:
+    LLM_CACHE_PATH         SQLite file (default: tmp-cache/llm_cache.sqlite3,
+                           /tmp/llm_cache.sqlite3 on Vercel)
+    LLM_CACHE_PERSIST      "0" keeps the cache in memory only (default: "1")
+    LLM_CACHE_TTL_SECONDS  Entry lifetime (default: 7 days)
+    LLM_CACHE_MAX_MB       Size budget of the SQLite tier (default: 64)
+    LLM_CACHE_MAX_SIZE     Entries in the in-process tier (default: 500)
+
+USAGE:
+    from llm.response_cache import get_llm_cache
+
+    cache = get_llm_cache()
+    key = cache.make_key("unified_detection", provider, model, prompt)
+    text = cache.get(key)
+    if text is None:
+        text = adapter.complete(prompt)
+        cache.put(key, text, namespace="unified_detection", persist=provider != "stub")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_MB = 64
+DEFAULT_MEMORY_ENTRIES = 500
+_EVICT_EVERY = 32  # puts between size checks of the SQLite tier
+
+if os.getenv("VERCEL") == "1":
+    DEFAULT_CACHE_PATH = Path("/tmp/llm_cache.sqlite3")
+else:
+    DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / "tmp-cache" / "llm_cache.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires_at ON llm_cache (expires_at);
+"""
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+class LLMResponseCache:
+    """Two-tier (memory + SQLite) cache of LLM response strings."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        persist: bool = True,
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.memory_entries = max(0, memory_entries)
+        self.persist = persist and self.path is not None
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._puts_since_evict = 0
+        self._disk_failed = False
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "stores": 0,
+            "evictions": 0,
+            "bytes_saved": 0,
+        }
+        self._by_namespace: Dict[str, Dict[str, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(namespace: str, provider: str, model: str, prompt: Any) -> str:
+        """Hash the inputs that determine an LLM response."""
+
+        if not isinstance(prompt, str):
+            prompt = json.dumps(prompt, sort_keys=True, ensure_ascii=False, default=str)
+        material = "\x1f".join((namespace or "", provider or "", model or "", prompt))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # SQLite tier
+    # ------------------------------------------------------------------
+
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        if not self.persist or self._disk_failed:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+        except sqlite3.Error as exc:
+            logger.warning("[LLM_CACHE] Disk tier disabled (%s): %s", self.path, exc)
+            self._disk_failed = True
+            return None
+        self._local.conn = conn
+        return conn
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        conn = self._conn()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            return row[0], row[1]
+        except sqlite3.Error as exc:
+            logger.debug("[LLM_CACHE] read failed: %s", exc)
+            return None
+
+    def _disk_put(self, key: str, namespace: str, value: str, now: float, expires_at: float) -> None:
+        conn = self._conn()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, namespace, value, size, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, namespace, value, len(value.encode("utf-8")), now, expires_at, now),
+            )
+        except sqlite3.Error as exc:
+            logger.debug("[LLM_CACHE] write failed: %s", exc)
+            return
+        with self._lock:
+            self._puts_since_evict += 1
+            due = self._puts_since_evict >= _EVICT_EVERY
+            if due:
+                self._puts_since_evict = 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then LRU entries until under the size budget."""
+
+        conn = self._conn()
+        if conn is None:
+            return 0
+        removed = 0
+        try:
+            removed += conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+            while total > self.max_bytes:
+                rows = conn.execute(
+                    "SELECT key, size FROM llm_cache ORDER BY last_access LIMIT 64"
+                ).fetchall()
+                if not rows:
+                    break
+                for key, size in rows:
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    removed += 1
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+        except sqlite3.Error as exc:
+            logger.debug("[LLM_CACHE] eviction failed: %s", exc)
+        if removed:
+            with self._lock:
+                self._stats["evictions"] += removed
+        return removed
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def _count(self, namespace: str, field: str, amount: int = 1) -> None:
+        bucket = self._by_namespace.setdefault(namespace, {"hits": 0, "misses": 0, "bytes_saved": 0})
+        bucket[field] += amount
+
+    def get(self, key: str, *, namespace: str = "default") -> Optional[str]:
+        """Return the cached response for ``key`` or None."""
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] > now:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["memory_hits"] += 1
+                self._stats["bytes_saved"] += len(entry[0])
+                self._count(namespace, "hits")
+                self._count(namespace, "bytes_saved", len(entry[0]))
+                return entry[0]
+            if entry is not None:
+                self._memory.pop(key, None)
+
+        disk = self._disk_get(key, now)
+        with self._lock:
+            if disk is None:
+                self._stats["misses"] += 1
+                self._count(namespace, "misses")
+                return None
+            self._remember(key, disk[0], disk[1])
+            self._stats["hits"] += 1
+            self._stats["disk_hits"] += 1
+            self._stats["bytes_saved"] += len(disk[0])
+            self._count(namespace, "hits")
+            self._count(namespace, "bytes_saved", len(disk[0]))
+        return disk[0]
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def put(
+        self,
+        key: str,
+        value: str,
+        *,
+        namespace: str = "default",
+        persist: bool = True,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        """Store a response; ``persist=False`` keeps it in this process only."""
+
+        if not isinstance(value, str):
+            return
+        now = time.time()
+        expires_at = now + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        with self._lock:
+            self._remember(key, value, expires_at)
+            self._stats["stores"] += 1
+        if persist:
+            self._disk_put(key, namespace, value, now, expires_at)
+
+    def discard(self, key: str) -> None:
+        """Remove one entry from both tiers (e.g. a response that proved unusable)."""
+
+        with self._lock:
+            self._memory.pop(key, None)
+        conn = self._conn()
+        if conn is not None:
+            try:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            except sqlite3.Error as exc:
+                logger.debug("[LLM_CACHE] discard failed: %s", exc)
+
+    def clear(self, *, persisted: bool = True) -> None:
+        """Drop cached entries; ``persisted=False`` only forgets the memory tier."""
+
+        with self._lock:
+            self._memory.clear()
+        if not persisted:
+            return
+        conn = self._conn()
+        if conn is not None:
+            try:
+                conn.execute("DELETE FROM llm_cache")
+            except sqlite3.Error as exc:
+                logger.debug("[LLM_CACHE] clear failed: %s", exc)
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate, bytes saved and tier sizes."""
+
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["by_namespace"] = {
+                ns: dict(bucket, hit_rate=_rate(bucket["hits"], bucket["misses"]))
+                for ns, bucket in self._by_namespace.items()
+            }
+        stats["hit_rate"] = _rate(stats["hits"], stats["misses"])
+        stats["persist"] = self.persist and not self._disk_failed
+        stats["disk_entries"] = 0
+        stats["disk_bytes"] = 0
+        conn = self._conn()
+        if conn is not None:
+            try:
+                entries, size = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+                ).fetchone()
+                stats["disk_entries"] = entries
+                stats["disk_bytes"] = size
+            except sqlite3.Error:
+                pass
+        return stats
+
+
+def _rate(hits: int, misses: int) -> Optional[float]:
+    total = hits + misses
+    return round(hits / total, 4) if total else None
+
+
+_CACHE: Optional[LLMResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Return the process-wide cache configured from the environment."""
+
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = LLMResponseCache(
+                Path(os.getenv("LLM_CACHE_PATH") or DEFAULT_CACHE_PATH),
+                ttl_seconds=_env_float("LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+                max_bytes=int(_env_float("LLM_CACHE_MAX_MB", DEFAULT_MAX_MB) * 1024 * 1024),
+                memory_entries=int(_env_float("LLM_CACHE_MAX_SIZE", DEFAULT_MEMORY_ENTRIES)),
+                persist=os.getenv("LLM_CACHE_PERSIST", "1") != "0",
+            )
+        return _CACHE
+
+
+def reset_llm_cache() -> None:
+    """Forget the process-wide cache instance (tests)."""
+
+    global _CACHE
+    with _CACHE_LOCK:
+        cache, _CACHE = _CACHE, None
+    if cache is not None:
+        cache.close()
+
+
+def llm_cache_stats() -> Dict[str, Any]:
+    return get_llm_cache().stats()
+
+
+__all__ = [
+    "LLMResponseCache",
+    "get_llm_cache",
+    "llm_cache_stats",
+    "reset_llm_cache",
+]
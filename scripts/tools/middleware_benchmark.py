@@ -0,0 +1,142 @@
+"""Measure the per-request overhead of the API middleware chain.
+
+Builds two FastAPI apps with the same ``GET /ping`` and ``POST /echo``
+routes: one bare and one wrapped in ``RequestSizeLimitMiddleware``,
+``TenantContextMiddleware`` and ``AuthMiddleware`` (API-key auth and the
+tenant header enabled). Both are driven by calling the ASGI app directly
+(no server, no sockets), so the difference is the middleware cost alone.
+
+Report: best-of-``--repeats`` mean microseconds per request for each app and
+route, and the overhead of the middleware chain.
+
+Usage:
+    python scripts/tools/middleware_benchmark.py
+    python scripts/tools/middleware_benchmark.py --requests 10000 --body-kb 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from fastapi import FastAPI, Request
+
+from api.middleware import AuthMiddleware, TenantContextMiddleware
+from api.middleware.request_limits import RequestSizeLimitMiddleware
+
+_API_KEY = "bench-key"
+_WARMUP = 300
+
+
+def build_app(with_middleware: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> Dict[str, Any]:
+        return {"ok": True}
+
+    @app.post("/echo")
+    async def echo(request: Request) -> Dict[str, Any]:
+        return {"size": len(await request.body())}
+
+    if with_middleware:
+        # Same order as app.py: the last one added runs first
+        app.add_middleware(RequestSizeLimitMiddleware)
+        app.add_middleware(TenantContextMiddleware)
+        app.add_middleware(AuthMiddleware)
+    return app
+
+
+def _scope(method: str, path: str, body: bytes) -> Dict[str, Any]:
+    headers = [(b"host", b"bench"), (b"x-team-id", b"team-1"), (b"authorization", f"Bearer {_API_KEY}".encode())]
+    if body:
+        headers.append((b"content-length", str(len(body)).encode()))
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+
+
+async def _call(app: FastAPI, method: str, path: str, body: bytes) -> None:
+    sent: List[Dict[str, Any]] = []
+    delivered = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal delivered
+        if delivered:
+            # Like a client that keeps the connection open: only disconnect checks get here
+            await asyncio.sleep(3600)
+        delivered = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        sent.append(message)
+
+    await app(_scope(method, path, body), receive, send)
+    if sent[0]["status"] != 200:
+        raise RuntimeError(f"{method} {path} returned {sent[0]['status']}")
+
+
+async def _measure(app: FastAPI, method: str, path: str, body: bytes, requests: int, repeats: int) -> float:
+    """Best mean latency in microseconds over ``repeats`` runs of ``requests`` calls."""
+
+    for _ in range(_WARMUP):
+        await _call(app, method, path, body)
+    samples = []
+    for _ in range(repeats):
+        started = perf_counter()
+        for _ in range(requests):
+            await _call(app, method, path, body)
+        samples.append((perf_counter() - started) / requests * 1e6)
+    return min(samples)
+
+
+async def run(requests: int, repeats: int, body_kb: int) -> List[Tuple[str, float, float]]:
+    bare, wrapped = build_app(False), build_app(True)
+    body = b"x" * (body_kb * 1024)
+    results = []
+    for label, method, path, payload in (
+        ("GET /ping", "GET", "/ping", b""),
+        (f"POST /echo {body_kb}KB", "POST", "/echo", body),
+    ):
+        results.append((
+            label,
+            await _measure(bare, method, path, payload, requests, repeats),
+            await _measure(wrapped, method, path, payload, requests, repeats),
+        ))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=4000, help="requests per timed run (default: 4000)")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs, best one reported (default: 5)")
+    parser.add_argument("--body-kb", type=int, default=2, help="POST body size in KB (default: 2)")
+    args = parser.parse_args()
+
+    os.environ.update(AUTH_ENABLED="1", AUTH_MODE="api_key", API_KEY=_API_KEY, TENANT_HEADER_ENABLED="1")
+    for label, bare, wrapped in asyncio.run(run(args.requests, args.repeats, args.body_kb)):
+        print(f"{label:<16} bare {bare:8.1f} us   with middleware {wrapped:8.1f} us   overhead {wrapped - bare:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,533 @@
+"""Replay recorded conversations through ``process_msg`` and report turn performance.
+
+Conversations come from:
+    - scripts/tools/replay_scenarios.json   flows of tests/flow as message turns
+    - e2e-scenarios/*.md                    "**Client:**" blocks in order
+    - --jsonl FILE                          one message per line with thread_id/session_id
+                                            (subject, body, from_email); other lines are skipped
+
+The LLM is replaced by ``StubAgentAdapter`` plus recorded responses: turns may
+carry ``"llm": {"intent": [label, confidence], "entities": {...}}`` and the
+fixture's ``"completions"`` map prompt hashes to raw completions. API keys are
+removed from the process environment and the LLM response cache is off, so
+every run does the same work. ``--record FILE`` runs the live adapter once
+instead and writes a fixture in that format: the replayed conversations with
+each turn's recorded ``llm`` analysis, plus the completions.
+
+Report: p50/p95/p99 turn latency, turns/sec, DB bytes read/written per turn
+(the JSON file, or the shards that missed the read cache) and peak RSS.
+``--save-baseline`` stores the report per backend and thread count;
+``--compare`` exits 1 when a metric is worse than the baseline by more than
+``--tolerance`` or more turns fail.
+
+Usage:
+    python scripts/tools/replay_benchmark.py
+    python scripts/tools/replay_benchmark.py --threads 8 --iterations 5
+    python scripts/tools/replay_benchmark.py --save-baseline
+    python scripts/tools/replay_benchmark.py --compare --tolerance 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass, field
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+SCENARIOS_PATH = Path(__file__).resolve().with_name("replay_scenarios.json")
+E2E_DIR = ROOT / "e2e-scenarios"
+DEFAULT_BASELINE = Path(__file__).resolve().with_name("replay_baseline.json")
+
+_API_KEY_VARS = ("OPENAI_API_KEY", "openai_key_openevent", "GOOGLE_API_KEY", "GEMINI_API_KEY")
+
+# Metrics compared against the baseline: (path, higher_is_better)
+_COMPARED = (
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p95"), False),
+    (("latency_ms", "p99"), False),
+    (("turns_per_s",), True),
+    (("db_bytes_read_per_turn",), False),
+    (("db_bytes_written_per_turn",), False),
+    (("peak_rss_mb",), False),
+)
+
+
+@dataclass
+class Conversation:
+    id: str
+    source: str
+    turns: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha1(text.strip().encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Conversation sources
+# ---------------------------------------------------------------------------
+
+
+def load_fixture(path: Path) -> Tuple[List[Conversation], Dict[str, str]]:
+    """Conversations and recorded completions of a replay fixture."""
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    conversations = [
+        Conversation(id=item["id"], source=item.get("source", str(path)), turns=list(item["turns"]))
+        for item in data.get("conversations", [])
+    ]
+    return conversations, dict(data.get("completions", {}))
+
+
+_CLIENT_BLOCK = re.compile(r"\*\*Client:\*\*\s*\n```[^\n]*\n(.*?)```", re.DOTALL)
+
+
+def load_markdown(path: Path) -> Optional[Conversation]:
+    """Client messages of an e2e scenario write-up, in order."""
+
+    turns = []
+    for block in _CLIENT_BLOCK.findall(path.read_text(encoding="utf-8")):
+        headers: Dict[str, str] = {}
+        lines = block.strip().splitlines()
+        while lines and re.match(r"^(From|Subject):", lines[0]):
+            key, _, value = lines.pop(0).partition(":")
+            headers[key.lower()] = value.strip()
+        body = "\n".join(lines).strip().strip('"').strip()
+        if body:
+            turns.append({"subject": headers.get("subject"), "from_email": headers.get("from"), "body": body})
+    if not turns:
+        return None
+    return Conversation(id=path.stem, source=str(path.relative_to(ROOT) if path.is_relative_to(ROOT) else path), turns=turns)
+
+
+def load_jsonl(path: Path) -> List[Conversation]:
+    """Messages grouped by thread_id/session_id; lines without one are skipped."""
+
+    threads: Dict[str, Conversation] = {}
+    skipped = 0
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                skipped += 1
+                continue
+            thread = record.get("thread_id") or record.get("session_id") if isinstance(record, dict) else None
+            if not thread or not record.get("body"):
+                skipped += 1
+                continue
+            conversation = threads.setdefault(str(thread), Conversation(id=str(thread), source=str(path)))
+            conversation.turns.append(
+                {key: record.get(key) for key in ("subject", "body", "from_email", "from_name", "llm")}
+            )
+    if skipped:
+        print(f"[replay] {path}: skipped {skipped} line(s) without thread_id/session_id and body")
+    return list(threads.values())
+
+
+def collect_conversations(
+    *, fixture: Optional[Path], e2e_dir: Optional[Path], jsonl: Sequence[Path]
+) -> Tuple[List[Conversation], Dict[str, str]]:
+    conversations: List[Conversation] = []
+    completions: Dict[str, str] = {}
+    if fixture is not None and fixture.exists():
+        loaded, completions = load_fixture(fixture)
+        conversations.extend(loaded)
+    if e2e_dir is not None and e2e_dir.is_dir():
+        for path in sorted(e2e_dir.glob("*.md")):
+            conversation = load_markdown(path)
+            if conversation is not None:
+                conversations.append(conversation)
+    for path in jsonl:
+        conversations.extend(load_jsonl(path))
+    return conversations, completions
+
+
+# ---------------------------------------------------------------------------
+# Deterministic LLM stand-in
+# ---------------------------------------------------------------------------
+
+
+def _recorded_adapter(conversations: Sequence[Conversation], completions: Dict[str, str]):
+    from adapters.agent_adapter import StubAgentAdapter
+
+    intents: Dict[str, Tuple[str, float]] = {}
+    entities: Dict[str, Dict[str, Any]] = {}
+    for conversation in conversations:
+        for turn in conversation.turns:
+            llm = turn.get("llm") or {}
+            key = _hash(turn.get("body") or "")
+            if llm.get("intent"):
+                label, confidence = llm["intent"]
+                intents[key] = (str(label), float(confidence))
+            if isinstance(llm.get("entities"), dict):
+                entities[key] = llm["entities"]
+
+    class RecordedAgentAdapter(StubAgentAdapter):
+        """Stub heuristics, overridden by recorded intents, entities and completions."""
+
+        def route_intent(self, msg: Dict[str, Any]) -> Tuple[str, float]:
+            return intents.get(_hash(msg.get("body") or "")) or super().route_intent(msg)
+
+        def extract_entities(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+            recorded = entities.get(_hash(msg.get("body") or ""))
+            return dict(recorded) if recorded is not None else super().extract_entities(msg)
+
+        def analyze_message(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+            intent, confidence = self.route_intent(msg)
+            return {"intent": intent, "confidence": confidence, "fields": self.extract_entities(msg)}
+
+        def complete(self, prompt: str, *, system_prompt: Optional[str] = None, **kwargs: Any) -> str:
+            recorded = completions.get(_hash(f"{system_prompt or ''}\n{prompt}"))
+            if recorded is not None:
+                return recorded
+            return super().complete(prompt, system_prompt=system_prompt, **kwargs)
+
+    return RecordedAgentAdapter()
+
+
+def _recording_adapter(live: Any, recorded: Dict[str, Any]):
+    """Live adapter that keeps its analyses (by body hash) and completions in ``recorded``."""
+
+    from adapters.agent_adapter import AgentAdapter
+
+    lock = threading.Lock()
+
+    def _keep(msg: Dict[str, Any], **llm: Any) -> None:
+        with lock:
+            recorded["turns"].setdefault(_hash(msg.get("body") or ""), {}).update(llm)
+
+    class RecordingAgentAdapter(AgentAdapter):
+        """Delegates to the live adapter and keeps what it answered."""
+
+        def analyze_message(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+            result = live.analyze_message(msg)
+            _keep(msg, intent=[result.get("intent"), result.get("confidence")], entities=result.get("fields") or {})
+            return result
+
+        def route_intent(self, msg: Dict[str, Any]) -> Tuple[str, float]:
+            intent, confidence = live.route_intent(msg)
+            _keep(msg, intent=[intent, confidence])
+            return intent, confidence
+
+        def extract_entities(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+            entities = live.extract_entities(msg)
+            _keep(msg, entities=dict(entities or {}))
+            return entities
+
+        def complete(self, prompt: str, *, system_prompt: Optional[str] = None, **kwargs: Any) -> str:
+            text = live.complete(prompt, system_prompt=system_prompt, **kwargs)
+            with lock:
+                recorded["completions"][_hash(f"{system_prompt or ''}\n{prompt}")] = text
+            return text
+
+    return RecordingAgentAdapter()
+
+
+def recorded_fixture(conversations: Sequence[Conversation], recorded: Dict[str, Any]) -> Dict[str, Any]:
+    """A replay fixture (``load_fixture`` format) of a ``--record`` run.
+
+    Each turn carries the ``llm`` analysis recorded for its body.
+    """
+
+    fixture_conversations = []
+    for conversation in conversations:
+        turns = []
+        for turn in conversation.turns:
+            entry = {key: value for key, value in turn.items() if key != "llm" and value is not None}
+            llm = recorded["turns"].get(_hash(turn.get("body") or ""))
+            if llm:
+                entry["llm"] = llm
+            turns.append(entry)
+        fixture_conversations.append({"id": conversation.id, "source": conversation.source, "turns": turns})
+    return {
+        "description": "Recorded with scripts/tools/replay_benchmark.py --record.",
+        "conversations": fixture_conversations,
+        "completions": dict(recorded["completions"]),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+
+def _percentile(ordered: Sequence[float], pct: float) -> Optional[float]:
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return round(ordered[int(rank) - 1], 2)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - non-POSIX platforms
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def _message(conversation: Conversation, iteration: int, index: int, turn: Dict[str, Any]) -> Dict[str, Any]:
+    slug = re.sub(r"[^a-z0-9]+", "-", conversation.id.lower()).strip("-")
+    return {
+        "msg_id": f"{slug}-{iteration}-{index}",
+        "thread_id": f"replay-{slug}-{iteration}",
+        "from_name": turn.get("from_name") or "Replay Client",
+        # One client per replayed conversation so runs never share an event
+        "from_email": f"{slug}-{iteration}@replay.example",
+        "subject": turn.get("subject") or f"Event request ({conversation.id})",
+        "body": turn["body"],
+        "ts": "2026-01-05T09:00:00Z",
+    }
+
+
+def replay(
+    conversations: Sequence[Conversation],
+    db_path: Path,
+    *,
+    threads: int = 1,
+    iterations: int = 1,
+    iteration_offset: int = 0,
+) -> Dict[str, Any]:
+    """Replay every conversation ``iterations`` times on ``threads`` workers."""
+
+    from workflow_email import process_msg
+    from workflows.io.database import storage_backend
+    from workflows.io.revisions import get_write_stats
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+
+    def _run(job: Tuple[int, Conversation]) -> None:
+        iteration, conversation = job
+        local: List[float] = []
+        for index, turn in enumerate(conversation.turns):
+            message = _message(conversation, iteration, index, turn)
+            started = perf_counter()
+            try:
+                process_msg(message, db_path=db_path)
+            except Exception as exc:  # keep replaying the other conversations
+                with lock:
+                    errors.append(f"{conversation.id}#{index}: {type(exc).__name__}: {exc}")
+                break
+            finally:
+                local.append((perf_counter() - started) * 1000.0)
+        with lock:
+            latencies.extend(local)
+
+    jobs = [(iteration_offset + it, conversation) for it in range(iterations) for conversation in conversations]
+    before = get_write_stats()
+    started = perf_counter()
+    if threads <= 1:
+        for job in jobs:
+            _run(job)
+    else:
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="replay") as pool:
+            list(pool.map(_run, jobs))
+    wall = perf_counter() - started
+    after = get_write_stats()
+
+    ordered = sorted(latencies)
+    turns = len(ordered)
+    return {
+        "conversations": len(conversations),
+        "turns": turns,
+        "threads": threads,
+        "iterations": iterations,
+        "backend": storage_backend(),
+        "wall_s": round(wall, 3),
+        "turns_per_s": round(turns / wall, 2) if wall > 0 else None,
+        "latency_ms": {
+            "p50": _percentile(ordered, 50),
+            "p95": _percentile(ordered, 95),
+            "p99": _percentile(ordered, 99),
+            "max": round(ordered[-1], 2) if ordered else None,
+            "mean": round(sum(ordered) / turns, 2) if turns else None,
+        },
+        "db_bytes_read_per_turn": round((after["bytes_read"] - before["bytes_read"]) / turns) if turns else None,
+        "db_bytes_written_per_turn": round((after["bytes_written"] - before["bytes_written"]) / turns) if turns else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "errors": errors,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Baseline
+# ---------------------------------------------------------------------------
+
+
+def _metric(report: Dict[str, Any], path: Tuple[str, ...]) -> Optional[float]:
+    value: Any = report
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value if isinstance(value, (int, float)) else None
+
+
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Metrics worse than the baseline by more than ``tolerance`` (a fraction)."""
+
+    regressions = []
+    for path, higher_is_better in _COMPARED:
+        current = _metric(report, path)
+        reference = _metric(baseline, path)
+        if current is None or reference is None or reference == 0:
+            continue
+        change = (current - reference) / reference
+        worse = change < -tolerance if higher_is_better else change > tolerance
+        if worse:
+            regressions.append(f"{'.'.join(path)}: {reference} -> {current} ({change:+.0%})")
+    errors, known = len(report.get("errors") or []), len(baseline.get("errors") or [])
+    if errors > known:
+        regressions.append(f"errors: {known} -> {errors}")
+    return regressions
+
+
+def _baseline_key(report: Dict[str, Any]) -> str:
+    return f"{report['backend']}/threads={report['threads']}"
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+
+def _prepare_environment(*, live: bool, llm_cache: bool) -> None:
+    """Deterministic runs: stub agent, no API keys, no LLM response cache."""
+
+    if not live:
+        os.environ["AGENT_MODE"] = "stub"
+        for name in _API_KEY_VARS:
+            os.environ.pop(name, None)
+    os.environ["LLM_CACHE_PERSIST"] = "0"
+    if not llm_cache:
+        os.environ["LLM_CACHE_MAX_SIZE"] = "0"
+
+
+@contextmanager
+def _scratch_side_effects(scratch: Path) -> Iterator[None]:
+    """Keep calendar logs (cwd-relative) and page snapshots out of the checkout."""
+
+    from utils import page_snapshots
+
+    previous_cwd = Path.cwd()
+    previous = page_snapshots.SNAPSHOTS_DB, page_snapshots.SNAPSHOTS_FILE
+    page_snapshots.SNAPSHOTS_DB = scratch / "page_snapshots" / "snapshots.sqlite3"
+    page_snapshots.SNAPSHOTS_FILE = scratch / "page_snapshots" / "snapshots.json"
+    os.chdir(scratch)
+    try:
+        yield
+    finally:
+        os.chdir(previous_cwd)
+        page_snapshots.SNAPSHOTS_DB, page_snapshots.SNAPSHOTS_FILE = previous
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", type=int, default=1, help="concurrent conversations (default 1)")
+    parser.add_argument("--iterations", type=int, default=3, help="replays of the whole set (default 3)")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured replays first (default 1)")
+    parser.add_argument("--fixture", type=Path, default=SCENARIOS_PATH)
+    parser.add_argument("--no-e2e", action="store_true", help="skip e2e-scenarios/*.md")
+    parser.add_argument("--jsonl", type=Path, action="append", default=[], help="extra JSONL conversations")
+    parser.add_argument("--llm-cache", action="store_true", help="keep the in-memory LLM response cache")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="exit 1 on regressions against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression fraction (default 0.25)")
+    parser.add_argument("--record", type=Path, help="run the live adapter once and write its responses here")
+    parser.add_argument("--output", type=Path, help="also write the report to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="keep workflow logs and prints")
+    args = parser.parse_args(argv)
+
+    _prepare_environment(live=args.record is not None, llm_cache=args.llm_cache)
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    conversations, completions = collect_conversations(
+        fixture=args.fixture,
+        e2e_dir=None if args.no_e2e else E2E_DIR,
+        jsonl=args.jsonl,
+    )
+    if not conversations:
+        print("[replay] no conversations found")
+        return 1
+
+    from adapters.agent_adapter import get_agent_adapter, set_agent_adapter
+    from workflows.io.revisions import reset_write_stats
+
+    recorded: Dict[str, Any] = {"turns": {}, "completions": {}}
+    if args.record is not None:
+        set_agent_adapter(_recording_adapter(get_agent_adapter(), recorded))
+        args.iterations, args.warmup = 1, 0
+    else:
+        set_agent_adapter(_recorded_adapter(conversations, completions))
+
+    devnull = open(os.devnull, "w", encoding="utf-8")
+    try:
+        with TemporaryDirectory(prefix="oe-replay-") as tmp:
+            sink = sys.stdout if args.verbose else devnull
+            with _scratch_side_effects(Path(tmp)), redirect_stdout(sink):
+                if args.warmup:
+                    replay(conversations, Path(tmp) / "warmup.json", iterations=args.warmup, iteration_offset=-args.warmup)
+                reset_write_stats()
+                report = replay(conversations, Path(tmp) / "events.json", threads=args.threads, iterations=args.iterations)
+    finally:
+        devnull.close()
+        set_agent_adapter(None)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if args.record is not None:
+        fixture = recorded_fixture(conversations, recorded)
+        args.record.write_text(json.dumps(fixture, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"[replay] recorded {len(recorded['turns'])} analyses and {len(recorded['completions'])} completions to {args.record}")
+        return 0
+
+    key = _baseline_key(report)
+    baselines: Dict[str, Any] = {}
+    if args.baseline.exists():
+        baselines = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if args.save_baseline:
+        baselines[key] = report
+        args.baseline.write_text(json.dumps(baselines, indent=2) + "\n", encoding="utf-8")
+        print(f"[replay] baseline {key} saved to {args.baseline}")
+    if args.compare:
+        if key not in baselines:
+            print(f"[replay] no baseline for {key} in {args.baseline}; run with --save-baseline first")
+            return 1
+        regressions = compare_reports(report, baselines[key], args.tolerance)
+        for line in regressions:
+            print(f"[replay] REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"[replay] within {args.tolerance:.0%} of baseline {key}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from datetime import date, datetime, time, timedelta
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from adapters.calendar_adapter import get_calendar_adapter
 from services.rooms import get_room
+from workflows.common.occupancy import active_index, occupancy_batch
 from workflows.io.config_store import get_timezone, get_operating_hours
 
 # Dynamic venue configuration (fetched from database)
@@ -136,7 +137,11 @@ def calendar_free(room_identifier: str, window: Dict[str, Any], db: Optional[Dic
         if date_iso:
             from workflows.common.timeutils import format_iso_date_to_ddmmyyyy
             date_ddmmyyyy = format_iso_date_to_ddmmyyyy(date_iso)
-            if date_ddmmyyyy:
+            index = active_index(db)
+            if date_ddmmyyyy and index is not None:
+                if index.calendar_blocked(room_identifier, date_ddmmyyyy):
+                    return False
+            elif date_ddmmyyyy:
                 room_lower = room_identifier.lower()
                 for event in db.get("events", []):
                     event_data = event.get("event_data", {})
@@ -165,6 +170,11 @@ def _has_overlap(start_iso: str, end_iso: str, busy_list: List[Dict[str, str]])
         end_dt = datetime.fromisoformat(end_iso.replace("Z", "+00:00"))
     except ValueError:
         return False
+    return _slots_overlap(start_dt, end_dt, _parse_busy(busy_list))
+
+
+def _parse_busy(busy_list: Iterable[Dict[str, str]]) -> List[Tuple[datetime, datetime]]:
+    parsed: List[Tuple[datetime, datetime]] = []
     for slot in busy_list:
         raw_start = slot.get("start")
         raw_end = slot.get("end")
@@ -175,7 +185,77 @@ def _has_overlap(start_iso: str, end_iso: str, busy_list: List[Dict[str, str]])
             slot_end = datetime.fromisoformat(raw_end.replace("Z", "+00:00"))
         except ValueError:
             continue
+        parsed.append((slot_start, slot_end))
+    return parsed
+
+
+def _slots_overlap(start_dt: datetime, end_dt: datetime, slots: Iterable[Tuple[datetime, datetime]]) -> bool:
+    for slot_start, slot_end in slots:
         if slot_end <= start_dt or end_dt <= slot_start:
             continue
         return True
-    return False
\ No newline at end of file
+    return False
+
+
+def availability_matrix(
+    room_identifiers: Iterable[str],
+    windows: Sequence[Dict[str, Any]],
+    db: Optional[Dict[str, Any]] = None,
+) -> Dict[str, List[bool]]:
+    """``calendar_free`` for every room x window, in one pass over the booking data.
+
+    Each room is resolved once and checked against its parsed busy timeline
+    (one bisect per cell), each window is parsed once, and DB bookings come
+    from one occupancy index instead of an events scan per cell.
+
+    Args:
+        room_identifiers: Room names or IDs (rows)
+        windows: Dicts with 'date_iso', 'start', 'end' keys (columns)
+        db: Optional events database, as for ``calendar_free``
+
+    Returns:
+        {room_identifier: [free?, ...]} aligned with ``windows``
+    """
+    from workflows.common.timeutils import format_iso_date_to_ddmmyyyy
+
+    columns: List[Optional[Tuple[datetime, datetime, Optional[str]]]] = []
+    for window in windows:
+        start_iso = window.get("start")
+        end_iso = window.get("end")
+        if not (start_iso and end_iso):
+            columns.append(None)  # calendar_free: no window means free
+            continue
+        try:
+            start_dt = datetime.fromisoformat(start_iso.replace("Z", "+00:00"))
+            end_dt = datetime.fromisoformat(end_iso.replace("Z", "+00:00"))
+        except ValueError:
+            start_dt = end_dt = None  # type: ignore[assignment]
+        date_ddmmyyyy = format_iso_date_to_ddmmyyyy(window.get("date_iso")) if db is not None else None
+        columns.append((start_dt, end_dt, date_ddmmyyyy))
+
+    parsed_windows = [c for c in columns if c is not None and c[0] is not None]
+    matrix: Dict[str, List[bool]] = {}
+    adapter = get_calendar_adapter()
+    with occupancy_batch(db) as index:
+        for room_identifier in room_identifiers:
+            record = get_room(room_identifier)
+            if record is None:
+                matrix[room_identifier] = [True] * len(columns)
+                continue
+            timeline = adapter.busy_timeline(record.calendar_id) if record.calendar_id and parsed_windows else None
+            row: List[bool] = []
+            for column in columns:
+                if column is None:
+                    row.append(True)
+                    continue
+                start_dt, end_dt, date_ddmmyyyy = column
+                if index is not None and date_ddmmyyyy and index.calendar_blocked(room_identifier, date_ddmmyyyy):
+                    row.append(False)
+                elif timeline is None or start_dt is None:
+                    row.append(True)
+                elif start_dt.tzinfo is None or end_dt.tzinfo is None:
+                    row.append(not _slots_overlap(start_dt, end_dt, _parse_busy(timeline.slots)))
+                else:
+                    row.append(not timeline.overlaps(start_dt.timestamp(), end_dt.timestamp()))
+            matrix[room_identifier] = row
+    return matrix
\ No newline at end of file
@@ -17,8 +17,6 @@ from __future__ import annotations
 
 import os
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from typing import Any, Dict, Optional
 from zoneinfo import ZoneInfo
@@ -30,6 +28,7 @@ from workflows.io.config_store import (
     get_from_name,
     get_frontend_url,
 )
+from services.mail_queue import build_message, get_mail_queue, get_smtp_pool, mail_queue_enabled
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +71,7 @@ def get_hil_email_config() -> Dict[str, Any]:
         "smtp_password": os.getenv("SMTP_PASSWORD"),
         "from_email": os.getenv("HIL_FROM_EMAIL", venue_from_email),
         "from_name": os.getenv("HIL_FROM_NAME", venue_from_name),
+        "smtp_starttls": os.getenv("SMTP_STARTTLS", "1").strip().lower() not in ("0", "false", "no"),
     }
 
     # Check database config first
@@ -298,12 +298,16 @@ def send_hil_notification(
     draft_body: str,
     event_summary: Optional[Dict[str, Any]] = None,
     event_id: Optional[str] = None,
+    immediate: bool = False,
 ) -> Dict[str, Any]:
     """
     Send HIL notification email to the Event Manager.
 
     This function is called when a HIL task is created to ALSO send
-    an email notification (in addition to the frontend panel).
+    an email notification (in addition to the frontend panel). The email
+    is queued (see services.mail_queue) unless ``immediate`` is set or the
+    queue is disabled; queued notifications for the same manager within
+    the batch window arrive as one digest.
 
     Args:
         task_id: Unique task ID
@@ -313,9 +317,13 @@ def send_hil_notification(
         draft_body: AI-generated draft message
         event_summary: Optional event details for context
         event_id: Optional event ID
+        immediate: Send now over SMTP instead of queueing (test endpoint)
+        job_id: Mail queue job id to use, so the caller can record the
+            job before the sender picks it up
 
     Returns:
-        Result dict with success status and message
+        Result dict with success status and message (``queued`` and
+        ``job_id`` when the email was queued)
     """
     config = get_hil_email_config()
 
@@ -354,20 +362,25 @@ def send_hil_notification(
             frontend_url=frontend_url,
         )
 
-        # Create message
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = f"{config['from_name']} <{config['from_email']}>"
-        msg["To"] = config["manager_email"]
-
-        msg.attach(MIMEText(plain_body, "plain"))
-        msg.attach(MIMEText(html_body, "html"))
-
-        # Send via SMTP
-        with smtplib.SMTP(config["smtp_host"], config["smtp_port"]) as server:
-            server.starttls()
-            server.login(config["smtp_user"], config["smtp_password"])
-            server.send_message(msg)
+        if not immediate and mail_queue_enabled():
+            job_id = get_mail_queue(get_hil_email_config).enqueue(
+                "hil",
+                config["manager_email"],
+                subject,
+                plain_body,
+                html_body,
+                batch_key=config["manager_email"],
+            )
+            return {
+                "success": True,
+                "queued": True,
+                "message": f"Email queued for {config['manager_email']}",
+                "task_id": task_id,
+                "job_id": job_id,
+            }
+
+        msg = build_message(config, config["manager_email"], subject, plain_body, html_body)
+        get_smtp_pool().send(config, msg)
 
         logger.info(f"[HIL_EMAIL] Sent notification for task {task_id} to {config['manager_email']}")
 
@@ -396,11 +409,15 @@ def send_client_email(
     body_text: str,
     body_html: Optional[str] = None,
     event_id: Optional[str] = None,
+    immediate: bool = False,
+    job_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Send email to a client (offer, confirmation, etc).
 
-    This is for OUTBOUND emails to clients after HIL approval.
+    This is for OUTBOUND emails to clients after HIL approval. The email is
+    queued and sent by the background sender unless ``immediate`` is set
+    or the queue is disabled.
 
     Args:
         to_email: Client's email address
@@ -408,10 +425,15 @@ def send_client_email(
         subject: Email subject
         body_text: Plain text body
         body_html: Optional HTML body
-        event_id: Optional event ID for tracking
+        event_id: Optional event ID for tracking (passed to the mail
+            queue's delivery listeners as ``meta["event_id"]``)
+        immediate: Send now over SMTP instead of queueing (test endpoint)
+        job_id: Mail queue job id to use, so the caller can record the
+            job before the sender picks it up
 
     Returns:
-        Result dict with success status
+        Result dict with success status (``queued`` and ``job_id`` when
+        the email was queued)
     """
     config = get_hil_email_config()
 
@@ -419,19 +441,27 @@ def send_client_email(
         return {"success": False, "error": "SMTP credentials not configured"}
 
     try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = f"{config['from_name']} <{config['from_email']}>"
-        msg["To"] = f"{to_name} <{to_email}>"
-
-        msg.attach(MIMEText(body_text, "plain"))
-        if body_html:
-            msg.attach(MIMEText(body_html, "html"))
-
-        with smtplib.SMTP(config["smtp_host"], config["smtp_port"]) as server:
-            server.starttls()
-            server.login(config["smtp_user"], config["smtp_password"])
-            server.send_message(msg)
+        if not immediate and mail_queue_enabled():
+            job_id = get_mail_queue(get_hil_email_config).enqueue(
+                "client",
+                to_email,
+                subject,
+                body_text,
+                body_html,
+                to_name=to_name,
+                meta={"event_id": event_id} if event_id else None,
+                job_id=job_id,
+            )
+            return {
+                "success": True,
+                "queued": True,
+                "message": f"Email queued for {to_email}",
+                "to_email": to_email,
+                "job_id": job_id,
+            }
+
+        msg = build_message(config, f"{to_name} <{to_email}>", subject, body_text, body_html)
+        get_smtp_pool().send(config, msg)
 
         logger.info(f"[CLIENT_EMAIL] Sent email to {to_email}, subject: {subject}")
 
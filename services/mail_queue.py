@@ -0,0 +1,590 @@
+"""
+Outbound mail queue with a background sender and pooled SMTP connections.
+
+HIL notifications used to open an SMTP connection, run STARTTLS, log in
+and send inside ``enqueue_hil_tasks``, which is on the client's request
+path. Client emails did the same inside the API request. Now:
+
+- ``MailQueue.enqueue`` stores the rendered message in SQLite
+  (``tmp-cache/mail_queue.sqlite3``) and returns immediately, so queued
+  mail survives a restart.
+- One daemon thread sends due jobs over an ``SMTPPool`` connection that
+  stays open between messages. The connection is re-established when the
+  server drops it and closed after ``OE_MAIL_IDLE_SECONDS`` without use.
+- A failed send is retried with exponential backoff (capped at 10 minutes)
+  up to ``OE_MAIL_MAX_ATTEMPTS`` times. Refused recipients fail right away.
+  Failed jobs stay in the table with their last error.
+- HIL notifications wait ``OE_MAIL_BATCH_SECONDS`` before sending, so the
+  tasks a manager gets within that window arrive as one digest email. The
+  window opens with the first pending notification; later ones join it.
+- The sender claims due jobs (status ``sending``, leased for
+  ``_LEASE_S``) in one transaction before sending, so two processes on the
+  same queue never send a job twice. A lease left by a crashed sender
+  expires and the job is picked up again.
+- ``add_delivery_listener()`` hooks are told when a job is finally sent or
+  failed, with the ``meta`` it was enqueued with.
+
+SMTP settings (including the password) are read from the config factory at
+send time and are never written to the queue.
+
+Environment:
+    OE_MAIL_QUEUE=1|0             queue outbound mail (default) or send inline
+    OE_MAIL_QUEUE_DB=<path>       queue database (default: tmp-cache/mail_queue.sqlite3)
+    OE_MAIL_BATCH_SECONDS=<s>     HIL digest window per manager (default: 5)
+    OE_MAIL_MAX_ATTEMPTS=<n>      send attempts before a job is marked failed (default: 8)
+    OE_MAIL_IDLE_SECONDS=<s>      close pooled SMTP connections idle this long (default: 60)
+    SMTP_STARTTLS=1|0             upgrade SMTP connections with STARTTLS (default: 1)
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import smtplib
+import sqlite3
+import threading
+import time
+import uuid
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "tmp-cache" / "mail_queue.sqlite3"
+DEFAULT_BATCH_SECONDS = 5.0
+DEFAULT_MAX_ATTEMPTS = 8
+DEFAULT_IDLE_SECONDS = 60.0
+_BACKOFF_BASE_S = 5.0
+_BACKOFF_MAX_S = 600.0
+_POLL_MAX_S = 5.0
+_LEASE_S = 300.0
+_DUE_BATCH = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbound_mail (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    batch_key TEXT,
+    to_email TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbound_mail_due ON outbound_mail (status, next_attempt_at);
+"""
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        logger.warning("[MAIL_QUEUE] Ignoring invalid %s=%r", name, raw)
+        return default
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
+
+
+def mail_queue_enabled() -> bool:
+    return os.getenv("OE_MAIL_QUEUE", "1").strip().lower() not in ("0", "false", "no")
+
+
+DeliveryListener = Callable[[str, Dict[str, Any], str, Optional[str]], None]
+_LISTENERS: List[DeliveryListener] = []
+
+
+def add_delivery_listener(listener: DeliveryListener) -> None:
+    """Call ``listener(job_id, meta, status, error)`` once a job is sent or failed."""
+
+    if listener not in _LISTENERS:
+        _LISTENERS.append(listener)
+
+
+def _notify(jobs: List[Tuple[str, Dict[str, Any]]], status: str, error: Optional[str] = None) -> None:
+    for listener in list(_LISTENERS):
+        for job_id, meta in jobs:
+            try:
+                listener(job_id, meta, status, error)
+            except Exception as exc:  # a listener must not stall the sender
+                logger.warning("[MAIL_QUEUE] Delivery listener failed for %s: %s", job_id, exc)
+
+
+class SMTPNotConfigured(Exception):
+    """SMTP credentials are missing from the config."""
+
+
+def build_message(
+    config: Dict[str, Any],
+    to_header: str,
+    subject: str,
+    body_text: str,
+    body_html: Optional[str] = None,
+) -> MIMEMultipart:
+    """Build the multipart/alternative message sent for HIL and client emails."""
+
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = f"{config['from_name']} <{config['from_email']}>"
+    msg["To"] = to_header
+    msg.attach(MIMEText(body_text, "plain"))
+    if body_html:
+        msg.attach(MIMEText(body_html, "html"))
+    return msg
+
+
+# =============================================================================
+# SMTP connection pool
+# =============================================================================
+
+
+class SMTPPool:
+    """Logged-in SMTP connections reused across sends, one per server/account."""
+
+    def __init__(
+        self,
+        *,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        timeout: float = 30.0,
+        factory: Callable[..., smtplib.SMTP] = smtplib.SMTP,
+    ) -> None:
+        self.idle_seconds = idle_seconds
+        self.timeout = timeout
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._connections: Dict[Tuple[Any, ...], Tuple[smtplib.SMTP, float]] = {}
+        self._counters: Dict[str, int] = {"connects": 0, "sends": 0, "reused": 0, "reconnects": 0}
+
+    def send(self, config: Dict[str, Any], msg: MIMEMultipart) -> None:
+        """Send ``msg`` with the account in ``config``; raises ``smtplib.SMTPException``.
+
+        The lock only guards checking a connection out and back in; the
+        SMTP conversation runs without it, so concurrent sends (and inline
+        sends next to the background sender) don't queue behind each other.
+        """
+
+        if not config.get("smtp_user") or not config.get("smtp_password"):
+            raise SMTPNotConfigured("SMTP credentials not configured")
+        key = (config["smtp_host"], int(config["smtp_port"]), config["smtp_user"], bool(config.get("smtp_starttls", True)))
+        server: Optional[smtplib.SMTP] = None
+        with self._lock:
+            entry = self._connections.pop(key, None)
+            if entry is not None and time.monotonic() - entry[1] < self.idle_seconds:
+                server = entry[0]
+                self._counters["reused"] += 1
+        if entry is not None and server is None:
+            self._quit(entry[0])
+        try:
+            if server is not None:
+                try:
+                    server.send_message(msg)
+                except (smtplib.SMTPServerDisconnected, ConnectionError):
+                    with self._lock:
+                        self._counters["reconnects"] += 1
+                    self._quit(server)
+                    server = None
+            if server is None:
+                server = self._connect(config)
+                server.send_message(msg)
+        except Exception:
+            if server is not None:
+                self._quit(server)
+            raise
+        with self._lock:
+            # A concurrent send may have checked in a connection meanwhile; keep one
+            spare = self._connections.get(key)
+            self._connections[key] = (server, time.monotonic())
+            self._counters["sends"] += 1
+        if spare is not None:
+            self._quit(spare[0])
+
+    def _connect(self, config: Dict[str, Any]) -> smtplib.SMTP:
+        server = self._factory(config["smtp_host"], int(config["smtp_port"]), timeout=self.timeout)
+        try:
+            if config.get("smtp_starttls", True):
+                server.starttls()
+            server.login(config["smtp_user"], config["smtp_password"])
+        except Exception:
+            self._quit(server)
+            raise
+        with self._lock:
+            self._counters["connects"] += 1
+        return server
+
+    @staticmethod
+    def _quit(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def close_idle(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            idle = [key for key, (_server, last_used) in self._connections.items() if now - last_used >= self.idle_seconds]
+            closing = [self._connections.pop(key)[0] for key in idle]
+        for server in closing:
+            self._quit(server)
+
+    def close_all(self) -> None:
+        with self._lock:
+            closing = [server for server, _last_used in self._connections.values()]
+            self._connections.clear()
+        for server in closing:
+            self._quit(server)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"open": len(self._connections), **self._counters}
+
+
+_POOL: Optional[SMTPPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPPool:
+    """Return the process-wide SMTP pool (shared by the queue and inline sends)."""
+
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = SMTPPool(idle_seconds=_env_float("OE_MAIL_IDLE_SECONDS", DEFAULT_IDLE_SECONDS))
+        return _POOL
+
+
+# =============================================================================
+# Persistent queue and sender
+# =============================================================================
+
+
+class MailQueue:
+    """SQLite-backed outbound mail jobs drained by one sender thread."""
+
+    def __init__(
+        self,
+        config_factory: Callable[[], Dict[str, Any]],
+        *,
+        db_path: Path = DEFAULT_DB_PATH,
+        pool: Optional[SMTPPool] = None,
+        batch_seconds: float = DEFAULT_BATCH_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = _BACKOFF_BASE_S,
+        background: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.config_factory = config_factory
+        self.pool = pool or get_smtp_pool()
+        self.batch_seconds = batch_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self._clock = clock
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()
+        self._counters: Dict[str, int] = {"enqueued": 0, "sent": 0, "messages": 0, "retries": 0, "failed": 0}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._idle = threading.Condition()
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._thread = threading.Thread(target=self._run, name="mail-queue-sender", daemon=True)
+            self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        kind: str,
+        to_email: str,
+        subject: str,
+        body_text: str,
+        body_html: Optional[str] = None,
+        *,
+        to_name: Optional[str] = None,
+        batch_key: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+        job_id: Optional[str] = None,
+    ) -> str:
+        """Persist a message and wake the sender; return the job id.
+
+        Jobs sharing a ``batch_key`` (HIL notifications per manager) wait for
+        the batch window and are sent together as one digest: a job joins
+        the window of a pending job with the same key if there is one.
+        ``meta`` is handed back to the delivery listeners. Pass ``job_id``
+        (see ``new_job_id``) to record the job before the sender can see it.
+        """
+
+        job_id = job_id or new_job_id()
+        now = self._clock()
+        due = now + (self.batch_seconds if batch_key else 0.0)
+        payload = json.dumps(
+            {"subject": subject, "text": body_text, "html": body_html, "to_name": to_name, "meta": meta or {}}
+        )
+        with self._transaction():
+            if batch_key:
+                window = self._conn.execute(
+                    "SELECT MIN(next_attempt_at) FROM outbound_mail "
+                    "WHERE status = 'pending' AND attempts = 0 AND kind = ? AND batch_key = ?",
+                    (kind, batch_key),
+                ).fetchone()[0]
+                if window is not None:
+                    due = min(due, window)
+            self._conn.execute(
+                "INSERT INTO outbound_mail (job_id, kind, batch_key, to_email, payload, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, batch_key, to_email, payload, due, now),
+            )
+        self._counters["enqueued"] += 1
+        self._wake.set()
+        return job_id
+
+    # ------------------------------------------------------------------
+    # Sender side
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                next_due = self.run_once()
+            except Exception as exc:  # keep the sender alive
+                logger.error("[MAIL_QUEUE] Sender error: %s", exc)
+                next_due = None
+            self.pool.close_idle()
+            wait = _POLL_MAX_S if next_due is None else min(_POLL_MAX_S, max(0.0, next_due - self._clock()))
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def run_once(self) -> Optional[float]:
+        """Send every due job; return when the next pending job is due (None if none)."""
+
+        with self._idle:
+            self._busy = True
+        try:
+            rows = self._claim_due(self._clock())
+            groups: Dict[Tuple[str, str], List[Tuple[Any, ...]]] = {}
+            for row in rows:
+                group_key = (row[1], row[2]) if row[2] else (row[1], row[0])
+                groups.setdefault(group_key, []).append(row)
+            for jobs in groups.values():
+                self._send_group(jobs)
+            with self._db_lock:
+                next_row = self._conn.execute(
+                    "SELECT MIN(next_attempt_at) FROM outbound_mail WHERE status IN ('pending', 'sending')"
+                ).fetchone()
+            return next_row[0] if next_row else None
+        finally:
+            with self._idle:
+                self._busy = False
+                self._idle.notify_all()
+
+    def _claim_due(self, now: float) -> List[Tuple[Any, ...]]:
+        """Lease the due jobs to this sender and return them.
+
+        Jobs whose lease expired (a sender died mid-send) are due again.
+        """
+
+        with self._transaction():
+            rows = self._conn.execute(
+                "SELECT job_id, kind, batch_key, to_email, payload, attempts FROM outbound_mail "
+                "WHERE status IN ('pending', 'sending') AND next_attempt_at <= ? ORDER BY created_at LIMIT ?",
+                (now, _DUE_BATCH),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE outbound_mail SET status = 'sending', next_attempt_at = ? WHERE job_id = ?",
+                [(now + _LEASE_S, row[0]) for row in rows],
+            )
+        return rows
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Serialize against other threads and, with BEGIN IMMEDIATE, other processes."""
+
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _send_group(self, jobs: List[Tuple[Any, ...]]) -> None:
+        config = self.config_factory()
+        payloads = [json.loads(job[4]) for job in jobs]
+        to_email = jobs[0][3]
+        to_name = payloads[0].get("to_name")
+        subject, text, html = _compose(payloads)
+        try:
+            msg = build_message(config, f"{to_name} <{to_email}>" if to_name else to_email, subject, text, html)
+            self.pool.send(config, msg)
+        except Exception as exc:
+            permanent = isinstance(exc, smtplib.SMTPRecipientsRefused)
+            done = [(job[0], payload.get("meta") or {}) for job, payload in zip(jobs, payloads)]
+            self._retry(done, max(job[5] for job in jobs) + 1, exc, permanent)
+            return
+        with self._db_lock:
+            self._conn.executemany("DELETE FROM outbound_mail WHERE job_id = ?", [(job[0],) for job in jobs])
+        self._counters["sent"] += len(jobs)
+        self._counters["messages"] += 1
+        logger.info("[MAIL_QUEUE] Sent %d job(s) to %s: %s", len(jobs), to_email, subject)
+        _notify([(job[0], payload.get("meta") or {}) for job, payload in zip(jobs, payloads)], "sent")
+
+    def _retry(self, jobs: List[Tuple[str, Dict[str, Any]]], attempts: int, exc: Exception, permanent: bool) -> None:
+        failed = permanent or attempts >= self.max_attempts
+        due = self._clock() + min(_BACKOFF_MAX_S, self.backoff_base * 2 ** (attempts - 1))
+        with self._db_lock:
+            self._conn.executemany(
+                "UPDATE outbound_mail SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE job_id = ?",
+                [("failed" if failed else "pending", attempts, due, str(exc)[:500], job_id) for job_id, _meta in jobs],
+            )
+        if failed:
+            self._counters["failed"] += len(jobs)
+            logger.error("[MAIL_QUEUE] Giving up on %d job(s) after %d attempt(s): %s", len(jobs), attempts, exc)
+            _notify(jobs, "failed", str(exc)[:500])
+        else:
+            self._counters["retries"] += len(jobs)
+            logger.warning("[MAIL_QUEUE] Send failed (attempt %d), retrying: %s", attempts, exc)
+
+    # ------------------------------------------------------------------
+    # Metrics / lifecycle
+    # ------------------------------------------------------------------
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Send everything pending now (skipping the batch window); False on timeout."""
+
+        deadline = time.monotonic() + timeout
+        with self._db_lock:
+            self._conn.execute(
+                "UPDATE outbound_mail SET next_attempt_at = ? WHERE status = 'pending' AND attempts = 0",
+                (self._clock(),),
+            )
+        if self._thread is None or not self._thread.is_alive():
+            self.run_once()
+            return True
+        while time.monotonic() < deadline:
+            self._wake.set()
+            with self._idle:
+                self._idle.wait_for(lambda: not self._busy, max(0.0, deadline - time.monotonic()))
+            with self._db_lock:
+                waiting = self._conn.execute(
+                    "SELECT COUNT(*) FROM outbound_mail WHERE status = 'pending' AND attempts = 0"
+                ).fetchone()[0]
+            if not waiting:
+                return True
+            time.sleep(0.01)
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._db_lock:
+            by_status = dict(self._conn.execute("SELECT status, COUNT(*) FROM outbound_mail GROUP BY status").fetchall())
+        return {
+            "pending": by_status.get("pending", 0),
+            "sending": by_status.get("sending", 0),
+            "failed_jobs": by_status.get("failed", 0),
+            **self._counters,
+            "smtp": self.pool.stats(),
+        }
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the sender and close connections; unsent jobs stay in the table."""
+
+        if self._thread is not None and self._thread.is_alive():
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout)
+        self.pool.close_all()
+        with self._db_lock:
+            self._conn.close()
+
+
+def _compose(payloads: List[Dict[str, Any]]) -> Tuple[str, str, Optional[str]]:
+    """Subject and bodies for one job, or a digest of several."""
+
+    if len(payloads) == 1:
+        only = payloads[0]
+        return only["subject"], only["text"], only.get("html")
+    subject = f"[OpenEvent] {len(payloads)} HIL tasks waiting for review"
+    rule = "\n\n" + "-" * 60 + "\n\n"
+    text = rule.join(f"{payload['subject']}\n\n{payload['text']}" for payload in payloads)
+    html_parts = [payload.get("html") or f"<pre>{payload['text']}</pre>" for payload in payloads]
+    return subject, text, "<hr>".join(html_parts)
+
+
+_QUEUE: Optional[MailQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_mail_queue(config_factory: Callable[[], Dict[str, Any]]) -> MailQueue:
+    """Return the process-wide queue, starting its sender on first use."""
+
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            db_path = os.getenv("OE_MAIL_QUEUE_DB", "").strip()
+            _QUEUE = MailQueue(
+                config_factory,
+                db_path=Path(db_path) if db_path else DEFAULT_DB_PATH,
+                batch_seconds=_env_float("OE_MAIL_BATCH_SECONDS", DEFAULT_BATCH_SECONDS),
+                max_attempts=max(1, int(_env_float("OE_MAIL_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS))),
+            )
+        return _QUEUE
+
+
+def mail_queue_stats() -> Dict[str, Any]:
+    """Counters of the process-wide queue (empty until first use)."""
+
+    queue = _QUEUE
+    if queue is None:
+        return {"enabled": mail_queue_enabled(), "pending": 0}
+    return {"enabled": mail_queue_enabled(), **queue.stats()}
+
+
+def shutdown_mail_queue() -> None:
+    """Stop the sender and close pooled SMTP connections (no-op if never started)."""
+
+    global _QUEUE
+    with _QUEUE_LOCK:
+        queue, _QUEUE = _QUEUE, None
+    if queue is not None:
+        queue.shutdown()
+    pool = _POOL
+    if pool is not None:
+        pool.close_all()
+
+
+atexit.register(shutdown_mail_queue)
+
+
+__all__ = [
+    "DeliveryListener",
+    "MailQueue",
+    "SMTPNotConfigured",
+    "SMTPPool",
+    "add_delivery_listener",
+    "build_message",
+    "get_mail_queue",
+    "get_smtp_pool",
+    "mail_queue_enabled",
+    "mail_queue_stats",
+    "new_job_id",
+    "shutdown_mail_queue",
+]
@@ -1,11 +1,41 @@
 from __future__ import annotations
 
+import os
+import re
+import threading
 from dataclasses import dataclass, field
-from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
 
 from utils import json_io
+from workflows.io.config_store import get_config_version
+
+_DEFAULT_CATALOG_PATH = Path(__file__).resolve().parents[1] / "data" / "products.json"
+_WORD_RUN = re.compile(r"\w+")
+# Same separators the step 1 product-token regexes join name parts with
+_PART_SPLIT = re.compile(r"[\s\-]+")
+_TOKEN_MEMO_LIMIT = 16384
+_TEXT_MEMO_LIMIT = 256
+
+# Event/room descriptions that contain category keywords without asking for
+# a product: "conference room" is not Equipment even though "conference" is
+# a conference-camera synonym, "dinner party" is an event type, not Catering.
+_FALSE_POSITIVE_PHRASES: Tuple[str, ...] = (
+    # Equipment false positives (room types)
+    "conference room",
+    "video room",
+    "presentation room",
+    "screen room",
+    # Catering false positives (event types - not actual catering requests)
+    "dinner party",
+    "dinner event",
+    "lunch meeting",
+    "lunch event",
+    "breakfast meeting",
+    "cocktail party",
+    "cocktail event",
+    "cocktail reception",
+)
 
 
 @dataclass
@@ -19,9 +49,7 @@ class ProductRecord:
     synonyms: List[str] = field(default_factory=list)
 
 
-@lru_cache(maxsize=1)
-def _load_catalog(path: Optional[Path] = None) -> Dict[str, ProductRecord]:
-    catalog_path = path or Path(__file__).resolve().parents[1] / "data" / "products.json"
+def _read_records(catalog_path: Path) -> Dict[str, ProductRecord]:
     if not catalog_path.exists():
         return {}
     with catalog_path.open("r", encoding="utf-8") as handle:
@@ -55,25 +83,203 @@ def _load_catalog(path: Optional[Path] = None) -> Dict[str, ProductRecord]:
     return records
 
 
+def _category_keywords(records: Iterable[ProductRecord]) -> Dict[str, Set[str]]:
+    """Category -> keywords (names, synonyms and their words longer than 2 chars)."""
+    category_keywords: Dict[str, Set[str]] = {}
+    for record in records:
+        category = (record.category or "").strip()
+        if not category:
+            continue
+        keywords = category_keywords.setdefault(category, set())
+        for phrase in [record.name.lower(), *record.synonyms]:
+            keywords.add(phrase)
+            for word in phrase.split():
+                if len(word) > 2:  # Skip very short words
+                    keywords.add(word)
+    return category_keywords
+
+
+class ProductCatalog:
+    """One parsed version of products.json plus its lookup indexes.
+
+    - ``records`` / synonym map: O(1) ``find_product``.
+    - Token index: name/synonym word (and its plural) -> record positions,
+      so message scans only visit products whose words occur in the text.
+    - Category keywords keep their substring semantics ("coffee" matches
+      "coffees"). Keywords made of word characters can only occur inside a
+      single word of the message, so each distinct message word is resolved
+      once to the categories of the keywords it contains and memoised; the
+      few keywords with spaces/punctuation that are not implied by one of
+      their own words are checked against the text directly.
+    """
+
+    def __init__(self, records: Dict[str, ProductRecord]) -> None:
+        self.records = records
+        self.record_list: List[ProductRecord] = list(records.values())
+        self._by_synonym: Dict[str, ProductRecord] = {}
+        for record in self.record_list:
+            for synonym in record.synonyms:
+                self._by_synonym.setdefault(synonym, record)
+
+        self._token_records: Dict[str, Tuple[int, ...]] = {}
+        always: List[int] = []
+        token_positions: Dict[str, List[int]] = {}
+        for position, record in enumerate(self.record_list):
+            forms: Set[str] = set()
+            unindexable = False
+            for phrase in [record.name.lower(), *record.synonyms]:
+                for part in _PART_SPLIT.split(phrase.strip()):
+                    if not part:
+                        continue
+                    if _WORD_RUN.fullmatch(part):
+                        forms.update((part, f"{part}s"))
+                    else:
+                        unindexable = True
+            if unindexable:
+                always.append(position)
+            for form in forms:
+                token_positions.setdefault(form, []).append(position)
+        self._token_records = {token: tuple(positions) for token, positions in token_positions.items()}
+        self._always_scan: Tuple[int, ...] = tuple(always)
+
+        self.category_keywords = _category_keywords(self.record_list)
+        self.categories: List[str] = list(self.category_keywords)
+        word_keywords: Dict[str, Set[str]] = {}
+        phrase_keywords: Dict[str, Set[str]] = {}
+        for category, keywords in self.category_keywords.items():
+            for keyword in keywords:
+                if _WORD_RUN.fullmatch(keyword):
+                    word_keywords.setdefault(keyword, set()).add(category)
+                elif not any(other != keyword and other in keyword for other in keywords):
+                    # e.g. "coffee break" is implied by "coffee" in the same category
+                    phrase_keywords.setdefault(keyword, set()).add(category)
+        self._word_keywords: Dict[str, FrozenSet[str]] = {kw: frozenset(cats) for kw, cats in word_keywords.items()}
+        self._word_lengths: Tuple[int, ...] = tuple(sorted({len(kw) for kw in word_keywords}))
+        self._phrase_keywords: Tuple[Tuple[str, FrozenSet[str]], ...] = tuple(
+            (kw, frozenset(cats)) for kw, cats in phrase_keywords.items()
+        )
+        self._token_categories: Dict[str, FrozenSet[str]] = {}
+        self._text_categories: Dict[str, FrozenSet[str]] = {}
+
+    def find(self, name: str) -> Optional[ProductRecord]:
+        lowered = name.strip().lower()
+        return self.records.get(lowered) or self._by_synonym.get(lowered)
+
+    def records_for_text(self, text: str) -> List[ProductRecord]:
+        """Records, in catalog order, that a word-boundary match of their
+        name, synonyms or last words (plain or with a trailing "s") could hit."""
+        positions = set(self._always_scan)
+        for token in set(_WORD_RUN.findall(text.lower())):
+            positions.update(self._token_records.get(token, ()))
+        return [self.record_list[position] for position in sorted(positions)]
+
+    def _categories_in_token(self, token: str) -> FrozenSet[str]:
+        cached = self._token_categories.get(token)
+        if cached is not None:
+            return cached
+        found: Set[str] = set()
+        size = len(token)
+        for length in self._word_lengths:
+            if length > size:
+                break
+            for start in range(size - length + 1):
+                categories = self._word_keywords.get(token[start:start + length])
+                if categories:
+                    found.update(categories)
+        result = frozenset(found)
+        if len(self._token_categories) >= _TOKEN_MEMO_LIMIT:
+            self._token_categories.clear()
+        self._token_categories[token] = result
+        return result
+
+    def mentioned_categories(self, text: str) -> FrozenSet[str]:
+        """Categories with at least one keyword occurring in ``text``."""
+        cached = self._text_categories.get(text)
+        if cached is not None:
+            return cached
+        cleaned = text.lower()
+        for phrase in _FALSE_POSITIVE_PHRASES:
+            cleaned = cleaned.replace(phrase, " ")
+        found: Set[str] = set()
+        for token in set(_WORD_RUN.findall(cleaned)):
+            found.update(self._categories_in_token(token))
+        for keyword, categories in self._phrase_keywords:
+            if not categories <= found and keyword in cleaned:
+                found.update(categories)
+        result = frozenset(found)
+        if len(self._text_categories) >= _TEXT_MEMO_LIMIT:
+            self._text_categories.clear()
+        self._text_categories[text] = result
+        return result
+
+
+_CATALOG_LOCK = threading.Lock()
+_CATALOGS: Dict[Path, Tuple[Optional[Tuple[int, int]], int, ProductCatalog]] = {}
+_CATALOG_STATS: Dict[str, int] = {"hits": 0, "loads": 0}
+
+
+def _catalog_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def get_catalog(path: Optional[Path] = None) -> ProductCatalog:
+    """Return the indexed catalog, reparsing only when the file changed
+    (mtime/size) or the config store was invalidated."""
+    catalog_path = path or _DEFAULT_CATALOG_PATH
+    signature = _catalog_signature(catalog_path)
+    version = get_config_version()
+    cached = _CATALOGS.get(catalog_path)
+    if cached is not None and cached[0] == signature and cached[1] == version:
+        _CATALOG_STATS["hits"] += 1
+        return cached[2]
+    with _CATALOG_LOCK:
+        cached = _CATALOGS.get(catalog_path)
+        if cached is not None and cached[0] == signature and cached[1] == version:
+            _CATALOG_STATS["hits"] += 1
+            return cached[2]
+        catalog = ProductCatalog(_read_records(catalog_path) if signature is not None else {})
+        _CATALOGS[catalog_path] = (signature, version, catalog)
+        _CATALOG_STATS["loads"] += 1
+        return catalog
+
+
+def reset_catalog_cache() -> None:
+    """Drop every loaded catalog (used by tests)."""
+    with _CATALOG_LOCK:
+        _CATALOGS.clear()
+        for key in _CATALOG_STATS:
+            _CATALOG_STATS[key] = 0
+
+
+def _load_catalog(path: Optional[Path] = None) -> Dict[str, ProductRecord]:
+    return get_catalog(path).records
+
+
 def list_product_records(path: Optional[Path] = None) -> List[ProductRecord]:
     """Expose the full product catalog as ProductRecord entries."""
 
-    return list(_load_catalog(path).values())
+    return list(get_catalog(path).record_list)
+
+
+def candidate_product_records(text: str) -> List[ProductRecord]:
+    """Catalog records whose name/synonym words occur as words of ``text``.
+
+    A superset of the records any word-boundary product-token match can
+    find, in catalog order; use it to skip the rest of the catalog.
+    """
+
+    return get_catalog().records_for_text(text)
 
 
 def find_product(name: str) -> Optional[ProductRecord]:
     if not name:
         return None
-    catalog = _load_catalog()
-    record = catalog.get(name.strip().lower())
-    if record:
-        return record
-    # Attempt fuzzy lookup using synonyms
-    lowered = name.strip().lower()
-    for entry in catalog.values():
-        if lowered in entry.synonyms:
-            return entry
-    return None
+    # Exact name first, then synonyms (first product listing the synonym wins)
+    return get_catalog().find(name)
 
 
 def _copy_product_record(record: ProductRecord, quantity: Optional[int] = None) -> Dict[str, Any]:
@@ -210,7 +416,7 @@ def check_availability(
     room_identifier: Optional[str],
     event_date_iso: Optional[str],
 ) -> Dict[str, List[Dict[str, Any]]]:
-    catalog = _load_catalog()
+    catalog = get_catalog().records
     room_key = (room_identifier or "").strip().lower()
 
     available: List[Dict[str, Any]] = []
@@ -246,43 +452,17 @@ def check_availability(
 # Category-based semantic matching
 # =============================================================================
 
-@lru_cache(maxsize=1)
 def _build_category_keywords() -> Dict[str, set]:
     """
     Build a mapping of category -> set of keywords (names + synonyms).
-    Loaded once and cached for performance.
+    Built once per catalog version (see ProductCatalog).
     """
-    catalog = _load_catalog()
-    category_keywords: Dict[str, set] = {}
-
-    for record in catalog.values():
-        category = (record.category or "").strip()
-        if not category:
-            continue
-
-        if category not in category_keywords:
-            category_keywords[category] = set()
-
-        # Add product name (lowercase, split into words)
-        name_lower = record.name.lower()
-        category_keywords[category].add(name_lower)
-        for word in name_lower.split():
-            if len(word) > 2:  # Skip very short words
-                category_keywords[category].add(word)
-
-        # Add all synonyms
-        for synonym in record.synonyms:
-            category_keywords[category].add(synonym.lower())
-            for word in synonym.lower().split():
-                if len(word) > 2:
-                    category_keywords[category].add(word)
-
-    return category_keywords
+    return get_catalog().category_keywords
 
 
 def get_categories() -> List[str]:
     """Get all unique product categories from the catalog."""
-    return list(_build_category_keywords().keys())
+    return list(get_catalog().categories)
 
 
 def text_matches_category(text: str, category: str) -> bool:
@@ -300,37 +480,7 @@ def text_matches_category(text: str, category: str) -> bool:
     if not text or not category:
         return False
 
-    keywords = _build_category_keywords().get(category, set())
-    if not keywords:
-        return False
-
-    text_lower = text.lower()
-
-    # Exclude common false positives where event/room descriptions contain category keywords
-    # E.g., "conference room" should NOT match Equipment category due to "conference" keyword
-    # (conference camera is equipment, but conference room is not)
-    # Similarly, "dinner party" is an event type, not a catering product request
-    false_positive_phrases = [
-        # Equipment false positives (room types)
-        "conference room",
-        "video room",
-        "presentation room",
-        "screen room",
-        # Catering false positives (event types - not actual catering requests)
-        "dinner party",
-        "dinner event",
-        "lunch meeting",
-        "lunch event",
-        "breakfast meeting",
-        "cocktail party",
-        "cocktail event",
-        "cocktail reception",
-    ]
-    text_cleaned = text_lower
-    for phrase in false_positive_phrases:
-        text_cleaned = text_cleaned.replace(phrase, " ")
-
-    return any(kw in text_cleaned for kw in keywords)
+    return category in get_catalog().mentioned_categories(text)
 
 
 def detect_mentioned_categories(text: str) -> List[str]:
@@ -346,11 +496,9 @@ def detect_mentioned_categories(text: str) -> List[str]:
     if not text:
         return []
 
-    mentioned = []
-    for category in get_categories():
-        if text_matches_category(text, category):
-            mentioned.append(category)
-    return mentioned
+    catalog = get_catalog()
+    mentioned = catalog.mentioned_categories(text)
+    return [category for category in catalog.categories if category in mentioned]
 
 
 def has_specific_product_request(text: str, exclude_categories: Optional[List[str]] = None) -> bool:
@@ -6,6 +6,7 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 from services.availability import calendar_free
 from services.products import check_availability
 from services.rooms import RoomRecord, load_room_catalog
+from workflows.common.occupancy import occupancy_batch
 
 STATUS_ORDER = {"Available": 0, "Option": 1, "Unavailable": 2}
 
@@ -58,45 +59,47 @@ def evaluate_rooms(
     requested = requested_products or event_entry.get("requested_products") or []
 
     evaluations: List[RoomEvaluation] = []
-    for record in load_room_catalog():
-        available = calendar_free(record.name, window, db=db)
-        capacity_ok, slack, capacity_reason = _check_capacity(record, participants, layout)
-
-        matched, missing = _feature_coverage(record.features, requested_features)
-        availability = check_availability(requested, record.room_id, window.get("date_iso"))
-        available_products = availability.get("available", []) if availability else []
-        missing_products = availability.get("missing", []) if availability else []
-
-        reasons: List[str] = []
-        if not available:
-            reasons.append("Another event overlaps this time.")
-        if not capacity_ok and capacity_reason:
-            reasons.append(capacity_reason)
-        if missing:
-            missing_human = ", ".join(_humanize_feature(f) for f in missing)
-            reasons.append(f"Missing: {missing_human}")
-
-        if available and capacity_ok:
-            status = "Available"
-        elif capacity_ok:
-            status = "Option"
-        else:
-            status = "Unavailable"
-
-        evaluations.append(
-            RoomEvaluation(
-                record=record,
-                status=status,
-                coverage_matched=len(matched),
-                coverage_total=len(requested_features),
-                matched_features=[_humanize_feature(f) for f in matched],
-                missing_features=[_humanize_feature(f) for f in missing],
-                capacity_slack=slack,
-                reasons=reasons,
-                available_products=available_products,
-                missing_products=missing_products,
+    # One occupancy index for all rooms instead of one events scan per room
+    with occupancy_batch(db):
+        for record in load_room_catalog():
+            available = calendar_free(record.name, window, db=db)
+            capacity_ok, slack, capacity_reason = _check_capacity(record, participants, layout)
+
+            matched, missing = _feature_coverage(record.features, requested_features)
+            availability = check_availability(requested, record.room_id, window.get("date_iso"))
+            available_products = availability.get("available", []) if availability else []
+            missing_products = availability.get("missing", []) if availability else []
+
+            reasons: List[str] = []
+            if not available:
+                reasons.append("Another event overlaps this time.")
+            if not capacity_ok and capacity_reason:
+                reasons.append(capacity_reason)
+            if missing:
+                missing_human = ", ".join(_humanize_feature(f) for f in missing)
+                reasons.append(f"Missing: {missing_human}")
+
+            if available and capacity_ok:
+                status = "Available"
+            elif capacity_ok:
+                status = "Option"
+            else:
+                status = "Unavailable"
+
+            evaluations.append(
+                RoomEvaluation(
+                    record=record,
+                    status=status,
+                    coverage_matched=len(matched),
+                    coverage_total=len(requested_features),
+                    matched_features=[_humanize_feature(f) for f in matched],
+                    missing_features=[_humanize_feature(f) for f in missing],
+                    capacity_slack=slack,
+                    reasons=reasons,
+                    available_products=available_products,
+                    missing_products=missing_products,
+                )
             )
-        )
     return evaluations
 
 
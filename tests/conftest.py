@@ -10,3 +10,6 @@ if PROJECT_ROOT not in sys.path:
 
 # Force plain verbalizer tone for deterministic test output
 os.environ.setdefault("VERBALIZER_TONE", "plain")
+
+# Keep LLM responses in memory only so test runs never share a cache file
+os.environ.setdefault("LLM_CACHE_PERSIST", "0")
@@ -0,0 +1,86 @@
+"""
+Tests for the precompiled keyword matcher (detection/keywords/matcher.py).
+
+Tests:
+- PatternSet agrees with per-pattern re.search on every bucket
+- Word, stem and regex patterns are classified and matched correctly
+- Labels come back once each, in declaration order
+- IGNORECASE sets match mixed-case patterns against lowercased text
+"""
+
+import re
+
+import pytest
+
+from detection.keywords import buckets
+from detection.keywords.matcher import PatternSet
+
+MESSAGES = [
+    "Hi, could we actually change the date to 14.03.2026 instead? We'd prefer Room B for 40 people.",
+    "Thanks for the parking info! What rooms have a projector and HDMI available in February?",
+    "Yes that works, please go ahead and book it.",
+    "Guten Tag, wir möchten den Termin verschieben und brauchen einen anderen Raum für 30 Personen.",
+    "We need to reschedule - something's come up. Can we push it back a week?",
+    "Nous voulons annuler, merci.",
+    "",
+]
+
+
+def _bucket_lists():
+    yield buckets.REVISION_MARKERS_EN
+    yield buckets.REVISION_MARKERS_DE
+    yield buckets.REQUEST_MODIFIERS_EN
+    yield buckets.PURE_QA_SIGNALS_EN
+    yield buckets.CONFIRMATION_SIGNALS_DE
+    yield buckets.DECLINE_SIGNALS_FR
+    for group in buckets.CHANGE_VERBS_EN.values():
+        yield group
+    for lang_patterns in buckets.TARGET_PATTERNS.values():
+        yield lang_patterns["en"] + lang_patterns["de"]
+
+
+@pytest.mark.parametrize("patterns", list(_bucket_lists()))
+def test_pattern_set_matches_re_search(patterns):
+    pattern_set = PatternSet.from_patterns(patterns)
+    for message in MESSAGES:
+        text = message.lower()
+        expected = [p for p in patterns if re.search(p, text)]
+        assert pattern_set.matched_patterns(text) == expected
+        assert pattern_set.search(text) == bool(expected)
+
+
+def test_word_stem_and_regex_patterns():
+    pattern_set = PatternSet.from_patterns([r"\bmove\b", r"\breschedul\w*\b", r"\bpush\s+\w*\s*(back|out)\b"])
+
+    assert pattern_set.matched_patterns("we are rescheduling") == [r"\breschedul\w*\b"]
+    assert pattern_set.matched_patterns("can we push it back") == [r"\bpush\s+\w*\s*(back|out)\b"]
+    assert pattern_set.matched_patterns("removed the movers") == []
+    assert pattern_set.first("move and reschedule") == r"\bmove\b"
+
+
+def test_labels_are_distinct_and_ordered():
+    pattern_set = PatternSet.from_groups(
+        {"strong": [r"\bchange\b", r"\bupdate\b"], "booking": [r"\bre-?book\b"], "product_mod": [r"\badd\b"]}
+    )
+
+    assert pattern_set.matched_labels("please add wine, change and update the rebook") == [
+        "strong",
+        "booking",
+        "product_mod",
+    ]
+    assert pattern_set.matches("change it") == [(r"\bchange\b", "strong")]
+
+
+def test_ignorecase_set_matches_mixed_case_patterns():
+    pattern_set = PatternSet.from_patterns([r"\b(ich|wir|Sie|uns|Ihnen)\b"], re.IGNORECASE)
+
+    assert pattern_set.search("können sie helfen")
+    assert not pattern_set.search("sieben tage")
+
+
+def test_change_intent_uses_precompiled_sets():
+    result = buckets.compute_change_intent_score("Actually, can we change the date to 14.03.2026?")
+
+    assert result.has_change_intent
+    assert result.target_type == "date"
+    assert r"\bchange\b" in result.revision_signals
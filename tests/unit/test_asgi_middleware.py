@@ -0,0 +1,205 @@
+"""
+Unit tests for the pure-ASGI middleware chain (api/middleware).
+
+Tests:
+- Content-Length over the limit is rejected before the app runs
+- Chunked bodies are counted while streaming and answered with 413
+- Bodies under the limit and GET requests pass through untouched
+- Tenant and auth contextvars are visible downstream and reset afterwards
+- Auth rejects missing/invalid keys with 401 and skips allowlisted paths
+- Streaming responses are forwarded chunk by chunk through the whole chain
+"""
+
+import asyncio
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+try:
+    from api.middleware.auth import AuthMiddleware
+    from api.middleware.request_limits import RequestSizeLimitMiddleware
+    from api.middleware.tenant_context import CURRENT_TEAM_ID, TenantContextMiddleware
+except ImportError as e:
+    pytest.skip(f"api package shadowed by tests/api under importlib mode: {e}", allow_module_level=True)
+
+
+def _scope(method="POST", path="/api/x", headers=()):
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers],
+    }
+
+
+def _run(app, scope, chunks=(b"",)):
+    """Drive ``app`` with ``chunks`` as the request body; return sent messages."""
+
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+def _status(sent):
+    return sent[0]["status"]
+
+
+def _json(sent):
+    return json.loads(b"".join(message.get("body", b"") for message in sent[1:]))
+
+
+async def _echo_length(scope, receive, send):
+    """App that reads the whole body, FastAPI-style turning read errors into a 400."""
+
+    size = 0
+    try:
+        while True:
+            message = await receive()
+            size += len(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+    except Exception:
+        await send({"type": "http.response.start", "status": 400, "headers": []})
+        await send({"type": "http.response.body", "body": b'{"detail": "There was an error parsing the body"}'})
+        return
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": json.dumps({"size": size}).encode()})
+
+
+def test_content_length_over_limit_rejected_without_calling_app():
+    called = []
+
+    async def app(scope, receive, send):
+        called.append(True)
+
+    sent = _run(RequestSizeLimitMiddleware(app, max_body_size=1024), _scope(headers=[("Content-Length", "4096")]))
+    assert _status(sent) == 413
+    assert _json(sent)["error"] == "request_too_large"
+    assert called == []
+
+
+def test_streamed_body_over_limit_returns_413():
+    middleware = RequestSizeLimitMiddleware(_echo_length, max_body_size=1024)
+    sent = _run(middleware, _scope(), chunks=(b"x" * 600, b"x" * 600, b"x" * 600))
+    assert _status(sent) == 413
+    assert _json(sent)["error"] == "request_too_large"
+
+
+def test_streamed_body_over_limit_when_app_lets_error_escape():
+    async def app(scope, receive, send):
+        while (await receive()).get("more_body"):
+            pass
+
+    sent = _run(RequestSizeLimitMiddleware(app, max_body_size=10), _scope(), chunks=(b"x" * 8, b"x" * 8))
+    assert _status(sent) == 413
+
+
+def test_bodies_under_limit_and_gets_pass_through():
+    middleware = RequestSizeLimitMiddleware(_echo_length, max_body_size=1024)
+    sent = _run(middleware, _scope(), chunks=(b"x" * 500, b"x" * 500))
+    assert _status(sent) == 200 and _json(sent) == {"size": 1000}
+    sent = _run(middleware, _scope("GET", headers=[("Content-Length", "999999")]))
+    assert _status(sent) == 200
+
+
+def test_tenant_context_set_downstream_and_reset():
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(CURRENT_TEAM_ID.get())
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def scenario():
+        middleware = TenantContextMiddleware(app)
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            sent.append(message)
+
+        await middleware(_scope("GET", headers=[("X-Team-Id", "team-1")]), receive, send)
+        return CURRENT_TEAM_ID.get()
+
+    with patch.dict(os.environ, {"TENANT_HEADER_ENABLED": "1"}):
+        after = asyncio.run(scenario())
+    assert seen == ["team-1"]
+    assert after is None
+
+    with patch.dict(os.environ, {"TENANT_HEADER_ENABLED": "0"}):
+        _run(TenantContextMiddleware(app), _scope("GET", headers=[("X-Team-Id", "team-2")]))
+    assert seen[-1] is None
+
+
+def test_auth_rejects_and_allowlists():
+    middleware = AuthMiddleware(_echo_length)
+    with patch.dict(os.environ, {"AUTH_ENABLED": "1", "AUTH_MODE": "api_key", "API_KEY": "secret"}):
+        sent = _run(middleware, _scope())
+        assert _status(sent) == 401 and _json(sent)["detail"] == "missing_token"
+        sent = _run(middleware, _scope(headers=[("Authorization", "Bearer wrong")]))
+        assert _status(sent) == 401 and _json(sent)["detail"] == "invalid_token"
+        assert _status(_run(middleware, _scope(headers=[("Authorization", "Bearer secret")]))) == 200
+        assert _status(_run(middleware, _scope(headers=[("X-Api-Key", "secret")]))) == 200
+        assert _status(_run(middleware, _scope("GET", "/health"))) == 200
+    with patch.dict(os.environ, {"AUTH_ENABLED": "1", "AUTH_MODE": "bogus"}):
+        assert _status(_run(middleware, _scope())) == 500
+
+
+def test_auth_sets_and_resets_claims(monkeypatch):
+    from api.middleware import auth
+
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append((auth.get_current_user_id(), CURRENT_TEAM_ID.get()))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    monkeypatch.setattr(
+        auth, "_validate_supabase_jwt", lambda token: (True, "", {"user_id": "u-1", "team_id": "t-1"})
+    )
+    with patch.dict(os.environ, {"AUTH_ENABLED": "1", "AUTH_MODE": "supabase_jwt"}):
+        _run(AuthMiddleware(app), _scope(headers=[("Authorization", "Bearer jwt")]))
+    assert seen == [("u-1", "t-1")]
+    assert auth.get_current_user_id() is None and CURRENT_TEAM_ID.get() is None
+
+
+def test_streaming_response_forwarded_chunk_by_chunk():
+    order = []
+
+    async def streaming_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for n in range(3):
+            order.append(f"app:{n}")
+            await send({"type": "http.response.body", "body": str(n).encode(), "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    chain = AuthMiddleware(TenantContextMiddleware(RequestSizeLimitMiddleware(streaming_app)))
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message["body"]:
+            order.append(f"client:{message['body'].decode()}")
+        sent.append(message)
+
+    with patch.dict(os.environ, {"AUTH_ENABLED": "0", "TENANT_HEADER_ENABLED": "1"}):
+        asyncio.run(chain(_scope(headers=[("X-Team-Id", "t")]), receive, send))
+    assert order == ["app:0", "client:0", "app:1", "client:1", "app:2", "client:2"]
@@ -0,0 +1,102 @@
+"""
+Unit tests for the bulk availability query (services/availability.availability_matrix).
+
+Tests:
+- Every matrix cell equals calendar_free for the same room and window
+- Busy calendar slots and Option/Confirmed DB bookings both mark cells busy
+- candidate_dates_calendar_free agrees with candidate_is_calendar_free
+- The busy calendar is fetched once per room, not once per date
+"""
+
+import json
+from datetime import date, time, timedelta
+
+import pytest
+
+from adapters import calendar_adapter
+from services.availability import availability_matrix, calendar_free
+from workflows.common.datetime_parse import build_window_iso
+from workflows.steps.step2_date_confirmation.trigger.calendar_checks import (
+    candidate_dates_calendar_free,
+    candidate_is_calendar_free,
+)
+
+ROOMS = ["Room A", "Room B", "Room C", "Unknown Room"]
+
+
+@pytest.fixture
+def calendar_dir(tmp_path, monkeypatch):
+    (tmp_path / "atelier-room-a.json").write_text(
+        json.dumps({"busy": [{"start": "2026-03-04T17:00:00Z", "end": "2026-03-04T21:00:00Z"}]})
+    )
+    (tmp_path / "atelier-room-b.json").write_text(
+        json.dumps({"busy": [{"start": "2026-03-02T08:00:00Z", "end": "2026-03-06T08:00:00Z"}]})
+    )
+    adapter = calendar_adapter.CalendarAdapter(tmp_path)
+    monkeypatch.setattr(calendar_adapter, "_CALENDAR_SINGLETON", adapter)
+    return adapter
+
+
+@pytest.fixture
+def db():
+    return {
+        "events": [
+            {
+                "event_id": "evt-1",
+                "status": "Option",
+                "event_data": {"Event Date": "03.03.2026", "Preferred Room": "Room C"},
+            },
+            {
+                "event_id": "evt-2",
+                "status": "Lead",
+                "event_data": {"Event Date": "05.03.2026", "Preferred Room": "Room C"},
+            },
+        ]
+    }
+
+
+def _windows(start=time(18, 0), end=time(22, 0)):
+    windows = []
+    for offset in range(7):
+        iso_date = (date(2026, 3, 1) + timedelta(days=offset)).isoformat()
+        start_iso, end_iso = build_window_iso(iso_date, start, end)
+        windows.append({"date_iso": iso_date, "start": start_iso, "end": end_iso})
+    windows.append({"date_iso": "2026-03-08"})  # no times: free, as in calendar_free
+    return windows
+
+
+def test_matrix_matches_calendar_free(calendar_dir, db):
+    windows = _windows()
+
+    matrix = availability_matrix(ROOMS, windows, db=db)
+
+    for room in ROOMS:
+        assert matrix[room] == [calendar_free(room, window, db=db) for window in windows]
+    assert matrix["Room A"][3] is False  # busy slot on 04.03
+    assert matrix["Room B"][1:5] == [False] * 4  # multi-day busy slot
+    assert matrix["Room C"][2] is False and matrix["Room C"][4] is True  # Option blocks, Lead does not
+    assert all(matrix["Unknown Room"])
+
+
+def test_candidate_dates_bulk_matches_single(calendar_dir, db):
+    dates = [(date(2026, 3, 1) + timedelta(days=offset)).isoformat() for offset in range(7)] + ["not-a-date"]
+
+    bulk = candidate_dates_calendar_free("Room B", dates, time(9, 0), time(11, 0), db=db)
+
+    assert bulk == {d: candidate_is_calendar_free("Room B", d, time(9, 0), time(11, 0), db=db) for d in dates}
+    assert candidate_dates_calendar_free("Not specified", dates, time(9, 0), time(11, 0)) == dict.fromkeys(dates, True)
+
+
+def test_busy_calendar_fetched_once_per_room(calendar_dir, monkeypatch):
+    calls = []
+    original = calendar_dir.busy_timeline
+
+    def counting_timeline(calendar_id):
+        calls.append(calendar_id)
+        return original(calendar_id)
+
+    monkeypatch.setattr(calendar_dir, "busy_timeline", counting_timeline)
+
+    availability_matrix(["Room A", "Room B"], _windows())
+
+    assert sorted(calls) == ["atelier-room-a", "atelier-room-b"]
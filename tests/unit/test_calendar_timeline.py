@@ -0,0 +1,93 @@
+"""
+Unit tests for the parsed busy-slot timeline in adapters/calendar_adapter.py.
+
+Tests:
+- get_busy is a true range query (exclusive ends), full list without a range
+- overlaps / overlaps_many agree with a brute-force check
+- Slots are parsed once per calendar until clear_cache
+- Step 3 pipeline conflicts and near-miss shifts honour room buffers
+"""
+
+import json
+import random
+from datetime import datetime, time, timezone
+
+import pytest
+
+from adapters.calendar_adapter import BusyTimeline, CalendarAdapter
+from workflows.steps.step3_room_availability.db_pers.room_availability_pipeline import (
+    RequestedWindow,
+    collect_conflicts,
+    near_miss_suggestions,
+)
+
+BUSY = [
+    {"start": "2026-03-04T14:00:00Z", "end": "2026-03-04T16:00:00Z"},
+    {"start": "2026-03-02T08:00:00Z", "end": "2026-03-06T08:00:00Z"},
+    {"start": "2026-03-10T09:00:00", "end": "2026-03-10T10:00:00"},  # naive: UTC
+    {"start": "broken", "end": "2026-03-10T10:00:00Z"},
+]
+
+
+@pytest.fixture
+def adapter(tmp_path):
+    (tmp_path / "cal.json").write_text(json.dumps({"busy": BUSY}))
+    return CalendarAdapter(tmp_path)
+
+
+def test_get_busy_is_a_range_query(adapter):
+    assert adapter.get_busy("cal", "2026-03-08T00:00:00Z", "2026-03-09T00:00:00Z") == []
+    assert adapter.get_busy("cal", "2026-03-06T08:00:00Z", "2026-03-06T09:00:00Z") == []  # touching end
+    assert adapter.get_busy("cal", "2026-03-04T15:00:00+01:00", "2026-03-04T15:30:00+01:00") == [BUSY[1], BUSY[0]]
+    assert adapter.get_busy("cal", "2026-03-10T09:30:00Z", "2026-03-10T11:00:00Z") == [BUSY[2]]
+    assert len(adapter.get_busy("cal", "", "")) == 3  # unparsable slot dropped
+
+
+def test_overlaps_match_brute_force():
+    rng = random.Random(11)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+    slots = []
+    for _ in range(200):
+        start = base + rng.randrange(0, 86400 * 30, 900)
+        slots.append((start, start + rng.choice([900, 3600, 86400 * 2])))
+    timeline = BusyTimeline(
+        {
+            "start": datetime.fromtimestamp(s, timezone.utc).isoformat(),
+            "end": datetime.fromtimestamp(e, timezone.utc).isoformat(),
+        }
+        for s, e in slots
+    )
+    windows = [(base + q, base + q + 7200) for q in range(0, 86400 * 31, 3600 * 7)]
+
+    expected = [any(s < we and ws < e for s, e in slots) for ws, we in windows]
+
+    assert timeline.overlaps_many(windows) == expected
+    assert [timeline.overlaps(*w) for w in windows] == expected
+    assert [len(timeline.indices(*w)) for w in windows] == [
+        sum(1 for s, e in slots if s < we and ws < e) for ws, we in windows
+    ]
+
+
+def test_timeline_parsed_once_until_cleared(adapter):
+    first = adapter.busy_timeline("cal")
+
+    assert adapter.busy_timeline("cal") is first
+    adapter.clear_cache()
+    assert adapter.busy_timeline("cal") is not first
+
+
+def test_pipeline_uses_buffers_and_shifts(adapter):
+    room = {"name": "Room A", "calendar_id": "cal", "buffer_before_min": 0, "buffer_after_min": 60}
+    day = datetime(2026, 3, 10)
+    window = RequestedWindow(
+        date="2026-03-10",
+        start=datetime.combine(day.date(), time(7, 0), tzinfo=timezone.utc),
+        end=datetime.combine(day.date(), time(8, 30), tzinfo=timezone.utc),
+    )
+
+    conflict, intervals = collect_conflicts(room, window, adapter)
+    suggestions = near_miss_suggestions(room, window, adapter)
+
+    assert conflict  # 08:30 + 60 min buffer reaches the 09:00 slot
+    assert intervals == [{"start": "2026-03-10T09:00:00+00:00", "end": "2026-03-10T10:00:00+00:00"}]
+    assert [s["note"] for s in suggestions] == ["shift -30m", "shift -60m", "shift -90m"]
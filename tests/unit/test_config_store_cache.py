@@ -0,0 +1,82 @@
+"""
+Unit tests for the config_store snapshot cache.
+
+Tests:
+- Repeated getter calls hit the snapshot instead of re-loading the DB
+- File changes (mtime/size) and explicit invalidation trigger a reload
+- Returned sections are copies (callers cannot corrupt the snapshot)
+"""
+
+import pytest
+
+from workflows.io import config_store
+from workflows.io import database as db_io
+
+
+@pytest.fixture
+def config_db(monkeypatch, tmp_path):
+    path = tmp_path / "events_database.json"
+    monkeypatch.setattr(config_store, "DB_PATH", path)
+    config_store.reset_config_cache()
+    yield path
+    config_store.reset_config_cache()
+
+
+def _write_config(path, config):
+    db = db_io.get_default_db()
+    db["config"] = config
+    db_io.save_db(db, path)
+
+
+def test_getters_share_one_load(config_db, monkeypatch):
+    _write_config(config_db, {"venue": {"name": "Loft", "timezone": "Europe/Berlin"}})
+    loads = []
+    real_load = config_store.load_db
+    monkeypatch.setattr(config_store, "load_db", lambda p: loads.append(p) or real_load(p))
+
+    assert config_store.get_venue_name() == "Loft"
+    assert config_store.get_timezone() == "Europe/Berlin"
+    assert config_store.get_operating_hours() == (8, 23)
+    assert config_store.get_faq_items()  # defaults
+
+    assert len(loads) == 1
+    stats = config_store.get_config_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 3
+
+
+def test_file_change_reloads_snapshot(config_db):
+    _write_config(config_db, {"venue": {"name": "Loft"}})
+    assert config_store.get_venue_name() == "Loft"
+
+    _write_config(config_db, {"venue": {"name": "Warehouse Hall"}})
+
+    assert config_store.get_venue_name() == "Warehouse Hall"
+
+
+def test_invalidate_forces_reload(config_db, monkeypatch):
+    _write_config(config_db, {"managers": {"names": ["Anna"]}})
+    assert config_store.get_manager_names() == ["Anna"]
+    misses = config_store.get_config_cache_stats()["misses"]
+
+    config_store.invalidate_config_cache()
+    config_store.get_manager_names()
+
+    stats = config_store.get_config_cache_stats()
+    assert stats["misses"] == misses + 1
+    assert stats["invalidations"] == 1
+
+
+def test_returned_sections_are_copies(config_db):
+    _write_config(config_db, {"faq": {"items": [{"category": "Parking", "question": "q", "answer": "a"}]}})
+
+    items = config_store.get_faq_items()
+    items[0]["answer"] = "mutated"
+    items.append({})
+
+    assert config_store.get_faq_items() == [{"category": "Parking", "question": "q", "answer": "a"}]
+
+
+def test_missing_db_uses_defaults(config_db):
+    assert config_store.get_venue_name() == "The Atelier"
+    assert config_store.get_site_visit_slots() == [10, 14, 16]
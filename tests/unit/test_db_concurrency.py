@@ -1,40 +1,41 @@
 """
 Test: Database concurrency behavior (F-02 finding)
 
-This test documents the race condition in JSON database updates:
-- The FileLock only wraps individual I/O operations (load/save)
-- It does NOT wrap the entire "load → process → save" transaction
-- Concurrent workers can load the same snapshot and overwrite each other
-
-This is an INFORMATIONAL test - it documents known behavior, not a regression guard.
-When the underlying concurrency issue is fixed, this test should be updated.
+Concurrent load → modify → save cycles used to lose updates: the FileLock
+only wraps the individual load/save, so two workers could load the same
+snapshot and the last writer won. Saves are now compare-and-swap per record
+(workflows/io/revisions.py); these tests guard against the regression.
 """
 
 import json
+import os
 import tempfile
 import threading
 import time
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import List
 
 import pytest
 
-from workflows.io.database import load_db, save_db
+from workflows.io import revisions
+from workflows.io.database import FileLock, load_db, save_db
+
+
+@pytest.fixture(autouse=True)
+def _monolithic_backend(monkeypatch):
+    monkeypatch.delenv("OE_DB_BACKEND", raising=False)
 
 
 @pytest.mark.v4
-def test_concurrent_updates_can_lose_data():
+def test_concurrent_updates_do_not_lose_data():
     """
-    Demonstrate that concurrent load→modify→save cycles can lose updates.
+    Concurrent load→modify→save cycles keep both workers' changes.
 
     Scenario:
     - Worker A loads DB, adds event "A"
     - Worker B loads DB (same snapshot), adds event "B"
     - Worker A saves → DB has event "A"
-    - Worker B saves → DB has only event "B" (A's update is lost!)
-
-    This test PASSES when data loss occurs (documenting the current behavior).
-    When the bug is fixed, this test should FAIL and be rewritten.
+    - Worker B saves → its save is rebased onto A's → DB has both
     """
     with tempfile.TemporaryDirectory() as tmpdir:
         db_path = Path(tmpdir) / "test_db.json"
@@ -44,73 +45,200 @@ def test_concurrent_updates_can_lose_data():
         with open(db_path, "w") as f:
             json.dump(initial_db, f)
 
-        results: Dict[str, Any] = {"a_loaded": False, "b_loaded": False}
         barrier = threading.Barrier(2)  # Sync both workers
 
         def worker_a():
-            # Load DB
             db = load_db(db_path)
-            results["a_loaded"] = True
-
-            # Wait for B to also load (both have same snapshot)
             barrier.wait()
-
-            # Add event A
             db["events"].append({"event_id": "event-A", "name": "Event A"})
-
-            # Small delay to let B modify its copy
             time.sleep(0.05)
-
-            # Save
             save_db(db, db_path)
 
         def worker_b():
-            # Load DB
             db = load_db(db_path)
-            results["b_loaded"] = True
-
-            # Wait for A to also load
             barrier.wait()
-
-            # Add event B
             db["events"].append({"event_id": "event-B", "name": "Event B"})
-
             # Delay to ensure A saves first
             time.sleep(0.1)
-
-            # Save (this overwrites A's changes)
             save_db(db, db_path)
 
-        # Run both workers concurrently
         thread_a = threading.Thread(target=worker_a)
         thread_b = threading.Thread(target=worker_b)
-
         thread_a.start()
         thread_b.start()
-
         thread_a.join(timeout=5)
         thread_b.join(timeout=5)
 
-        # Load final state
         final_db = load_db(db_path)
         event_ids = [e["event_id"] for e in final_db.get("events", [])]
 
-        # Document the race condition: B's save overwrites A's changes
-        # Expected (if bug exists): only event-B is present
-        # Expected (if bug fixed): both event-A and event-B are present
-
-        if "event-A" in event_ids and "event-B" in event_ids:
-            pytest.fail(
-                "GOOD NEWS: Both events preserved! The concurrency bug may be fixed. "
-                "Update this test to be a regression guard."
-            )
-        else:
-            # This documents the current buggy behavior
-            assert "event-B" in event_ids, "Event B should be present (last writer wins)"
-            assert "event-A" not in event_ids, (
-                "Event A is lost due to race condition (F-02). "
-                "This test documents the known behavior."
-            )
+        assert event_ids == ["event-A", "event-B"]
+
+
+@pytest.mark.v4
+def test_concurrent_changes_to_same_event_are_merged(tmp_path):
+    db_path = tmp_path / "db.json"
+    save_db(
+        {"events": [{"event_id": "EVT", "msgs": [], "thread_state": "Awaiting Client"}], "clients": {}, "tasks": []},
+        db_path,
+    )
+    revisions.reset_write_stats()
+
+    db_a = load_db(db_path)
+    db_b = load_db(db_path)
+    event_a = db_a["events"][0]
+    event_a["msgs"].append("m1")
+    event_a["chosen_date"] = "12.05.2026"
+    db_b["events"][0]["msgs"].append("m2")
+    db_b["events"][0]["locked_room_id"] = "Room A"
+
+    save_db(db_a, db_path)
+    save_db(db_b, db_path)
+
+    final = load_db(db_path)["events"][0]
+    assert final["msgs"] == ["m1", "m2"]
+    assert final["chosen_date"] == "12.05.2026"
+    assert final["locked_room_id"] == "Room A"
+    assert final[revisions.REVISION_FIELD] == 2
+    # The first worker's in-memory record object is still the one it committed
+    assert event_a[revisions.REVISION_FIELD] == 1
+
+    stats = revisions.get_write_stats()
+    assert stats["saves_rebased"] == 1
+    assert stats["record_conflicts"] == 1
+    assert stats["field_conflicts"] == 0
+
+
+@pytest.mark.v4
+def test_rebased_save_refreshes_in_memory_view(tmp_path):
+    """After a rebased save, a second flush of the same turn must not drop others' records."""
+    db_path = tmp_path / "db.json"
+    save_db({"events": [], "clients": {}, "tasks": []}, db_path)
+
+    db_a = load_db(db_path)
+    db_b = load_db(db_path)
+    db_a["events"].append({"event_id": "A"})
+    save_db(db_a, db_path)
+    event_b = {"event_id": "B"}
+    db_b["events"].append(event_b)
+    save_db(db_b, db_path)
+    event_b["msgs"] = ["late"]
+    save_db(db_b, db_path)
+
+    final = load_db(db_path)
+    assert [e["event_id"] for e in final["events"]] == ["A", "B"]
+    assert final["events"][1]["msgs"] == ["late"]
+
+
+@pytest.mark.v4
+def test_same_field_conflict_keeps_later_commit(tmp_path):
+    db_path = tmp_path / "db.json"
+    save_db({"events": [{"event_id": "EVT", "current_step": 2}], "clients": {}, "tasks": []}, db_path)
+    revisions.reset_write_stats()
+
+    db_a = load_db(db_path)
+    db_b = load_db(db_path)
+    db_a["events"][0]["current_step"] = 3
+    db_b["events"][0]["current_step"] = 4
+    save_db(db_a, db_path)
+    save_db(db_b, db_path)
+
+    assert load_db(db_path)["events"][0]["current_step"] == 4
+    assert revisions.get_write_stats()["field_conflicts"] == 1
+
+
+@pytest.mark.v4
+def test_file_lock_blocks_until_released(tmp_path):
+    lock_path = tmp_path / ".db.lock"
+    acquired_at: List[float] = []
+    holder = FileLock(lock_path)
+    holder.acquire()
+
+    def waiter():
+        with FileLock(lock_path):
+            acquired_at.append(time.perf_counter())
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    time.sleep(0.05)
+    assert acquired_at == []
+    released_at = time.perf_counter()
+    holder.release()
+    thread.join(timeout=5)
+
+    assert len(acquired_at) == 1
+    # Picked up within one backoff step, not a full LOCK_SLEEP interval
+    assert acquired_at[0] - released_at < 0.05
+
+
+@pytest.mark.v4
+def test_file_lock_times_out(tmp_path):
+    lock_path = tmp_path / ".db.lock"
+    with FileLock(lock_path):
+        with pytest.raises(TimeoutError):
+            FileLock(lock_path, timeout=0.05).acquire()
+    # The timed-out waiter leaves no helper thread behind holding the lock
+    assert not [t for t in threading.enumerate() if t.name == "db-lock-wait"]
+    with FileLock(lock_path, timeout=1.0):
+        pass
+
+
+@pytest.mark.v4
+def test_file_lock_timeout_closes_fd(tmp_path):
+    lock_path = tmp_path / ".db.lock"
+    open_fds = lambda: len(os.listdir("/proc/self/fd"))  # noqa: E731
+    with FileLock(lock_path):
+        before = open_fds()
+        for _ in range(5):
+            with pytest.raises(TimeoutError):
+                FileLock(lock_path, timeout=0.01).acquire()
+        assert open_fds() == before
+
+
+@pytest.mark.v4
+def test_read_only_load_does_not_encode_records(tmp_path, monkeypatch):
+    db_path = tmp_path / "db.json"
+    db_path.write_text(json.dumps({"events": [{"event_id": "EVT", "msgs": []}], "clients": {}, "tasks": []}))
+    with monkeypatch.context() as patched:
+        patched.setattr(revisions, "encode_record", lambda record: pytest.fail("record encoded"))
+        db = load_db(db_path)
+    assert db["events"][0]["event_id"] == "EVT"
+
+    # The deferred baseline is the loaded file, not the modified db
+    db["events"][0]["msgs"].append("m1")
+    save_db(db, db_path)
+    assert load_db(db_path)["events"][0][revisions.REVISION_FIELD] == 1
+
+
+@pytest.mark.v4
+def test_concurrent_duplicate_appends_are_kept(tmp_path):
+    db_path = tmp_path / "db.json"
+    save_db({"events": [{"event_id": "EVT", "msgs": ["m0"]}], "clients": {}, "tasks": []}, db_path)
+
+    db_a = load_db(db_path)
+    db_b = load_db(db_path)
+    db_a["events"][0]["msgs"].append("ok")
+    db_b["events"][0]["msgs"] += ["ok", "ok"]
+    save_db(db_a, db_path)
+    save_db(db_b, db_path)
+
+    assert load_db(db_path)["events"][0]["msgs"] == ["m0", "ok", "ok", "ok"]
+
+
+@pytest.mark.v4
+def test_reload_of_own_write_reuses_baseline(tmp_path, monkeypatch):
+    db_path = tmp_path / "db.json"
+    save_db({"events": [{"event_id": "EVT", 1: "int key"}], "clients": {}, "tasks": []}, db_path)
+    db = load_db(db_path)
+    db["events"][0]["msgs"] = ["m1"]
+    save_db(db, db_path)
+
+    monkeypatch.setattr(revisions, "snapshot", lambda db: pytest.fail("baseline re-encoded"))
+    reloaded = load_db(db_path)
+    save_db(reloaded, db_path)
+
+    # Unchanged records are not bumped by the reused baseline
+    assert load_db(db_path)["events"][0][revisions.REVISION_FIELD] == 1
 
 
 @pytest.mark.v4
@@ -0,0 +1,91 @@
+"""
+Unit tests for the trigram fuzzy-match index (workflows/common/fuzzy_index.py).
+
+Tests:
+- ranked() returns exactly what scoring every candidate returns
+- Containment respects the minimum length (no "art" in "flipchart")
+- Candidates without shared trigrams are still found ("wifi" vs "wi fi")
+- Room preference matching uses the index built from the product catalog
+"""
+
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from workflows.common.fuzzy_index import FuzzyIndex
+from workflows.nlu.preferences import extract_preferences
+
+VARIANTS = [
+    ("flip chart", "Flip Chart"),
+    ("flipchart", "Flip Chart"),
+    ("latte art", "Latte Art"),
+    ("wi fi", "WiFi"),
+    ("projector", "Projector"),
+    ("beamer", "Projector"),
+    ("sound system", "Sound System"),
+    ("microphone", "Microphone"),
+    ("coffee break", "Coffee Break"),
+    ("coffee", "Coffee Break"),
+    ("whiteboard", "Whiteboard"),
+]
+
+
+def _brute_force(entries, query, limit, floor=0.0, containment_score=None, min_containment=0):
+    best = {}
+    for pos, (text, key) in enumerate(entries):
+        if not text:
+            continue
+        if text == query:
+            score = 1.0
+        elif (
+            containment_score is not None
+            and len(query) >= min_containment
+            and len(text) >= min_containment
+            and (query in text or text in query)
+        ):
+            score = containment_score
+        else:
+            score = SequenceMatcher(a=query, b=text).ratio()
+        entry = (score, -pos)
+        if key not in best or entry > best[key]:
+            best[key] = entry
+    ordered = sorted(best.items(), key=lambda item: (-item[1][0], -item[1][1]))
+    return [(score, key) for key, (score, _) in ordered[:limit] if score >= floor]
+
+
+@pytest.mark.parametrize("options", [{}, {"containment_score": 0.92, "min_containment": 5}, {"floor": 0.8}])
+def test_ranked_matches_brute_force(options):
+    index = FuzzyIndex(VARIANTS)
+    rng = random.Random(7)
+    alphabet = "abcdefghiloprt "
+    queries = ["flipchart", "flip", "art", "wifi", "projecter", "coffee breaks", "sound", "mic"]
+    queries += ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 14))) for _ in range(300)]
+    for query in queries:
+        for limit in (1, 3):
+            assert index.ranked(query, limit, **options) == _brute_force(VARIANTS, query, limit, **options), query
+
+
+def test_short_containment_is_not_a_match():
+    index = FuzzyIndex(VARIANTS)
+    top = index.ranked("art", 1, containment_score=0.92, min_containment=5)
+    assert top and top[0][0] < 0.92
+
+
+def test_match_without_shared_trigram():
+    index = FuzzyIndex(VARIANTS)
+    assert index.best("wifi", floor=0.8) == (pytest.approx(8 / 9), "WiFi")
+
+
+def test_empty_inputs():
+    assert FuzzyIndex([]).ranked("projector", 3) == []
+    assert FuzzyIndex([("", "x")]).best("x") is None
+    assert FuzzyIndex(VARIANTS).ranked("", 3) == []
+
+
+def test_room_recommendations_use_catalog_index():
+    prefs = extract_preferences({"wish_products": ["projector", "flipchart"]})
+    assert prefs is not None
+    breakdown = prefs["room_match_breakdown"]
+    assert breakdown
+    assert any("Projector" in entry["matched"] or "Projector" in " ".join(entry["closest"]) for entry in breakdown.values())
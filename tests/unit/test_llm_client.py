@@ -0,0 +1,133 @@
+"""
+Unit tests for the pooled LLM client helpers.
+
+Tests:
+- run_concurrently overlaps independent calls and keeps result order
+- Per-provider limiter caps in-flight requests
+- achat_completion / abatch_chat_completion on a fake async client
+- Agent adapters run intent + entity extraction concurrently
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from adapters.agent_adapter import OpenAIAgentAdapter
+from llm import client as llm_client
+
+
+def test_run_concurrently_overlaps_calls_and_keeps_order():
+    barrier = threading.Barrier(3, timeout=2)
+
+    def call(value):
+        barrier.wait()  # times out unless all three run at once
+        return value
+
+    results = llm_client.run_concurrently(*(lambda v=v: call(v) for v in ("a", "b", "c")))
+
+    assert results == ["a", "b", "c"]
+
+
+def test_run_concurrently_raises_after_all_calls_finish():
+    finished = []
+
+    def slow():
+        time.sleep(0.05)
+        finished.append("slow")
+        return "ok"
+
+    def boom():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        llm_client.run_concurrently(boom, slow)
+    assert finished == ["slow"]
+
+    results = llm_client.run_concurrently(boom, slow, return_exceptions=True)
+    assert isinstance(results[0], ValueError)
+    assert results[1] == "ok"
+
+
+def test_run_concurrently_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("LLM_FANOUT", "0")
+    threads = llm_client.run_concurrently(threading.get_ident, threading.get_ident)
+
+    assert threads == [threading.get_ident()] * 2
+
+
+def test_provider_limiter_caps_in_flight():
+    limiter = llm_client.ProviderLimiter("test", 2)
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def call():
+        with limiter.slot():
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    stats = limiter.stats()
+    assert active["max"] == 2
+    assert stats["calls"] == 6
+    assert stats["peak_in_flight"] == 2
+    assert stats["throttled"] >= 1
+    assert stats["in_flight"] == 0
+
+
+def test_achat_and_batch_use_async_client(monkeypatch):
+    calls = []
+
+    class FakeCompletions:
+        async def create(self, **kwargs):
+            calls.append(kwargs)
+            await asyncio.sleep(0.01)
+            content = kwargs["messages"][-1]["content"].upper()
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+    monkeypatch.setattr(llm_client, "get_async_openai_client", lambda: fake)
+
+    async def main():
+        single = await llm_client.achat_completion([{"role": "user", "content": "hi"}], json_mode=True)
+        batch = await llm_client.abatch_chat_completion(
+            [{"messages": [{"role": "user", "content": "a"}]}, {"messages": [{"role": "user", "content": "b"}]}]
+        )
+        return single, batch
+
+    single, batch = asyncio.run(main())
+
+    assert single == "HI"
+    assert batch == ["A", "B"]
+    assert calls[0]["response_format"] == {"type": "json_object"}
+
+
+def test_openai_adapter_analyze_message_runs_calls_concurrently():
+    adapter = object.__new__(OpenAIAgentAdapter)
+    barrier = threading.Barrier(2, timeout=2)
+
+    def route_intent(msg):
+        barrier.wait()
+        return "event_request", 0.9
+
+    def extract_entities(msg):
+        barrier.wait()
+        return {"participants": 30}
+
+    adapter.route_intent = route_intent
+    adapter.extract_entities = extract_entities
+
+    result = adapter.analyze_message({"subject": "", "body": "30 people"})
+
+    assert result == {"intent": "event_request", "confidence": 0.9, "fields": {"participants": 30}}
@@ -0,0 +1,162 @@
+"""
+Unit tests for the persistent LLM response cache.
+
+Tests:
+- Entries survive a new cache instance (another process / restart)
+- Keys separate namespace, provider and model
+- Expired entries are not served
+- Size budget evicts least recently used entries
+- persist=False keeps entries in memory only
+- Hit rate and bytes saved statistics
+- Analysis results from stub adapters are never written to disk
+- Verbalizer drafts (temperature 0.3) expire after the short draft TTL
+- An undecodable cached Q&A extraction is evicted and the LLM is asked again
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from llm import response_cache
+from llm.response_cache import LLMResponseCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "llm_cache.sqlite3"
+
+
+def test_entries_survive_new_instance(cache_path):
+    first = LLMResponseCache(cache_path)
+    key = first.make_key("analysis", "openai", "gpt-4o-mini", "hello")
+    first.put(key, '{"intent": "event_request"}', namespace="analysis")
+    first.close()
+
+    second = LLMResponseCache(cache_path)
+
+    assert second.get(key, namespace="analysis") == '{"intent": "event_request"}'
+    assert second.stats()["disk_hits"] == 1
+
+
+def test_key_depends_on_provider_and_model():
+    make_key = LLMResponseCache.make_key
+    base = make_key("analysis", "openai", "gpt-4o-mini", "hello")
+
+    assert base == make_key("analysis", "openai", "gpt-4o-mini", "hello")
+    assert base != make_key("analysis", "gemini", "gpt-4o-mini", "hello")
+    assert base != make_key("analysis", "openai", "gpt-4o", "hello")
+    assert base != make_key("verbalizer", "openai", "gpt-4o-mini", "hello")
+
+
+def test_expired_entries_are_not_served(cache_path):
+    cache = LLMResponseCache(cache_path, memory_entries=0)
+    cache.put("k", "value", ttl_seconds=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("k") is None
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_size_budget_evicts_least_recently_used(cache_path):
+    cache = LLMResponseCache(cache_path, max_bytes=250, memory_entries=0)
+    for idx in range(4):
+        cache.put(f"k{idx}", "x" * 100)
+        time.sleep(0.01)
+    cache.get("k0")  # refresh k0 so k1 is the oldest
+
+    removed = cache.evict()
+
+    assert removed == 2
+    assert cache.get("k0") == "x" * 100
+    assert cache.get("k1") is None
+    assert cache.get("k3") == "x" * 100
+
+
+def test_persist_false_stays_in_memory(cache_path):
+    cache = LLMResponseCache(cache_path)
+    cache.put("k", "value", persist=False)
+
+    assert cache.get("k") == "value"
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_stats_report_hit_rate_and_bytes_saved(cache_path):
+    cache = LLMResponseCache(cache_path)
+    cache.put("k", "abcd", namespace="qna_extraction")
+
+    cache.get("k", namespace="qna_extraction")
+    cache.get("missing", namespace="qna_extraction")
+
+    stats = cache.stats()
+    assert stats["hit_rate"] == 0.5
+    assert stats["bytes_saved"] == 4
+    assert stats["by_namespace"]["qna_extraction"]["hits"] == 1
+
+
+def test_stub_analysis_is_not_persisted(monkeypatch, cache_path):
+    from workflows.llm import adapter as llm_adapter
+
+    monkeypatch.setenv("AGENT_MODE", "stub")
+    monkeypatch.setattr(response_cache, "_CACHE", LLMResponseCache(cache_path))
+    llm_adapter.reset_llm_adapter()
+
+    message = {"msg_id": "m-1", "subject": "Booking", "body": "We'd like to book a room for 30 people."}
+    first = llm_adapter.extract_user_information(message)
+    second = llm_adapter.extract_user_information(message)
+
+    stats = response_cache.get_llm_cache().stats()
+    assert first == second
+    assert stats["hits"] >= 1
+    assert stats["disk_entries"] == 0
+    llm_adapter.reset_llm_adapter()
+
+
+def test_verbalizer_drafts_use_short_ttl(monkeypatch, cache_path):
+    from adapters import agent_adapter
+    from ux import universal_verbalizer as uv
+
+    class _Adapter:
+        def complete(self, **kwargs):
+            return "Here are your options."
+
+    cache = LLMResponseCache(cache_path)
+    monkeypatch.setattr(response_cache, "_CACHE", cache)
+    monkeypatch.setattr(agent_adapter, "get_adapter_for_provider", lambda provider: _Adapter())
+    monkeypatch.setattr(uv, "_llm_cache_key", lambda payload: "draft-key")
+
+    uv._call_llm({"system": "sys", "user": "facts"})
+
+    expires_at = cache._memory["draft-key"][1]
+    assert expires_at - time.time() <= uv._DRAFT_CACHE_TTL < response_cache.DEFAULT_TTL_SECONDS
+
+
+def test_undecodable_qna_extraction_is_refetched(monkeypatch, cache_path):
+    from workflows.qna import extraction
+
+    cache = LLMResponseCache(cache_path)
+    monkeypatch.setattr(response_cache, "_CACHE", cache)
+    payload = {"message": "Do you have parking?"}
+    key = cache.make_key(
+        "qna_extraction",
+        "openai",
+        extraction.QNA_EXTRACTION_MODEL,
+        f"{extraction.SYSTEM_PROMPT}\n{json.dumps(payload, ensure_ascii=False)}",
+    )
+    cache.put(key, '{"msg_type": "ev', namespace="qna_extraction")
+
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content='{"msg_type": "non_event"}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(extraction, "is_llm_available", lambda: True)
+    monkeypatch.setattr(extraction, "get_openai_client", lambda: client)
+
+    assert extraction._run_qna_extraction(payload) == {"msg_type": "non_event"}
+    assert len(calls) == 1
+    assert cache.get(key, namespace="qna_extraction") == '{"msg_type": "non_event"}'
@@ -0,0 +1,116 @@
+"""
+Unit tests for the background debug log writer (debug/log_sink.py).
+
+Tests:
+- Appends are written in order and batched per file
+- Truncating writes replace the file in queue order
+- flush(close=True) releases the handle before a file is moved or deleted
+- The open-file LRU stays bounded
+- Inline mode and writes after shutdown go straight to disk
+- flush() gives up after its timeout when the queue stays full
+- Timeline and live log go through the sink and are flushed on close
+"""
+
+import json
+import time
+
+import pytest
+
+from debug import live_log, log_sink, timeline
+from debug.log_sink import LogSink
+
+
+@pytest.fixture
+def sink():
+    instance = LogSink(max_open_files=2)
+    yield instance
+    instance.shutdown()
+
+
+def test_appends_in_order(tmp_path, sink):
+    path = tmp_path / "a.log"
+    for index in range(200):
+        sink.write(path, f"{index}\n")
+    assert sink.flush(path)
+    assert path.read_text().splitlines() == [str(index) for index in range(200)]
+    assert sink.stats()["written"] == 200
+    assert sink.stats()["batches"] < 200
+
+
+def test_truncate_keeps_queue_order(tmp_path, sink):
+    path = tmp_path / "live.log"
+    sink.write(path, "old\n")
+    sink.write(path, "header\n", truncate=True)
+    sink.write(path, "line\n")
+    sink.flush(path)
+    assert path.read_text() == "header\nline\n"
+
+
+def test_flush_close_before_move(tmp_path, sink):
+    path = tmp_path / "nested" / "t.jsonl"
+    sink.write(path, "one\n")
+    sink.flush(path, close=True)
+    moved = path.rename(tmp_path / "archived.jsonl")
+    sink.write(path, "two\n")
+    sink.flush(path)
+    assert moved.read_text() == "one\n"
+    assert path.read_text() == "two\n"
+
+
+def test_open_files_are_bounded(tmp_path, sink):
+    for index in range(5):
+        sink.write(tmp_path / f"{index}.log", "x\n")
+    sink.flush()
+    assert sink.stats()["open_files"] == 2
+    assert all((tmp_path / f"{index}.log").read_text() == "x\n" for index in range(5))
+
+
+def test_inline_mode_and_after_shutdown(tmp_path):
+    inline = LogSink(background=False)
+    inline.write(tmp_path / "inline.log", "now\n")
+    assert (tmp_path / "inline.log").read_text() == "now\n"
+    inline.shutdown()
+
+    background = LogSink()
+    background.shutdown()
+    background.write(tmp_path / "late.log", "late\n")
+    assert (tmp_path / "late.log").read_text() == "late\n"
+    background.shutdown()
+
+
+def test_flush_times_out_on_full_queue(tmp_path):
+    sink = LogSink(max_queue=1)
+    path = tmp_path / "a.log"
+    with sink._io_lock:  # stall the writer mid-batch
+        sink.write(path, "first\n")
+        deadline = time.monotonic() + 2
+        while not sink._queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        sink.write(path, "second\n")  # fills the queue
+        started = time.monotonic()
+        assert sink.flush(timeout=0.1) is False
+        assert time.monotonic() - started < 1
+    assert sink.flush(timeout=2)
+    assert path.read_text() == "first\nsecond\n"
+    sink.shutdown()
+
+
+def test_timeline_and_live_log_use_sink(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEBUG_TRACE", "1")
+    monkeypatch.setattr(timeline, "ROOT", tmp_path / "sessions")
+    monkeypatch.setattr(timeline, "ARCH", tmp_path / "sessions" / "archive")
+    monkeypatch.setattr(live_log, "ROOT", tmp_path / "live")
+    monkeypatch.setattr(log_sink, "_SINK", LogSink())
+
+    event = {"kind": "STEP_ENTER", "subject": "Step1", "granularity": "logic", "seq": 1}
+    timeline.append("t-1", event)
+    live_log.append_log("t-1", event)
+
+    assert timeline.snapshot("t-1") == [event]
+    assert live_log.list_active_logs() == ["t-1"]
+    assert ">> ENTER Step1" in live_log.get_log_path("t-1").read_text()
+
+    archived = timeline.mark_closed("t-1")
+    assert [json.loads(line) for line in open(archived, encoding="utf-8")] == [event]
+    assert live_log.get_log_path("t-1") is None
+    log_sink.shutdown_log_sink()
@@ -0,0 +1,317 @@
+"""
+Unit tests for the outbound mail queue (services/mail_queue.py).
+
+Tests:
+- Queued emails go out over one pooled SMTP connection
+- A dropped connection is re-established transparently
+- HIL notifications for the same manager are sent as one digest
+- A notification enqueued mid-window joins the pending digest
+- Claimed jobs are not sent by a second queue until their lease expires
+- Pooled sends don't hold the pool lock during SMTP I/O
+- Delivery listeners learn when a job is sent or failed, under a caller-chosen job id too
+- Failed sends are retried with backoff and marked failed after max attempts
+- Refused recipients fail without retries
+- Jobs persisted by one queue are delivered by the next (restart)
+- The background sender drains the queue on flush()
+"""
+
+import base64
+import socket
+import socketserver
+import threading
+
+import pytest
+
+from services import mail_queue
+from services.mail_queue import MailQueue, SMTPPool, add_delivery_listener
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        sink = self.server.sink
+        sink.connections.append(self.connection)
+        self.reply("220 sink ready")
+        mail = None
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.wfile.write(b"250-sink\r\n250 AUTH PLAIN\r\n")
+            elif verb == "AUTH":
+                user = base64.b64decode(command.split()[-1]).split(b"\0")[1].decode()
+                sink.logins.append(user)
+                self.reply("235 ok")
+            elif verb == "MAIL":
+                mail = {"from": command, "rcpt": [], "data": ""}
+                self.reply("250 ok")
+            elif verb == "RCPT":
+                if "bounce" in command:
+                    self.reply("550 no such user")
+                else:
+                    mail["rcpt"].append(command.split(":", 1)[1].strip("<> "))
+                    self.reply("250 ok")
+            elif verb == "DATA":
+                self.reply("354 go ahead")
+                lines = []
+                while True:
+                    line = self.rfile.readline().decode()
+                    if line.rstrip("\r\n") == ".":
+                        break
+                    lines.append(line)
+                mail["data"] = "".join(lines)
+                sink.messages.append(mail)
+                self.reply("250 queued")
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 ok")
+            elif verb == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("502 unknown")
+
+
+class SMTPSink:
+    """Minimal local SMTP server recording logins and messages."""
+
+    def __init__(self):
+        self.connections = []
+        self.logins = []
+        self.messages = []
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SinkHandler)
+        self.server.daemon_threads = True
+        self.server.sink = self
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def drop_connections(self):
+        for conn in self.connections:
+            conn.shutdown(socket.SHUT_RDWR)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def sink():
+    server = SMTPSink()
+    yield server
+    server.close()
+
+
+def _config(port):
+    return {
+        "smtp_host": "127.0.0.1",
+        "smtp_port": port,
+        "smtp_user": "mailer",
+        "smtp_password": "secret",
+        "smtp_starttls": False,
+        "from_email": "noreply@venue.test",
+        "from_name": "Venue",
+    }
+
+
+def _queue(tmp_path, config, **kwargs):
+    kwargs.setdefault("background", False)
+    return MailQueue(lambda: config, db_path=tmp_path / "mail.sqlite3", pool=SMTPPool(timeout=5), **kwargs)
+
+
+def test_client_emails_share_one_connection(tmp_path, sink):
+    queue = _queue(tmp_path, _config(sink.port))
+    for n in range(3):
+        queue.enqueue("client", f"client{n}@example.com", f"Offer {n}", "body", to_name=f"Client {n}")
+    assert queue.run_once() is None
+    assert [mail["rcpt"] for mail in sink.messages] == [[f"client{n}@example.com"] for n in range(3)]
+    assert sink.logins == ["mailer"]
+    stats = queue.stats()
+    assert stats["pending"] == 0 and stats["sent"] == 3
+    assert stats["smtp"]["connects"] == 1 and stats["smtp"]["reused"] == 2
+    queue.shutdown()
+
+
+def test_dropped_connection_is_reopened(tmp_path, sink):
+    queue = _queue(tmp_path, _config(sink.port))
+    queue.enqueue("client", "a@example.com", "First", "body")
+    queue.run_once()
+    sink.drop_connections()
+    queue.enqueue("client", "b@example.com", "Second", "body")
+    queue.run_once()
+    assert len(sink.messages) == 2
+    assert queue.stats()["smtp"]["reconnects"] == 1
+    queue.shutdown()
+
+
+def test_hil_notifications_batched_per_manager(tmp_path, sink):
+    clock = Clock()
+    queue = _queue(tmp_path, _config(sink.port), batch_seconds=5, clock=clock)
+    for n in range(3):
+        queue.enqueue("hil", "manager@venue.test", f"HIL task {n}", f"draft {n}", batch_key="manager@venue.test")
+    queue.enqueue("hil", "other@venue.test", "HIL task x", "draft x", batch_key="other@venue.test")
+
+    assert queue.run_once() == 1005.0  # still inside the batch window
+    assert sink.messages == []
+
+    clock.now = 1005.0
+    queue.run_once()
+    assert len(sink.messages) == 2
+    digest = next(mail for mail in sink.messages if mail["rcpt"] == ["manager@venue.test"])
+    assert "3 HIL tasks waiting for review" in digest["data"]
+    assert all(f"draft {n}" in digest["data"] for n in range(3))
+    assert queue.stats()["sent"] == 4 and queue.stats()["messages"] == 2
+    queue.shutdown()
+
+
+def test_staggered_hil_notifications_join_the_open_window(tmp_path, sink):
+    clock = Clock()
+    queue = _queue(tmp_path, _config(sink.port), batch_seconds=5, clock=clock)
+    queue.enqueue("hil", "manager@venue.test", "HIL task 0", "draft 0", batch_key="manager@venue.test")
+    clock.now = 1003.0
+    queue.enqueue("hil", "manager@venue.test", "HIL task 1", "draft 1", batch_key="manager@venue.test")
+    assert queue.run_once() == 1005.0
+
+    clock.now = 1005.0
+    queue.run_once()
+    assert len(sink.messages) == 1
+    assert "2 HIL tasks waiting for review" in sink.messages[0]["data"]
+    queue.shutdown()
+
+
+def test_claimed_jobs_are_leased_to_one_sender(tmp_path, sink):
+    clock = Clock()
+    config = _config(sink.port)
+    first = _queue(tmp_path, config, clock=clock)
+    second = _queue(tmp_path, config, clock=clock)
+    first.enqueue("client", "a@example.com", "Offer", "body")
+
+    assert len(first._claim_due(clock.now)) == 1
+    assert second.run_once() == 1000.0 + mail_queue._LEASE_S
+    assert sink.messages == [] and second.stats()["sending"] == 1
+
+    clock.now += mail_queue._LEASE_S  # the first sender died mid-send
+    second.run_once()
+    assert [mail["rcpt"] for mail in sink.messages] == [["a@example.com"]]
+    assert second.stats()["sending"] == 0 and second.stats()["pending"] == 0
+    first.shutdown()
+    second.shutdown()
+
+
+def test_pool_does_not_serialize_sends():
+    barrier = threading.Barrier(2, timeout=2)
+
+    class FakeSMTP:
+        def __init__(self, host, port, timeout):
+            pass
+
+        def login(self, user, password):
+            pass
+
+        def send_message(self, msg):
+            barrier.wait()  # both sends must be in flight at once
+
+        def quit(self):
+            pass
+
+    pool = SMTPPool(factory=FakeSMTP)
+    configs = [{**_config(25), "smtp_user": user} for user in ("one", "two")]
+    errors = []
+
+    def send(config):
+        try:
+            pool.send(config, mail_queue.build_message(config, "a@example.com", "s", "b"))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=send, args=(config,)) for config in configs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert pool.stats()["sends"] == 2 and pool.stats()["open"] == 2
+
+
+def test_delivery_listeners(tmp_path, sink, monkeypatch):
+    seen = []
+    monkeypatch.setattr(mail_queue, "_LISTENERS", [])
+    add_delivery_listener(lambda job_id, meta, status, error: seen.append((job_id, meta, status, error)))
+    queue = _queue(tmp_path, _config(sink.port))
+    job_id = mail_queue.new_job_id()
+    sent = queue.enqueue("client", "a@example.com", "Offer", "body", meta={"event_id": "evt-1"}, job_id=job_id)
+    assert sent == job_id
+    refused = queue.enqueue("client", "bounce@example.com", "Offer", "body")
+    queue.run_once()
+    assert seen[0] == (sent, {"event_id": "evt-1"}, "sent", None)
+    assert seen[1][:3] == (refused, {}, "failed") and "no such user" in seen[1][3]
+    queue.shutdown()
+
+
+def test_failed_sends_retry_with_backoff_then_fail(tmp_path, sink):
+    clock = Clock()
+    config = _config(1)  # nothing listens on port 1
+    queue = _queue(tmp_path, config, max_attempts=3, backoff_base=10, clock=clock)
+    queue.enqueue("client", "a@example.com", "Offer", "body")
+
+    assert queue.run_once() == 1010.0
+    clock.now = 1010.0
+    assert queue.run_once() == 1030.0
+    assert queue.stats()["retries"] == 2
+
+    config["smtp_port"] = sink.port  # server is back
+    clock.now = 1030.0
+    queue.run_once()
+    assert len(sink.messages) == 1
+
+    config["smtp_port"] = 1
+    queue.enqueue("client", "b@example.com", "Offer", "body")
+    for _ in range(3):
+        queue.run_once()
+        clock.now += 1000
+    stats = queue.stats()
+    assert stats["pending"] == 0 and stats["failed_jobs"] == 1
+    queue.shutdown()
+
+
+def test_refused_recipient_fails_without_retry(tmp_path, sink):
+    queue = _queue(tmp_path, _config(sink.port))
+    queue.enqueue("client", "bounce@example.com", "Offer", "body")
+    queue.run_once()
+    stats = queue.stats()
+    assert stats["failed_jobs"] == 1 and stats["retries"] == 0
+    queue.shutdown()
+
+
+def test_jobs_survive_restart(tmp_path, sink):
+    config = _config(sink.port)
+    first = _queue(tmp_path, config)
+    first.enqueue("client", "a@example.com", "Offer", "body")
+    first.shutdown()
+    assert sink.messages == []
+
+    second = _queue(tmp_path, config)
+    assert second.stats()["pending"] == 1
+    second.run_once()
+    assert [mail["rcpt"] for mail in sink.messages] == [["a@example.com"]]
+    second.shutdown()
+
+
+def test_background_sender_flush(tmp_path, sink):
+    queue = _queue(tmp_path, _config(sink.port), background=True, batch_seconds=60)
+    queue.enqueue("hil", "manager@venue.test", "HIL task", "draft", batch_key="manager@venue.test")
+    queue.enqueue("client", "a@example.com", "Offer", "body")
+    assert queue.flush(timeout=5)
+    assert len(sink.messages) == 2
+    queue.shutdown()
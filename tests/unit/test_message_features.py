@@ -0,0 +1,77 @@
+"""
+Unit tests for per-turn message features (workflows/common/message_features.py).
+
+Tests:
+- Fields match the detectors they replace
+- Fields are computed once per text and shared inside a turn
+- Outside a turn every call gets fresh features
+- The pre-filter German word count keeps its space-delimited semantics
+"""
+
+from datetime import date, time
+
+from detection.keywords.buckets import detect_language
+from detection.pre_filter import run_pre_filter
+from detection.qna.general_qna import quick_general_qna_scan
+from workflows.common.datetime_parse import parse_all_dates
+from workflows.common.message_features import MessageFeatures, message_features, turn_features
+from workflows.common.types import IncomingMessage
+
+TEXT = "Hi! Can we book a room for 30 guests on 12.03.2027 or March 14, 14:00 - 18:00?"
+
+
+def test_fields_match_detectors():
+    features = MessageFeatures(TEXT)
+    assert features.normalized == TEXT.lower().strip()
+    assert features.tokens[:3] == ("hi", "can", "we")
+    assert features.language == detect_language(TEXT)
+    assert list(features.dates) == parse_all_dates(TEXT, fallback_year=date.today().year)
+    assert features.dates[0] == date(2027, 3, 12)
+    assert features.time_range == (time(14, 0), time(18, 0), True)
+    assert features.general_qna_scan == quick_general_qna_scan(TEXT)
+    assert features.participants == 30
+
+
+def test_parsed_dates_memoised_per_year():
+    features = MessageFeatures("14 March")
+    assert features.parsed_dates(2030) == (date(2030, 3, 14),)
+    assert features.parsed_dates(2030) is features.parsed_dates(2030)
+    assert features.dates == (date(date.today().year, 3, 14),)
+
+
+def test_from_message_joins_subject_and_body():
+    message = IncomingMessage(None, None, None, " Booking ", "Body text\n", None)
+    assert MessageFeatures.from_message(message).text == "Booking\nBody text"
+
+
+def test_shared_within_turn():
+    turn = MessageFeatures(TEXT)
+    with turn_features(turn):
+        assert message_features(TEXT) is turn
+        body = message_features("only the body")
+        assert message_features("only the body") is body
+        assert body.reference == turn.reference
+    assert message_features(TEXT) is not turn
+    assert message_features(TEXT) is not message_features(TEXT)
+
+
+def test_language_computed_once(monkeypatch):
+    calls = []
+    import detection.keywords.buckets as buckets
+
+    original = buckets.detect_language
+
+    def counting(text):
+        calls.append(text)
+        return original(text)
+
+    monkeypatch.setattr(buckets, "detect_language", counting)
+    features = MessageFeatures("Guten Tag, wir möchten bitte einen Raum buchen")
+    assert features.language == features.language
+    assert len(calls) == 1
+
+
+def test_pre_filter_german_words_need_spaces():
+    assert run_pre_filter("Wir möchten bitte und danke").language == "de"
+    # Punctuation glued to a word does not count (unchanged behaviour)
+    assert run_pre_filter("bitte, danke.").language == "en"
@@ -0,0 +1,121 @@
+"""
+Unit tests for the per-record page snapshot store (utils/page_snapshots.py).
+
+Tests:
+- Snapshots round-trip with the same dict shape as before
+- Expired snapshots are hidden before the sweeper runs, then swept
+- Inserts (and the sweeper) trim the store to MAX_SNAPSHOTS, keeping the newest
+- The sweeper stays bound to the database it was started for
+- Listing and event cleanup use the indexed columns
+- Live entries of the legacy snapshots.json are imported once
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils import page_snapshots
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_snapshots, "_use_supabase", lambda: False)
+    monkeypatch.setattr(page_snapshots, "_ensure_sweeper", lambda store: None)
+    monkeypatch.setattr(page_snapshots, "SNAPSHOTS_DB", tmp_path / "snapshots.sqlite3")
+    monkeypatch.setattr(page_snapshots, "SNAPSHOTS_FILE", tmp_path / "snapshots.json")
+    yield
+    page_snapshots._store().close()
+
+
+def test_round_trip():
+    snapshot_id = page_snapshots.create_snapshot("rooms", [{"name": "Room A"}], event_id="evt-1", params={"date": "2026-11-02"})
+    snapshot = page_snapshots.get_snapshot(snapshot_id)
+    assert set(snapshot) == {"snapshot_id", "type", "created_at", "expires_at", "event_id", "params", "data"}
+    assert snapshot["data"] == [{"name": "Room A"}] and snapshot["params"] == {"date": "2026-11-02"}
+    assert page_snapshots.get_snapshot_data(snapshot_id) == [{"name": "Room A"}]
+    assert page_snapshots.get_snapshot("snap_missing") is None
+
+
+def test_expired_hidden_then_swept():
+    snapshot_id = page_snapshots.create_snapshot("rooms", [], ttl_days=-1)
+    assert page_snapshots.get_snapshot(snapshot_id) is None
+    assert page_snapshots.list_snapshots() == []
+    assert page_snapshots.sweep_snapshots() == {"expired": 1, "overflow": 0}
+    assert page_snapshots._store().count() == 0
+
+
+def test_insert_trims_to_newest(monkeypatch):
+    monkeypatch.setattr(page_snapshots, "MAX_SNAPSHOTS", 3)
+    ids = [page_snapshots.create_snapshot("qna", {"n": n}) for n in range(5)]
+    assert page_snapshots._store().count() == 3
+    assert [page_snapshots.get_snapshot(i) is not None for i in ids] == [False, False, True, True, True]
+
+
+def test_sweep_trims_to_newest(monkeypatch):
+    ids = [page_snapshots.create_snapshot("qna", {"n": n}) for n in range(5)]
+    monkeypatch.setattr(page_snapshots, "MAX_SNAPSHOTS", 3)
+    assert page_snapshots.sweep_snapshots()["overflow"] == 2
+    assert [page_snapshots.get_snapshot(i) is not None for i in ids] == [False, False, True, True, True]
+
+
+def test_sweeper_bound_to_its_store(tmp_path, monkeypatch):
+    swept = []
+    monkeypatch.setattr(page_snapshots, "sweep_snapshots", lambda store: swept.append(store.path))
+    monkeypatch.setattr(page_snapshots.time, "sleep", lambda seconds: (_ for _ in ()).throw(SystemExit))
+    first = page_snapshots._store()
+    monkeypatch.setattr(page_snapshots, "SNAPSHOTS_DB", tmp_path / "other.sqlite3")
+
+    with pytest.raises(SystemExit):
+        page_snapshots._sweep_forever(first)
+    assert swept == [tmp_path / "snapshots.sqlite3"]
+
+
+def test_list_and_event_cleanup():
+    first = page_snapshots.create_snapshot("rooms", [1], event_id="evt-1")
+    second = page_snapshots.create_snapshot("offer", [2], event_id="evt-1")
+    other = page_snapshots.create_snapshot("rooms", [3], event_id="evt-2")
+
+    listed = page_snapshots.list_snapshots(event_id="evt-1")
+    assert [item["snapshot_id"] for item in listed] == [second, first]
+    assert "data" not in listed[0]
+    assert [item["snapshot_id"] for item in page_snapshots.list_snapshots(snapshot_type="rooms", limit=1)] == [other]
+
+    assert page_snapshots.delete_snapshots_for_event("evt-1") == 2
+    assert page_snapshots.delete_snapshot(other) is True
+    assert page_snapshots.delete_snapshot(other) is False
+
+
+def test_legacy_json_imported_once(tmp_path):
+    now = datetime.utcnow()
+    legacy = {
+        "snapshots": {
+            "snap_live": {
+                "snapshot_id": "snap_live",
+                "type": "qna",
+                "created_at": now.isoformat(),
+                "expires_at": (now + timedelta(days=1)).isoformat(),
+                "event_id": None,
+                "params": {},
+                "data": {"answer": 42},
+            },
+            "snap_old": {
+                "snapshot_id": "snap_old",
+                "type": "rooms",
+                "created_at": (now - timedelta(days=9)).isoformat(),
+                "expires_at": (now - timedelta(days=2)).isoformat(),
+                "event_id": None,
+                "params": {},
+                "data": [],
+            },
+        }
+    }
+    (tmp_path / "snapshots.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    assert page_snapshots.get_snapshot_data("snap_live") == {"answer": 42}
+    assert page_snapshots._store().count() == 1
+    page_snapshots.delete_snapshot("snap_live")
+
+    # A fresh store on the same file does not import again
+    page_snapshots._store().close()
+    assert page_snapshots.SnapshotStore(tmp_path / "snapshots.sqlite3", tmp_path / "snapshots.json").get("snap_live") is None
@@ -0,0 +1,91 @@
+"""
+Unit tests for the indexed product catalog (services/products.py).
+
+Tests:
+- Category detection keeps substring semantics and the false-positive phrases
+- find_product resolves names and synonyms through the index
+- candidate_product_records narrows the catalog to products named in the text
+- The catalog reloads on file change and on config-store invalidation only
+"""
+
+import json
+import os
+
+import pytest
+
+from services import products
+from workflows.io.config_store import invalidate_config_cache
+
+CATALOG = {
+    "products": [
+        {"id": "p1", "name": "Coffee Break", "category": "Catering", "synonyms": ["kaffee pause"]},
+        {"id": "p2", "name": "Wine Pairing", "category": "Beverages", "synonyms": ["vino"]},
+        {"id": "p3", "name": "Conference Camera", "category": "Equipment", "synonyms": ["a/v kit"]},
+        {"id": "p4", "name": "Flip Chart", "category": "Equipment", "synonyms": []},
+    ]
+}
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    path = tmp_path / "products.json"
+    path.write_text(json.dumps(CATALOG))
+    products.reset_catalog_cache()
+    yield path
+    products.reset_catalog_cache()
+
+
+def test_categories_use_substring_semantics(catalog_path):
+    catalog = products.get_catalog(catalog_path)
+
+    assert catalog.categories == ["Catering", "Beverages", "Equipment"]
+    assert catalog.mentioned_categories("Two COFFEES and some vinos") == {"Catering", "Beverages"}
+    assert catalog.mentioned_categories("The conference room, please") == frozenset()
+    assert catalog.mentioned_categories("we need an a/v kit") == {"Equipment"}
+
+
+def test_detection_matches_default_catalog():
+    text = "Coffee break and a projector please, plus wine for the dinner party"
+
+    mentioned = products.detect_mentioned_categories(text)
+
+    assert mentioned == [c for c in products.get_categories() if products.text_matches_category(text, c)]
+    assert "Catering" in mentioned and "Equipment" in mentioned
+    assert products.has_specific_product_request(text, exclude_categories=["Catering", "Beverages"])
+
+
+def test_find_by_name_and_synonym(catalog_path):
+    catalog = products.get_catalog(catalog_path)
+
+    assert catalog.find(" coffee BREAK ").product_id == "p1"
+    assert catalog.find("Vino").product_id == "p2"
+    assert catalog.find("beer") is None
+
+
+def test_candidate_records_follow_message_words(catalog_path):
+    catalog = products.get_catalog(catalog_path)
+
+    names = [record.name for record in catalog.records_for_text("two flip-charts and CAMERAS")]
+
+    # "a/v kit" cannot be indexed by word, so Conference Camera is always scanned
+    assert names == ["Conference Camera", "Flip Chart"]
+    assert [r.name for r in catalog.records_for_text("nothing here")] == ["Conference Camera"]
+
+
+def test_reload_on_file_change_and_config_invalidation(catalog_path):
+    first = products.get_catalog(catalog_path)
+    assert products.get_catalog(catalog_path) is first
+
+    invalidate_config_cache()
+    second = products.get_catalog(catalog_path)
+    assert second is not first
+
+    updated = {"products": CATALOG["products"] + [{"id": "p5", "name": "Lectern", "category": "Furniture"}]}
+    catalog_path.write_text(json.dumps(updated))
+    stat = catalog_path.stat()
+    os.utime(catalog_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    third = products.get_catalog(catalog_path)
+    assert third is not second
+    assert third.find("lectern").product_id == "p5"
+    assert products.list_product_records(catalog_path)[-1].name == "Lectern"
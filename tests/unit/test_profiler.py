@@ -0,0 +1,110 @@
+"""
+Unit tests for the span profiler (utils/profiler.py).
+
+Tests:
+- Histogram percentiles stay within the bucket error of exact percentiles
+- Spans nest through the context and are logged as one tree per turn
+- Disabled profiling records nothing
+- Prometheus export (summaries and labelled counters)
+- LLM token usage is attached to the provider span
+"""
+
+import logging
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from llm.client import get_provider_limiter, record_llm_usage
+from utils import profiler
+from utils.profiler import LatencyHistogram, count, profile_step, render_prometheus, span, span_stats
+
+
+@pytest.fixture
+def enabled():
+    profiler.reset_profiler()
+    profiler.set_profiling_enabled(True)
+    yield
+    profiler.set_profiling_enabled(False)
+    profiler.reset_profiler()
+
+
+def test_histogram_percentiles_are_close():
+    rng = random.Random(5)
+    samples = [rng.lognormvariate(3, 1.2) for _ in range(5000)]
+    histogram = LatencyHistogram()
+    for value in samples:
+        histogram.record(value)
+    ordered = sorted(samples)
+    for pct in (50, 90, 95, 99):
+        exact = ordered[int(len(ordered) * pct / 100) - 1]
+        assert histogram.percentile(pct) == pytest.approx(exact, rel=0.04)
+    assert histogram.percentile(100) == pytest.approx(max(samples), rel=1e-3)
+    assert LatencyHistogram().percentile(50) is None
+
+
+def test_spans_nest_and_log_tree(enabled, caplog):
+    @profile_step("outer")
+    def outer():
+        with span("inner", step=3) as current:
+            current.set(prompt_tokens=12)
+        with span("inner"):
+            pass
+
+    with caplog.at_level(logging.INFO, logger="utils.profiler"):
+        outer()
+
+    stats = span_stats()
+    assert stats["outer"]["count"] == 1
+    assert stats["inner"]["count"] == 2
+    assert stats["outer"]["sum_ms"] >= stats["inner"]["sum_ms"]
+    [record] = [r for r in caplog.records if r.getMessage().startswith("[PERF]")]
+    lines = record.getMessage()[len("[PERF] "):].splitlines()
+    assert lines[0].startswith("outer: ")
+    assert lines[1].startswith("  inner: ") and lines[1].endswith("step=3 prompt_tokens=12")
+    assert lines[2].startswith("  inner: ")
+
+
+def test_error_is_recorded_on_span(enabled, caplog):
+    with caplog.at_level(logging.INFO, logger="utils.profiler"):
+        with pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+    assert "failing" in span_stats()
+    assert "error=ValueError" in caplog.text
+
+
+def test_disabled_records_nothing():
+    profiler.reset_profiler()
+    with span("ignored") as current:
+        current.set(x=1)
+    profile_step("ignored")(lambda: None)()
+    count("calls", 1)
+    assert span_stats() == {}
+    assert "oe_calls_total" not in render_prometheus()
+
+
+def test_prometheus_export(enabled):
+    with span('db "load"'):
+        pass
+    count("llm_tokens", 7, provider="openai", kind="prompt")
+    text = render_prometheus()
+    assert "# TYPE oe_span_duration_seconds summary" in text
+    assert 'oe_span_duration_seconds{span="db \\"load\\"",quantile="0.99"}' in text
+    assert 'oe_span_duration_seconds_count{span="db \\"load\\""} 1' in text
+    assert "# TYPE oe_llm_tokens_total counter" in text
+    assert 'oe_llm_tokens_total{kind="prompt",provider="openai"} 7' in text
+
+
+def test_llm_usage_is_attached_to_provider_span(enabled, caplog):
+    openai_response = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=40, completion_tokens=9))
+    gemini_response = SimpleNamespace(usage=None, usage_metadata=SimpleNamespace(prompt_token_count=5, candidates_token_count=2))
+    with caplog.at_level(logging.INFO, logger="utils.profiler"):
+        with get_provider_limiter("openai").slot():
+            record_llm_usage("openai", openai_response)
+        with get_provider_limiter("gemini").slot():
+            record_llm_usage("gemini", gemini_response)
+    assert "llm.openai: " in caplog.text and "prompt_tokens=40 completion_tokens=9" in caplog.text
+    text = render_prometheus()
+    assert 'oe_llm_tokens_total{kind="completion",provider="openai"} 9' in text
+    assert 'oe_llm_tokens_total{kind="prompt",provider="gemini"} 5' in text
@@ -0,0 +1,122 @@
+"""
+Unit tests for the replay benchmark (scripts/tools/replay_benchmark.py).
+
+Tests:
+- Built-in fixture, e2e scenario markdown and thread-keyed JSONL are loaded
+- Recorded analyses override the stub heuristics
+- A --record run writes a fixture whose recorded analyses are replayed
+- Baseline comparison flags slower latency, lower throughput and new errors
+- A short replay reports latency, throughput and DB bytes per turn
+"""
+
+import hashlib
+import json
+
+from scripts.tools.replay_benchmark import (
+    E2E_DIR,
+    SCENARIOS_PATH,
+    _recorded_adapter,
+    compare_reports,
+    load_fixture,
+    load_jsonl,
+    load_markdown,
+    main,
+    replay,
+)
+
+
+def test_fixture_and_markdown_sources():
+    conversations, completions = load_fixture(SCENARIOS_PATH)
+    assert len(conversations) >= 4
+    assert all(turn["body"] for conversation in conversations for turn in conversation.turns)
+    assert isinstance(completions, dict)
+
+    scenario = load_markdown(sorted(E2E_DIR.glob("*.md"))[0])
+    assert scenario is not None and scenario.turns
+    assert not any(turn["body"].startswith(("From:", "Subject:")) for turn in scenario.turns)
+
+
+def test_jsonl_groups_by_thread_and_skips_other_records(tmp_path, capsys):
+    path = tmp_path / "log.jsonl"
+    lines = [
+        {"thread_id": "t1", "body": "first"},
+        {"request_id": "user-001", "title": "not a message", "body": "backlog entry"},
+        {"session_id": "t2", "body": "other"},
+        {"thread_id": "t1", "body": "second", "subject": "Re"},
+    ]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\nnot json\n", encoding="utf-8")
+    conversations = {c.id: c for c in load_jsonl(path)}
+    assert [turn["body"] for turn in conversations["t1"].turns] == ["first", "second"]
+    assert len(conversations["t2"].turns) == 1
+    assert "skipped 2 line(s)" in capsys.readouterr().out
+
+
+def test_recorded_responses_override_stub():
+    conversations, _ = load_fixture(SCENARIOS_PATH)
+    prompt_key = hashlib.sha1("sys\nprompt".encode()).hexdigest()
+    adapter = _recorded_adapter(conversations, {prompt_key: '{"ok": true}'})
+    turn = conversations[0].turns[0]
+    analysis = adapter.analyze_message({"body": turn["body"]})
+    assert analysis["intent"] == turn["llm"]["intent"][0]
+    assert analysis["fields"]["participants"] == 25
+    assert adapter.complete("prompt", system_prompt="sys") == '{"ok": true}'
+    assert adapter.route_intent({"subject": "hello", "body": "just saying hi"})[0] != "event_request"
+
+
+def test_record_round_trip(tmp_path, monkeypatch):
+    from adapters.agent_adapter import StubAgentAdapter, set_agent_adapter
+
+    class LiveAdapter(StubAgentAdapter):
+        def _classify_intent(self, msg):
+            return "recorded_intent", 0.42
+
+        def _extract_entities(self, msg):
+            return {"participants": 77}
+
+    source = tmp_path / "source.json"
+    conversations, _ = load_fixture(SCENARIOS_PATH)
+    turns = [{"subject": "Booking", "body": turn["body"]} for turn in conversations[0].turns[:2]]
+    source.write_text(json.dumps({"conversations": [{"id": "one", "turns": turns}]}), encoding="utf-8")
+    set_agent_adapter(LiveAdapter())  # main() restores the factories when it is done
+    monkeypatch.setenv("AGENT_MODE", "stub")
+    monkeypatch.chdir(tmp_path)
+    recorded = tmp_path / "recorded.json"
+    assert main(["--fixture", str(source), "--no-e2e", "--record", str(recorded)]) == 0
+
+    replayed, _ = load_fixture(recorded)
+    assert [turn["body"] for turn in replayed[0].turns] == [turn["body"] for turn in turns]
+    assert replayed[0].turns[0]["llm"]["intent"] == ["recorded_intent", 0.42]
+    adapter = _recorded_adapter(replayed, {})
+    assert adapter.route_intent({"body": turns[0]["body"]}) == ("recorded_intent", 0.42)
+    assert adapter.extract_entities({"body": turns[0]["body"]}) == {"participants": 77}
+
+
+def test_compare_reports():
+    baseline = {"latency_ms": {"p50": 10, "p95": 20, "p99": 30}, "turns_per_s": 100, "errors": []}
+    assert compare_reports(baseline, baseline, 0.25) == []
+    slower = {"latency_ms": {"p50": 10, "p95": 30, "p99": 30}, "turns_per_s": 70, "errors": ["x"]}
+    regressions = compare_reports(slower, baseline, 0.25)
+    assert [line.split(":")[0] for line in regressions] == ["latency_ms.p95", "turns_per_s", "errors"]
+
+
+def test_short_replay_reports_metrics(tmp_path, monkeypatch):
+    monkeypatch.setenv("AGENT_MODE", "stub")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.chdir(tmp_path)
+    from adapters.agent_adapter import set_agent_adapter
+    from utils import page_snapshots
+
+    monkeypatch.setattr(page_snapshots, "SNAPSHOTS_DB", tmp_path / "snapshots" / "snapshots.sqlite3")
+    monkeypatch.setattr(page_snapshots, "SNAPSHOTS_FILE", tmp_path / "snapshots" / "snapshots.json")
+    conversations, completions = load_fixture(SCENARIOS_PATH)
+    set_agent_adapter(_recorded_adapter(conversations[:1], completions))
+    try:
+        report = replay(conversations[:1], tmp_path / "events.json", threads=2, iterations=2)
+    finally:
+        set_agent_adapter(None)
+    assert report["turns"] == 2 * len(conversations[0].turns)
+    assert report["errors"] == []
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"] <= report["latency_ms"]["max"]
+    assert report["turns_per_s"] > 0
+    if report["backend"] == "json":
+        assert report["db_bytes_written_per_turn"] > 0
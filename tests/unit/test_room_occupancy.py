@@ -0,0 +1,175 @@
+"""
+Unit tests for the room occupancy index (workflows/common/occupancy.py).
+
+Tests:
+- Batch answers match the linear scans for conflicts and free rooms
+- First conflict is reported in database order
+- Interval lookup honours exclusive ends and multi-day spans
+- update_event_metadata refreshes an open batch; direct writes need note_event_changed
+- calendar_free uses the index inside a batch
+"""
+
+import random
+
+import pytest
+
+from detection.special.room_conflict import detect_room_conflict, get_available_rooms_on_date
+from services.availability import calendar_free
+from workflows.common.occupancy import event_window, note_event_changed, occupancy_batch
+from workflows.common.time_window import TimeWindow
+from workflows.io.database import update_event_metadata
+
+ROOMS = ["Room A", "Room B", "Room E", "Room F"]
+DATES = ["2026-02-06", "2026-02-07", "2026-02-08"]
+
+
+def _event(event_id, room, status, date, start=None, end=None, **extra):
+    event = {
+        "event_id": event_id,
+        "client_id": None,
+        "locked_room_id": room,
+        "status": status,
+        "chosen_date": date,
+        "event_data": {},
+    }
+    if start and end:
+        event["requested_window"] = {"start": f"{date}T{start}:00+01:00", "end": f"{date}T{end}:00+01:00"}
+    event.update(extra)
+    return event
+
+
+@pytest.fixture
+def random_db():
+    rng = random.Random(7)
+    events = []
+    for idx in range(120):
+        date = rng.choice(DATES)
+        hour = rng.randint(8, 20)
+        timed = rng.random() < 0.7
+        events.append(
+            _event(
+                f"evt-{idx}",
+                rng.choice(ROOMS + [None, "room a"]),
+                rng.choice(["Option", "Confirmed", "Lead", None]),
+                date,
+                f"{hour:02d}:00" if timed else None,
+                f"{min(hour + rng.randint(1, 4), 23):02d}:00" if timed else None,
+            )
+        )
+    events.append(_event("multi", "Room B", "Confirmed", "2026-02-06", end_date="2026-02-08"))
+    return {"events": events, "clients": {}, "rooms": {room: {} for room in ROOMS}}
+
+
+def _queries():
+    windows = [None]
+    for date in DATES:
+        windows.append(TimeWindow.from_iso(f"{date}T10:00:00+01:00", f"{date}T12:00:00+01:00"))
+        windows.append(TimeWindow.from_iso(f"{date}T18:00:00+01:00", f"{date}T22:00:00+01:00"))
+    for date in DATES:
+        for window in windows:
+            yield date, window
+
+
+def test_batch_matches_linear_scan(random_db):
+    linear_conflicts = []
+    linear_free = []
+    for date, window in _queries():
+        entry = {"requested_window": {"start": window.start.isoformat(), "end": window.end.isoformat()}} if window else None
+        for room in ROOMS:
+            linear_conflicts.append(detect_room_conflict(random_db, "evt-3", room, date, entry))
+        linear_free.append(sorted(get_available_rooms_on_date(random_db, "evt-3", date, query_window=window)))
+
+    batch_conflicts = []
+    batch_free = []
+    with occupancy_batch(random_db):
+        for date, window in _queries():
+            entry = {"requested_window": {"start": window.start.isoformat(), "end": window.end.isoformat()}} if window else None
+            for room in ROOMS:
+                batch_conflicts.append(detect_room_conflict(random_db, "evt-3", room, date, entry))
+            batch_free.append(sorted(get_available_rooms_on_date(random_db, "evt-3", date, query_window=window)))
+
+    assert batch_conflicts == linear_conflicts
+    assert batch_free == linear_free
+    assert any(linear_conflicts) and any(len(rooms) < len(ROOMS) for rooms in linear_free)
+
+
+def test_first_conflict_follows_database_order():
+    db = {
+        "events": {
+            "late": _event("late", "Room E", "Confirmed", "2026-02-07", "09:00", "11:00"),
+            "early": _event("early", "Room E", "Option", "2026-02-07", "08:00", "20:00"),
+        }
+    }
+    entry = {"requested_window": {"start": "2026-02-07T10:00:00+01:00", "end": "2026-02-07T10:30:00+01:00"}}
+
+    with occupancy_batch(db):
+        conflict = detect_room_conflict(db, "me", "room e", "2026-02-07", entry)
+
+    assert conflict["conflicting_event_id"] == "late"
+    assert conflict["status"] == "Confirmed"
+
+
+def test_interval_lookup_edges():
+    db = {
+        "events": [
+            _event("afternoon", "Room A", "Option", "2026-02-07", "14:00", "16:00"),
+            _event("multi", "Room B", "Confirmed", "2026-02-05", end_date="2026-02-09"),
+        ]
+    }
+    adjacent = TimeWindow.from_iso("2026-02-07T16:00:00+01:00", "2026-02-07T18:00:00+01:00")
+    overlapping = TimeWindow.from_iso("2026-02-07T15:59:00+01:00", "2026-02-07T18:00:00+01:00")
+
+    with occupancy_batch(db) as index:
+        assert index.conflicts("Room A", window=adjacent) == []
+        assert [b.event_id for b in index.conflicts("Room A", window=overlapping)] == ["afternoon"]
+        assert [b.event_id for b in index.conflicts("Room B", window=adjacent)] == ["multi"]
+
+
+def test_metadata_updates_refresh_open_batch():
+    event = _event("evt-1", "Room A", "Lead", "2026-02-07")
+    db = {"events": [event]}
+
+    with occupancy_batch(db):
+        assert detect_room_conflict(db, "other", "Room A", "2026-02-07") is None
+        update_event_metadata(event, status="Option")
+        assert detect_room_conflict(db, "other", "Room A", "2026-02-07")["status"] == "Option"
+
+        event["locked_room_id"] = "Room F"  # direct write: index is a snapshot until told
+        assert detect_room_conflict(db, "other", "Room F", "2026-02-07") is None
+        note_event_changed(event, db)
+        assert detect_room_conflict(db, "other", "Room F", "2026-02-07") is not None
+
+    # Outside a batch the live dicts are read
+    event["status"] = "Lead"
+    assert detect_room_conflict(db, "other", "Room F", "2026-02-07") is None
+
+
+def test_calendar_free_uses_index_in_batch():
+    db = {
+        "events": [
+            {
+                "event_id": "evt-1",
+                "status": "Option",
+                "event_data": {"Event Date": "07.02.2026", "Preferred Room": "Room A"},
+            }
+        ]
+    }
+    window = {"date_iso": "2026-02-07", "start": "2026-02-07T10:00:00+01:00", "end": "2026-02-07T12:00:00+01:00"}
+
+    expected = [calendar_free(room, window, db=db) for room in ROOMS]
+    with occupancy_batch(db) as index:
+        batched = [calendar_free(room, window, db=db) for room in ROOMS]
+        assert index.calendar_blocked("room a", "07.02.2026")
+
+    assert batched == expected
+    assert expected[0] is False
+
+
+def test_event_window_is_cached_on_window_fields():
+    event = _event("evt-1", "Room A", "Option", "2026-02-07", "14:00", "16:00")
+
+    first = event_window(event)
+    assert event_window(dict(event)) is first
+
+    event["requested_window"] = {"start": "2026-02-07T15:00:00+01:00", "end": "2026-02-07T17:00:00+01:00"}
+    assert event_window(event).start.hour == 15
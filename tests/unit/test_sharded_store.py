@@ -0,0 +1,226 @@
+"""
+Unit tests for the sharded storage backend (OE_DB_BACKEND=sharded).
+
+Tests:
+- load_db/save_db keep the monolithic db dict shape
+- Saves only rewrite the shards a turn touched
+- Legacy single-file databases are imported on first use
+- Scoped reads by event_id and client email
+- Loads parse only the shards a turn touches; lookups use the index
+- Unparsed records behave like plain dicts (JSON, copy, equality)
+- Shard reads and writes are counted in the storage byte counters
+"""
+
+import copy
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from workflows.io import database as db_io
+from workflows.io import revisions
+from workflows.io.sharded_store import LazyRecord, get_store, reset_stores, shard_root_for
+from workflows.io.tasks import update_task_status
+
+
+@pytest.fixture
+def sharded(monkeypatch, tmp_path):
+    monkeypatch.setenv("OE_DB_BACKEND", "sharded")
+    reset_stores()
+    yield tmp_path / "events_database.json"
+    reset_stores()
+
+
+def _seed(path: Path, n_events: int = 3) -> None:
+    db = db_io.get_default_db()
+    for i in range(n_events):
+        db["events"].append(
+            {"event_id": f"EVT-{i}", "created_at": f"2026-01-0{i + 1}", "event_data": {"Email": f"c{i}@example.com"}}
+        )
+        db["clients"][f"c{i}@example.com"] = {"profile": {"name": f"C{i}"}, "history": [], "event_ids": [f"EVT-{i}"]}
+    db["tasks"].append({"task_id": "T-1", "status": "pending"})
+    db["config"] = {"venue": {"name": "Atelier"}}
+    db_io.save_db(db, path)
+
+
+def test_roundtrip_preserves_db_shape(sharded):
+    _seed(sharded)
+
+    db = db_io.load_db(sharded)
+
+    assert [e["event_id"] for e in db["events"]] == ["EVT-0", "EVT-1", "EVT-2"]
+    assert set(db["clients"]) == {"c0@example.com", "c1@example.com", "c2@example.com"}
+    assert db["tasks"][0]["task_id"] == "T-1"
+    assert db["config"] == {"venue": {"name": "Atelier"}}
+    # Defaults are backfilled exactly like the monolithic backend
+    assert db["events"][0]["current_step"] == 1
+    assert not sharded.exists()
+    assert (shard_root_for(sharded) / "events" / "EVT-1.json").exists()
+
+
+def test_save_rewrites_only_touched_records(sharded):
+    _seed(sharded)
+    db = db_io.load_db(sharded)
+    db_io.save_db(db, sharded)  # normalise defaults once
+
+    store = get_store(sharded)
+    db = db_io.load_db(sharded)
+    writes_before = store.stats["shard_writes"]
+    db["events"][1].setdefault("msgs", []).append("m1")
+    db_io.save_db(db, sharded)
+
+    assert store.stats["shard_writes"] - writes_before == 1
+
+
+def test_untouched_records_do_not_clobber_concurrent_changes(sharded):
+    _seed(sharded)
+    db_a = db_io.load_db(sharded)
+    db_b = db_io.load_db(sharded)
+
+    db_a["events"][0].setdefault("msgs", []).append("from-a")
+    db_b["events"][2].setdefault("msgs", []).append("from-b")
+    db_io.save_db(db_a, sharded)
+    db_io.save_db(db_b, sharded)
+
+    final = db_io.load_db(sharded)
+    assert final["events"][0]["msgs"] == ["from-a"]
+    assert final["events"][2]["msgs"] == ["from-b"]
+
+
+def test_new_records_and_removals(sharded):
+    _seed(sharded)
+    db = db_io.load_db(sharded)
+    db["events"].pop(0)
+    db["events"].append({"event_id": "EVT-NEW", "event_data": {"Email": "new@example.com"}})
+    db_io.save_db(db, sharded)
+
+    final = db_io.load_db(sharded)
+    assert [e["event_id"] for e in final["events"]] == ["EVT-1", "EVT-2", "EVT-NEW"]
+    assert not (shard_root_for(sharded) / "events" / "EVT-0.json").exists()
+    assert db_io.load_events_for_email(sharded, "c0@example.com") == []
+
+
+def test_imports_monolithic_file_on_first_load(sharded):
+    legacy = {
+        "events": [{"event_id": "EVT-OLD", "event_data": {"Email": "Old@Example.com"}}],
+        "clients": {"old@example.com": {"profile": {}, "history": [], "event_ids": ["EVT-OLD"]}},
+        "tasks": [],
+        "config": {"timezone": "Europe/Zurich"},
+    }
+    sharded.write_text(json.dumps(legacy), encoding="utf-8")
+
+    db = db_io.load_db(sharded)
+
+    assert db["events"][0]["event_id"] == "EVT-OLD"
+    assert db["config"]["timezone"] == "Europe/Zurich"
+    assert (shard_root_for(sharded) / "_index.json").exists()
+
+
+def test_scoped_reads_by_event_id_and_email(sharded):
+    _seed(sharded)
+
+    event = db_io.load_event(sharded, "EVT-2")
+    by_email = db_io.load_events_for_email(sharded, "C1@example.com")
+
+    assert event["event_id"] == "EVT-2"
+    assert event["status"] == "Lead"
+    assert [e["event_id"] for e in by_email] == ["EVT-1"]
+    assert db_io.load_event(sharded, "missing") is None
+
+
+def test_json_backend_remains_default(monkeypatch, tmp_path):
+    monkeypatch.delenv("OE_DB_BACKEND", raising=False)
+    path = tmp_path / "db.json"
+    db = db_io.get_default_db()
+    db["events"].append({"event_id": "EVT-1"})
+    db_io.save_db(db, path)
+
+    assert path.exists()
+    assert not shard_root_for(path).exists()
+    assert db_io.load_event(path, "EVT-1")["event_id"] == "EVT-1"
+
+
+def test_concurrent_changes_to_same_event_are_merged(sharded):
+    _seed(sharded)
+    db_a = db_io.load_db(sharded)
+    db_b = db_io.load_db(sharded)
+
+    db_a["events"][1].setdefault("msgs", []).append("from-a")
+    db_b["events"][1].setdefault("msgs", []).append("from-b")
+    db_b["events"][1]["chosen_date"] = "12.05.2026"
+    db_io.save_db(db_a, sharded)
+    db_io.save_db(db_b, sharded)
+
+    final = db_io.load_event(sharded, "EVT-1")
+    assert final["msgs"] == ["from-a", "from-b"]
+    assert final["chosen_date"] == "12.05.2026"
+    assert final["_rev"] > db_a["events"][1]["_rev"]
+
+
+def test_turn_parses_only_touched_shards(sharded):
+    _seed(sharded, n_events=5)
+    db_io.save_db(db_io.load_db(sharded), sharded)  # normalise defaults once
+    store = get_store(sharded)
+    store._cache.clear()
+    reads_before = store.stats["shard_reads"]
+
+    db = db_io.load_db(sharded)
+    event = db_io.last_event_for_email(db, "c3@example.com")
+    event.setdefault("msgs", []).append("m1")
+    db["clients"]["c3@example.com"]["history"].append({"msg_id": "m1"})
+    update_task_status(db, "T-1", "done")
+    writes_before = store.stats["shard_writes"]
+    db_io.save_db(db, sharded)
+
+    # index + config + the event, client and task the turn touched
+    assert store.stats["shard_reads"] - reads_before == 5
+    assert [e.loaded for e in db["events"]] == [False, False, False, True, False]
+    assert store.stats["shard_writes"] - writes_before == 3
+    final = db_io.load_db(sharded)
+    assert final["events"][3]["msgs"] == ["m1"]
+    assert final["tasks"][0]["status"] == "done"
+    assert final["events"][0]["event_id"] == "EVT-0"
+
+
+def test_unparsed_records_behave_like_dicts(sharded):
+    _seed(sharded, n_events=2)
+    db = db_io.load_db(sharded)
+    first, second = db["events"]
+    assert isinstance(first, LazyRecord) and not first.loaded
+
+    assert json.loads(json.dumps(first))["event_id"] == "EVT-0"
+    assert type(copy.deepcopy(second)) is dict and second.loaded
+    other = db_io.load_db(sharded)
+    assert other["events"][0] == first and dict(other["events"][1]) == second
+    assert pickle.loads(pickle.dumps(db["clients"]["c1@example.com"]))["event_ids"] == ["EVT-1"]
+
+
+def test_record_removed_by_other_worker_stays_removed(sharded):
+    _seed(sharded)
+    db_a = db_io.load_db(sharded)
+    db_b = db_io.load_db(sharded)
+    db_b["events"].pop(1)
+    db_io.save_db(db_b, sharded)
+
+    assert db_io.find_event_idx_by_id(db_a, "EVT-1") is None
+    db_a["events"][0].setdefault("msgs", []).append("from-a")
+    db_io.save_db(db_a, sharded)
+
+    final = db_io.load_db(sharded)
+    assert [e["event_id"] for e in final["events"]] == ["EVT-0", "EVT-2"]
+    assert final["events"][0]["msgs"] == ["from-a"]
+
+
+def test_shard_io_counted_in_write_stats(sharded):
+    revisions.reset_write_stats()
+    _seed(sharded)
+    written = revisions.get_write_stats()["bytes_written"]
+    assert written > 0
+
+    store = get_store(sharded)
+    store._cache.clear()
+    db_io.load_db(sharded)["events"][0]["event_id"]
+
+    assert revisions.get_write_stats()["bytes_read"] > 0
+    assert revisions.get_write_stats()["bytes_written"] == written
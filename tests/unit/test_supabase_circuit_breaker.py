@@ -0,0 +1,213 @@
+"""
+Unit tests for the Supabase circuit breaker (workflows/io/integration/circuit_breaker.py).
+
+Tests:
+- Failure-rate and slow-call thresholds open the breaker after min_calls
+- Open breakers reject until open_seconds pass, then admit one half-open probe
+- The probe's outcome closes or re-opens the breaker; transitions are counted
+- The fallback adapter short-circuits to JSON per operation class while open
+- JSON-served writes are replayed to Supabase with JSON event ids remapped
+- Live Supabase calls use the id map too; journal and map survive a restart
+- A corrupt journal or id map is moved aside and the adapter starts empty
+- Writes that keep failing, or find the journal full, are dead-lettered
+"""
+
+import json
+
+from workflows.io.integration.adapter import SupabaseWithFallbackAdapter
+from workflows.io.integration.circuit_breaker import CLOSED, HALF_OPEN, OPEN, BreakerSettings, CircuitBreaker
+
+SETTINGS = BreakerSettings(window=4, min_calls=4, failure_rate=0.5, slow_ms=100, slow_rate=0.75, open_seconds=10)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_failure_rate_opens_after_min_calls():
+    breaker = CircuitBreaker("t", SETTINGS, clock=Clock())
+    breaker.record(False, 0.01)
+    breaker.record(True, 0.01)
+    assert breaker.record(False, 0.01) == CLOSED  # 3 calls < min_calls
+    assert breaker.record(True, 0.01) == OPEN
+    assert not breaker.allow() and breaker.stats()["rejected"] == 1
+
+
+def test_slow_calls_open_the_breaker():
+    breaker = CircuitBreaker("t", SETTINGS, clock=Clock())
+    for _ in range(3):
+        breaker.record(True, 0.5)
+    assert breaker.record(True, 0.01) == OPEN
+    assert breaker.stats()["slow"] == 3
+
+
+def test_half_open_probe():
+    clock = Clock()
+    breaker = CircuitBreaker("t", SETTINGS, clock=clock)
+    for _ in range(4):
+        breaker.record(False, 0.01)
+    clock.now = 10
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()  # one probe at a time
+    assert breaker.record(False, 0.01) == OPEN
+
+    clock.now = 20
+    assert breaker.allow()
+    assert breaker.record(True, 0.01) == CLOSED
+    assert breaker.stats()["transitions"] == {"closed->open": 1, "open->half_open": 2, "half_open->open": 1, "half_open->closed": 1}
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.down = True
+        self.calls = []
+
+    def _call(self, name, *args, **kwargs):
+        self.calls.append((name, args, kwargs))
+        if self.down:
+            raise ConnectionError("supabase down")
+
+    def initialize(self):
+        pass
+
+    def create_event(self, event_data):
+        self._call("create_event", event_data)
+        return "sb-evt"
+
+    def update_event(self, event_id, **fields):
+        self._call("update_event", event_id, **fields)
+        return {"id": event_id, **fields}
+
+    def get_rooms(self, date_iso=None):
+        self._call("get_rooms", date_iso)
+        return [{"id": "r-a"}]
+
+
+class FakeJSON:
+    def __init__(self):
+        self.calls = []
+
+    def initialize(self):
+        pass
+
+    def create_event(self, event_data):
+        self.calls.append("create_event")
+        return "json-evt"
+
+    def update_event(self, event_id, **fields):
+        self.calls.append("update_event")
+        return {"event_id": event_id, **fields}
+
+    def get_rooms(self, date_iso=None):
+        self.calls.append("get_rooms")
+        return []
+
+
+def _adapter(clock, journal_dir):
+    adapter = SupabaseWithFallbackAdapter(settings=SETTINGS, clock=clock, journal_dir=journal_dir)
+    adapter._supabase, adapter._json_fallback = FakeSupabase(), FakeJSON()
+    adapter._schedule_reconcile = lambda: None
+    return adapter
+
+
+def test_open_breaker_goes_straight_to_json_and_reconciles(tmp_path):
+    clock = Clock()
+    adapter = _adapter(clock, tmp_path)
+    for _ in range(4):
+        assert adapter.create_event({"Name": "Laura"}) == "json-evt"
+    attempted = len(adapter._supabase.calls)
+    assert attempted == 4
+
+    adapter.update_event("json-evt", status="Option")
+    assert len(adapter._supabase.calls) == attempted  # short-circuited
+    assert adapter.get_rooms() == [] and len(adapter._supabase.calls) == attempted + 1  # reads breaker still closed
+    stats = adapter.breaker_stats()
+    assert stats["breakers"]["writes"]["state"] == OPEN and stats["short_circuits"] == 1
+    assert stats["pending_sync"] == 5
+
+    # Supabase recovers: the probe closes the breaker and the journal is replayed
+    adapter._supabase.down = False
+    clock.now = 10
+    assert adapter.create_event({"Name": "Mia"}) == "sb-evt"
+    assert adapter._breakers["writes"].state == CLOSED
+    adapter._supabase.calls.clear()
+    assert adapter.reconcile() == 5
+    assert adapter._supabase.calls[-1] == ("update_event", ("sb-evt",), {"status": "Option"})
+    assert adapter.breaker_stats()["pending_sync"] == 0
+
+
+def test_reconcile_stops_at_first_failure(tmp_path):
+    adapter = _adapter(Clock(), tmp_path)
+    adapter.create_event({"Name": "Laura"})
+    adapter.update_event("json-evt", status="Option")
+    assert adapter.reconcile() == 0
+    assert adapter.breaker_stats()["pending_sync"] == 2
+
+
+def test_live_calls_map_ids_and_journal_survives_restart(tmp_path):
+    adapter = _adapter(Clock(), tmp_path)
+    adapter.create_event({"Name": "Laura"})
+    adapter.update_event("json-evt", status="Option")
+
+    restarted = _adapter(Clock(), tmp_path)
+    assert restarted.breaker_stats()["pending_sync"] == 2
+    restarted._supabase.down = False
+    assert restarted.reconcile() == 2
+
+    again = _adapter(Clock(), tmp_path)
+    again._supabase.down = False
+    assert again.breaker_stats()["pending_sync"] == 0
+    again.update_event("json-evt", current_step=3)
+    assert again._supabase.calls[-1] == ("update_event", ("sb-evt",), {"current_step": 3})
+
+
+def test_corrupt_journal_files_are_moved_aside(tmp_path):
+    adapter = _adapter(Clock(), tmp_path)
+    adapter.update_event("evt-1", status="Option")
+    (tmp_path / "journal.json").write_text('[{"method": "update_ev', encoding="utf-8")
+    (tmp_path / "id_map.json").write_text("", encoding="utf-8")
+
+    restarted = _adapter(Clock(), tmp_path)
+    assert restarted.breaker_stats()["pending_sync"] == 0 and restarted._id_map == {}
+    assert sorted(path.name.split(".corrupt-")[0] for path in tmp_path.glob("*.corrupt-*")) == [
+        "id_map.json",
+        "journal.json",
+    ]
+    assert not (tmp_path / "journal.json").exists()
+    restarted.update_event("evt-2", status="Lead")
+    assert json.loads((tmp_path / "journal.json").read_text())[0]["args"] == ["evt-2"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_failing_and_overflowing_writes_are_dead_lettered(tmp_path, monkeypatch):
+    monkeypatch.setenv("OE_SUPABASE_RECONCILE_MAX", "2")
+    monkeypatch.setenv("OE_SUPABASE_RECONCILE_ATTEMPTS", "2")
+    adapter = _adapter(Clock(), tmp_path)
+    adapter.update_event("evt-bad", status="Option")
+    adapter.update_event("evt-ok", status="Lead")
+    adapter.update_event("evt-late", status="Lead")  # journal full
+    assert adapter.breaker_stats()["pending_sync"] == 2 and adapter.breaker_stats()["dead_lettered"] == 1
+
+    adapter.reconcile()
+    assert adapter.breaker_stats()["pending_sync"] == 2  # first failure of the head
+    original = adapter._supabase.update_event
+
+    def update_event(event_id, **fields):
+        if event_id == "evt-bad":
+            raise ValueError("rejected")
+        return original(event_id, **fields)
+
+    adapter._supabase.down = False
+    adapter._supabase.update_event = update_event
+    assert adapter.reconcile() == 1
+    stats = adapter.breaker_stats()
+    assert stats["pending_sync"] == 0 and stats["dead_lettered"] == 2
+    dead = [json.loads(line) for line in (tmp_path / "dead_letter.jsonl").read_text().splitlines()]
+    assert [(entry["args"], entry["reason"]) for entry in dead] == [
+        (["evt-late"], "journal full"),
+        (["evt-bad"], "rejected"),
+    ]
@@ -0,0 +1,163 @@
+"""
+Unit tests for the Supabase read-through cache (workflows/io/integration/read_cache.py).
+
+Tests:
+- Rooms and products are fetched once per TTL and refresh the name -> UUID registry
+- Room lookups by id are served from the cached room list
+- Unknown emails are cached under the negative TTL; creating the client replaces the entry
+- Entries are per team; invalidation and expiry force a reload
+- A load overtaken by an invalidation or a write does not cache its stale result
+- An invalidation right after a load returns still drops the loaded value
+- Config saves drop rooms and products
+"""
+
+import threading
+
+import pytest
+
+from workflows.io.integration import read_cache, supabase_adapter
+from workflows.io.integration.memory_client import InMemorySupabaseClient
+from workflows.io.integration.read_cache import ReadCache
+from workflows.io.integration.uuid_adapter import get_entity_registry
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def fake(monkeypatch, clock):
+    client = InMemorySupabaseClient()
+    client.table("rooms").insert([
+        {"id": "r-a", "name": "Room A", "team_id": "team-1"},
+        {"id": "r-b", "name": "Room B", "team_id": "team-1"},
+        {"id": "r-x", "name": "Other", "team_id": "team-2"},
+    ]).execute()
+    client.table("products").insert({"id": "p-1", "name": "Coffee", "team_id": "team-1"}).execute()
+    client.log.clear()
+    monkeypatch.setattr(supabase_adapter, "_supabase_client", client)
+    monkeypatch.setattr(supabase_adapter, "get_team_id", lambda: "team-1")
+    monkeypatch.setattr(read_cache, "_CACHE", ReadCache(clock=clock))
+    monkeypatch.delenv("OE_READ_CACHE", raising=False)
+    return client
+
+
+def test_rooms_and_products_cached(fake, clock):
+    assert [room["id"] for room in supabase_adapter.get_rooms()] == ["r-a", "r-b"]
+    supabase_adapter.get_rooms()[0]["name"] = "mutated"
+    assert supabase_adapter.get_room_by_id("r-b")["name"] == "Room B"
+    assert supabase_adapter.get_rooms()[0]["name"] == "Room A"
+    assert supabase_adapter.get_products()[0]["name"] == "Coffee"
+    assert fake.requests == 2
+    assert get_entity_registry().get_room_uuid("room a") == "r-a"
+
+    clock.now += 301
+    supabase_adapter.get_rooms()
+    assert fake.requests == 3
+    stats = read_cache.read_cache_stats()["kinds"]["rooms"]
+    assert stats["loads"] == 2 and stats["hits"] == 3
+
+
+def test_unknown_email_negative_cached(fake, clock):
+    assert supabase_adapter.find_event_by_email("new@example.com") is None
+    assert supabase_adapter._lookup_client_by_email("NEW@example.com", "team-1") is None
+    assert fake.requests == 1
+    assert read_cache.read_cache_stats()["kinds"]["clients"]["negative_hits"] == 1
+
+    created = supabase_adapter.upsert_client("new@example.com", "New")
+    before = fake.requests
+    assert supabase_adapter._lookup_client_by_email("new@example.com", "team-1") == created["id"]
+    assert fake.requests == before
+
+    clock.now += 121
+    supabase_adapter._lookup_client_by_email("new@example.com", "team-1")
+    assert fake.requests == before + 1
+
+
+def test_entries_are_per_team_and_invalidated(fake, monkeypatch):
+    supabase_adapter.get_rooms()
+    monkeypatch.setattr(supabase_adapter, "get_team_id", lambda: "team-2")
+    assert [room["id"] for room in supabase_adapter.get_rooms()] == ["r-x"]
+    assert fake.requests == 2
+
+    assert read_cache.invalidate_read_cache(team_id="team-2") == 1
+    supabase_adapter.get_rooms()
+    assert fake.requests == 3
+
+
+def test_load_overtaken_by_invalidation_is_not_cached(clock):
+    cache = ReadCache(clock=clock)
+
+    def stale_load():
+        cache.invalidate("team-1", "clients", "a@example.com")
+        return "c-old"
+
+    assert cache.get_or_load("team-1", "clients", "a@example.com", stale_load) == "c-old"
+    assert cache.get_or_load("team-1", "clients", "a@example.com", lambda: "c-new") == "c-new"
+
+    def overtaken_by_write():
+        cache.put("team-1", "clients", "b@example.com", "c-written")
+        return None
+
+    assert cache.get_or_load("team-1", "clients", "b@example.com", overtaken_by_write) is None
+    assert cache.get_or_load("team-1", "clients", "b@example.com", lambda: "unused") == "c-written"
+    assert cache._generations == {} and cache._loading == {}
+
+
+class HookedLock:
+    """Lock that runs ``after_release`` once, right after the next release."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.after_release = None
+
+    def __enter__(self):
+        self._lock.acquire()
+
+    def __exit__(self, *exc_info):
+        self._lock.release()
+        hook, self.after_release = self.after_release, None
+        if hook is not None:
+            hook()
+
+
+def test_invalidation_after_load_returns_is_not_lost(clock):
+    cache = ReadCache(clock=clock)
+    cache._lock = HookedLock()
+
+    def load():
+        # Lands between the loader returning and the next point the lock is free
+        cache._lock.after_release = lambda: cache.invalidate("team-1", "clients", "a@example.com")
+        return "c-old"
+
+    assert cache.get_or_load("team-1", "clients", "a@example.com", load) == "c-old"
+    assert cache.get_or_load("team-1", "clients", "a@example.com", lambda: "c-new") == "c-new"
+    assert cache._generations == {} and cache._loading == {}
+
+
+def test_disabled_cache_reads_through(fake, monkeypatch):
+    monkeypatch.setenv("OE_READ_CACHE", "0")
+    supabase_adapter.get_rooms()
+    supabase_adapter.get_rooms()
+    assert fake.requests == 2
+
+
+def test_config_save_invalidates_reference_data(fake, monkeypatch):
+    try:
+        from api.routes import config as config_routes
+    except ImportError:
+        pytest.skip("api package shadowed by tests/api under importlib mode")
+    monkeypatch.setattr(config_routes, "wf_save_db", lambda db: None)
+    supabase_adapter.get_rooms()
+    supabase_adapter.get_products()
+    config_routes._save_config({})
+    assert read_cache.read_cache_stats()["entries"] == 0
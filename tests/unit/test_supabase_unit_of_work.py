@@ -0,0 +1,183 @@
+"""
+Unit tests for Supabase write batching (workflows/io/integration/unit_of_work.py).
+
+Tests:
+- An offer turn's writes are sent as one bulk insert per table
+- Updates to the same row are merged, and folded into pending inserts
+- Reads inside the unit of work see pending rows; repeated client lookups are skipped
+- Event updates inside a unit of work return the whole row, read once per turn
+- Outside a unit of work, offer line items are inserted in one request
+- A failing block discards its writes
+- Write-behind retries failed requests without repeating earlier ones and replays its spool
+- A spooled batch claimed by a live worker is not replayed by another
+"""
+
+import pytest
+
+from workflows.io.integration import supabase_adapter
+from workflows.io.integration.adapter import SupabaseDatabaseAdapter
+from workflows.io.integration.memory_client import InMemorySupabaseClient
+from workflows.io.integration.unit_of_work import UnitOfWork, WriteBehindQueue, unit_of_work
+
+LINE_ITEMS = [
+    {"name": "Room A", "unit_price": 500.0, "quantity": 1, "total": 500.0},
+    {"name": "Coffee break", "unit_price": 8.0, "quantity": 30, "total": 240.0},
+    {"name": "Projector", "unit_price": 50.0, "quantity": 1, "total": 50.0},
+]
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    client = InMemorySupabaseClient()
+    monkeypatch.setattr(supabase_adapter, "_supabase_client", client)
+    monkeypatch.delenv("OE_WRITE_BEHIND", raising=False)
+    return client
+
+
+def _offer_turn(adapter):
+    adapter.upsert_client("Laura@Example.com", "Laura")
+    event_id = adapter.create_event({"Name": "Laura", "Event Date": "02.11.2026", "Number of Participants": "30"})
+    adapter.update_event(event_id, status="Option")
+    adapter.update_event_billing(event_id, [dict(item) for item in LINE_ITEMS], 790.0)
+    adapter.create_message_approval(event_id, "Laura", "laura@example.com", "Draft offer")
+    return event_id
+
+
+def test_offer_turn_is_batched(fake):
+    adapter = SupabaseDatabaseAdapter()
+    with adapter.unit_of_work():
+        event_id = _offer_turn(adapter)
+        assert fake.requests == 1  # only the client lookup
+
+    # clients, events, offers, offer_line_items, tasks: one bulk insert each
+    assert fake.requests == 6
+    assert [entry[:2] for entry in fake.log[1:]] == [
+        ("clients", "insert"), ("events", "insert"), ("offers", "insert"),
+        ("offer_line_items", "insert"), ("tasks", "insert"),
+    ]
+    [event] = fake.rows("events")
+    assert event["id"] == event_id and event["status"] == "option"
+    items = fake.rows("offer_line_items")
+    assert len(items) == 3 and {item["offer_id"] for item in items} == {fake.rows("offers")[0]["id"]}
+
+
+def test_write_through_without_unit_of_work(fake):
+    adapter = SupabaseDatabaseAdapter()
+    _offer_turn(adapter)
+    # lookup + client + event + update + offer + bulk line items + task
+    assert fake.requests == 7
+    assert ("offer_line_items", "insert", 3) in fake.log
+
+
+def test_updates_are_merged():
+    work = UnitOfWork()
+    row = work.insert("events", {"title": "x"})
+    work.update("events", row["id"], {"status": "lead"})
+    work.update("events", "existing", {"status": "option"}, team_id="t")
+    work.update("events", "existing", {"current_step": 4}, team_id="t")
+    assert work.pending("events", row["id"]) == ({**row, "status": "lead"}, {})
+    batch = work.requests()
+    assert [(request.table, request.method) for request in batch] == [("events", "insert"), ("events", "update")]
+    assert batch[1].rows == [{"status": "option", "current_step": 4}]
+    assert batch[1].filters == {"id": "existing", "team_id": "t"}
+
+
+def test_reads_see_pending_rows(fake):
+    fake.table("events").insert({"id": "evt-1", "status": "lead", "current_step": 2}).execute()
+    fake.table("clients").insert({"id": "c-1", "email": "laura@example.com", "name": "", "team_id": None}).execute()
+    adapter = SupabaseDatabaseAdapter()
+    with adapter.unit_of_work():
+        new_id = adapter.create_event({"Name": "Laura"})
+        adapter.update_event("evt-1", current_step=3)
+        assert adapter.find_event_by_id(new_id)["event_id"] == new_id
+        assert adapter.find_event_by_id("evt-1")["current_step"] == 3
+        assert adapter.upsert_client("laura@example.com")["id"] == "c-1"
+        before = fake.requests
+        assert adapter.upsert_client("Laura@example.com", "Laura") == {**fake.rows("clients")[0], "name": "Laura"}
+        assert fake.requests == before
+    assert fake.rows("clients")[0]["name"] == "Laura"
+
+
+def test_update_inside_unit_of_work_returns_whole_row(fake):
+    fake.table("events").insert({"id": "evt-1", "title": "Party", "status": "lead", "team_id": None}).execute()
+    with unit_of_work(lambda: fake):
+        row = supabase_adapter.update_event_metadata("evt-1", current_step=3)
+        assert row == {"id": "evt-1", "title": "Party", "status": "lead", "team_id": None, "current_step": 3}
+        before = fake.requests
+        row = supabase_adapter.update_event_metadata("evt-1", status="Option")
+        assert row["title"] == "Party" and row["status"] == "option" and row["current_step"] == 3
+        assert supabase_adapter.find_event_by_id("evt-1")["current_step"] == 3
+        assert fake.requests == before
+        new_id = supabase_adapter.create_event_entry({"Name": "Laura"})
+        assert supabase_adapter.update_event_metadata(new_id, current_step=2)["id"] == new_id
+    assert fake.rows("events")[0]["current_step"] == 3
+
+
+def test_failed_block_discards_writes(fake):
+    adapter = SupabaseDatabaseAdapter()
+    with pytest.raises(RuntimeError):
+        with adapter.unit_of_work():
+            adapter.create_event({"Name": "Laura"})
+            raise RuntimeError("turn failed")
+    assert fake.requests == 0
+
+
+def test_write_behind_retries_and_replays_spool(fake, tmp_path, monkeypatch):
+    work = UnitOfWork()
+    event = work.insert("events", {"title": "x"})
+    work.update("events", "evt-old", {"status": "lead"})
+    fake.table("events").insert({"id": "evt-old"}).execute()
+
+    writer = WriteBehindQueue(lambda: fake, spool_dir=tmp_path, backoff_base=0.001)
+    fake.fail_requests(2)
+    writer.submit(work.requests())
+    assert writer.flush(5)
+    assert writer.stats()["retries"] == 2 and writer.stats()["batches"] == 1
+    assert {row["id"] for row in fake.rows("events")} == {"evt-old", event["id"]}
+    assert list(tmp_path.glob("*.json")) == []
+    writer.shutdown()
+
+    # A batch that ran out of attempts stays spooled and is replayed on the next start
+    stranded = WriteBehindQueue(lambda: fake, spool_dir=tmp_path, max_attempts=1)
+    fake.fail_requests(1)
+    stranded.submit([work.requests()[1]])
+    assert stranded.flush(5) and stranded.stats()["stranded"] == 1
+    stranded.shutdown()
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    restarted = WriteBehindQueue(lambda: fake, spool_dir=tmp_path)
+    assert restarted.flush(5) and restarted.stats()["batches"] == 1
+    assert list(tmp_path.glob("*.json")) == []
+    restarted.shutdown()
+
+
+def test_write_behind_mode_returns_before_writing(fake, tmp_path, monkeypatch):
+    from workflows.io.integration import unit_of_work as uow_module
+
+    monkeypatch.setenv("OE_WRITE_BEHIND", "1")
+    monkeypatch.setenv("OE_WRITE_BEHIND_DIR", str(tmp_path))
+    monkeypatch.setattr(uow_module, "_QUEUE", None)
+    with unit_of_work(lambda: fake) as work:
+        work.insert("events", {"title": "queued"})
+    uow_module.shutdown_write_behind()
+    assert [row["title"] for row in fake.rows("events")] == ["queued"]
+
+
+def test_claimed_spool_is_not_replayed_twice(fake, tmp_path):
+    work = UnitOfWork()
+    work.insert("events", {"title": "once"})
+    stranded = WriteBehindQueue(lambda: fake, spool_dir=tmp_path, max_attempts=1)
+    fake.fail_requests(1)
+    stranded.submit(work.requests())
+    assert stranded.flush(5)
+    stranded.shutdown()
+
+    first = WriteBehindQueue(lambda: fake, spool_dir=tmp_path, backoff_base=0.05)
+    fake.fail_requests(2)  # keep the first worker busy with the batch
+    second = WriteBehindQueue(lambda: fake, spool_dir=tmp_path)
+    assert first.flush(5) and second.flush(5)
+    assert first.stats()["batches"] == 1 and second.stats()["batches"] == 0
+    assert [row["title"] for row in fake.rows("events")] == ["once"]
+    assert list(tmp_path.iterdir()) == []
+    first.shutdown()
+    second.shutdown()
@@ -0,0 +1,94 @@
+"""
+Unit tests for the precompiled tool-argument validators (agents/chatkit_runner.py).
+
+Tests:
+- Every tool schema has a compiled validator
+- Error messages are unchanged (types, bounds, patterns, unions, additional properties)
+- Validation failures raise ToolExecutionError with the collected errors
+- Step allow-lists are precomputed and shared
+"""
+
+import pytest
+
+# tests/agents shadows the agents package in full-suite runs (as in the parity tests)
+try:
+    from agents.chatkit_runner import (
+        ENGINE_TOOL_ALLOWLIST,
+        TOOL_SCHEMAS,
+        StepToolPolicy,
+        ToolExecutionError,
+        _TOOL_VALIDATORS,
+        _validate_json_schema,
+        validate_tool_call,
+    )
+except ImportError as e:
+    pytest.skip(f"Agents module not importable: {e}", allow_module_level=True)
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "date": {"type": "string", "pattern": r"^\d{2}\.\d{2}\.\d{4}$"},
+        "kind": {"type": "string", "enum": ["a", "b"]},
+        "count": {"type": "integer", "minimum": 1, "maximum": 10},
+        "ratio": {"type": "number", "maximum": 1},
+        "flag": {"type": "boolean"},
+        "note": {"type": ["string", "null"]},
+        "items": {"type": "array", "items": {"type": "object", "required": ["id"], "properties": {"id": {"type": "string"}}}},
+    },
+    "required": ["date"],
+    "additionalProperties": False,
+}
+
+
+def test_every_schema_is_compiled():
+    assert set(_TOOL_VALIDATORS) == {name for name, schema in TOOL_SCHEMAS.items() if schema}
+
+
+def test_valid_payload_has_no_errors():
+    payload = {"date": "12.03.2026", "kind": "a", "count": 3, "ratio": 0.5, "flag": True, "note": None, "items": [{"id": "x"}]}
+    assert _validate_json_schema(SCHEMA, payload) == []
+
+
+def test_error_messages():
+    payload = {
+        "kind": "c",
+        "count": 0,
+        "ratio": True,
+        "flag": "yes",
+        "note": 5,
+        "items": [{"id": 1}, {}],
+        "extra": 1,
+    }
+    assert _validate_json_schema(SCHEMA, payload) == [
+        "root.date: missing required property",
+        "root.kind: expected one of ['a', 'b'], received 'c'",
+        "root.count: value 0 < minimum 1",
+        "root.ratio: expected number, received bool",
+        "root.flag: expected boolean, received str",
+        "root.note: expected one of ['string', 'null'], received int",
+        "root.items[0].id: expected string, received int",
+        "root.items[1].id: missing required property",
+        "root.extra: additional property not allowed",
+    ]
+    assert _validate_json_schema(SCHEMA, {"date": "2026-03-12"}) == [
+        "root.date: value '2026-03-12' does not match pattern '^\\\\d{2}\\\\.\\\\d{2}\\\\.\\\\d{4}$'"
+    ]
+    assert _validate_json_schema(SCHEMA, []) == ["root: expected object, received list"]
+
+
+def test_tool_call_errors_are_raised():
+    with pytest.raises(ToolExecutionError) as exc:
+        validate_tool_call("tool_suggest_dates", {"current_step": 2}, {"days_ahead": 0, "bogus": True})
+    assert exc.value.detail["reason"] == "schema_validation_failed"
+    assert exc.value.detail["errors"] == [
+        "root.days_ahead: value 0 < minimum 1",
+        "root.bogus: additional property not allowed",
+    ]
+    validate_tool_call("tool_suggest_dates", {"current_step": 2}, {"days_ahead": 30})
+
+
+def test_step_allowlists_are_precomputed():
+    assert StepToolPolicy.allowed_tools_for(3) is StepToolPolicy.allowed_tools_for("3")
+    assert StepToolPolicy.allowed_tools_for(3) == ENGINE_TOOL_ALLOWLIST["3"]
+    assert StepToolPolicy.allowed_tools_for(None) == set().union(*ENGINE_TOOL_ALLOWLIST.values())
+    assert StepToolPolicy.allowed_tools_for(6) == set()
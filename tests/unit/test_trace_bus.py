@@ -0,0 +1,134 @@
+"""
+Unit tests for the memory-bounded trace bus (debug/trace.py).
+
+Tests:
+- Events are stored as slotted records and read back as dicts
+- Incremental reads return only events after a sequence, with reset/dropped hints
+- The byte budget evicts the least recently used threads and their bookkeeping
+- A single thread over the budget loses its oldest events
+- The timeline line keeps payload/data aliases but the size counts them once
+- Incremental trace payloads take the timeline from the buffer, not the JSONL file
+"""
+
+import json
+
+import pytest
+
+from debug import trace
+from debug.trace import TraceBus, TraceEvent
+
+
+def _event(thread_id, seq, payload=None):
+    return TraceEvent(
+        thread_id=thread_id,
+        ts=float(seq),
+        seq=seq,
+        row_id=f"{seq}",
+        kind="STEP_ENTER",
+        lane="step",
+        payload=payload or {},
+        data=payload or {},
+        captured_additions=("date",),
+    )
+
+
+def test_events_are_compact_and_read_as_dicts():
+    bus = TraceBus()
+    bus.emit(_event("t1", 1, {"op": "load"}))
+    assert not hasattr(_event("t1", 1), "__dict__")
+    [record] = bus.get("t1")
+    assert record["payload"] == {"op": "load"} and record["data"] is record["payload"]
+    assert record["captured_additions"] == ["date"] and record["confirmed_now"] == []
+    assert bus.get("missing") == []
+
+
+def test_incremental_reads():
+    bus = TraceBus(max_events=5)
+    for seq in range(1, 5):
+        bus.emit(_event("t1", seq))
+    assert [ev["seq"] for ev in bus.get("t1", since=2)] == [3, 4]
+
+    window = bus.read("t1", 4)
+    assert window == {"events": [], "last_seq": 4, "reset": False, "dropped": 0}
+
+    for seq in range(5, 9):
+        bus.emit(_event("t1", seq))
+    window = bus.read("t1", 1)
+    assert [ev["seq"] for ev in window["events"]] == [4, 5, 6, 7, 8]
+    assert window["dropped"] == 2 and window["last_seq"] == 8
+
+    # Thread evicted and started over: the client's cursor is ahead of the buffer
+    bus.drop("t1")
+    bus.emit(_event("t1", 1))
+    window = bus.read("t1", 8)
+    assert window["reset"] and [ev["seq"] for ev in window["events"]] == [1]
+
+
+def test_budget_evicts_least_recently_used_threads(monkeypatch):
+    size = trace._event_size(_event("x", 1, {"blob": "x" * 1000}))
+    bus = TraceBus(max_bytes=int(size * 2.5))
+    forgotten = []
+    monkeypatch.setattr(trace, "_forget_thread", forgotten.append)
+
+    bus.emit(_event("a", 1, {"blob": "x" * 1000}))
+    bus.emit(_event("b", 1, {"blob": "x" * 1000}))
+    bus.get("a")  # reading keeps "a" in use
+    bus.emit(_event("c", 1, {"blob": "x" * 1000}))
+
+    assert bus.list_threads() == ["a", "c"]
+    assert forgotten == ["b"]
+    assert bus.stats()["bytes"] <= bus.stats()["max_bytes"]
+
+
+def test_single_thread_over_budget_trims_oldest():
+    size = trace._event_size(_event("x", 1, {"blob": "x" * 1000}))
+    bus = TraceBus(max_bytes=int(size * 3.5))
+    for seq in range(1, 11):
+        bus.emit(_event("solo", seq, {"blob": "x" * 1000}))
+    assert [ev["seq"] for ev in bus.get("solo")] == [8, 9, 10]
+    assert bus.stats() == {"threads": 1, "events": 3, "bytes": pytest.approx(size * 3, rel=0.01), "max_bytes": int(size * 3.5)}
+
+
+def test_forget_thread_drops_bookkeeping():
+    trace._next_sequence("gone")
+    trace._next_step_minor("gone", 2)
+    trace._LAST_ENTITY_LABEL["gone"] = "Client"
+    trace._record_summary("gone", step_major=2, wait_state=None, hash_status=None)
+    trace._forget_thread("gone")
+    assert "gone" not in trace._SEQ_COUNTER and "gone" not in trace._STEP_MINOR_STATE
+    assert "gone" not in trace._LAST_ENTITY_LABEL
+    assert "current_step_major" not in trace.get_trace_summary("gone")
+
+
+def test_event_line_counts_aliased_payload_once():
+    payload = {"note": "x" * 1000}
+    record = _event("t1", 1, payload).to_dict()
+    record["io"] = record["db"] = {"op": "save"}
+
+    line, size = trace._event_line(record)
+
+    assert json.loads(line) == json.loads(json.dumps(record))
+    # The payload is in the line twice but counted once
+    assert 1000 < size < len(line) - 1000
+
+
+def test_incremental_payload_skips_timeline_file(monkeypatch):
+    from debug import reporting
+
+    bus = TraceBus(max_events=5)
+    for seq in range(1, 4):
+        bus.emit(_event("t1", seq))
+    parsed = []
+    monkeypatch.setattr(reporting, "BUS", bus)
+    monkeypatch.setattr(reporting.timeline, "snapshot", lambda thread_id: parsed.append(thread_id) or [{"seq": 3}])
+
+    payload = reporting.collect_trace_payload("t1", since_seq=1)
+    assert [entry["seq"] for entry in payload["timeline"]] == [2, 3] and parsed == []
+    assert payload["cursor"]["last_seq"] == 3
+
+    for seq in range(4, 9):
+        bus.emit(_event("t1", seq))
+    payload = reporting.collect_trace_payload("t1", since_seq=1)  # 2 and 3 were trimmed
+    assert payload["cursor"]["dropped"] == 2 and parsed == ["t1"]
+    reporting.collect_trace_payload("t1")
+    assert parsed == ["t1", "t1"]
@@ -0,0 +1,103 @@
+"""
+Unit tests for the workflow turn executor.
+
+Tests:
+- Turns of one thread run in submission order, one at a time
+- Unrelated threads run in parallel
+- Bounded queue rejects with TurnQueueFull
+- Request contextvars reach the worker
+"""
+
+import asyncio
+import threading
+import time
+from contextvars import ContextVar
+
+import pytest
+
+from workflows.runtime.turn_executor import TurnExecutor, TurnQueueFull
+
+
+@pytest.fixture
+def executor():
+    ex = TurnExecutor(max_workers=4, max_queue=8)
+    yield ex
+    ex.shutdown(wait=True)
+
+
+def test_same_thread_turns_are_fifo_and_serialized(executor):
+    order = []
+    active = {"n": 0, "max": 0}
+    lock = threading.Lock()
+
+    def turn(i):
+        with lock:
+            active["n"] += 1
+            active["max"] = max(active["max"], active["n"])
+        time.sleep(0.01)
+        order.append(i)
+        with lock:
+            active["n"] -= 1
+        return i
+
+    futures = [executor.submit("thread-1", turn, i) for i in range(6)]
+    results = [f.result(timeout=5) for f in futures]
+
+    assert results == list(range(6))
+    assert order == list(range(6))
+    assert active["max"] == 1
+
+
+def test_unrelated_threads_run_in_parallel(executor):
+    barrier = threading.Barrier(3, timeout=2)
+
+    def turn():
+        barrier.wait()  # would time out if the turns were serialized
+        return True
+
+    futures = [executor.submit(f"thread-{i}", turn) for i in range(3)]
+
+    assert all(f.result(timeout=5) for f in futures)
+
+
+def test_bounded_queue_rejects_when_full():
+    ex = TurnExecutor(max_workers=1, max_queue=2)
+    release = threading.Event()
+    try:
+        first = ex.submit("a", release.wait)
+        second = ex.submit("b", lambda: "b")
+        with pytest.raises(TurnQueueFull):
+            ex.submit("c", lambda: "c")
+        release.set()
+        assert first.result(timeout=5) is True
+        assert second.result(timeout=5) == "b"
+        stats = ex.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert stats["queue_depth"] == 0
+    finally:
+        release.set()
+        ex.shutdown(wait=True)
+
+
+def test_exceptions_propagate_and_chain_continues(executor):
+    def boom():
+        raise ValueError("turn failed")
+
+    failing = executor.submit("t", boom)
+    following = executor.submit("t", lambda: "next")
+
+    with pytest.raises(ValueError):
+        failing.result(timeout=5)
+    assert following.result(timeout=5) == "next"
+    assert executor.stats()["failed"] == 1
+
+
+def test_async_run_copies_contextvars(executor):
+    team: ContextVar = ContextVar("team", default=None)
+
+    async def main():
+        team.set("team-42")
+        return await executor.run("t", team.get)
+
+    assert asyncio.run(main()) == "team-42"
@@ -0,0 +1,180 @@
+"""Tests for streaming verbalization (sentence-level fact checks, mid-stream fallback)."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from adapters.agent_adapter import OpenAIAgentAdapter
+from utils import profiler
+from ux import universal_verbalizer as uv
+from ux.universal_verbalizer import (
+    MessageContext,
+    VerbalizerChunk,
+    stream_verbalized_message,
+    verbalize_message,
+    verbalizer_stream,
+)
+
+FALLBACK = "Room A is available on 15.03.2026 for 30 guests. The total is CHF 500.00."
+
+
+def _context() -> MessageContext:
+    return MessageContext(
+        step=3,
+        topic="room_avail_result",
+        event_date="15.03.2026",
+        room_name="Room A",
+        participants_count=30,
+        total_amount=500.00,
+    )
+
+
+def _stream(pieces):
+    """Generator standing in for ``_stream_llm`` (closed when the stream stops early)."""
+    yield from pieces
+
+
+def _run(pieces, context=None):
+    with patch.object(uv, "_bypass_reply", return_value=None), patch.object(
+        uv, "_stream_llm", return_value=_stream(pieces)
+    ):
+        return list(stream_verbalized_message(FALLBACK, context or _context()))
+
+
+def _kinds(chunks):
+    return [chunk.kind for chunk in chunks]
+
+
+class TestSentenceSplitting:
+    def test_keeps_dates_and_amounts_whole(self):
+        sentences, rest = uv._split_sentences("Great news. On 15.03.2026 it is CHF 75.00! More")
+        assert sentences == ["Great news. ", "On 15.03.2026 it is CHF 75.00! "]
+        assert rest == "More"
+
+    def test_line_breaks_end_sentences(self):
+        sentences, rest = uv._split_sentences("Hello Anna,\n\nRoom A")
+        assert sentences == ["Hello Anna,\n\n"]
+        assert rest == "Room A"
+
+
+class TestStreamVerbalizedMessage:
+    def test_streams_verified_sentences(self):
+        pieces = ["Good news! Room A is free on 15.", "03.2026 for your 30 gu", "ests. The total is CHF 500.00."]
+        chunks = _run(pieces)
+        assert _kinds(chunks) == ["delta", "delta", "delta", "done"]
+        streamed = "".join(chunk.text for chunk in chunks if chunk.kind == "delta")
+        assert streamed == "".join(pieces)
+        assert chunks[-1].text == streamed
+
+    def test_first_sentence_arrives_before_completion(self):
+        def pieces():
+            yield "Good news! "
+            raise AssertionError("stream consumed before first chunk was handed out")
+
+        with patch.object(uv, "_bypass_reply", return_value=None), patch.object(
+            uv, "_stream_llm", return_value=pieces()
+        ):
+            first = next(stream_verbalized_message(FALLBACK, _context()))
+        assert first.kind == "delta" and first.text == "Good news! "
+
+    def test_invented_amount_falls_back_mid_stream(self):
+        pieces = ["Room A on 15.03.2026 for 30 guests. ", "It costs CHF 900.00. ", "Never sent."]
+        with patch.object(uv, "_discard_cached_draft") as discard:
+            chunks = _run(pieces)
+        assert _kinds(chunks) == ["delta", "replace", "done"]
+        assert chunks[-1].text == FALLBACK
+        assert all("Never sent" not in chunk.text for chunk in chunks)
+        assert discard.called
+
+    def test_unit_swap_is_patched_in_sentence(self):
+        sentence = "Coffee is CHF 500.00 per person. "
+        patched = uv._check_sentence(sentence, {"amounts": ["CHF 500.00"], "units": ["per event"]})
+        assert patched == "Coffee is CHF 500.00 per event. "
+
+    def test_sentence_patch_adds_missing_unit(self):
+        sentence = "Coffee is CHF 12.50 and tea is CHF 13.50. "
+        patched = uv._check_sentence(sentence, {"amounts": ["CHF 12.50"], "units": ["per event"]})
+        assert patched == "Coffee is CHF 12.50 per event and tea is CHF 12.50. "
+
+    def test_missing_fact_replaces_at_end(self):
+        pieces = ["Room A is lovely. ", "See you soon."]
+        with patch.object(uv, "_discard_cached_draft"):
+            chunks = _run(pieces)
+        assert _kinds(chunks) == ["delta", "delta", "replace", "done"]
+        assert chunks[-1].text == FALLBACK
+
+    def test_llm_error_falls_back(self):
+        def pieces():
+            yield "Room A "
+            raise RuntimeError("connection reset")
+
+        with patch.object(uv, "_bypass_reply", return_value=None), patch.object(
+            uv, "_stream_llm", return_value=pieces()
+        ):
+            chunks = list(stream_verbalized_message(FALLBACK, _context()))
+        assert _kinds(chunks) == ["replace", "done"]
+        assert FALLBACK in chunks[-1].text
+
+    def test_bypass_yields_done_only(self):
+        with patch.dict("os.environ", {"VERBALIZER_TONE": "plain"}):
+            chunks = list(stream_verbalized_message(FALLBACK, _context()))
+        assert _kinds(chunks) == ["done"]
+        assert FALLBACK in chunks[0].text
+
+
+class TestVerbalizerStreamSink:
+    def test_verbalize_message_forwards_chunks_and_returns_final(self):
+        received = []
+        reply = "Room A is free on 15.03.2026 for 30 guests. The total is CHF 500.00."
+        with patch.object(uv, "_bypass_reply", return_value=None), patch.object(
+            uv, "_stream_llm", return_value=_stream([reply])
+        ):
+            with verbalizer_stream(received.append):
+                result = verbalize_message(FALLBACK, _context())
+        assert result == reply
+        assert [chunk.kind for chunk in received] == ["delta", "delta", "done"]
+
+    def test_no_sink_uses_blocking_path(self):
+        reply = "Room A is free on 15.03.2026 for 30 guests. The total is CHF 500.00."
+        with patch.object(uv, "_bypass_reply", return_value=None), patch.object(
+            uv, "_call_llm", return_value=reply
+        ), patch.object(uv, "_stream_llm") as stream:
+            assert verbalize_message(FALLBACK, _context()) == reply
+        assert not stream.called
+
+
+def test_openai_stream_records_token_usage():
+    def chunk(text):
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None)
+
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs)
+        usage = SimpleNamespace(prompt_tokens=21, completion_tokens=4)
+        return iter([chunk("Room A "), chunk("is free."), SimpleNamespace(choices=[], usage=usage)])
+
+    adapter = OpenAIAgentAdapter.__new__(OpenAIAgentAdapter)
+    adapter._intent_model = "test-model"
+    adapter._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    profiler.reset_profiler()
+    profiler.set_profiling_enabled(True)
+    try:
+        assert "".join(adapter.stream_complete("prompt")) == "Room A is free."
+        text = profiler.render_prometheus()
+    finally:
+        profiler.set_profiling_enabled(False)
+        profiler.reset_profiler()
+    assert requests[0]["stream_options"] == {"include_usage": True}
+    assert 'oe_llm_tokens_total{kind="prompt",provider="openai"} 21' in text
+    assert 'oe_llm_tokens_total{kind="completion",provider="openai"} 4' in text
+
+
+def test_chunk_payload_is_json_ready():
+    chunk = VerbalizerChunk(kind="delta", text="Hi. ", step=2, topic="date_candidates")
+    assert json.loads(json.dumps(chunk.to_payload())) == {
+        "kind": "delta",
+        "text": "Hi. ",
+        "step": 2,
+        "topic": "date_candidates",
+    }
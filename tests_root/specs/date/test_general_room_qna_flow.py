@@ -45,7 +45,7 @@ def test_general_room_qna_path(monkeypatch, tmp_path):
     appropriate candidate dates from the mocked availability service.
     """
     monkeypatch.setenv("DEBUG_TRACE", "1")
-    BUS._buf.clear()  # type: ignore[attr-defined]
+    BUS.clear()
 
     state = _state(tmp_path)
     event_entry = {
@@ -26,7 +26,7 @@ def _state(tmp_path: Path) -> WorkflowState:
 
 def test_vague_month_weekday_enumeration(monkeypatch, tmp_path):
     monkeypatch.setenv("DEBUG_TRACE", "1")
-    BUS._buf.clear()  # type: ignore[attr-defined]
+    BUS.clear()
 
     deterministic = [
         date(2026, 2, 7),
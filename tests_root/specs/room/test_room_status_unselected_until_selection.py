@@ -6,7 +6,7 @@ from debug.trace import BUS
 
 def test_room_status_transitions(monkeypatch):
     monkeypatch.setenv("DEBUG_TRACE", "1")
-    BUS._buf.clear()  # type: ignore[attr-defined]
+    BUS.clear()
     thread_id = "room-status-thread"
 
     trace_state(
@@ -49,4 +49,4 @@ def test_room_status_transitions(monkeypatch):
     if counters:
         assert counters.get("met") == counters.get("total") == 3
 
-    BUS._buf.clear()  # type: ignore[attr-defined]
+    BUS.clear()
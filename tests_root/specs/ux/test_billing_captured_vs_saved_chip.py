@@ -6,7 +6,7 @@ from debug.trace import BUS
 
 def test_billing_tracked_info(monkeypatch):
     monkeypatch.setenv("DEBUG_TRACE", "1")
-    BUS._buf.clear()  # type: ignore[attr-defined]
+    BUS.clear()
     thread_id = "billing-info-thread"
 
     trace_state(
@@ -41,4 +41,4 @@ def test_billing_tracked_info(monkeypatch):
     assert tracked_latest.get("billing_address_saved") is True
     assert "billing_address_captured_raw" not in tracked_latest
 
-    BUS._buf.clear()  # type: ignore[attr-defined]
+    BUS.clear()
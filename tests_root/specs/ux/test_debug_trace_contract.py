@@ -19,7 +19,7 @@ def _reset_bus(thread_id: str) -> None:
     from debug.trace import BUS
 
     try:
-        BUS._buf.pop(thread_id, None)  # type: ignore[attr-defined]
+        BUS.drop(thread_id)
     except AttributeError:
         pass
 
@@ -31,6 +31,13 @@ def loads(data: str | bytes, *, parse_float=None, parse_int=None, parse_constant
     )
 
 
+def _builtin(obj: Any) -> Any:
+    for base in (dict, list, str, int):
+        if isinstance(obj, base):
+            return base(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 def dumps(
     obj: Any,
     *,
@@ -42,10 +49,13 @@ def dumps(
     """Serialize JSON, delegating to `orjson` when parameters permit."""
 
     if orjson is not None and indent is None and separators is None and ensure_ascii:
-        option = 0
+        # orjson reads dict/list subclasses straight from their C storage;
+        # route them through ``_builtin`` so overridden accessors (e.g. the
+        # sharded store's lazily parsed records) are honoured.
+        option = orjson.OPT_PASSTHROUGH_SUBCLASS  # type: ignore[attr-defined]
         if sort_keys:
             option |= orjson.OPT_SORT_KEYS  # type: ignore[attr-defined]
-        return orjson.dumps(obj, option=option).decode("utf-8")  # type: ignore[no-any-return]
+        return orjson.dumps(obj, option=option, default=_builtin).decode("utf-8")  # type: ignore[no-any-return]
     return json.dumps(obj, indent=indent, sort_keys=sort_keys, ensure_ascii=ensure_ascii, separators=separators)
 
 
@@ -8,22 +8,36 @@ we store a snapshot so that:
 3. Same data source as verbalizer ensures consistency
 
 Storage backends:
-- JSON file (default): Local storage, suitable for single-worker deployments
+- SQLite file (default): one row per snapshot, indexed by id, expiry and
+  event. Creating or reading a snapshot touches only that row, and WAL mode
+  lets every worker process on the host share the file. Inserts trim the
+  store to ``MAX_SNAPSHOTS``; a background sweeper removes expired rows, and
+  reads also check expiry, so correctness never depends on the sweeper
 - Supabase (OE_INTEGRATION_MODE=supabase): Database storage for multi-worker deployments
+
+The former ``snapshots.json`` store is imported once when the SQLite file is
+first opened.
+
+ENVIRONMENT:
+    PAGE_SNAPSHOT_SWEEP_SECONDS   Interval of the expiry sweeper (default: 600)
 """
 
 from __future__ import annotations
 
-import hashlib
+import logging
 import os
+import sqlite3
+import threading
 import time
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from utils import json_io
 
+logger = logging.getLogger(__name__)
+
 
 def _use_supabase() -> bool:
     """Check if Supabase snapshots are enabled (lazy import to avoid circular deps)."""
@@ -33,12 +47,13 @@ def _use_supabase() -> bool:
     except ImportError:
         return False
 
-# Snapshot storage location
 # Snapshot storage location
 if os.getenv("VERCEL") == "1":
     SNAPSHOTS_DIR = Path("/tmp/page_snapshots")
 else:
     SNAPSHOTS_DIR = Path(__file__).resolve().parent.parent / "tmp-cache" / "page_snapshots"
+SNAPSHOTS_DB = SNAPSHOTS_DIR / "snapshots.sqlite3"
+# Legacy whole-file store, imported into SNAPSHOTS_DB once
 SNAPSHOTS_FILE = SNAPSHOTS_DIR / "snapshots.json"
 
 # Default TTL by snapshot type
@@ -52,64 +67,244 @@ TTL_BY_TYPE = {
     "products": 7,     # Product/catering info (event-specific)
 }
 
-# Maximum snapshots to keep (cleanup old ones)
+# Maximum snapshots to keep (enforced on insert; the sweeper re-checks)
 MAX_SNAPSHOTS = 500
 
+SWEEP_INTERVAL_SECONDS = float(os.getenv("PAGE_SNAPSHOT_SWEEP_SECONDS", "") or 600)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS page_snapshots (
+    snapshot_id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    event_id TEXT,
+    created_at TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    params TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_page_snapshots_expires_at ON page_snapshots (expires_at);
+CREATE INDEX IF NOT EXISTS idx_page_snapshots_created_at ON page_snapshots (created_at);
+CREATE INDEX IF NOT EXISTS idx_page_snapshots_event_id ON page_snapshots (event_id);
+CREATE TABLE IF NOT EXISTS page_snapshots_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
 
-def _ensure_dir() -> None:
-    """Create snapshots directory if it doesn't exist."""
-    SNAPSHOTS_DIR.mkdir(parents=True, exist_ok=True)
+_COLUMNS = "snapshot_id, type, event_id, created_at, expires_at, params, data"
+
+
+class SnapshotStore:
+    """SQLite table of snapshots with per-thread connections."""
+
+    def __init__(self, path: Path, legacy_path: Optional[Path] = None) -> None:
+        self.path = Path(path)
+        self.legacy_path = legacy_path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._init_lock:
+            if not self._initialized:
+                conn.executescript(_SCHEMA)
+                self._import_legacy(conn)
+                self._initialized = True
+        self._local.conn = conn
+        return conn
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> None:
+        """Copy live entries of the old snapshots.json (once per database)."""
+
+        if self.legacy_path is None or not self.legacy_path.exists():
+            return
+        if conn.execute("SELECT 1 FROM page_snapshots_meta WHERE key = 'legacy_imported'").fetchone():
+            return
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                legacy = (json_io.load(f) or {}).get("snapshots", {})
+        except Exception as exc:
+            logger.warning("[SNAPSHOTS] Could not read legacy store %s: %s", self.legacy_path, exc)
+            legacy = {}
+        now = datetime.utcnow().isoformat()
+        rows = [
+            _row(snapshot)
+            for snapshot in legacy.values()
+            if isinstance(snapshot, dict) and snapshot.get("snapshot_id") and (snapshot.get("expires_at") or "") > now
+        ]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not conn.execute("SELECT 1 FROM page_snapshots_meta WHERE key = 'legacy_imported'").fetchone():
+                conn.executemany(f"INSERT OR IGNORE INTO page_snapshots ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.execute("INSERT INTO page_snapshots_meta (key, value) VALUES ('legacy_imported', ?)", (now,))
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        if rows:
+            logger.info("[SNAPSHOTS] Imported %d snapshots from %s", len(rows), self.legacy_path)
+
+    def put(self, snapshot: Dict[str, Any], keep: Optional[int] = None) -> None:
+        """Insert ``snapshot``; with ``keep``, drop the oldest beyond it in the same transaction."""
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                f"INSERT OR REPLACE INTO page_snapshots ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                _row(snapshot),
+            )
+            if keep is not None:
+                self.trim(keep)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            f"SELECT {_COLUMNS} FROM page_snapshots WHERE snapshot_id = ?", (snapshot_id,)
+        ).fetchone()
+        return _snapshot(row) if row else None
+
+    def list(self, snapshot_type: Optional[str], event_id: Optional[str], now: str, limit: int) -> List[Dict[str, Any]]:
+        clauses, args = ["expires_at > ?"], [now]
+        if snapshot_type:
+            clauses.append("type = ?")
+            args.append(snapshot_type)
+        if event_id:
+            clauses.append("event_id = ?")
+            args.append(event_id)
+        rows = self._conn().execute(
+            "SELECT snapshot_id, type, created_at, expires_at, event_id, params FROM page_snapshots "
+            f"WHERE {' AND '.join(clauses)} ORDER BY created_at DESC LIMIT ?",
+            (*args, max(0, limit)),
+        ).fetchall()
+        return [
+            {
+                "snapshot_id": row[0],
+                "type": row[1],
+                "created_at": row[2],
+                "expires_at": row[3],
+                "event_id": row[4],
+                "params": json_io.loads(row[5]),
+            }
+            for row in rows
+        ]
+
+    def delete(self, snapshot_id: str) -> bool:
+        return self._conn().execute("DELETE FROM page_snapshots WHERE snapshot_id = ?", (snapshot_id,)).rowcount > 0
+
+    def delete_for_event(self, event_id: str) -> int:
+        return self._conn().execute("DELETE FROM page_snapshots WHERE event_id = ?", (event_id,)).rowcount
+
+    def delete_expired(self, now: str) -> int:
+        return self._conn().execute("DELETE FROM page_snapshots WHERE expires_at <= ?", (now,)).rowcount
+
+    def trim(self, keep: int) -> int:
+        """Drop the oldest snapshots beyond ``keep``."""
+
+        return self._conn().execute(
+            "DELETE FROM page_snapshots WHERE created_at < ("
+            "SELECT created_at FROM page_snapshots ORDER BY created_at DESC LIMIT 1 OFFSET ?)",
+            (max(0, keep - 1),),
+        ).rowcount
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM page_snapshots").fetchone()[0]
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _row(snapshot: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        snapshot["snapshot_id"],
+        snapshot.get("type") or "",
+        snapshot.get("event_id"),
+        snapshot.get("created_at") or "",
+        snapshot.get("expires_at") or "",
+        json_io.dumps(snapshot.get("params") or {}),
+        json_io.dumps(snapshot.get("data")),
+    )
 
 
-def _load_snapshots() -> Dict[str, Any]:
-    """Load snapshots from storage file."""
-    _ensure_dir()
-    if not SNAPSHOTS_FILE.exists():
-        return {"snapshots": {}}
-    try:
-        with open(SNAPSHOTS_FILE, "r", encoding="utf-8") as f:
-            return json_io.load(f)
-    except Exception:
-        return {"snapshots": {}}
+def _snapshot(row: Tuple[Any, ...]) -> Dict[str, Any]:
+    return {
+        "snapshot_id": row[0],
+        "type": row[1],
+        "created_at": row[3],
+        "expires_at": row[4],
+        "event_id": row[2],
+        "params": json_io.loads(row[5]),
+        "data": json_io.loads(row[6]),
+    }
 
 
-def _save_snapshots(data: Dict[str, Any]) -> None:
-    """Save snapshots to storage file."""
-    _ensure_dir()
-    with open(SNAPSHOTS_FILE, "w", encoding="utf-8") as f:
-        json_io.dump(data, f, indent=2)
+_STORE: Optional[SnapshotStore] = None
+_STORE_LOCK = threading.Lock()
+# One sweeper per database file, bound to the store it was started for
+_SWEEPERS: Dict[Path, threading.Thread] = {}
 
 
-def _generate_snapshot_id() -> str:
-    """Generate a unique snapshot ID."""
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    unique = uuid.uuid4().hex[:8]
-    return f"snap_{timestamp}_{unique}"
+def _store() -> SnapshotStore:
+    """Store for the current ``SNAPSHOTS_DB`` (reopened if the path changes)."""
 
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None or _STORE.path != SNAPSHOTS_DB:
+            if _STORE is not None:
+                _STORE.close()
+            _STORE = SnapshotStore(SNAPSHOTS_DB, legacy_path=SNAPSHOTS_FILE)
+        return _STORE
 
-def _cleanup_expired(snapshots: Dict[str, Any]) -> Dict[str, Any]:
-    """Remove expired snapshots."""
-    now = datetime.utcnow().isoformat()
-    active = {}
-    for snap_id, snap_data in snapshots.items():
-        expires_at = snap_data.get("expires_at", "")
-        if expires_at and expires_at > now:
-            active[snap_id] = snap_data
-    return active
 
+def _sweep_forever(store: SnapshotStore) -> None:
+    while True:
+        try:
+            sweep_snapshots(store)
+        except Exception as exc:  # keep sweeping after transient errors
+            logger.debug("[SNAPSHOTS] Sweep failed: %s", exc)
+        time.sleep(SWEEP_INTERVAL_SECONDS)
 
-def _cleanup_overflow(snapshots: Dict[str, Any]) -> Dict[str, Any]:
-    """Remove oldest snapshots if exceeding MAX_SNAPSHOTS."""
-    if len(snapshots) <= MAX_SNAPSHOTS:
-        return snapshots
 
-    # Sort by created_at and keep newest
-    sorted_snaps = sorted(
-        snapshots.items(),
-        key=lambda x: x[1].get("created_at", ""),
-        reverse=True
-    )
-    return dict(sorted_snaps[:MAX_SNAPSHOTS])
+def _ensure_sweeper(store: SnapshotStore) -> None:
+    """Start the background expiry sweeper for ``store`` on first local use."""
+
+    if store.path in _SWEEPERS:
+        return
+    with _STORE_LOCK:
+        if store.path not in _SWEEPERS:
+            sweeper = threading.Thread(
+                target=_sweep_forever, args=(store,), name="page-snapshot-sweeper", daemon=True
+            )
+            _SWEEPERS[store.path] = sweeper
+            sweeper.start()
+
+
+def sweep_snapshots(store: Optional[SnapshotStore] = None) -> Dict[str, int]:
+    """Remove expired snapshots and trim the store to ``MAX_SNAPSHOTS``."""
+
+    store = store or _store()
+    expired = store.delete_expired(datetime.utcnow().isoformat())
+    overflow = store.trim(MAX_SNAPSHOTS)
+    if expired or overflow:
+        logger.debug("[SNAPSHOTS] Swept %d expired and %d overflow snapshots", expired, overflow)
+    return {"expired": expired, "overflow": overflow}
+
+
+def _generate_snapshot_id() -> str:
+    """Generate a unique snapshot ID."""
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    unique = uuid.uuid4().hex[:8]
+    return f"snap_{timestamp}_{unique}"
 
 
 def create_snapshot(
@@ -149,13 +344,6 @@ def create_snapshot(
             ttl_days=ttl_days,
         )
 
-    storage = _load_snapshots()
-    snapshots = storage.get("snapshots", {})
-
-    # Cleanup expired and overflow
-    snapshots = _cleanup_expired(snapshots)
-    snapshots = _cleanup_overflow(snapshots)
-
     # Generate new snapshot
     snapshot_id = _generate_snapshot_id()
     now = datetime.utcnow()
@@ -171,9 +359,9 @@ def create_snapshot(
         "data": data,
     }
 
-    snapshots[snapshot_id] = snapshot
-    storage["snapshots"] = snapshots
-    _save_snapshots(storage)
+    store = _store()
+    store.put(snapshot, keep=MAX_SNAPSHOTS)
+    _ensure_sweeper(store)
 
     return snapshot_id
 
@@ -189,14 +377,15 @@ def get_snapshot(snapshot_id: str) -> Optional[Dict[str, Any]]:
         from workflows.io.integration import supabase_snapshots
         return supabase_snapshots.get_snapshot(snapshot_id)
 
-    storage = _load_snapshots()
-    snapshots = storage.get("snapshots", {})
-
-    snapshot = snapshots.get(snapshot_id)
+    try:
+        snapshot = _store().get(snapshot_id)
+    except sqlite3.Error as exc:
+        logger.warning("[SNAPSHOTS] Lookup of %s failed: %s", snapshot_id, exc)
+        return None
     if not snapshot:
         return None
 
-    # Check expiration
+    # Check expiration (the sweeper may not have run yet)
     expires_at = snapshot.get("expires_at", "")
     if expires_at and expires_at < datetime.utcnow().isoformat():
         return None
@@ -240,32 +429,7 @@ def list_snapshots(
             limit=limit,
         )
 
-    storage = _load_snapshots()
-    snapshots = storage.get("snapshots", {})
-
-    # Cleanup expired first
-    snapshots = _cleanup_expired(snapshots)
-
-    results = []
-    for snap_id, snap_data in snapshots.items():
-        if snapshot_type and snap_data.get("type") != snapshot_type:
-            continue
-        if event_id and snap_data.get("event_id") != event_id:
-            continue
-
-        # Return metadata only
-        results.append({
-            "snapshot_id": snap_data.get("snapshot_id"),
-            "type": snap_data.get("type"),
-            "created_at": snap_data.get("created_at"),
-            "expires_at": snap_data.get("expires_at"),
-            "event_id": snap_data.get("event_id"),
-            "params": snap_data.get("params"),
-        })
-
-    # Sort by created_at descending
-    results.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-    return results[:limit]
+    return _store().list(snapshot_type, event_id, datetime.utcnow().isoformat(), limit)
 
 
 def delete_snapshot(snapshot_id: str) -> bool:
@@ -275,15 +439,7 @@ def delete_snapshot(snapshot_id: str) -> bool:
         from workflows.io.integration import supabase_snapshots
         return supabase_snapshots.delete_snapshot(snapshot_id)
 
-    storage = _load_snapshots()
-    snapshots = storage.get("snapshots", {})
-
-    if snapshot_id in snapshots:
-        del snapshots[snapshot_id]
-        storage["snapshots"] = snapshots
-        _save_snapshots(storage)
-        return True
-    return False
+    return _store().delete(snapshot_id)
 
 
 def cleanup_all_expired() -> int:
@@ -297,15 +453,7 @@ def cleanup_all_expired() -> int:
         from workflows.io.integration import supabase_snapshots
         return supabase_snapshots.cleanup_all_expired()
 
-    storage = _load_snapshots()
-    snapshots = storage.get("snapshots", {})
-    original_count = len(snapshots)
-
-    snapshots = _cleanup_expired(snapshots)
-    storage["snapshots"] = snapshots
-    _save_snapshots(storage)
-
-    return original_count - len(snapshots)
+    return _store().delete_expired(datetime.utcnow().isoformat())
 
 
 def delete_snapshots_for_event(event_id: str) -> int:
@@ -326,23 +474,7 @@ def delete_snapshots_for_event(event_id: str) -> int:
         from workflows.io.integration import supabase_snapshots
         return supabase_snapshots.delete_snapshots_for_event(event_id)
 
-    storage = _load_snapshots()
-    snapshots = storage.get("snapshots", {})
-
-    # Find and remove snapshots for this event
-    to_delete = [
-        snap_id for snap_id, snap_data in snapshots.items()
-        if snap_data.get("event_id") == event_id
-    ]
-
-    for snap_id in to_delete:
-        del snapshots[snap_id]
-
-    if to_delete:
-        storage["snapshots"] = snapshots
-        _save_snapshots(storage)
-
-    return len(to_delete)
+    return _store().delete_for_event(event_id)
 
 
 __all__ = [
@@ -353,4 +485,5 @@ __all__ = [
     "delete_snapshot",
     "delete_snapshots_for_event",
     "cleanup_all_expired",
+    "sweep_snapshots",
 ]
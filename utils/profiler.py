@@ -1,40 +1,336 @@
-"""Minimal profiling decorator gated by the `OE_PERF` environment flag."""
+"""Hierarchical span profiler gated by the `OE_PERF` environment flag.
+
+Spans nest through a context variable, so a turn's tree follows the call
+stack (and threads that copy the context, such as the turn executor and
+``run_concurrently``)::
+
+    with span("db.load", path=str(path)):
+        ...
+
+    @profile_step("workflow.step3.room_availability")
+    def process(state): ...
+
+Every finished span feeds a per-name latency histogram (log-linear buckets,
+~3% relative error, constant memory). When the outermost span of a turn
+finishes, its tree is logged as ``[PERF]`` lines if it took at least
+``OE_PERF_SLOW_MS`` (default 0). ``render_prometheus()`` exports the
+percentiles and counters in the Prometheus text format (``/api/metrics``).
+
+Disabled (the default), ``span()`` returns a shared no-op context and
+``profile_step`` calls straight through: one global flag check per call.
+"""
 
 from __future__ import annotations
 
 import logging
 import os
+import threading
+from contextvars import ContextVar
 from functools import wraps
 from time import perf_counter
-from typing import Any, Callable, TypeVar, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, cast
 
 logger = logging.getLogger(__name__)
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+_ENABLED = os.environ.get("OE_PERF", "0") == "1"
+_SLOW_MS = float(os.environ.get("OE_PERF_SLOW_MS", "0") or 0)
+
+# Sub-bucket resolution: 2**_SUB_BITS values per power of two (~3% error)
+_SUB_BITS = 6
+_HALF = 1 << (_SUB_BITS - 1)
+_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def profiling_enabled() -> bool:
+    """Whether spans are being collected."""
+    return _ENABLED
+
+
+def set_profiling_enabled(enabled: bool) -> None:
+    """Turn span collection on or off at runtime (``OE_PERF`` sets the default)."""
+
+    global _ENABLED
+    _ENABLED = bool(enabled)
+
+
+# ---------------------------------------------------------------------------
+# Histograms
+# ---------------------------------------------------------------------------
+
+
+def _bucket_index(value: int) -> int:
+    if value < 2 * _HALF:
+        return value
+    shift = value.bit_length() - _SUB_BITS
+    return shift * _HALF + (value >> shift)
+
+
+def _bucket_midpoint(index: int) -> float:
+    if index < 2 * _HALF:
+        return float(index)
+    shift = index // _HALF - 1
+    top = index - shift * _HALF
+    return ((top << shift) + ((top + 1) << shift) - 1) / 2.0
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram over microseconds (HDR-style)."""
+
+    __slots__ = ("counts", "count", "total_us", "min_us", "max_us")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = []
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def record(self, duration_ms: float) -> None:
+        value = max(0, int(duration_ms * 1000.0))
+        index = _bucket_index(value)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        if not self.count or value < self.min_us:
+            self.min_us = value
+        if value > self.max_us:
+            self.max_us = value
+        self.count += 1
+        self.total_us += value
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency in ms at ``pct`` (0-100), None when empty."""
+
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * pct // 100))
+        if rank >= self.count:
+            return self.max_us / 1000.0
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                value = min(max(_bucket_midpoint(index), self.min_us), self.max_us)
+                return value / 1000.0
+        return self.max_us / 1000.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_ms": round(self.total_us / 1000.0, 3),
+            "min_ms": self.min_us / 1000.0 if self.count else None,
+            "max_ms": self.max_us / 1000.0 if self.count else None,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+_REGISTRY_LOCK = threading.Lock()
+_HISTOGRAMS: Dict[str, LatencyHistogram] = {}
+_COUNTERS: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+
+def _record(name: str, duration_ms: float) -> None:
+    with _REGISTRY_LOCK:
+        histogram = _HISTOGRAMS.get(name)
+        if histogram is None:
+            histogram = _HISTOGRAMS[name] = LatencyHistogram()
+        histogram.record(duration_ms)
+
+
+def count(name: str, amount: float = 1, **labels: Any) -> None:
+    """Add ``amount`` to a labelled counter (no-op when profiling is off)."""
+
+    if not _ENABLED:
+        return
+    key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+    with _REGISTRY_LOCK:
+        _COUNTERS[key] = _COUNTERS.get(key, 0) + amount
+
+
+def span_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-span latency summaries (count, sum, min/max, p50/p90/p95/p99 in ms)."""
+
+    with _REGISTRY_LOCK:
+        return {name: histogram.summary() for name, histogram in sorted(_HISTOGRAMS.items())}
+
+
+def reset_profiler() -> None:
+    """Drop all recorded histograms and counters."""
 
-def _perf_enabled() -> bool:
-    return os.environ.get("OE_PERF", "0") == "1"
+    with _REGISTRY_LOCK:
+        _HISTOGRAMS.clear()
+        _COUNTERS.clear()
+
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+
+class Span:
+    """One timed region; children and attributes are collected on the root."""
+
+    __slots__ = ("name", "attrs", "parent", "depth", "start", "duration_ms", "_tree", "_token")
+
+    def __init__(self, name: str, attrs: Dict[str, Any]) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.parent: Optional[Span] = None
+        self.depth = 0
+        self.start = 0.0
+        self.duration_ms = 0.0
+        self._tree: Optional[List[Span]] = None
+        self._token: Any = None
+
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes (token counts, step numbers, ...) to this span."""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        parent = _current.get()
+        if parent is not None:
+            self.parent = parent
+            self.depth = parent.depth + 1
+            self._tree = parent._tree
+        else:
+            self._tree = []
+        self._tree.append(self)
+        self._token = _current.set(self)
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.duration_ms = (perf_counter() - self.start) * 1000.0
+        try:
+            _current.reset(self._token)
+        except ValueError:
+            # Exited in another context (e.g. a generator closed elsewhere)
+            _current.set(self.parent)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _record(self.name, self.duration_ms)
+        if self.parent is None and self.duration_ms >= _SLOW_MS:
+            logger.info("[PERF] %s", format_span_tree(self._tree or [self]))
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs: Any) -> None:
+        return None
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+_current: ContextVar[Optional[Span]] = ContextVar("profiler_span", default=None)
+
+
+def span(name: str, **attrs: Any) -> Any:
+    """Context manager timing ``name`` as a child of the current span."""
+
+    if not _ENABLED:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def current_span() -> Any:
+    """The innermost open span, or a no-op span (safe to call ``set`` on)."""
+
+    if not _ENABLED:
+        return _NOOP
+    return _current.get() or _NOOP
+
+
+def format_span_tree(spans: List[Span]) -> str:
+    """Render spans (in start order) as an indented ``name: x ms`` tree."""
+
+    lines = []
+    for item in spans:
+        attrs = " ".join(f"{key}={value}" for key, value in item.attrs.items())
+        lines.append(f"{'  ' * item.depth}{item.name}: {item.duration_ms:.1f} ms{' ' + attrs if attrs else ''}")
+    return "\n".join(lines)
 
 
 def profile_step(name: str) -> Callable[[F], F]:
-    """Decorate a function to emit a `[PERF]` timing when `OE_PERF=1`."""
+    """Decorate a function to run inside ``span(name)`` when `OE_PERF=1`."""
 
     def decorator(fn: F) -> F:
         @wraps(fn)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            if not _perf_enabled():
+            if not _ENABLED:
                 return fn(*args, **kwargs)
-            start = perf_counter()
-            try:
+            with Span(name, {}):
                 return fn(*args, **kwargs)
-            finally:
-                duration_ms = (perf_counter() - start) * 1000.0
-                logger.info("[PERF] %s: %.1f ms", name, duration_ms)
 
         return cast(F, wrapper)
 
     return decorator
 
 
-__all__ = ["profile_step"]
+# ---------------------------------------------------------------------------
+# Prometheus export
+# ---------------------------------------------------------------------------
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs: Tuple[Tuple[str, str], ...]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in pairs) + "}"
+
+
+def render_prometheus() -> str:
+    """Span latency summaries and counters in the Prometheus text format."""
+
+    with _REGISTRY_LOCK:
+        histograms = [(name, histogram.summary(), [histogram.percentile(q * 100) for q in _QUANTILES])
+                      for name, histogram in sorted(_HISTOGRAMS.items())]
+        counters = sorted(_COUNTERS.items())
+
+    lines = [
+        "# HELP oe_span_duration_seconds Latency of profiled spans.",
+        "# TYPE oe_span_duration_seconds summary",
+    ]
+    for name, summary, quantiles in histograms:
+        label = _escape_label(name)
+        for quantile, value in zip(_QUANTILES, quantiles):
+            lines.append(f'oe_span_duration_seconds{{span="{label}",quantile="{quantile}"}} {value / 1000.0:.6f}')
+        lines.append(f'oe_span_duration_seconds_sum{{span="{label}"}} {summary["sum_ms"] / 1000.0:.6f}')
+        lines.append(f'oe_span_duration_seconds_count{{span="{label}"}} {summary["count"]}')
+
+    declared = set()
+    for (name, pairs), value in counters:
+        metric = f"oe_{name}_total"
+        if metric not in declared:
+            declared.add(metric)
+            lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric}{_labels(pairs)} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "LatencyHistogram",
+    "count",
+    "current_span",
+    "profiling_enabled",
+    "profile_step",
+    "render_prometheus",
+    "reset_profiler",
+    "set_profiling_enabled",
+    "span",
+    "span_stats",
+]
@@ -34,13 +34,16 @@ import logging
 import os
 import re
 import time
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from dateutil import parser as dateutil_parser
 
 from workflows.io.config_store import get_venue_name, get_venue_city
+from utils.profiler import profile_step
 
 logger = logging.getLogger(__name__)
 
@@ -429,29 +432,10 @@ def _contains_structured_content(text: str) -> bool:
 # Verbalizer Core
 # =============================================================================
 
-def verbalize_message(
-    fallback_text: str,
-    context: MessageContext,
-    *,
-    locale: str = "en",
-) -> str:
-    """
-    Verbalize any client-facing message using the universal verbalizer.
+def _bypass_reply(fallback_text: str, context: MessageContext) -> Optional[str]:
+    """Reply to use without calling the LLM, or None when verbalization runs.
 
-    This is the main entry point for all message verbalization. It:
-    1. Checks if empathetic mode is enabled
-    2. Builds an appropriate LLM prompt based on context
-    3. Calls the LLM
-    4. Verifies all hard facts are preserved
-    5. Returns LLM output or falls back to deterministic text
-
-    Args:
-        fallback_text: Deterministic template to use if verification fails
-        context: MessageContext with all facts and metadata
-        locale: Language locale (en or de)
-
-    Returns:
-        Verbalized text (LLM if valid, fallback otherwise)
+    Covers empty and structured templates, plain tone and a missing API key.
     """
     if not fallback_text or not fallback_text.strip():
         return fallback_text
@@ -488,6 +472,48 @@ def verbalize_message(
             topic=context.topic,
         )
         return wrap_fallback(fallback_text, ctx)
+    return None
+
+
+@profile_step("verbalizer.verbalize")
+def verbalize_message(
+    fallback_text: str,
+    context: MessageContext,
+    *,
+    locale: str = "en",
+) -> str:
+    """
+    Verbalize any client-facing message using the universal verbalizer.
+
+    This is the main entry point for all message verbalization. It:
+    1. Checks if empathetic mode is enabled
+    2. Builds an appropriate LLM prompt based on context
+    3. Calls the LLM
+    4. Verifies all hard facts are preserved
+    5. Returns LLM output or falls back to deterministic text
+
+    Args:
+        fallback_text: Deterministic template to use if verification fails
+        context: MessageContext with all facts and metadata
+        locale: Language locale (en or de)
+
+    Returns:
+        Verbalized text (LLM if valid, fallback otherwise)
+    """
+    bypass = _bypass_reply(fallback_text, context)
+    if bypass is not None:
+        return bypass
+
+    sink = _stream_sink.get()
+    if sink is not None:
+        final_text = fallback_text
+        for chunk in stream_verbalized_message(fallback_text, context, locale=locale):
+            sink(chunk)
+            if chunk.kind == "done":
+                final_text = chunk.text
+        return final_text
+
+    from core.fallback import create_fallback_context, wrap_fallback
 
     try:
         prompt_payload = _build_prompt(context, fallback_text, locale)
@@ -539,6 +565,7 @@ def verbalize_message(
                 f"universal_verbalizer: patching failed for step={context.step}, topic={context.topic}, using fallback. "
                 f"Missing: {verification[1]}, Invented: {verification[2]}",
             )
+            _discard_cached_draft(prompt_payload)
             # Return fallback directly - don't wrap with diagnostic block
             # The warning above provides debugging info in logs
             return fallback_text
@@ -747,10 +774,42 @@ def _format_facts_for_prompt(context: MessageContext) -> str:
     return "\n".join(lines) if lines else "No specific facts extracted."
 
 
+# Drafts are sampled at temperature 0.3, so a cached one only stands in for a
+# fresh completion briefly (retried or replayed turns), not for the cache's
+# default 7 days.
+_DRAFT_CACHE_TTL = float(os.getenv("VERBALIZER_CACHE_TTL_SECONDS", "600"))
+
+
+def _llm_cache_key(payload: Dict[str, Any]) -> Optional[str]:
+    """Response-cache key for a verbalization prompt (None for stub/fake adapters)."""
+    from adapters.agent_adapter import GeminiAgentAdapter, OpenAIAgentAdapter, get_adapter_for_provider
+    from llm.provider_config import get_verbalization_provider
+    from llm.response_cache import get_llm_cache
+
+    provider = get_verbalization_provider()
+    adapter = get_adapter_for_provider(provider)
+    if not isinstance(adapter, (OpenAIAgentAdapter, GeminiAgentAdapter)):
+        return None
+    return get_llm_cache().make_key(
+        "verbalizer",
+        provider,
+        getattr(adapter, "_intent_model", ""),
+        f"{payload['system']}\n{payload['user']}",
+    )
+
+
 def _call_llm(payload: Dict[str, Any]) -> str:
     """Call the LLM for verbalization using configured provider."""
     from adapters.agent_adapter import get_adapter_for_provider
     from llm.provider_config import get_verbalization_provider
+    from llm.response_cache import get_llm_cache
+
+    # Identical facts + prompt produce an equivalent draft; reuse a cached one
+    cache_key = _llm_cache_key(payload)
+    if cache_key is not None:
+        cached = get_llm_cache().get(cache_key, namespace="verbalizer")
+        if cached is not None:
+            return cached
 
     # Get the verbalization provider from config (hybrid mode support)
     provider = get_verbalization_provider()
@@ -761,12 +820,237 @@ def _call_llm(payload: Dict[str, Any]) -> str:
 
     # Call the adapter's complete method
     # Note: json_mode=False because verbalization outputs prose, not JSON
-    return adapter.complete(
+    text = adapter.complete(
         prompt=prompt,
         system_prompt=payload["system"],
         temperature=0.3,  # Slightly higher for natural variation
         json_mode=False,  # Verbalization outputs prose, not JSON
     )
+    if cache_key is not None and isinstance(text, str) and text.strip():
+        get_llm_cache().put(cache_key, text, namespace="verbalizer", ttl_seconds=_DRAFT_CACHE_TTL)
+    return text
+
+
+# =============================================================================
+# Streaming Verbalization
+# =============================================================================
+# The client sees the reply sentence by sentence instead of after the whole
+# completion. Invented facts (swapped units, unknown dates/amounts) are local
+# to one match, so each sentence is checked (and patched if possible) before
+# it is sent. Missing facts can only be judged on the full reply; they are
+# checked at the end, after which the sent text may still be replaced by a
+# patched reply or the deterministic template.
+
+
+@dataclass
+class VerbalizerChunk:
+    """One streaming event for a verbalized reply.
+
+    kind:
+        "delta"   - append ``text`` to the reply shown so far
+        "replace" - discard what was shown, show ``text`` instead
+        "done"    - final reply (what ``verbalize_message`` returns)
+    """
+
+    kind: str
+    text: str
+    step: int
+    topic: str
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "text": self.text, "step": self.step, "topic": self.topic}
+
+
+_stream_sink: ContextVar[Optional[Callable[[VerbalizerChunk], None]]] = ContextVar(
+    "verbalizer_stream_sink", default=None
+)
+
+# A sentence ends at . ! ? followed by whitespace, or at a line break
+_SENTENCE_BOUNDARY = re.compile(r"[.!?]+[\"')\]]*\s+|\n+")
+
+
+@contextmanager
+def verbalizer_stream(sink: Callable[[VerbalizerChunk], None]) -> Iterator[None]:
+    """Stream every ``verbalize_message`` call in this context to ``sink``.
+
+    ``verbalize_message`` still returns the final text, so callers are
+    unchanged; the sink additionally receives the chunks as they are verified.
+    """
+    token = _stream_sink.set(sink)
+    try:
+        yield
+    finally:
+        _stream_sink.reset(token)
+
+
+def _split_sentences(buffer: str) -> Tuple[List[str], str]:
+    """Split complete sentences (with their trailing whitespace) off ``buffer``."""
+    sentences: List[str] = []
+    start = 0
+    for match in _SENTENCE_BOUNDARY.finditer(buffer):
+        sentences.append(buffer[start:match.end()])
+        start = match.end()
+    return sentences, buffer[start:]
+
+
+def _check_sentence(sentence: str, hard_facts: Dict[str, List[str]]) -> Optional[str]:
+    """The sentence (patched if needed) when it invents no facts, else None."""
+    invented = _find_invented_facts(sentence, hard_facts)
+    if not invented:
+        return sentence
+    # The patcher uses the missing facts to add units to bare prices
+    _, missing, _ = _verify_facts(sentence, hard_facts)
+    patched, changed = _apply_patches(sentence, hard_facts, missing, invented)
+    if changed and not _find_invented_facts(patched, hard_facts):
+        return patched
+    logger.warning("universal_verbalizer: invented facts mid-stream: %s", invented)
+    return None
+
+
+def _stream_llm(payload: Dict[str, Any]) -> Iterator[str]:
+    """Stream the verbalization completion (a cached draft arrives in one piece)."""
+    from adapters.agent_adapter import get_adapter_for_provider
+    from llm.provider_config import get_verbalization_provider
+    from llm.response_cache import get_llm_cache
+
+    cache_key = _llm_cache_key(payload)
+    if cache_key is not None:
+        cached = get_llm_cache().get(cache_key, namespace="verbalizer")
+        if cached is not None:
+            yield cached
+            return
+
+    adapter = get_adapter_for_provider(get_verbalization_provider())
+    pieces: List[str] = []
+    for piece in adapter.stream_complete(
+        payload["user"],
+        system_prompt=payload["system"],
+        temperature=0.3,
+    ):
+        pieces.append(piece)
+        yield piece
+    # Only a fully received completion is cached
+    text = "".join(pieces)
+    if cache_key is not None and text.strip():
+        get_llm_cache().put(cache_key, text, namespace="verbalizer", ttl_seconds=_DRAFT_CACHE_TTL)
+
+
+def _discard_cached_draft(payload: Dict[str, Any]) -> None:
+    """Don't keep serving a draft that failed verification from the cache."""
+    cache_key = _llm_cache_key(payload)
+    if cache_key is not None:
+        from llm.response_cache import get_llm_cache
+
+        get_llm_cache().discard(cache_key)
+
+
+def stream_verbalized_message(
+    fallback_text: str,
+    context: MessageContext,
+    *,
+    locale: str = "en",
+) -> Iterator[VerbalizerChunk]:
+    """
+    Streaming form of ``verbalize_message``.
+
+    Yields "delta" chunks for verified sentences as the LLM produces them,
+    a "replace" chunk if the reply must be swapped for a patched reply or the
+    deterministic template, and always ends with one "done" chunk holding the
+    final text.
+    """
+    from core.fallback import create_fallback_context, wrap_fallback
+
+    def _chunk(kind: str, text: str) -> VerbalizerChunk:
+        return VerbalizerChunk(kind=kind, text=text, step=context.step, topic=context.topic)
+
+    bypass = _bypass_reply(fallback_text, context)
+    if bypass is not None:
+        yield _chunk("done", bypass)
+        return
+
+    hard_facts = context.extract_hard_facts()
+    sent: List[str] = []
+    started = time.perf_counter()
+    prompt_payload: Optional[Dict[str, Any]] = None
+    try:
+        prompt_payload = _build_prompt(context, fallback_text, locale)
+        pending = ""
+        with closing(_stream_llm(prompt_payload)) as pieces:
+            for piece in pieces:
+                sentences, pending = _split_sentences(pending + piece)
+                for sentence in sentences:
+                    checked = _check_sentence(sentence, hard_facts)
+                    if checked is None:
+                        _discard_cached_draft(prompt_payload)
+                        yield _chunk("replace", fallback_text)
+                        yield _chunk("done", fallback_text)
+                        return
+                    if not sent:
+                        logger.debug(
+                            "universal_verbalizer: first sentence after %.0f ms (step=%s, topic=%s)",
+                            (time.perf_counter() - started) * 1000,
+                            context.step,
+                            context.topic,
+                        )
+                    sent.append(checked)
+                    yield _chunk("delta", checked)
+        if pending:
+            checked = _check_sentence(pending, hard_facts)
+            if checked is None:
+                _discard_cached_draft(prompt_payload)
+                yield _chunk("replace", fallback_text)
+                yield _chunk("done", fallback_text)
+                return
+            sent.append(checked)
+            yield _chunk("delta", checked)
+    except Exception as exc:
+        ctx = create_fallback_context(
+            source="ux.verbalizer",
+            trigger="llm_call_failed",
+            step=context.step,
+            topic=context.topic,
+            error=exc,
+        )
+        fallback = wrap_fallback(fallback_text, ctx)
+        yield _chunk("replace", fallback)
+        yield _chunk("done", fallback)
+        return
+
+    llm_text = "".join(sent)
+    if not llm_text.strip():
+        ctx = create_fallback_context(
+            source="ux.verbalizer",
+            trigger="empty_llm_response",
+            step=context.step,
+            topic=context.topic,
+        )
+        fallback = wrap_fallback(fallback_text, ctx)
+        yield _chunk("replace", fallback)
+        yield _chunk("done", fallback)
+        return
+
+    verification = _verify_facts(llm_text, hard_facts, topic=context.topic)
+    if verification[0]:
+        yield _chunk("done", llm_text)
+        return
+
+    patched_text, patch_success = _patch_facts(llm_text, hard_facts, verification[1], verification[2])
+    if patch_success:
+        logger.info(
+            f"universal_verbalizer: patched streamed reply for step={context.step}, topic={context.topic}"
+        )
+        yield _chunk("replace", patched_text)
+        yield _chunk("done", patched_text)
+        return
+
+    logger.warning(
+        f"universal_verbalizer: streamed reply failed verification for step={context.step}, "
+        f"topic={context.topic}, using fallback. Missing: {verification[1]}, Invented: {verification[2]}",
+    )
+    if prompt_payload is not None:
+        _discard_cached_draft(prompt_payload)
+    yield _chunk("replace", fallback_text)
+    yield _chunk("done", fallback_text)
 
 
 # =============================================================================
@@ -1036,6 +1320,25 @@ def _verify_facts(
         if not unit_found:
             missing.append(f"unit:{unit}")
 
+    invented.extend(_find_invented_facts(llm_text, hard_facts))
+
+    ok = len(missing) == 0 and len(invented) == 0
+    return (ok, missing, invented)
+
+
+def _find_invented_facts(llm_text: str, hard_facts: Dict[str, List[str]]) -> List[str]:
+    """
+    Facts in the LLM output that are not in the source: swapped units, dates
+    and CHF amounts that match no expected value.
+
+    Every check looks at one match in the text, so running it sentence by
+    sentence finds the same facts as running it on the whole reply.
+    """
+    invented: List[str] = []
+    text_lower = llm_text.lower()
+    text_no_apostrophe = llm_text.replace("'", "")
+    input_units = set(hard_facts.get("units", []))
+
     # Check for unit swaps (invented wrong unit)
     has_per_event = "per event" in input_units
     has_per_person = "per person" in input_units
@@ -1136,8 +1439,7 @@ def _verify_facts(
                 if not is_close:
                     invented.append(f"amount:CHF {found_amount}")
 
-    ok = len(missing) == 0 and len(invented) == 0
-    return (ok, missing, invented)
+    return invented
 
 
 def _patch_facts(
@@ -1163,6 +1465,37 @@ def _patch_facts(
         the fixed text. If patching isn't possible, returns original text
         with success=False.
     """
+    patched, patched_something = _apply_patches(llm_text, hard_facts, missing, invented)
+
+    # --- Verify the patch worked ---
+    if patched_something:
+        # Re-verify after patching
+        new_verification = _verify_facts(patched, hard_facts)
+        if new_verification[0]:  # All facts now correct
+            logger.info("_patch_facts: successfully patched LLM output")
+            return (patched, True)
+        else:
+            # Patching didn't fully fix it
+            logger.warning(
+                "_patch_facts: patching incomplete",
+                extra={"still_missing": new_verification[1], "still_invented": new_verification[2]},
+            )
+            return (patched, False)
+
+    # Nothing to patch or couldn't patch
+    return (llm_text, False)
+
+
+def _apply_patches(
+    llm_text: str,
+    hard_facts: Dict[str, List[str]],
+    missing: List[str],
+    invented: List[str],
+) -> Tuple[str, bool]:
+    """Apply the unit and amount fixes of ``_patch_facts`` without re-verifying.
+
+    Returns (text, whether anything was changed).
+    """
     patched = llm_text
     patched_something = False
 
@@ -1236,23 +1569,7 @@ def _patch_facts(
             patched_something = True
             logger.debug(f"_patch_facts: fixed amount CHF {wrong_amount} -> {correct_amount}")
 
-    # --- Verify the patch worked ---
-    if patched_something:
-        # Re-verify after patching
-        new_verification = _verify_facts(patched, hard_facts)
-        if new_verification[0]:  # All facts now correct
-            logger.info("_patch_facts: successfully patched LLM output")
-            return (patched, True)
-        else:
-            # Patching didn't fully fix it
-            logger.warning(
-                "_patch_facts: patching incomplete",
-                extra={"still_missing": new_verification[1], "still_invented": new_verification[2]},
-            )
-            return (patched, False)
-
-    # Nothing to patch or couldn't patch
-    return (llm_text, False)
+    return (patched, patched_something)
 
 
 # =============================================================================
@@ -1302,6 +1619,9 @@ def verbalize_step_message(
 
 __all__ = [
     "MessageContext",
+    "VerbalizerChunk",
+    "stream_verbalized_message",
     "verbalize_message",
     "verbalize_step_message",
+    "verbalizer_stream",
 ]
@@ -12,6 +12,7 @@ from domain import TaskStatus, TaskType
 
 from workflows.common.types import IncomingMessage, WorkflowState
 from workflows.common.types import GroupResult
+from workflows.common.message_features import MessageFeatures, message_features, turn_features
 from workflows.steps import step1_intake as intake
 # Step handlers moved to runtime/router.py (W3 extraction)
 from workflows.io import database as db_io
@@ -23,7 +24,6 @@ from workflows.llm import adapter as llm_adapter
 from workflows.nlu import (
     detect_general_room_query,
     empty_general_qna_detection,
-    quick_general_qna_scan,
 )
 from workflows.qna.extraction import ensure_qna_extraction
 from utils.profiler import profile_step
@@ -253,7 +253,7 @@ def _ensure_general_qna_classification(state: WorkflowState, message_text: str)
 
     scan = state.extras.get("general_qna_scan")
     if not scan:
-        scan = quick_general_qna_scan(message_text)
+        scan = message_features(message_text).general_qna_scan
         state.extras["general_qna_scan"] = scan
 
     ensure_qna_extraction(state, message_text, scan)
@@ -277,6 +277,7 @@ def _ensure_general_qna_classification(state: WorkflowState, message_text: str)
         or (scan.get("heuristics") or {}).get("borderline")
     )
     if needs_detailed:
+        # Sequential on purpose: both calls read and write state.extras
         classification = detect_general_room_query(message_text, state)
     else:
         classification = empty_general_qna_detection()
@@ -392,10 +393,17 @@ def process_msg(msg: Dict[str, Any], db_path: Path = DB_PATH) -> Dict[str, Any]:
         )
     state.thread_id = str(raw_thread_id)
     STATE_STORE.clear(state.thread_id)
-    combined_text = "\n".join(
-        part for part in ((message.subject or "").strip(), (message.body or "").strip()) if part
-    )
-    state.extras["general_qna_scan"] = quick_general_qna_scan(combined_text)
+    # Text, dates and detector inputs are derived once per turn and shared
+    state.features = MessageFeatures.from_message(message)
+    with turn_features(state.features):
+        return _process_turn(state, msg, path, lock_path)
+
+
+def _process_turn(state: WorkflowState, msg: Dict[str, Any], path: Path, lock_path: Path) -> Dict[str, Any]:
+    """[Trigger] Run intake, pre-routing and the step loop for one message."""
+
+    combined_text = state.features.text
+    state.extras["general_qna_scan"] = state.features.general_qna_scan
     # [DEV TEST MODE] Pass through skip_dev_choice flag for testing convenience
     if msg.get("skip_dev_choice"):
         state.extras["skip_dev_choice"] = True
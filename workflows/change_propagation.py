@@ -1103,10 +1103,10 @@ def detect_change_type_enhanced(
                     date_in_message = True
                 else:
                     # Parse dates from message and check if extracted date matches
-                    from workflows.common.datetime_parse import parse_all_dates
+                    from workflows.common.message_features import message_features
                     from datetime import date as dt_date
                     try:
-                        parsed_dates = list(parse_all_dates(message_text, fallback_year=dt_date.today().year))
+                        parsed_dates = message_features(message_text).dates
                         parsed_iso = {d.isoformat() for d in parsed_dates}
                         # Check if ISO date format matches
                         if extracted_date in parsed_iso:
@@ -33,6 +33,8 @@ from datetime import datetime
 from enum import Enum
 import logging
 
+from workflows.common.occupancy import active_index, note_event_changed
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,9 +71,16 @@ def detect_room_conflict(
             "status": str  # "Option" or "Confirmed"
         }
     """
-    events = db.get("events") or {}
+    index = active_index(db)
+    if index is not None:
+        booking = index.first_conflict(room_id, exclude_event_id=event_id, date=event_date)
+        if booking is None:
+            return None
+        candidates = [(booking.event_id, booking.event)]
+    else:
+        candidates = (db.get("events") or {}).items()
 
-    for other_event_id, other_event in events.items():
+    for other_event_id, other_event in candidates:
         # Skip self
         if other_event_id == event_id:
             continue
@@ -141,7 +150,12 @@ def get_available_rooms_on_date(
 
     # Find rooms locked by other events on this date
     events = db.get("events") or {}
-    locked_rooms = set()
+    index = active_index(db)
+    if index is not None:
+        locked_rooms = index.locked_rooms(exclude_event_id=event_id, date=event_date, statuses=exclude_statuses)
+        events = {}
+    else:
+        locked_rooms = set()
 
     for other_event_id, other_event in events.items():
         if other_event_id == event_id:
@@ -319,6 +333,7 @@ def handle_loser_event(
             "available_rooms": available_rooms,
             "resolved_at": datetime.now().isoformat(),
         }
+        note_event_changed(loser_event, db)
 
         return {
             "action": "choose_another_room",
@@ -342,6 +357,7 @@ def handle_loser_event(
             "action": "choose_another_date",
             "resolved_at": datetime.now().isoformat(),
         }
+        note_event_changed(loser_event, db)
 
         return {
             "action": "choose_another_date",
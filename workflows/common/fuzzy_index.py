@@ -0,0 +1,206 @@
+"""Trigram index for fuzzy phrase matching.
+
+Preference matching scored every wish against every product variant of every
+room with ``difflib.SequenceMatcher`` (hundreds of ratios per wish, repeated
+for each room). A ``FuzzyIndex`` holds the character-trigram signature,
+character counts and length of each candidate, built once per catalog
+version, and answers "best ``limit`` keys for this query" as:
+
+1. Exact hits, then containment hits (a candidate fully inside the query has
+   all its trigrams in the query and vice versa, so only candidates with full
+   trigram overlap are verified).
+2. The trigram shortlist (candidates sharing trigrams, most overlap first) is
+   scored exactly; that usually fixes the top ``limit`` early.
+3. Every other candidate is skipped when an upper bound on its ratio (length
+   window by bisect, then common character count) cannot reach the current
+   ``limit``-th score. Candidates without trigram overlap still get this
+   check: "wifi" vs "wi fi" shares no trigram but has a 0.89 ratio.
+
+The bounds are exact upper bounds of ``SequenceMatcher.ratio()``, so results
+(scores, order, tie-breaking by candidate order) are identical to scoring
+every candidate.
+
+USAGE:
+    index = FuzzyIndex([("flip chart", "Flip Chart"), ("flipchart", "Flip Chart")])
+    index.ranked("flipchart stand", limit=3, containment_score=0.92)
+"""
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, FrozenSet, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+_GRAM = 3
+_EPS = 1e-9
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Distinct character trigrams of ``text`` (empty below three characters)."""
+    return frozenset(text[i:i + _GRAM] for i in range(len(text) - _GRAM + 1))
+
+
+@lru_cache(maxsize=16384)
+def sequence_ratio(a: str, b: str) -> float:
+    """``SequenceMatcher(a=a, b=b).ratio()``, memoised across rooms and turns."""
+    return SequenceMatcher(a=a, b=b).ratio()
+
+
+class FuzzyIndex:
+    """Candidate phrases with keys, ranked against a query by similarity.
+
+    Candidates sharing a key form a group; a group ranks by its best score,
+    ties broken by the earliest candidate reaching it. Empty candidates are
+    ignored.
+    """
+
+    __slots__ = ("texts", "keys", "_grams", "_counts", "_postings", "_exact", "_short", "_by_length", "_lengths")
+
+    def __init__(self, entries: Iterable[Tuple[str, Hashable]]) -> None:
+        self.texts: List[str] = []
+        self.keys: List[Hashable] = []
+        for text, key in entries:
+            if text:
+                self.texts.append(text)
+                self.keys.append(key)
+        self._grams: List[FrozenSet[str]] = [trigrams(text) for text in self.texts]
+        self._counts: List[Dict[str, int]] = [dict(Counter(text)) for text in self.texts]
+        self._postings: Dict[str, List[int]] = {}
+        self._exact: Dict[str, List[int]] = {}
+        self._short: List[int] = []
+        for pos, text in enumerate(self.texts):
+            self._exact.setdefault(text, []).append(pos)
+            if not self._grams[pos]:
+                self._short.append(pos)
+            for gram in self._grams[pos]:
+                self._postings.setdefault(gram, []).append(pos)
+        self._by_length: List[int] = sorted(range(len(self.texts)), key=lambda pos: len(self.texts[pos]))
+        self._lengths: List[int] = [len(self.texts[pos]) for pos in self._by_length]
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    # ------------------------------------------------------------------
+    # Candidate selection
+    # ------------------------------------------------------------------
+
+    def _overlap(self, grams: FrozenSet[str]) -> Dict[int, int]:
+        overlap: Dict[int, int] = {}
+        for gram in grams:
+            for pos in self._postings.get(gram, ()):
+                overlap[pos] = overlap.get(pos, 0) + 1
+        return overlap
+
+    def _contained(self, query: str, grams: FrozenSet[str], overlap: Dict[int, int]) -> Iterator[int]:
+        """Positions whose text is inside ``query`` or contains it."""
+        texts = self.texts
+        if not grams:
+            for pos, text in enumerate(texts):
+                if query in text or (not self._grams[pos] and text in query):
+                    yield pos
+            return
+        for pos, shared in overlap.items():
+            text = texts[pos]
+            if (shared == len(self._grams[pos]) and text in query) or (shared == len(grams) and query in text):
+                yield pos
+        for pos in self._short:
+            if texts[pos] in query:
+                yield pos
+
+    def _bound(self, counts: Dict[str, int], length: int, pos: int) -> float:
+        """Upper bound of the ratio: matched characters <= common characters."""
+        other = self._counts[pos]
+        common = 0
+        for char, count in counts.items():
+            available = other.get(char)
+            if available:
+                common += count if count < available else available
+        return 2.0 * common / (length + len(self.texts[pos]))
+
+    def _length_window(self, length: int, floor: float) -> List[int]:
+        """Positions whose length allows ``2*min/(la+lb) >= floor``."""
+        if floor <= 0.0:
+            return self._by_length
+        low = floor * length / (2.0 - floor)
+        high = length * (2.0 - floor) / floor
+        start = bisect_left(self._lengths, low - _EPS)
+        end = bisect_right(self._lengths, high + _EPS)
+        return self._by_length[start:end]
+
+    # ------------------------------------------------------------------
+    # Ranking
+    # ------------------------------------------------------------------
+
+    def ranked(
+        self,
+        query: str,
+        limit: int = 1,
+        *,
+        floor: float = 0.0,
+        containment_score: Optional[float] = None,
+        min_containment: int = 0,
+    ) -> List[Tuple[float, Hashable]]:
+        """Top ``limit`` groups as ``(score, key)``, best first.
+
+        Scores: 1.0 for an exact match; ``containment_score`` when one text
+        contains the other and both have at least ``min_containment``
+        characters (if given); otherwise ``SequenceMatcher(a=query,
+        b=candidate).ratio()``. Groups scoring below ``floor`` are dropped.
+        """
+        if not query or not self.texts or limit <= 0:
+            return []
+        length = len(query)
+        grams = trigrams(query)
+        overlap = self._overlap(grams)
+        counts = dict(Counter(query))
+        best: Dict[Hashable, Tuple[float, int]] = {}
+        scored: Set[int] = set()
+        # (score, -position) a candidate must reach to change the top ``limit``
+        cutoff: List[Optional[Tuple[float, int]]] = [(floor, -len(self.texts)) if floor > 0.0 else None]
+
+        def offer(pos: int, score: float) -> None:
+            scored.add(pos)
+            key = self.keys[pos]
+            entry = (score, -pos)
+            current = best.get(key)
+            if current is None or entry > current:
+                best[key] = entry
+                if len(best) >= limit:
+                    kth = heapq.nlargest(limit, best.values())[-1]
+                    if cutoff[0] is None or kth > cutoff[0]:
+                        cutoff[0] = kth
+
+        def worth_scoring(pos: int) -> bool:
+            if cutoff[0] is None:
+                return True
+            return (self._bound(counts, length, pos), -pos) >= cutoff[0]
+
+        for pos in self._exact.get(query, ()):
+            offer(pos, 1.0)
+        if containment_score is not None and length >= min_containment:
+            for pos in self._contained(query, grams, overlap):
+                if pos not in scored and len(self.texts[pos]) >= min_containment:
+                    offer(pos, containment_score)
+
+        shortlist = sorted((pos for pos in overlap if pos not in scored), key=lambda pos: (-overlap[pos], pos))
+        for pos in shortlist:
+            if worth_scoring(pos):
+                offer(pos, sequence_ratio(query, self.texts[pos]))
+
+        window_floor = cutoff[0][0] if cutoff[0] is not None else 0.0
+        for pos in self._length_window(length, window_floor):
+            if pos not in scored and worth_scoring(pos):
+                offer(pos, sequence_ratio(query, self.texts[pos]))
+
+        ordered = sorted(best.items(), key=lambda item: (-item[1][0], -item[1][1]))
+        return [(score, key) for key, (score, _) in ordered[:limit] if score >= floor]
+
+    def best(self, query: str, **options: object) -> Optional[Tuple[float, Hashable]]:
+        """Single best ``(score, key)`` or None (see ``ranked``)."""
+        top = self.ranked(query, 1, **options)  # type: ignore[arg-type]
+        return top[0] if top else None
+
+
+__all__ = ["FuzzyIndex", "sequence_ratio", "trigrams"]
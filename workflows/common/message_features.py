@@ -0,0 +1,164 @@
+"""Per-turn message features shared by detectors and step handlers.
+
+One inbound message used to be lowercased, regex-scanned and date-parsed
+over and over in a single turn: the general Q&A scan, the pre-filter's
+German word count, ``detect_language`` (once per detector), and
+``parse_all_dates`` in change propagation and the step 3 / step 5 handlers.
+
+``MessageFeatures`` is an immutable view of one text. Every field is
+computed on first access and then reused:
+
+- ``normalized`` / ``tokens`` / ``spaced_words``
+- ``language`` (``detection.keywords.buckets`` markers)
+- ``dates`` (``parse_all_dates`` with the current year) and
+  ``parsed_dates(fallback_year)`` for other years
+- ``time_range`` (``parse_time_range``)
+- ``general_qna_scan`` (question heuristics and constraints) and
+  ``participants`` from it
+
+``process_msg`` builds the features of the combined subject + body, stores
+them on ``WorkflowState.features`` and opens ``turn_features(...)``; inside
+it ``message_features(text)`` returns the shared object for that text (or a
+per-turn sibling for other texts such as the body alone or a quote-stripped
+copy). Outside a turn it returns a fresh object, so detectors called
+directly behave as before.
+
+Callers must treat the returned values as read-only.
+"""
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date, time
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterator, Optional, Tuple
+
+from workflows.common.datetime_parse import parse_all_dates, parse_time_range
+
+if TYPE_CHECKING:
+    from workflows.common.types import IncomingMessage
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_active: ContextVar[Optional["MessageFeatures"]] = ContextVar("message_features", default=None)
+
+
+@dataclass(frozen=True)
+class MessageFeatures:
+    """Lazily computed, cached features of one message text."""
+
+    text: str
+    reference: date = field(default_factory=date.today)
+    _siblings: Dict[str, "MessageFeatures"] = field(default_factory=dict, repr=False, compare=False)
+    _dates_by_year: Dict[int, Tuple[date, ...]] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_message(cls, message: "IncomingMessage") -> "MessageFeatures":
+        """Features of the subject and body joined by a newline (as routed)."""
+
+        combined = "\n".join(
+            part for part in ((message.subject or "").strip(), (message.body or "").strip()) if part
+        )
+        return cls(combined)
+
+    def for_text(self, text: str) -> "MessageFeatures":
+        """Features of ``text``: ``self`` for the same text, else a cached sibling."""
+
+        if text == self.text:
+            return self
+        sibling = self._siblings.get(text)
+        if sibling is None:
+            sibling = MessageFeatures(text, self.reference)
+            self._siblings[text] = sibling
+        return sibling
+
+    # ------------------------------------------------------------------
+    # Text
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def normalized(self) -> str:
+        """Lowercased, stripped text."""
+        return self.text.lower().strip()
+
+    @cached_property
+    def tokens(self) -> Tuple[str, ...]:
+        """Word tokens of ``normalized`` in order."""
+        return tuple(_TOKEN_RE.findall(self.normalized))
+
+    @cached_property
+    def spaced_words(self) -> FrozenSet[str]:
+        """Words of ``normalized`` split on single spaces, punctuation kept.
+
+        Same semantics as ``f" {word} " in f" {text} "``.
+        """
+        return frozenset(self.normalized.split(" "))
+
+    @cached_property
+    def language(self) -> str:
+        """``detect_language`` result ("en", "de", "fr", "it", "es" or "mixed")."""
+        from detection.keywords.buckets import detect_language  # pylint: disable=import-outside-toplevel
+
+        return detect_language(self.text)
+
+    # ------------------------------------------------------------------
+    # Dates, times, numbers
+    # ------------------------------------------------------------------
+
+    def parsed_dates(self, fallback_year: Optional[int] = None) -> Tuple[date, ...]:
+        """``parse_all_dates(text, fallback_year=...)``, memoised per year."""
+
+        year = self.reference.year if fallback_year is None else fallback_year
+        dates = self._dates_by_year.get(year)
+        if dates is None:
+            dates = tuple(parse_all_dates(self.text, fallback_year=year, reference=self.reference))
+            self._dates_by_year[year] = dates
+        return dates
+
+    @property
+    def dates(self) -> Tuple[date, ...]:
+        """All dates in order of appearance, current year for year-less dates."""
+        return self.parsed_dates()
+
+    @cached_property
+    def time_range(self) -> Tuple[Optional[time], Optional[time], bool]:
+        """``parse_time_range(text)``: (start, end, matched)."""
+        return parse_time_range(self.text)
+
+    @cached_property
+    def general_qna_scan(self) -> Dict[str, Any]:
+        """``quick_general_qna_scan(text)``: heuristics and parsed constraints."""
+        from detection.qna.general_qna import quick_general_qna_scan  # pylint: disable=import-outside-toplevel
+
+        return quick_general_qna_scan(self.text)
+
+    @property
+    def participants(self) -> Optional[int]:
+        """Head count mentioned with a unit ("30 guests", "~40 pax")."""
+        return (self.general_qna_scan.get("parsed") or {}).get("pax")
+
+
+@contextmanager
+def turn_features(features: MessageFeatures) -> Iterator[MessageFeatures]:
+    """Share ``features`` with every ``message_features`` call in this turn."""
+
+    token = _active.set(features)
+    try:
+        yield features
+    finally:
+        _active.reset(token)
+
+
+def message_features(text: Optional[str]) -> MessageFeatures:
+    """Features of ``text``, shared within the current turn."""
+
+    value = text or ""
+    active = _active.get()
+    if active is None:
+        return MessageFeatures(value)
+    return active.for_text(value)
+
+
+__all__ = ["MessageFeatures", "message_features", "turn_features"]
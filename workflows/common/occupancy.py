@@ -0,0 +1,376 @@
+"""Room occupancy index for conflict and availability queries.
+
+Conflict detection used to rebuild ``TimeWindow.from_event`` for every other
+event on every query: ``get_available_rooms_on_date`` parsed each Option /
+Confirmed booking in the database, once per date asked about, and room
+evaluation repeated the ``calendar_free`` scan once per room.
+
+Two layers:
+
+- ``event_window(event)``: TimeWindow cache keyed by the fields that define
+  the window (plus the venue timezone), so a booking is parsed once no matter
+  how often it is compared. Single queries keep their linear pass over the
+  events but skip the parsing.
+- ``RoomOccupancyIndex``: per-room interval index (bookings sorted by start
+  with the room's longest span as search bound, so an overlap query is two
+  bisects plus the hits) and per-(room, date) buckets for the date-only
+  fallback. Bulk callers open ``occupancy_batch(db)``; inside it every query
+  on that db is answered from the index, which the database helpers
+  (``update_event_room``, ``update_event_date``, ``update_event_metadata``)
+  refresh incrementally through ``note_event_changed``.
+
+The index is a snapshot: code inside a batch that writes booking fields
+directly (``event["status"] = ...``) must call ``note_event_changed``. Outside
+a batch every query sees the live dicts.
+
+Results are identical to the previous scans, including which conflict is
+reported first (database order).
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from workflows.common.time_window import TimeWindow
+from workflows.io.config_store import get_timezone
+
+LOCKING_STATUSES = ("option", "confirmed")
+
+_EMPTY: Dict[str, Any] = {}
+_UNSET = object()
+_WINDOW_CACHE_SIZE = 4096
+_window_cache: "OrderedDict[Tuple[Any, ...], Optional[TimeWindow]]" = OrderedDict()
+_window_lock = Lock()
+_active: ContextVar[Tuple["RoomOccupancyIndex", ...]] = ContextVar("room_occupancy_batches", default=())
+
+
+def _window_key(event: Dict[str, Any]) -> Tuple[Any, ...]:
+    requested = event.get("requested_window") or _EMPTY
+    event_data = event.get("event_data") or _EMPTY
+    requirements = event.get("requirements") or _EMPTY
+    duration = requirements.get("event_duration") or _EMPTY
+    return (
+        requested.get("start"),
+        requested.get("end"),
+        event.get("chosen_date"),
+        event.get("end_date_iso"),
+        event.get("end_date"),
+        duration.get("start"),
+        duration.get("end"),
+        event_data.get("Start Time"),
+        event_data.get("End Time"),
+    )
+
+
+def event_window(event: Dict[str, Any], timezone: Optional[str] = None) -> Optional[TimeWindow]:
+    """``TimeWindow.from_event`` memoised on the event's date/time fields.
+
+    The returned window is shared; treat it as read-only.
+    """
+    key = (timezone or get_timezone(),) + _window_key(event)
+    with _window_lock:
+        if key in _window_cache:
+            _window_cache.move_to_end(key)
+            return _window_cache[key]
+    window = TimeWindow.from_event(event)
+    with _window_lock:
+        _window_cache[key] = window
+        while len(_window_cache) > _WINDOW_CACHE_SIZE:
+            _window_cache.popitem(last=False)
+    return window
+
+
+def event_items(events: Any) -> List[Tuple[Any, Dict[str, Any]]]:
+    """``(event_id, event)`` pairs for list (production) or dict (tests) stores."""
+    if isinstance(events, dict):
+        return list(events.items())
+    return [(e.get("event_id"), e) for e in events or () if isinstance(e, dict)]
+
+
+def _status_of(event: Dict[str, Any]) -> Any:
+    return event.get("status") or event.get("Status")
+
+
+def _epoch(window: Optional[TimeWindow]) -> Optional[Tuple[float, float]]:
+    if window is None or window.start.tzinfo is None or window.end.tzinfo is None:
+        return None
+    return window.start.timestamp(), window.end.timestamp()
+
+
+class Booking:
+    """One event holding a room, as seen by the index."""
+
+    __slots__ = ("event_id", "event", "order", "room", "status", "status_key", "date", "timezone", "_window")
+
+    def __init__(self, event_id: Any, event: Dict[str, Any], order: int, timezone: str) -> None:
+        self.event_id = event_id
+        self.event = event
+        self.order = order
+        self.room = str(event.get("locked_room_id")).lower()
+        self.status = _status_of(event)
+        self.status_key = str(self.status or "").lower()
+        self.date = event.get("chosen_date") or event.get("Event Date")
+        self.timezone = timezone
+        self._window: Any = _UNSET
+
+    @property
+    def window(self) -> Optional[TimeWindow]:
+        # Parsed on first use: a batch that only asks calendar_free never needs it
+        if self._window is _UNSET:
+            self._window = event_window(self.event, self.timezone)
+        return self._window
+
+    @property
+    def span(self) -> Optional[Tuple[float, float]]:
+        return _epoch(self.window)
+
+    def blocks(self, window: Optional[TimeWindow], date: Any, require_date: bool) -> bool:
+        """Same rule as the old scans: time overlap when both sides have a window, else same date."""
+        if window is not None and self.window is not None:
+            return window.overlaps(self.window)
+        if require_date and not self.date:
+            return False
+        return str(self.date) == str(date)
+
+
+class _RoomBucket:
+    __slots__ = ("bookings", "starts", "timed", "loose", "untimed_by_date", "by_date", "max_span")
+
+    def __init__(self, bookings: List[Booking]) -> None:
+        self.bookings = sorted(bookings, key=lambda b: b.order)
+        spans = sorted(
+            ((span, b) for b in self.bookings for span in (b.span,) if span is not None),
+            key=lambda item: item[0][0],
+        )
+        self.timed = [b for _, b in spans]
+        self.starts = [span[0] for span, _ in spans]
+        self.max_span = max((span[1] - span[0] for span, _ in spans), default=0.0)
+        # Windows without tzinfo cannot be placed on the epoch axis; compared directly
+        self.loose = [b for b in self.bookings if b.window is not None and b.span is None]
+        self.untimed_by_date: Dict[str, List[Booking]] = {}
+        self.by_date: Dict[str, List[Booking]] = {}
+        for booking in self.bookings:
+            self.by_date.setdefault(str(booking.date), []).append(booking)
+            if booking.window is None:
+                self.untimed_by_date.setdefault(str(booking.date), []).append(booking)
+
+    def candidates(self, window: Optional[TimeWindow], date: Any) -> List[Booking]:
+        """Bookings that may block ``window``/``date`` (superset; confirm with ``blocks``)."""
+        if window is None:
+            return self.by_date.get(str(date), [])
+        found = list(self.untimed_by_date.get(str(date), ()))
+        found.extend(self.loose)
+        span = _epoch(window)
+        if span is None:
+            found.extend(self.timed)
+            return found
+        lo = bisect_left(self.starts, span[0] - self.max_span)
+        hi = bisect_right(self.starts, span[1])
+        found.extend(self.timed[lo:hi])
+        return found
+
+
+class RoomOccupancyIndex:
+    """Bookings of one events store grouped per room, with interval lookup."""
+
+    def __init__(self, db: Dict[str, Any]) -> None:
+        self.db = db
+        self.timezone = get_timezone()
+        self._bookings: Dict[int, Booking] = {}
+        # Per event (by identity): (event_id, order, calendar_free key)
+        self._seen: Dict[int, Tuple[Any, int, Optional[Tuple[str, str]]]] = {}
+        self._calendar_blocks: Dict[Tuple[str, str], int] = {}
+        self._rooms: Dict[str, _RoomBucket] = {}
+        self._dirty_rooms: Set[str] = set()
+        for order, (event_id, event) in enumerate(event_items(db.get("events"))):
+            self._add(event_id, event, order)
+        # Room buckets are built on first query (see _bucket)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _add(self, event_id: Any, event: Dict[str, Any], order: int) -> None:
+        if event.get("locked_room_id"):
+            booking = Booking(event_id, event, order, self.timezone)
+            self._bookings[id(event)] = booking
+            self._dirty_rooms.add(booking.room)
+        calendar_key = _calendar_key(event)
+        self._seen[id(event)] = (event_id, order, calendar_key)
+        if calendar_key is not None:
+            self._calendar_blocks[calendar_key] = self._calendar_blocks.get(calendar_key, 0) + 1
+
+    def _remove(self, event: Dict[str, Any]) -> None:
+        booking = self._bookings.pop(id(event), None)
+        if booking is not None:
+            self._dirty_rooms.add(booking.room)
+        _, _, calendar_key = self._seen.pop(id(event))
+        if calendar_key is not None:
+            remaining = self._calendar_blocks.get(calendar_key, 0) - 1
+            if remaining > 0:
+                self._calendar_blocks[calendar_key] = remaining
+            else:
+                self._calendar_blocks.pop(calendar_key, None)
+
+    def refresh(self, event: Dict[str, Any]) -> None:
+        """Re-read one event after its room, date, times or status changed.
+
+        Events created after the batch opened are appended in database order.
+        """
+        if not isinstance(event, dict):
+            return
+        seen = self._seen.get(id(event))
+        if seen is None:
+            event_id, order = event.get("event_id"), len(self._seen)
+        else:
+            event_id, order, _ = seen
+            self._remove(event)
+        self._add(event_id, event, order)
+
+    def _rebuild_rooms(self, rooms: Optional[Set[str]]) -> None:
+        grouped: Dict[str, List[Booking]] = {}
+        for booking in self._bookings.values():
+            if rooms is None or booking.room in rooms:
+                grouped.setdefault(booking.room, []).append(booking)
+        for room in rooms if rooms is not None else set(self._rooms) | set(grouped):
+            if room in grouped:
+                self._rooms[room] = _RoomBucket(grouped[room])
+            else:
+                self._rooms.pop(room, None)
+
+    def _bucket(self, room: str) -> Optional[_RoomBucket]:
+        if self._dirty_rooms:
+            dirty, self._dirty_rooms = self._dirty_rooms, set()
+            self._rebuild_rooms(dirty)
+        return self._rooms.get(room)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def conflicts(
+        self,
+        room_id: Any,
+        *,
+        exclude_event_id: Any = None,
+        window: Optional[TimeWindow] = None,
+        date: Any = None,
+        statuses: Sequence[str] = LOCKING_STATUSES,
+        require_date: bool = True,
+    ) -> List[Booking]:
+        """Bookings of ``room_id`` that block the window/date, in database order."""
+        bucket = self._bucket(str(room_id).lower())
+        if bucket is None:
+            return []
+        hits = [
+            booking
+            for booking in bucket.candidates(window, date)
+            if booking.event_id != exclude_event_id
+            and booking.status_key in statuses
+            and booking.blocks(window, date, require_date)
+        ]
+        hits.sort(key=lambda b: b.order)
+        return hits
+
+    def first_conflict(self, room_id: Any, **kwargs: Any) -> Optional[Booking]:
+        hits = self.conflicts(room_id, **kwargs)
+        return hits[0] if hits else None
+
+    def locked_rooms(
+        self,
+        *,
+        exclude_event_id: Any = None,
+        window: Optional[TimeWindow] = None,
+        date: Any = None,
+        statuses: Sequence[str] = LOCKING_STATUSES,
+    ) -> Set[str]:
+        """Lower-cased rooms held by another booking during ``window``/``date``."""
+        if self._dirty_rooms:
+            self._bucket("")
+        return {
+            room
+            for room in self._rooms
+            if self.conflicts(
+                room,
+                exclude_event_id=exclude_event_id,
+                window=window,
+                date=date,
+                statuses=statuses,
+                require_date=False,
+            )
+        }
+
+    def calendar_blocked(self, room: str, date_ddmmyyyy: str) -> bool:
+        """``calendar_free`` rule: Option/Confirmed event for this room on this Event Date."""
+        return (room.lower(), date_ddmmyyyy) in self._calendar_blocks
+
+
+def _calendar_key(event: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    event_data = event.get("event_data") or _EMPTY
+    event_date = event_data.get("Event Date")
+    stored_room = event_data.get("Preferred Room") or event.get("locked_room_id")
+    if not event_date or not stored_room:
+        return None
+    status = str(event.get("status") or event_data.get("Status") or "").lower()
+    if status not in LOCKING_STATUSES:
+        return None
+    return str(stored_room).lower(), event_date
+
+
+# ----------------------------------------------------------------------
+# Batches
+# ----------------------------------------------------------------------
+
+
+def active_index(db: Optional[Dict[str, Any]]) -> Optional[RoomOccupancyIndex]:
+    """Index of the innermost ``occupancy_batch`` open on ``db``, if any."""
+    if db is None:
+        return None
+    for index in reversed(_active.get()):
+        if index.db is db:
+            return index
+    return None
+
+
+@contextmanager
+def occupancy_batch(db: Optional[Dict[str, Any]]) -> Iterator[Optional[RoomOccupancyIndex]]:
+    """Answer every conflict/availability query on ``db`` from one index.
+
+    Re-entrant: a nested batch on the same db reuses the outer index.
+    """
+    if db is None:
+        yield None
+        return
+    existing = active_index(db)
+    if existing is not None:
+        yield existing
+        return
+    index = RoomOccupancyIndex(db)
+    token = _active.set(_active.get() + (index,))
+    try:
+        yield index
+    finally:
+        _active.reset(token)
+
+
+def note_event_changed(event: Dict[str, Any], db: Optional[Dict[str, Any]] = None) -> None:
+    """Refresh ``event`` in the open batch indexes (no-op outside a batch)."""
+    for index in _active.get():
+        if db is None or index.db is db:
+            index.refresh(event)
+
+
+__all__ = [
+    "Booking",
+    "LOCKING_STATUSES",
+    "RoomOccupancyIndex",
+    "active_index",
+    "event_items",
+    "event_window",
+    "note_event_changed",
+    "occupancy_batch",
+]
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from domain import IntentLabel
 from workflows.common.prompts import compose_footer, FOOTER_SEPARATOR
 
+if TYPE_CHECKING:
+    from workflows.common.message_features import MessageFeatures
+
 
 @dataclass
 class IncomingMessage:
@@ -189,6 +192,8 @@ class WorkflowState:
     subloops_trace: List[str] = field(default_factory=list)
     audit_log: List[Dict[str, Any]] = field(default_factory=list)
     telemetry: TurnTelemetry = field(default_factory=TurnTelemetry)
+    # Shared text/date/language features of this turn's message (set by process_msg)
+    features: Optional["MessageFeatures"] = None
 
     def record_context(self, context: Dict[str, Any]) -> None:
         """[OpenEvent Database] Store the latest context snapshot for the workflow."""
@@ -7,15 +7,24 @@ under db["config"]["venue"] and can be updated via the API or edited directly.
 
 All accessors return sensible defaults if the config is missing, ensuring
 backward compatibility with existing installations.
+
+Reads go through a process-wide snapshot of db["config"]. The snapshot is
+reloaded only when the backing file's (mtime_ns, size) changes or when
+invalidate_config_cache() bumps the version counter (the config POST
+endpoints do this after saving), so getters no longer re-parse the whole
+events database on every call.
 """
 
 from __future__ import annotations
 
+import copy
+import os
 import re
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Pattern, Tuple
+from typing import Any, Dict, List, Optional, Pattern, Tuple
 
-from workflows.io.database import load_db
+from workflows.io.database import FileLock, load_db, lock_path_for, storage_backend
 
 __workflow_role__ = "ConfigStore"
 
@@ -53,16 +62,147 @@ _PRODUCT_DEFAULTS: Dict[str, Any] = {
 }
 
 
-def _get_venue_config() -> Dict[str, Any]:
-    """[OpenEvent Config Store] Load venue config from database with defaults."""
+# =============================================================================
+# Config Snapshot Cache
+# =============================================================================
+
+_SNAPSHOT_LOCK = threading.Lock()
+_SNAPSHOT: Dict[str, Any] = {
+    "path": None,
+    "signature": None,
+    "version": -1,
+    "config": {},
+}
+_CONFIG_VERSION = 0
+_CACHE_STATS: Dict[str, int] = {"hits": 0, "misses": 0, "invalidations": 0, "errors": 0}
+
+
+def _config_source(path: Path) -> Path:
+    """[OpenEvent Config Store] Return the file whose changes invalidate the snapshot."""
+    if storage_backend() == "sharded":
+        from workflows.io.sharded_store import CONFIG_FILE, shard_root_for
+
+        config_shard = shard_root_for(path) / CONFIG_FILE
+        if config_shard.exists():
+            return config_shard
+    return path
+
+
+def _config_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """[OpenEvent Config Store] (mtime_ns, size) of the config source, None if missing."""
     try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        venue = config.get("venue", {})
-        return venue
-    except Exception:
-        # If DB fails to load, return empty dict (defaults will be used)
+        st = os.stat(_config_source(path))
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_config(path: Path) -> Dict[str, Any]:
+    """[OpenEvent Config Store] Read db["config"] from disk (one full load on miss)."""
+    if storage_backend() == "sharded":
+        from workflows.io.sharded_store import get_store
+
+        store = get_store(path)
+        if store.exists():
+            # Only the config shard is read; events are never touched.
+            with FileLock(lock_path_for(path)):
+                return store.load_config()
+    db = load_db(path)
+    return db.get("config", {}) or {}
+
+
+def _load_config_snapshot() -> Dict[str, Any]:
+    """[OpenEvent Config Store] Return the cached db["config"], reloading if stale."""
+    path = Path(DB_PATH)
+    signature = _config_signature(path)
+    snap = _SNAPSHOT
+    if (
+        snap["path"] == path
+        and snap["signature"] == signature
+        and snap["version"] == _CONFIG_VERSION
+    ):
+        _CACHE_STATS["hits"] += 1
+        return snap["config"]
+
+    with _SNAPSHOT_LOCK:
+        # Another thread may have refreshed while we waited.
+        version = _CONFIG_VERSION
+        signature = _config_signature(path)
+        if (
+            _SNAPSHOT["path"] == path
+            and _SNAPSHOT["signature"] == signature
+            and _SNAPSHOT["version"] == version
+        ):
+            _CACHE_STATS["hits"] += 1
+            return _SNAPSHOT["config"]
+        _CACHE_STATS["misses"] += 1
+        try:
+            config = _read_config(path) if signature is not None else {}
+        except Exception:
+            # If DB fails to load, serve empty config (defaults will be used)
+            # and retry on the next call instead of caching the failure.
+            _CACHE_STATS["errors"] += 1
+            return {}
+        _SNAPSHOT.update(
+            {"path": path, "signature": signature, "version": version, "config": config}
+        )
+        return config
+
+
+def _get_config_section(name: str) -> Dict[str, Any]:
+    """[OpenEvent Config Store] Return a private copy of one db["config"] section."""
+    section = _load_config_snapshot().get(name, {})
+    if not isinstance(section, dict):
         return {}
+    # Copy so callers mutating returned lists/dicts cannot corrupt the snapshot.
+    return copy.deepcopy(section)
+
+
+def invalidate_config_cache() -> None:
+    """[OpenEvent Config Store] Force the next getter call to reload from disk.
+
+    Call after writing db["config"] (the config POST endpoints do). mtime
+    checks already catch most writes; this covers coarse filesystem clocks
+    and same-size rewrites.
+    """
+    global _CONFIG_VERSION
+    with _SNAPSHOT_LOCK:
+        _CONFIG_VERSION += 1
+        _CACHE_STATS["invalidations"] += 1
+
+
+def get_config_version() -> int:
+    """[OpenEvent Config Store] Counter bumped by invalidate_config_cache().
+
+    Other caches derived from venue data (e.g. the product catalog) compare
+    it to drop their state when the config endpoints write.
+    """
+    return _CONFIG_VERSION
+
+
+def get_config_cache_stats() -> Dict[str, Any]:
+    """[OpenEvent Config Store] Return hit/miss counters for the config snapshot."""
+    hits = _CACHE_STATS["hits"]
+    misses = _CACHE_STATS["misses"]
+    total = hits + misses
+    return {
+        **_CACHE_STATS,
+        "version": _CONFIG_VERSION,
+        "hit_rate": (hits / total) if total else 0.0,
+    }
+
+
+def reset_config_cache() -> None:
+    """[OpenEvent Config Store] Clear snapshot and counters (used by tests)."""
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOT.update({"path": None, "signature": None, "version": -1, "config": {}})
+        for key in _CACHE_STATS:
+            _CACHE_STATS[key] = 0
+
+
+def _get_venue_config() -> Dict[str, Any]:
+    """[OpenEvent Config Store] Load venue config from database with defaults."""
+    return _get_config_section("venue")
 
 
 def get_venue_name() -> str:
@@ -149,12 +289,7 @@ def get_all_venue_config() -> Dict[str, Any]:
 
 def _get_site_visit_config() -> Dict[str, Any]:
     """[OpenEvent Config Store] Load site visit config from database."""
-    try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        return config.get("site_visit", {})
-    except Exception:
-        return {}
+    return _get_config_section("site_visit")
 
 
 def get_site_visit_blocked_dates() -> List[str]:
@@ -220,12 +355,7 @@ def get_all_site_visit_config() -> Dict[str, Any]:
 
 def _get_manager_config() -> Dict[str, Any]:
     """[OpenEvent Config Store] Load manager config from database."""
-    try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        return config.get("managers", {})
-    except Exception:
-        return {}
+    return _get_config_section("managers")
 
 
 def get_manager_names() -> List[str]:
@@ -255,12 +385,7 @@ def get_all_manager_config() -> Dict[str, Any]:
 
 def _get_product_config() -> Dict[str, Any]:
     """[OpenEvent Config Store] Load product config from database."""
-    try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        return config.get("products", {})
-    except Exception:
-        return {}
+    return _get_config_section("products")
 
 
 def get_product_autofill_threshold() -> float:
@@ -334,12 +459,7 @@ _MENU_DEFAULTS: Dict[str, Any] = {
 
 def _get_menus_config() -> Dict[str, Any]:
     """[OpenEvent Config Store] Load menus config from database."""
-    try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        return config.get("menus", {})
-    except Exception:
-        return {}
+    return _get_config_section("menus")
 
 
 def get_dinner_menu_options() -> List[Dict[str, Any]]:
@@ -387,12 +507,7 @@ _CATALOG_DEFAULTS: Dict[str, Any] = {
 
 def _get_catalog_config() -> Dict[str, Any]:
     """[OpenEvent Config Store] Load product catalog config from database."""
-    try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        return config.get("catalog", {})
-    except Exception:
-        return {}
+    return _get_config_section("catalog")
 
 
 def get_product_room_map() -> List[Dict[str, Any]]:
@@ -495,12 +610,7 @@ _FAQ_DEFAULTS: Dict[str, Any] = {
 
 def _get_faq_config() -> Dict[str, Any]:
     """[OpenEvent Config Store] Load FAQ config from database."""
-    try:
-        db = load_db(DB_PATH)
-        config = db.get("config", {})
-        return config.get("faq", {})
-    except Exception:
-        return {}
+    return _get_config_section("faq")
 
 
 def get_faq_items() -> List[Dict[str, Any]]:
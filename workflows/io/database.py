@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+import json
 import os
 import tempfile
 import time
@@ -11,17 +12,31 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from functools import lru_cache
 
+try:  # POSIX advisory locks; other platforms fall back to lock-file polling.
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
 from domain import EventStatus, TaskStatus
 from utils import json_io
 from utils.calendar_events import create_calendar_event
+from utils.profiler import profile_step, span
+from workflows.io import revisions
+from workflows.io.sharded_store import ShardedDB, iter_event_candidates
 
 __workflow_role__ = "Database"
 
 
 LOCK_TIMEOUT = 60.0  # Allow up to 60s for message processing
 LOCK_SLEEP = 0.1
+FLOCK_BACKOFF_MIN = 0.001
+FLOCK_BACKOFF_MAX = 0.02
 STALE_LOCK_AGE_SECONDS = 300  # Consider lock stale if file is older than 5 minutes
 
+# Storage backend: "json" (one monolithic file, default) or "sharded"
+# (one file per event/client/task, see workflows/io/sharded_store.py)
+DB_BACKEND_ENV = "OE_DB_BACKEND"
+
 logger = logging.getLogger(__name__)
 
 
@@ -93,8 +108,39 @@ def _cleanup_stale_lock(lock_path: Path) -> bool:
     return False
 
 
+def _flock_with_timeout(fd: int, timeout: float) -> bool:
+    """Poll a non-blocking exclusive flock on ``fd`` with exponential backoff.
+
+    A blocking ``flock`` cannot be given a timeout here: SIGALRM only works
+    on the main thread (turns run on executor threads), and a helper thread
+    stuck in ``flock`` would keep the fd open after the caller gave up.
+
+    Returns False once ``timeout`` has elapsed; ``fd`` stays with the caller.
+    """
+
+    deadline = time.monotonic() + timeout
+    delay = FLOCK_BACKOFF_MIN
+    while True:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, FLOCK_BACKOFF_MAX)
+
+
 class FileLock:
-    """[OpenEvent Database] Coarse-grained filesystem lock to guard JSON persistence."""
+    """[OpenEvent Database] Coarse-grained filesystem lock to guard JSON persistence.
+
+    On POSIX this is an ``fcntl.flock`` advisory lock: waiters retry with a
+    short exponential backoff (capped at FLOCK_BACKOFF_MAX), and the lock dies
+    with its process, so crashed workers never leave a stale lock behind. Other
+    platforms fall back to the O_EXCL lock file polled every ``sleep`` seconds.
+    """
 
     def __init__(self, path: Path, timeout: float = LOCK_TIMEOUT, sleep: float = LOCK_SLEEP) -> None:
         self.path = path
@@ -103,8 +149,40 @@ class FileLock:
         self.fd: Optional[int] = None
 
     def acquire(self) -> None:
-        """[OpenEvent Database] Block until a lock file can be created or raise on timeout."""
+        """[OpenEvent Database] Block until the lock is held or raise on timeout."""
 
+        with span("db.lock_wait"):
+            if fcntl is None:
+                self._acquire_lock_file()
+            else:
+                self._acquire_flock()
+
+    def _acquire_flock(self) -> None:
+        started = time.perf_counter()
+        fd = os.open(self.path, os.O_CREAT | os.O_RDWR, 0o644)
+        contended = False
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                contended = True
+                if not _flock_with_timeout(fd, self.timeout):
+                    revisions.record_lock_wait(0.0, True, timed_out=True)
+                    raise TimeoutError(f"Could not acquire lock {self.path}") from None
+        except BaseException:
+            # Also on timeout: the lock file fd must not outlive the attempt
+            os.close(fd)
+            raise
+        self.fd = fd
+        try:
+            # Holder PID, for debugging only; the kernel lock is authoritative.
+            os.ftruncate(fd, 0)
+            os.write(fd, str(os.getpid()).encode("utf-8"))
+        except OSError:
+            pass
+        revisions.record_lock_wait((time.perf_counter() - started) * 1000.0, contended)
+
+    def _acquire_lock_file(self) -> None:
         deadline = time.time() + self.timeout
         stale_check_done = False
 
@@ -127,8 +205,18 @@ class FileLock:
                 time.sleep(self.sleep)
 
     def release(self) -> None:
-        """[OpenEvent Database] Drop the lock file once a critical section completes."""
+        """[OpenEvent Database] Drop the lock once a critical section completes."""
 
+        if fcntl is not None:
+            # The lock file stays in place: unlinking it would let a new
+            # opener lock a fresh inode while a waiter holds the old one.
+            if self.fd is not None:
+                try:
+                    fcntl.flock(self.fd, fcntl.LOCK_UN)
+                finally:
+                    os.close(self.fd)
+                    self.fd = None
+            return
         if self.fd is not None:
             os.close(self.fd)
             self.fd = None
@@ -156,6 +244,21 @@ def get_default_db() -> Dict[str, Any]:
     return {"events": [], "clients": {}, "tasks": []}
 
 
+def storage_backend() -> str:
+    """[OpenEvent Database] Return the configured storage backend name."""
+
+    backend = os.getenv(DB_BACKEND_ENV, "json").strip().lower()
+    return "sharded" if backend == "sharded" else "json"
+
+
+def _sharded_store(path: Path):
+    """[OpenEvent Database] Resolve the sharded store backing a database path."""
+
+    from workflows.io.sharded_store import get_store
+
+    return get_store(path)
+
+
 def lock_path_for(path: Path, default_lock: Optional[Path] = None) -> Path:
     """[OpenEvent Database] Derive a sibling lockfile path for a JSON resource."""
 
@@ -165,9 +268,61 @@ def lock_path_for(path: Path, default_lock: Optional[Path] = None) -> Path:
     return path.with_name(f".{path.name}.lock")
 
 
+def _file_signature(path: Path) -> revisions.FileSignature:
+    """[OpenEvent Database] Identify the on-disk version of a database file."""
+
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return (str(path), -1, -1, -1)
+    # os.replace() gives every save a new inode, so same-size rewrites within
+    # one mtime tick are still told apart.
+    return (str(path), st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _track(
+    db: Dict[str, Any], signature: revisions.FileSignature, source_text: Optional[str] = None
+) -> revisions.TrackedDB:
+    """Wrap a freshly loaded ``db`` for compare-and-swap saves.
+
+    ``source_text`` is the file content ``db`` was parsed from. Unless this
+    process wrote that file (committed baseline), the baseline is built from
+    it only when a save needs it; ``db`` itself may be modified by then.
+    """
+
+    tracked = revisions.TrackedDB(db)
+    tracked.source_signature = signature
+    committed = revisions.baseline_for(tracked)
+    if committed is not None:
+        tracked.record_baseline = committed
+    elif source_text is None:
+        tracked.record_baseline = revisions.snapshot(tracked)
+    else:
+        tracked.defer_baseline(lambda: revisions.snapshot(_normalized_db(json.loads(source_text))))
+    return tracked
+
+
+def _normalized_db(db: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply ``load_db``'s normalization to a parsed database."""
+
+    if "events" not in db or not isinstance(db["events"], list):
+        db["events"] = []
+    if "clients" not in db or not isinstance(db["clients"], dict):
+        db["clients"] = {}
+    if "tasks" not in db or not isinstance(db["tasks"], list):
+        db["tasks"] = []
+    for event in db["events"]:
+        ensure_event_defaults(event)
+    return db
+
+
+@profile_step("db.load")
 def load_db(path: Path, lock_path: Optional[Path] = None, *, _lock_held: bool = False) -> Dict[str, Any]:
     """[OpenEvent Database] Load and validate the events database from disk.
 
+    The monolithic backend returns a ``TrackedDB`` that remembers the record
+    versions it was loaded from, so ``save_db`` can detect concurrent writers.
+
     Args:
         path: Path to the database JSON file
         lock_path: Optional explicit lock path
@@ -175,12 +330,27 @@ def load_db(path: Path, lock_path: Optional[Path] = None, *, _lock_held: bool =
     """
 
     path = Path(path)
-    if not path.exists():
-        return get_default_db()
+    sharded = storage_backend() == "sharded"
+    if sharded:
+        store = _sharded_store(path)
+        if not store.exists() and not path.exists():
+            return get_default_db()
+    elif not path.exists():
+        return _track(get_default_db(), _file_signature(path))
+
+    signature: Optional[revisions.FileSignature] = None
+    source_text: Optional[str] = None
 
     def _do_load():
+        nonlocal signature, source_text
+        if sharded:
+            store.import_monolithic(path)
+            return store.load(normalize_event=ensure_event_defaults)
+        signature = _file_signature(path)
         with path.open("r", encoding="utf-8") as fh:
-            return json_io.load(fh)
+            source_text = fh.read()
+        revisions.record_io(read=max(signature[2], 0))
+        return json.loads(source_text)
 
     if _lock_held:
         db = _do_load()
@@ -188,21 +358,27 @@ def load_db(path: Path, lock_path: Optional[Path] = None, *, _lock_held: bool =
         lock_candidate = lock_path_for(path, lock_path)
         with FileLock(lock_candidate):
             db = _do_load()
-    if "events" not in db or not isinstance(db["events"], list):
-        db["events"] = []
-    if "clients" not in db or not isinstance(db["clients"], dict):
-        db["clients"] = {}
-    if "tasks" not in db or not isinstance(db["tasks"], list):
-        db["tasks"] = []
-    events = db.get("events", [])
-    for event in events:
-        ensure_event_defaults(event)
+    if isinstance(db, ShardedDB):
+        # Sharded events are normalised when their shard is first parsed.
+        for key, empty in (("events", list), ("clients", dict), ("tasks", list)):
+            if key not in db or not isinstance(db[key], empty):
+                db[key] = empty()
+    else:
+        _normalized_db(db)
+    if signature is not None:
+        db = _track(db, signature, source_text)
     return db
 
 
+@profile_step("db.save")
 def save_db(db: Dict[str, Any], path: Path, lock_path: Optional[Path] = None, *, _lock_held: bool = False) -> None:
     """[OpenEvent Database] Persist the database atomically with crash-safe semantics.
 
+    A ``TrackedDB`` from ``load_db`` is saved compare-and-swap: if another
+    worker wrote the file since it was loaded, only the records this db
+    changed are applied onto the current file (see ``workflows/io/revisions``).
+    A plain dict is written as the full truth, as before.
+
     Args:
         db: The database dict to persist
         path: Path to the database JSON file
@@ -211,25 +387,57 @@ def save_db(db: Dict[str, Any], path: Path, lock_path: Optional[Path] = None, *,
     """
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    out_db = {
-        "events": db.get("events", []),
-        "clients": db.get("clients", {}),
-        "tasks": db.get("tasks", []),
-        "config": db.get("config", {}),
-    }
 
-    def _do_save():
+    def _write(out_db: Dict[str, Any]) -> None:
         tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
         try:
             with os.fdopen(tmp_fd, "w", encoding="utf-8") as fh:
                 json_io.dump(out_db, fh, indent=2, ensure_ascii=False)
                 fh.flush()
                 os.fsync(fh.fileno())
+                revisions.record_io(written=os.fstat(fh.fileno()).st_size)
             os.replace(tmp_path, path)
         finally:
             if os.path.exists(tmp_path):
                 os.remove(tmp_path)
 
+    def _do_save():
+        if storage_backend() == "sharded":
+            store = _sharded_store(path)
+            store.import_monolithic(path)
+            # Pass the original dict so the store can diff against its baseline.
+            store.save(db)
+            return
+        tracked = (
+            isinstance(db, revisions.TrackedDB)
+            and db.source_signature is not None
+            and db.source_signature[0] == str(path)
+        )
+        rebased = False
+        if tracked:
+            if _file_signature(path) == db.source_signature:
+                revisions.mark_committed(db)
+            else:
+                current = get_default_db()
+                if path.exists():
+                    with path.open("r", encoding="utf-8") as fh:
+                        current = json_io.load(fh)
+                        revisions.record_io(read=os.fstat(fh.fileno()).st_size)
+                revisions.rebase(db, current, normalize_event=ensure_event_defaults)
+                rebased = True
+        _write(
+            {
+                "events": db.get("events", []),
+                "clients": db.get("clients", {}),
+                "tasks": db.get("tasks", []),
+                "config": db.get("config", {}),
+            }
+        )
+        if tracked:
+            db.source_signature = _file_signature(path)
+            revisions.remember_baseline(db)
+            revisions.record_save(rebased)
+
     if _lock_held:
         _do_save()
     else:
@@ -238,6 +446,48 @@ def save_db(db: Dict[str, Any], path: Path, lock_path: Optional[Path] = None, *,
             _do_save()
 
 
+def load_event(path: Path, event_id: str, lock_path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """[OpenEvent Database] Read a single event without assembling the whole database.
+
+    With the sharded backend this touches only the event's own shard; the
+    monolithic backend has to parse the full file.
+    """
+
+    path = Path(path)
+    if storage_backend() == "sharded":
+        store = _sharded_store(path)
+        if store.exists():
+            with FileLock(lock_path_for(path, lock_path)):
+                event = store.load_event(event_id)
+            if event is not None:
+                ensure_event_defaults(event)
+            return event
+    db = load_db(path, lock_path=lock_path)
+    idx = find_event_idx_by_id(db, event_id)
+    return db["events"][idx] if idx is not None else None
+
+
+def load_events_for_email(path: Path, email: str, lock_path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """[OpenEvent Database] Read the events linked to a client email via the email index."""
+
+    path = Path(path)
+    email_lc = (email or "").lower()
+    if storage_backend() == "sharded":
+        store = _sharded_store(path)
+        if store.exists():
+            with FileLock(lock_path_for(path, lock_path)):
+                events = store.load_events_for_email(email_lc)
+            for event in events:
+                ensure_event_defaults(event)
+            return events
+    db = load_db(path, lock_path=lock_path)
+    return [
+        event
+        for event in db.get("events", [])
+        if ((event.get("event_data") or {}).get("Email") or "").lower() == email_lc
+    ]
+
+
 def upsert_client(db: Dict[str, Any], email: str, name: Optional[str] = None, event_entry: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """[OpenEvent Database] Create or return a client profile keyed by email."""
 
@@ -294,7 +544,7 @@ def _last_event_for_email(db: Dict[str, Any], email_lc: str) -> Optional[Dict[st
     """[OpenEvent Database] Locate the newest event entry for a given email."""
 
     candidates: List[Tuple[str, int, Dict[str, Any]]] = []
-    for idx, event in enumerate(db.get("events", [])):
+    for idx, event in iter_event_candidates(db, email=email_lc):
         data = event.get("event_data", {})
         if (data.get("Email") or "").lower() == email_lc:
             created = event.get("created_at") or ""
@@ -334,7 +584,7 @@ def find_event_idx(db: Dict[str, Any], client_email: str, event_date_ddmmyyyy: s
     """[OpenEvent Database] Locate an existing event entry by email and event date."""
 
     candidates: List[Tuple[int, str]] = []
-    for idx, event in enumerate(db.get("events", [])):
+    for idx, event in iter_event_candidates(db, email=(client_email or "").lower()):
         data = event.get("event_data", {})
         if (data.get("Email") or "").lower() == (client_email or "").lower() and data.get("Event Date") == event_date_ddmmyyyy:
             created = event.get("created_at", "")
@@ -348,7 +598,7 @@ def find_event_idx(db: Dict[str, Any], client_email: str, event_date_ddmmyyyy: s
 def find_event_idx_by_id(db: Dict[str, Any], event_id: str) -> Optional[int]:
     """[OpenEvent Database] Locate an event entry by its identifier."""
 
-    for idx, event in enumerate(db.get("events", [])):
+    for idx, event in iter_event_candidates(db, event_id=event_id):
         if event.get("event_id") == event_id:
             return idx
     return None
@@ -550,6 +800,21 @@ def append_audit_entry(
     )
 
 
+_OCCUPANCY_FIELDS = frozenset(
+    {
+        "locked_room_id",
+        "status",
+        "Status",
+        "chosen_date",
+        "end_date",
+        "end_date_iso",
+        "requested_window",
+        "event_data",
+        "requirements",
+    }
+)
+
+
 def update_event_metadata(event: Dict[str, Any], **fields: Any) -> None:
     """[OpenEvent Database] Apply metadata updates on workflow-specific fields.
 
@@ -559,6 +824,7 @@ def update_event_metadata(event: Dict[str, Any], **fields: Any) -> None:
     Also logs manager-visible activities for key workflow transitions.
     """
     from activity.persistence import log_workflow_activity
+    from workflows.common.occupancy import note_event_changed
 
     ensure_event_defaults(event)
 
@@ -581,6 +847,10 @@ def update_event_metadata(event: Dict[str, Any], **fields: Any) -> None:
             reason = fields.get("cancellation_reason", "")
             log_workflow_activity(event, "status_cancelled", reason=reason)
 
+    # Keep open room-occupancy batches in step (room, dates, times, status)
+    if _OCCUPANCY_FIELDS.intersection(fields):
+        note_event_changed(event)
+
     # Log activity for step transitions (manager-visible)
     if "current_step" in fields:
         new_step = fields["current_step"]
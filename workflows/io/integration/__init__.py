@@ -12,6 +12,10 @@ Structure:
 - offer_utils.py: Offer number generation and formatting
 - status_utils.py: Status normalization (Lead -> lead)
 - supabase_adapter.py: Supabase-compatible database operations
+- unit_of_work.py: Per-turn write batching and the write-behind worker
+- read_cache.py: Per-team TTL cache for rooms, products and client lookups
+- circuit_breaker.py: Failure/latency circuit breaker used by the fallback adapter
+- memory_client.py: In-memory PostgREST stand-in for tests and benchmarks
 - adapter.py: Main entry point that routes to JSON or Supabase based on config
 """
 
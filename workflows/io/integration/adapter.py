@@ -21,6 +21,11 @@ Or for more explicit control:
     adapter = get_database_adapter()
     adapter.upsert_client(email, name)
 
+    # Send the writes of one turn together (bulk requests on Supabase)
+    with adapter.unit_of_work():
+        client = adapter.upsert_client(email, name)
+        event_id = adapter.create_event(event_data)
+
 Environment:
     OE_INTEGRATION_MODE=json     -> Use local JSON file (default, current behavior)
     OE_INTEGRATION_MODE=supabase -> Use Supabase database
@@ -28,13 +33,20 @@ Environment:
 
 from __future__ import annotations
 
+import json
 import logging
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
-
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Deque, Dict, List, Optional, Tuple
+
+from .circuit_breaker import CLOSED, BreakerSettings, CircuitBreaker
 from .config import INTEGRATION_CONFIG, is_integration_mode, allow_json_fallback
-
-if TYPE_CHECKING:
-    from pathlib import Path
+from .unit_of_work import spool_directory, write_spool_file
 
 
 logger = logging.getLogger(__name__)
@@ -59,6 +71,10 @@ class DatabaseAdapter:
         """Initialize the adapter (called lazily on first use)."""
         raise NotImplementedError
 
+    def unit_of_work(self) -> ContextManager[Any]:
+        """Group the writes made in a ``with`` block (no-op by default)."""
+        return nullcontext()
+
     # Client operations
     def upsert_client(
         self,
@@ -250,16 +266,13 @@ class JSONDatabaseAdapter(DatabaseAdapter):
 
     def find_event_by_id(self, event_id: str) -> Optional[Dict[str, Any]]:
         self.initialize()
-        db = self._load()
-        idx = self._db_module.find_event_idx_by_id(db, event_id)
-        if idx is not None:
-            return db["events"][idx]
-        return None
+        # Scoped read: the sharded backend only touches this event's shard
+        return self._db_module.load_event(self._resolve_db_path(), event_id)
 
     def find_event_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         self.initialize()
-        db = self._load()
-        return self._db_module.last_event_for_email(db, email.lower())
+        events = self._db_module.load_events_for_email(self._resolve_db_path(), email)
+        return self._db_module.last_event_for_email({"events": events}, email.lower())
 
     def update_event(self, event_id: str, **fields: Any) -> Dict[str, Any]:
         self.initialize()
@@ -436,6 +449,13 @@ class SupabaseDatabaseAdapter(DatabaseAdapter):
         self._initialized = True
         logger.info("Supabase database adapter initialized")
 
+    def unit_of_work(self) -> ContextManager[Any]:
+        """Queue writes in the block and send them as bulk requests on exit."""
+        from .unit_of_work import unit_of_work
+
+        self.initialize()
+        return unit_of_work(self._supabase_module.get_supabase_client)
+
     def upsert_client(
         self,
         email: str,
@@ -573,6 +593,21 @@ class SupabaseDatabaseAdapter(DatabaseAdapter):
 # Supabase with JSON Fallback Adapter (Testing Mode)
 # =============================================================================
 
+# Separator line of the LOUD fallback warnings
+_RULE = "=" * 70
+
+
+@dataclass
+class _PendingWrite:
+    """A write served by JSON that still has to reach Supabase."""
+
+    method: str
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    json_result: Any = None
+    failures: int = 0
+
+
 class SupabaseWithFallbackAdapter(DatabaseAdapter):
     """
     Adapter that tries Supabase first, falls back to JSON on errors.
@@ -581,14 +616,55 @@ class SupabaseWithFallbackAdapter(DatabaseAdapter):
     This is for testing/development only - production should NOT use fallback.
 
     The adapter maintains both Supabase and JSON adapters, attempting Supabase
-    operations first and falling back to JSON if they fail.
+    operations first and falling back to JSON if they fail. Writes stay
+    write-through (no ``unit_of_work`` batching) so each one can fall back.
+
+    Each operation class (reads, writes, tasks) has a circuit breaker (see
+    circuit_breaker.py). While a breaker is open, its operations go straight
+    to JSON instead of waiting for Supabase to time out. Writes served by
+    JSON are journaled and replayed against Supabase (``reconcile()``) once
+    a Supabase call succeeds again with the write breakers closed. JSON event
+    ids are mapped to the Supabase ids created by the replay, in every later
+    Supabase call too.
+
+    The journal and the id map are kept next to the write-behind spool (see
+    unit_of_work.py), in ``<spool>/reconcile/``, so they survive restarts.
+    A write that fails ``OE_SUPABASE_RECONCILE_ATTEMPTS`` replays is moved
+    to ``dead_letter.jsonl`` there instead of holding up the writes behind
+    it; so is a write that finds the journal full.
+
+    Environment:
+        OE_SUPABASE_RECONCILE_MAX=<n>       journaled writes kept (default: 1000)
+        OE_SUPABASE_RECONCILE_ATTEMPTS=<n>  replays of one write before it is dead-lettered (default: 5)
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        settings: Optional[BreakerSettings] = None,
+        clock: Callable[[], float] = time.monotonic,
+        journal_dir: Optional[Path] = None,
+    ):
         super().__init__()
         self._supabase = SupabaseDatabaseAdapter()
         self._json_fallback = JSONDatabaseAdapter()
         self._fallback_count = 0
+        self._short_circuit_count = 0
+        settings = settings or BreakerSettings.from_env()
+        self._breakers = {
+            kind: CircuitBreaker(f"supabase.{kind}", settings, clock=clock)
+            for kind in ("reads", "writes", "tasks")
+        }
+        self._journal_max = max(1, int(os.getenv("OE_SUPABASE_RECONCILE_MAX", "") or 1000))
+        self._max_replays = max(1, int(os.getenv("OE_SUPABASE_RECONCILE_ATTEMPTS", "") or 5))
+        self._journal_dir = journal_dir if journal_dir is not None else spool_directory() / "reconcile"
+        self._pending_sync: Deque[_PendingWrite] = deque()
+        self._id_map: Dict[str, str] = {}
+        self._reconciled_count = 0
+        self._dead_letter_count = 0
+        self._journal_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._sync_thread: Optional[threading.Thread] = None
+        self._load_journal()
 
     def initialize(self) -> None:
         if self._initialized:
@@ -605,36 +681,191 @@ class SupabaseWithFallbackAdapter(DatabaseAdapter):
             )
         except Exception as e:
             logger.warning(
-                "\n"
-                "=" * 70 + "\n"
+                "\n%s\n"
                 "[SUPABASE_FALLBACK] Supabase initialization FAILED!\n"
                 "Error: %s\n"
                 "All operations will use JSON fallback.\n"
-                "=" * 70,
-                e
+                "%s",
+                _RULE,
+                e,
+                _RULE,
             )
 
         self._initialized = True
 
-    def _with_fallback(self, operation: str, supabase_fn, json_fn):
-        """Execute Supabase operation with JSON fallback on error."""
+    def _with_fallback(
+        self,
+        operation: str,
+        method: str,
+        args: Tuple[Any, ...] = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        *,
+        kind: str = "reads",
+        journal: bool = False,
+    ):
+        """Call ``method`` on Supabase, falling back to JSON on error or open breaker.
+
+        JSON event ids in the arguments are mapped to their Supabase ids for
+        the Supabase call. With ``journal``, a write that JSON serves is
+        journaled for ``reconcile()``.
+        """
+        kwargs = kwargs or {}
+        breaker = self._breakers[kind]
+        if not breaker.allow():
+            self._short_circuit_count += 1
+            return self._serve_from_json(method, args, kwargs, journal)
+        started = time.perf_counter()
         try:
-            return supabase_fn()
+            result = getattr(self._supabase, method)(*self._mapped(args), **self._mapped(kwargs))
         except Exception as e:
+            breaker.record(False, time.perf_counter() - started)
             self._fallback_count += 1
             logger.warning(
-                "\n"
-                "=" * 70 + "\n"
+                "\n%s\n"
                 "[SUPABASE_FALLBACK] Operation FAILED - falling back to JSON!\n"
                 "Operation: %s\n"
                 "Error: %s\n"
                 "Fallback count this session: %d\n"
-                "=" * 70,
+                "%s",
+                _RULE,
                 operation,
                 e,
-                self._fallback_count
+                self._fallback_count,
+                _RULE,
+            )
+            return self._serve_from_json(method, args, kwargs, journal)
+        breaker.record(True, time.perf_counter() - started)
+        if self._pending_sync and all(self._breakers[k].state == CLOSED for k in ("writes", "tasks")):
+            self._schedule_reconcile()
+        return result
+
+    def _serve_from_json(self, method: str, args: Tuple[Any, ...], kwargs: Dict[str, Any], journal: bool):
+        result = getattr(self._json_fallback, method)(*args, **kwargs)
+        if journal:
+            entry = _PendingWrite(method, args, kwargs, result)
+            with self._journal_lock:
+                if len(self._pending_sync) < self._journal_max:
+                    self._pending_sync.append(entry)
+                    self._save_journal()
+                    return result
+            logger.error(
+                "[SUPABASE_FALLBACK] Reconcile journal full (%d writes), dead-lettering %s",
+                self._journal_max,
+                method,
             )
-            return json_fn()
+            self._dead_letter(entry, "journal full")
+        return result
+
+    def _schedule_reconcile(self) -> None:
+        if self._sync_thread is not None and self._sync_thread.is_alive():
+            return
+        self._sync_thread = threading.Thread(target=self.reconcile, name="supabase-reconcile", daemon=True)
+        self._sync_thread.start()
+
+    def reconcile(self) -> int:
+        """Replay journaled JSON writes against Supabase in order; return how many succeeded.
+
+        Stops at the first failure and keeps the rest for the next attempt,
+        unless the failing write has used up its replays: it is then
+        dead-lettered and the writes behind it go on.
+        """
+        with self._sync_lock:
+            done = 0
+            while True:
+                with self._journal_lock:
+                    if not self._pending_sync:
+                        break
+                    # Only reconcile() removes entries, so the head stays put while it is replayed
+                    entry = self._pending_sync[0]
+                try:
+                    result = getattr(self._supabase, entry.method)(
+                        *self._mapped(entry.args), **self._mapped(entry.kwargs)
+                    )
+                except Exception as exc:
+                    entry.failures += 1
+                    if entry.failures < self._max_replays:
+                        with self._journal_lock:
+                            self._save_journal()
+                        logger.warning(
+                            "[SUPABASE_FALLBACK] Reconcile of %s failed, %d writes still pending: %s",
+                            entry.method,
+                            len(self._pending_sync),
+                            exc,
+                        )
+                        break
+                    logger.error(
+                        "[SUPABASE_FALLBACK] Reconcile of %s failed %d times, dead-lettering it: %s",
+                        entry.method,
+                        entry.failures,
+                        exc,
+                    )
+                    self._dead_letter(entry, str(exc))
+                else:
+                    if entry.method == "create_event" and isinstance(entry.json_result, str):
+                        with self._journal_lock:
+                            self._id_map[entry.json_result] = result
+                            write_spool_file(self._journal_dir / "id_map.json", self._id_map)
+                    done += 1
+                with self._journal_lock:
+                    self._pending_sync.popleft()
+                    self._save_journal()
+            self._reconciled_count += done
+            if done:
+                logger.info("[SUPABASE_FALLBACK] Reconciled %d JSON writes to Supabase", done)
+            return done
+
+    def _map_id(self, value: Any) -> Any:
+        return self._id_map.get(value, value) if isinstance(value, str) else value
+
+    def _mapped(self, values):
+        if isinstance(values, dict):
+            return {key: self._map_id(value) for key, value in values.items()}
+        return tuple(self._map_id(value) for value in values)
+
+    def _load_journal(self) -> None:
+        """Restore the journal and id map saved by an earlier process."""
+        self._journal_dir.mkdir(parents=True, exist_ok=True)
+        journal = self._read_journal_file("journal.json", [])
+        self._id_map = self._read_journal_file("id_map.json", {})
+        for item in journal:
+            self._pending_sync.append(_PendingWrite(**{**item, "args": tuple(item["args"])}))
+
+    def _read_journal_file(self, name: str, default: Any) -> Any:
+        """Parsed ``name``, or ``default`` when missing or corrupt (moved aside as ``.corrupt-<ts>``)."""
+        path = self._journal_dir / name
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return default
+        except ValueError as exc:
+            aside = path.with_name(f"{name}.corrupt-{int(time.time())}")
+            logger.error("[SUPABASE_FALLBACK] Unreadable %s (%s); moved to %s", path, exc, aside.name)
+            os.replace(path, aside)
+            return default
+
+    def _save_journal(self) -> None:
+        """Persist the journal; callers hold ``_journal_lock``."""
+        write_spool_file(
+            self._journal_dir / "journal.json",
+            [asdict(entry) for entry in self._pending_sync],
+        )
+
+    def _dead_letter(self, entry: _PendingWrite, reason: str) -> None:
+        with self._journal_lock:
+            self._dead_letter_count += 1
+            with open(self._journal_dir / "dead_letter.jsonl", "a", encoding="utf-8") as handle:
+                handle.write(json.dumps({**asdict(entry), "reason": reason}, default=str) + "\n")
+
+    def breaker_stats(self) -> Dict[str, Any]:
+        """Breaker states and transitions, fallback counts and the reconcile backlog."""
+        return {
+            "breakers": {kind: breaker.stats() for kind, breaker in self._breakers.items()},
+            "fallbacks": self._fallback_count,
+            "short_circuits": self._short_circuit_count,
+            "pending_sync": len(self._pending_sync),
+            "reconciled": self._reconciled_count,
+            "dead_lettered": self._dead_letter_count,
+        }
 
     def upsert_client(
         self,
@@ -646,40 +877,47 @@ class SupabaseWithFallbackAdapter(DatabaseAdapter):
         self.initialize()
         return self._with_fallback(
             f"upsert_client({email})",
-            lambda: self._supabase.upsert_client(email, name, company, phone),
-            lambda: self._json_fallback.upsert_client(email, name, company, phone),
+            "upsert_client",
+            (email, name, company, phone),
+            kind="writes",
+            journal=True,
         )
 
     def create_event(self, event_data: Dict[str, Any]) -> str:
         self.initialize()
         return self._with_fallback(
             "create_event",
-            lambda: self._supabase.create_event(event_data),
-            lambda: self._json_fallback.create_event(event_data),
+            "create_event",
+            (event_data,),
+            kind="writes",
+            journal=True,
         )
 
     def find_event_by_id(self, event_id: str) -> Optional[Dict[str, Any]]:
         self.initialize()
         return self._with_fallback(
             f"find_event_by_id({event_id})",
-            lambda: self._supabase.find_event_by_id(event_id),
-            lambda: self._json_fallback.find_event_by_id(event_id),
+            "find_event_by_id",
+            (event_id,),
         )
 
     def find_event_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         self.initialize()
         return self._with_fallback(
             f"find_event_by_email({email})",
-            lambda: self._supabase.find_event_by_email(email),
-            lambda: self._json_fallback.find_event_by_email(email),
+            "find_event_by_email",
+            (email,),
         )
 
     def update_event(self, event_id: str, **fields: Any) -> Dict[str, Any]:
         self.initialize()
         return self._with_fallback(
             f"update_event({event_id})",
-            lambda: self._supabase.update_event(event_id, **fields),
-            lambda: self._json_fallback.update_event(event_id, **fields),
+            "update_event",
+            (event_id,),
+            fields,
+            kind="writes",
+            journal=True,
         )
 
     def create_task(
@@ -693,8 +931,11 @@ class SupabaseWithFallbackAdapter(DatabaseAdapter):
         self.initialize()
         return self._with_fallback(
             f"create_task({event_id}, {task_type})",
-            lambda: self._supabase.create_task(event_id, task_type, title, payload, **kwargs),
-            lambda: self._json_fallback.create_task(event_id, task_type, title, payload, **kwargs),
+            "create_task",
+            (event_id, task_type, title, payload),
+            kwargs,
+            kind="tasks",
+            journal=True,
         )
 
     def create_message_approval(
@@ -708,20 +949,18 @@ class SupabaseWithFallbackAdapter(DatabaseAdapter):
         self.initialize()
         return self._with_fallback(
             f"create_message_approval({event_id})",
-            lambda: self._supabase.create_message_approval(
-                event_id, client_name, client_email, draft_message, subject
-            ),
-            lambda: self._json_fallback.create_message_approval(
-                event_id, client_name, client_email, draft_message, subject
-            ),
+            "create_message_approval",
+            (event_id, client_name, client_email, draft_message, subject),
+            kind="tasks",
+            journal=True,
         )
 
     def get_rooms(self, date_iso: Optional[str] = None) -> List[Dict[str, Any]]:
         self.initialize()
         return self._with_fallback(
             "get_rooms",
-            lambda: self._supabase.get_rooms(date_iso),
-            lambda: self._json_fallback.get_rooms(date_iso),
+            "get_rooms",
+            (date_iso,),
         )
 
     def update_event_date(
@@ -734,8 +973,11 @@ class SupabaseWithFallbackAdapter(DatabaseAdapter):
         self.initialize()
         return self._with_fallback(
             f"update_event_date({event_id})",
-            lambda: self._supabase.update_event_date(event_id, date_iso, confirmed=confirmed),
-            lambda: self._json_fallback.update_event_date(event_id, date_iso, confirmed=confirmed),
+            "update_event_date",
+            (event_id, date_iso),
+            {"confirmed": confirmed},
+            kind="writes",
+            journal=True,
         )
 
     def update_event_room(
@@ -748,8 +990,11 @@ class SupabaseWithFallbackAdapter(DatabaseAdapter):
         self.initialize()
         return self._with_fallback(
             f"update_event_room({event_id})",
-            lambda: self._supabase.update_event_room(event_id, room_id, status=status),
-            lambda: self._json_fallback.update_event_room(event_id, room_id, status=status),
+            "update_event_room",
+            (event_id, room_id),
+            {"status": status},
+            kind="writes",
+            journal=True,
         )
 
     def update_event_billing(
@@ -761,8 +1006,10 @@ class SupabaseWithFallbackAdapter(DatabaseAdapter):
         self.initialize()
         return self._with_fallback(
             f"update_event_billing({event_id})",
-            lambda: self._supabase.update_event_billing(event_id, products, total),
-            lambda: self._json_fallback.update_event_billing(event_id, products, total),
+            "update_event_billing",
+            (event_id, products, total),
+            kind="writes",
+            journal=True,
         )
 
     def append_audit(
@@ -774,8 +1021,10 @@ class SupabaseWithFallbackAdapter(DatabaseAdapter):
         self.initialize()
         return self._with_fallback(
             f"append_audit({event_id})",
-            lambda: self._supabase.append_audit(event_id, action, details),
-            lambda: self._json_fallback.append_audit(event_id, action, details),
+            "append_audit",
+            (event_id, action, details),
+            kind="writes",
+            journal=True,
         )
 
     def get_context_snapshot(
@@ -785,8 +1034,8 @@ class SupabaseWithFallbackAdapter(DatabaseAdapter):
         self.initialize()
         return self._with_fallback(
             f"get_context_snapshot({email})",
-            lambda: self._supabase.get_context_snapshot(email),
-            lambda: self._json_fallback.get_context_snapshot(email),
+            "get_context_snapshot",
+            (email,),
         )
 
 
@@ -0,0 +1,174 @@
+"""
+Circuit breaker for Supabase operations.
+
+``SupabaseWithFallbackAdapter`` used to try Supabase on every call, so
+during an outage or a slow period each DB operation of a turn paid the full
+client timeout before falling back to JSON. It now keeps one breaker per
+operation class (reads, writes, tasks):
+
+- CLOSED: calls go to Supabase. The outcome of the last ``window`` calls is
+  kept; once at least ``min_calls`` are recorded and the failure rate or the
+  slow-call rate (calls taking ``slow_ms`` or more) reaches its threshold,
+  the breaker opens.
+- OPEN: calls skip Supabase and go straight to the JSON fallback. After
+  ``open_seconds`` the breaker goes half-open.
+- HALF_OPEN: one probe call is let through. A fast success closes the
+  breaker; a failure or slow call opens it again.
+
+Every state change is counted in ``stats()`` (and in the profiler counter
+``supabase_breaker_transitions`` when OE_PERF=1) and logged.
+
+Environment:
+    OE_BREAKER_WINDOW=<n>          calls in the rolling window (default: 20)
+    OE_BREAKER_MIN_CALLS=<n>       calls before the rates are evaluated (default: 5)
+    OE_BREAKER_FAILURE_RATE=<f>    failure rate that opens the breaker (default: 0.5)
+    OE_BREAKER_SLOW_MS=<ms>        a call this slow counts as slow (default: 2000)
+    OE_BREAKER_SLOW_RATE=<f>       slow-call rate that opens the breaker (default: 0.5)
+    OE_BREAKER_OPEN_SECONDS=<s>    time open before the half-open probe (default: 30)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Tuple
+
+from utils.profiler import count
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        logger.warning("[BREAKER] Ignoring invalid %s=%r", name, raw)
+        return default
+
+
+@dataclass(frozen=True)
+class BreakerSettings:
+    """Thresholds shared by the breakers of one adapter."""
+
+    window: int = 20
+    min_calls: int = 5
+    failure_rate: float = 0.5
+    slow_ms: float = 2000.0
+    slow_rate: float = 0.5
+    open_seconds: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "BreakerSettings":
+        defaults = cls()
+        return cls(
+            window=max(1, int(_env_number("OE_BREAKER_WINDOW", defaults.window))),
+            min_calls=max(1, int(_env_number("OE_BREAKER_MIN_CALLS", defaults.min_calls))),
+            failure_rate=_env_number("OE_BREAKER_FAILURE_RATE", defaults.failure_rate),
+            slow_ms=_env_number("OE_BREAKER_SLOW_MS", defaults.slow_ms),
+            slow_rate=_env_number("OE_BREAKER_SLOW_RATE", defaults.slow_rate),
+            open_seconds=_env_number("OE_BREAKER_OPEN_SECONDS", defaults.open_seconds),
+        )
+
+
+class CircuitBreaker:
+    """Failure-rate and latency breaker with a single half-open probe."""
+
+    def __init__(
+        self,
+        name: str,
+        settings: BreakerSettings = BreakerSettings(),
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.settings = settings
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        # (failed, slow) per call
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=settings.window)
+        self._counters: Dict[str, int] = {"calls": 0, "failures": 0, "slow": 0, "rejected": 0}
+        self._transitions: Dict[str, int] = {}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Return True if the next call may go to Supabase."""
+
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.settings.open_seconds:
+                self._transition(HALF_OPEN)
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._counters["rejected"] += 1
+            return False
+
+    def record(self, success: bool, elapsed_s: float) -> str:
+        """Record a call's outcome; return the state afterwards."""
+
+        slow = elapsed_s * 1000.0 >= self.settings.slow_ms
+        failed = not success
+        with self._lock:
+            self._counters["calls"] += 1
+            self._counters["failures"] += failed
+            self._counters["slow"] += slow
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                self._transition(OPEN if failed or slow else CLOSED)
+                return self._state
+            if self._state == OPEN:
+                # A call admitted before the breaker opened
+                return self._state
+            self._window.append((failed, slow))
+            if len(self._window) >= self.settings.min_calls:
+                calls = len(self._window)
+                failure_rate = sum(1 for outcome in self._window if outcome[0]) / calls
+                slow_rate = sum(1 for outcome in self._window if outcome[1]) / calls
+                if failure_rate >= self.settings.failure_rate or slow_rate >= self.settings.slow_rate:
+                    self._transition(OPEN)
+            return self._state
+
+    def _transition(self, state: str) -> None:
+        previous, self._state = self._state, state
+        key = f"{previous}->{state}"
+        self._transitions[key] = self._transitions.get(key, 0) + 1
+        if state == OPEN:
+            self._opened_at = self._clock()
+            logger.warning("[BREAKER] %s: %s -> open, Supabase calls go to JSON for %.0fs", self.name, previous, self.settings.open_seconds)
+        elif state == CLOSED:
+            self._window.clear()
+            logger.info("[BREAKER] %s: %s -> closed", self.name, previous)
+        else:
+            logger.info("[BREAKER] %s: %s -> half_open, probing Supabase", self.name, previous)
+        count("supabase_breaker_transitions", breaker=self.name, to=state)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state,
+                "window": len(self._window),
+                "transitions": dict(self._transitions),
+                **self._counters,
+            }
+
+
+__all__ = ["BreakerSettings", "CircuitBreaker", "CLOSED", "HALF_OPEN", "OPEN"]
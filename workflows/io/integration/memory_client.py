@@ -0,0 +1,222 @@
+"""
+In-memory stand-in for the Supabase (PostgREST) client.
+
+Implements the subset of the supabase-py query builder used by this package
+(``table().select/insert/upsert/update/delete``, ``eq``/``in_`` filters,
+``order``, ``limit``, ``maybe_single``/``single``, ``execute``) on plain
+dicts, and records every ``execute()`` as one request. Tests and local
+benchmarks use it to count round trips without a Supabase project:
+
+    from workflows.io.integration import supabase_adapter
+    from workflows.io.integration.memory_client import InMemorySupabaseClient
+
+    fake = InMemorySupabaseClient()
+    supabase_adapter._supabase_client = fake
+    ...
+    assert fake.requests == 2
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class PostgrestError(Exception):
+    """Error raised by the stand-in (duplicate keys, injected failures)."""
+
+
+@dataclass
+class MemoryResponse:
+    """Mirror of postgrest's ``APIResponse`` (only ``data`` and ``count``)."""
+
+    data: Any
+    count: Optional[int] = None
+
+
+class InMemorySupabaseClient:
+    """Tables of dict rows keyed by ``id``, with a request log."""
+
+    def __init__(self) -> None:
+        self.tables: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.log: List[Tuple[str, str, int]] = []
+        self._fail_next = 0
+        self._lock = threading.Lock()
+
+    @property
+    def requests(self) -> int:
+        return len(self.log)
+
+    def table(self, name: str) -> "_Query":
+        return _Query(self, name)
+
+    def fail_requests(self, count: int = 1) -> None:
+        """Make the next ``count`` requests raise ``ConnectionError``."""
+        self._fail_next = count
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        return [copy.deepcopy(row) for row in self.tables.get(table, {}).values()]
+
+    def _execute(self, query: "_Query") -> MemoryResponse:
+        with self._lock:
+            if self._fail_next > 0:
+                self._fail_next -= 1
+                raise ConnectionError(f"injected failure for {query.method} {query.name}")
+            rows = self.tables.setdefault(query.name, {})
+            result = getattr(self, f"_{query.method}")(rows, query)
+            self.log.append((query.name, query.method, len(query.payload)))
+        if query.single_row:
+            return MemoryResponse(result[0] if result else None)
+        return MemoryResponse(result, len(result))
+
+    def _select(self, rows: Dict[str, Dict[str, Any]], query: "_Query") -> List[Dict[str, Any]]:
+        matched = [row for row in rows.values() if query.matches(row)]
+        for column, desc in reversed(query.ordering):
+            matched.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        if query.row_limit is not None:
+            matched = matched[: query.row_limit]
+        return [query.project(row) for row in matched]
+
+    def _insert(self, rows: Dict[str, Dict[str, Any]], query: "_Query") -> List[Dict[str, Any]]:
+        new_rows = [dict(row, id=row.get("id") or str(uuid.uuid4())) for row in query.payload]
+        for row in new_rows:
+            if row["id"] in rows:
+                raise PostgrestError(f"duplicate key value violates unique constraint on {query.name}.id")
+        for row in new_rows:
+            rows[row["id"]] = copy.deepcopy(row)
+        return copy.deepcopy(new_rows)
+
+    def _upsert(self, rows: Dict[str, Dict[str, Any]], query: "_Query") -> List[Dict[str, Any]]:
+        keys = [key.strip() for key in query.on_conflict.split(",")]
+        result = []
+        for row in query.payload:
+            existing = next(
+                (current for current in rows.values() if all(current.get(key) == row.get(key) for key in keys)),
+                None,
+            )
+            if existing is None:
+                stored = dict(row, id=row.get("id") or str(uuid.uuid4()))
+                rows[stored["id"]] = copy.deepcopy(stored)
+            elif query.ignore_duplicates:
+                continue
+            else:
+                existing.update(copy.deepcopy(row))
+                stored = existing
+            result.append(copy.deepcopy(stored))
+        return result
+
+    def _update(self, rows: Dict[str, Dict[str, Any]], query: "_Query") -> List[Dict[str, Any]]:
+        [fields] = query.payload
+        result = []
+        for row in rows.values():
+            if query.matches(row):
+                row.update(copy.deepcopy(fields))
+                result.append(copy.deepcopy(row))
+        return result
+
+    def _delete(self, rows: Dict[str, Dict[str, Any]], query: "_Query") -> List[Dict[str, Any]]:
+        doomed = [row_id for row_id, row in rows.items() if query.matches(row)]
+        return [rows.pop(row_id) for row_id in doomed]
+
+
+class _Query:
+    """Chainable request builder (one ``execute()`` = one request)."""
+
+    def __init__(self, client: InMemorySupabaseClient, name: str) -> None:
+        self.client = client
+        self.name = name
+        self.method = "select"
+        self.columns: Optional[List[str]] = None
+        self.payload: List[Dict[str, Any]] = []
+        self.filters: List[Tuple[str, str, Any]] = []
+        self.ordering: List[Tuple[str, bool]] = []
+        self.row_limit: Optional[int] = None
+        self.single_row = False
+        self.on_conflict = "id"
+        self.ignore_duplicates = False
+
+    # Operations ---------------------------------------------------------
+
+    def select(self, columns: str = "*", **_kwargs: Any) -> "_Query":
+        self.method = "select"
+        if columns.strip() != "*":
+            self.columns = [column.strip() for column in columns.split(",")]
+        return self
+
+    def insert(self, rows: Any, **_kwargs: Any) -> "_Query":
+        self.method = "insert"
+        self.payload = copy.deepcopy(rows if isinstance(rows, list) else [rows])
+        return self
+
+    def upsert(self, rows: Any, *, on_conflict: str = "id", ignore_duplicates: bool = False, **_kwargs: Any) -> "_Query":
+        self.method = "upsert"
+        self.payload = copy.deepcopy(rows if isinstance(rows, list) else [rows])
+        self.on_conflict = on_conflict
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, fields: Dict[str, Any], **_kwargs: Any) -> "_Query":
+        self.method = "update"
+        self.payload = [copy.deepcopy(fields)]
+        return self
+
+    def delete(self, **_kwargs: Any) -> "_Query":
+        self.method = "delete"
+        return self
+
+    # Modifiers ----------------------------------------------------------
+
+    def eq(self, column: str, value: Any) -> "_Query":
+        self.filters.append(("eq", column, value))
+        return self
+
+    def neq(self, column: str, value: Any) -> "_Query":
+        self.filters.append(("neq", column, value))
+        return self
+
+    def in_(self, column: str, values: Any) -> "_Query":
+        self.filters.append(("in", column, list(values)))
+        return self
+
+    def order(self, column: str, *, desc: bool = False, **_kwargs: Any) -> "_Query":
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, count: int, **_kwargs: Any) -> "_Query":
+        self.row_limit = count
+        return self
+
+    def maybe_single(self) -> "_Query":
+        self.single_row = True
+        return self
+
+    def single(self) -> "_Query":
+        self.single_row = True
+        return self
+
+    def execute(self) -> MemoryResponse:
+        return self.client._execute(self)
+
+    # Helpers ------------------------------------------------------------
+
+    def matches(self, row: Dict[str, Any]) -> bool:
+        for op, column, value in self.filters:
+            current = row.get(column)
+            if op == "eq" and current != value:
+                return False
+            if op == "neq" and current == value:
+                return False
+            if op == "in" and current not in value:
+                return False
+        return True
+
+    def project(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if self.columns is None:
+            return copy.deepcopy(row)
+        return {column: copy.deepcopy(row.get(column)) for column in self.columns}
+
+
+__all__ = ["InMemorySupabaseClient", "MemoryResponse", "PostgrestError"]
@@ -0,0 +1,245 @@
+"""
+Read-through cache for Supabase reference data.
+
+Rooms and products barely change but used to be fetched on every step 3/4
+turn, and every client lookup by email was a round trip. The Supabase
+adapter now reads them through this cache:
+
+- Entries are keyed by (team_id, kind, key) so tenants never share data.
+- Each kind has its own TTL. A loader result of ``None`` (e.g. an unknown
+  email) is cached too, under the shorter negative TTL.
+- Write paths keep it honest: ``upsert_client`` stores or drops the email's
+  entry, and config saves (``POST /api/config/*``) drop rooms and products.
+  ``invalidate_read_cache()`` is the hook for anything else. A load that
+  was already running when its key was invalidated (or written) returns
+  its result without caching it, so a stale read never outlives the write.
+- ``read_cache_stats()`` reports hits, misses and loads per kind
+  (``GET /api/workflow/read-cache``).
+
+Environment:
+    OE_READ_CACHE=1|0              enable the cache (default: 1)
+    OE_CACHE_ROOMS_TTL=<s>         rooms (default: 300)
+    OE_CACHE_PRODUCTS_TTL=<s>      products (default: 300)
+    OE_CACHE_CLIENTS_TTL=<s>       client id by email (default: 120)
+    OE_CACHE_NEGATIVE_TTL=<s>      "not found" results (default: 30)
+    OE_CACHE_MAX_ENTRIES=<n>       entries kept across teams and kinds (default: 4096)
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTLS: Dict[str, float] = {"rooms": 300.0, "products": 300.0, "clients": 120.0}
+DEFAULT_NEGATIVE_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 4096
+
+_Key = Tuple[Optional[str], str, str]
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        logger.warning("[READ_CACHE] Ignoring invalid %s=%r", name, raw)
+        return default
+
+
+def read_cache_enabled() -> bool:
+    return os.getenv("OE_READ_CACHE", "1").strip().lower() not in ("0", "false", "no")
+
+
+class ReadCache:
+    """TTL cache with negative entries, LRU bound and per-kind counters."""
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        *,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[_Key, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Generation per key with a load in flight, and how many loads share it
+        self._generations: Dict[_Key, int] = {}
+        self._loading: Dict[_Key, int] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, kind: str, counter: str) -> None:
+        kind_stats = self._stats.setdefault(
+            kind, {"hits": 0, "negative_hits": 0, "misses": 0, "loads": 0, "invalidations": 0}
+        )
+        kind_stats[counter] += 1
+
+    def get_or_load(self, team_id: Optional[str], kind: str, key: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key`` or call ``loader`` and cache its result.
+
+        Returned values are copies, so callers may mutate them freely.
+        """
+
+        entry_key = (team_id, kind, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(entry_key)
+                self._count(kind, "hits" if entry[1] is not None else "negative_hits")
+                return copy.deepcopy(entry[1])
+            self._count(kind, "misses")
+            generation = self._generations.setdefault(entry_key, 0)
+            self._loading[entry_key] = self._loading.get(entry_key, 0) + 1
+        try:
+            value = loader()
+        except BaseException:
+            with self._lock:
+                self._finish_load(entry_key)
+            raise
+        # Compare and store under the same lock that drops the bookkeeping, so
+        # an invalidation either bumps the generation first or drops the entry after
+        with self._lock:
+            if self._generations[entry_key] == generation:
+                self._store(entry_key, value)
+            self._count(kind, "loads")
+            self._finish_load(entry_key)
+        return copy.deepcopy(value)
+
+    def put(self, team_id: Optional[str], kind: str, key: str, value: Any) -> None:
+        entry_key = (team_id, kind, key)
+        with self._lock:
+            self._bump(entry_key)
+            self._store(entry_key, value)
+
+    def _store(self, entry_key: _Key, value: Any) -> None:
+        ttl = self.negative_ttl if value is None else self.ttls.get(entry_key[1], 0.0)
+        if ttl <= 0:
+            self._entries.pop(entry_key, None)
+            return
+        self._entries[entry_key] = (self._clock() + ttl, copy.deepcopy(value))
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _finish_load(self, entry_key: _Key) -> None:
+        self._loading[entry_key] -= 1
+        if not self._loading[entry_key]:
+            del self._loading[entry_key]
+            del self._generations[entry_key]
+
+    def _bump(self, entry_key: _Key) -> None:
+        """Make loads of ``entry_key`` that are in flight skip caching their result."""
+        if entry_key in self._generations:
+            self._generations[entry_key] += 1
+
+    def invalidate(self, team_id: Optional[str] = None, kind: Optional[str] = None, key: Optional[str] = None) -> int:
+        """Drop matching entries (``None`` matches anything); return how many."""
+
+        def matches(entry_key: _Key) -> bool:
+            return (
+                (team_id is None or entry_key[0] == team_id)
+                and (kind is None or entry_key[1] == kind)
+                and (key is None or entry_key[2] == key)
+            )
+
+        with self._lock:
+            for entry_key in self._generations:
+                if matches(entry_key):
+                    self._generations[entry_key] += 1
+            doomed = [entry_key for entry_key in self._entries if matches(entry_key)]
+            for entry_key in doomed:
+                del self._entries[entry_key]
+                self._count(entry_key[1], "invalidations")
+            return len(doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttls": dict(self.ttls),
+                "negative_ttl": self.negative_ttl,
+                "kinds": {kind: dict(counters) for kind, counters in self._stats.items()},
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_CACHE: Optional[ReadCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_read_cache() -> ReadCache:
+    """Return the process-wide cache, configured from the environment on first use."""
+
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = ReadCache(
+                {
+                    "rooms": _env_float("OE_CACHE_ROOMS_TTL", DEFAULT_TTLS["rooms"]),
+                    "products": _env_float("OE_CACHE_PRODUCTS_TTL", DEFAULT_TTLS["products"]),
+                    "clients": _env_float("OE_CACHE_CLIENTS_TTL", DEFAULT_TTLS["clients"]),
+                },
+                negative_ttl=_env_float("OE_CACHE_NEGATIVE_TTL", DEFAULT_NEGATIVE_TTL),
+                max_entries=max(1, int(_env_float("OE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))),
+            )
+        return _CACHE
+
+
+def cached(team_id: Optional[str], kind: str, key: str, loader: Callable[[], Any]) -> Any:
+    """Read ``key`` through the cache (straight to ``loader`` when disabled)."""
+
+    if not read_cache_enabled():
+        return loader()
+    return get_read_cache().get_or_load(team_id, kind, key, loader)
+
+
+def invalidate_read_cache(team_id: Optional[str] = None, kind: Optional[str] = None, key: Optional[str] = None) -> int:
+    """Drop cached entries; with no arguments, everything."""
+
+    cache = _CACHE
+    return cache.invalidate(team_id, kind, key) if cache is not None else 0
+
+
+def read_cache_stats() -> Dict[str, Any]:
+    """Counters of the process-wide cache (empty until first use)."""
+
+    cache = _CACHE
+    if cache is None:
+        return {"enabled": read_cache_enabled(), "entries": 0, "kinds": {}}
+    return {"enabled": read_cache_enabled(), **cache.stats()}
+
+
+def reset_read_cache() -> None:
+    """Forget the cache and its settings (tests)."""
+
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = None
+
+
+__all__ = [
+    "ReadCache",
+    "cached",
+    "get_read_cache",
+    "invalidate_read_cache",
+    "read_cache_enabled",
+    "read_cache_stats",
+    "reset_read_cache",
+]
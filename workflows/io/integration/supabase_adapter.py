@@ -8,6 +8,11 @@ Usage:
     When OE_INTEGRATION_MODE=supabase, the adapter.py module routes
     calls here instead of to database.py.
 
+Rooms, products and client-by-email lookups are read through a per-team
+TTL cache (see read_cache.py). Inside ``unit_of_work()`` (see unit_of_work.py), inserts and updates are
+queued and sent as bulk requests when the block exits; reads see the
+pending rows.
+
 Requirements:
     - supabase-py package
     - Environment variables: OE_SUPABASE_URL, OE_SUPABASE_KEY, OE_TEAM_ID, OE_SYSTEM_USER_ID
@@ -16,6 +21,7 @@ Requirements:
 from __future__ import annotations
 
 import logging
+import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -40,6 +46,8 @@ from .uuid_adapter import (
 )
 from .offer_utils import generate_offer_number, format_date_for_supabase
 from .hil_tasks import create_message_approval_task, create_email_record
+from .read_cache import cached, get_read_cache, invalidate_read_cache, read_cache_enabled
+from .unit_of_work import current_unit_of_work
 
 
 __workflow_role__ = "Database"
@@ -93,46 +101,49 @@ def get_supabase_client():
 
 
 def _lookup_client_by_email(email: str, team_id: str) -> Optional[str]:
-    """Lookup client UUID by email (used by uuid_adapter)."""
-    client = get_supabase_client()
-    result = client.table("clients") \
-        .select("id") \
-        .eq("email", email) \
-        .eq("team_id", team_id) \
-        .maybe_single() \
-        .execute()
+    """Lookup client UUID by email (used by uuid_adapter; unknown emails are cached too)."""
+    email = normalize_email(email)
 
-    if result.data:
-        return result.data["id"]
-    return None
+    def _load() -> Optional[str]:
+        result = get_supabase_client().table("clients") \
+            .select("id") \
+            .eq("email", email) \
+            .eq("team_id", team_id) \
+            .maybe_single() \
+            .execute()
+        return result.data["id"] if result.data else None
 
+    return cached(team_id, "clients", email, _load)
 
-def _load_entity_registries():
-    """Load room and product name -> UUID mappings."""
-    client = get_supabase_client()
-    team_id = get_team_id()
 
-    if not team_id:
-        return
+def _remember_client(team_id: Optional[str], record: Dict[str, Any]) -> None:
+    """Keep the client cache in step with a write (replaces a negative entry)."""
+    email = normalize_email(record.get("email") or "")
+    if email and read_cache_enabled():
+        get_read_cache().put(team_id, "clients", email, record.get("id"))
 
-    registry = get_entity_registry()
 
-    # Load rooms
-    rooms_result = client.table("rooms") \
-        .select("id, name") \
-        .eq("team_id", team_id) \
-        .execute()
+def _load_entity_registries():
+    """Load room and product name -> UUID mappings (from the read cache)."""
+    if not get_team_id():
+        return
+    get_rooms()
+    get_products()
+
 
-    # Load products
-    products_result = client.table("products") \
-        .select("id, name") \
+def _fetch_team_rows(table: str, team_id: Optional[str]) -> List[Dict[str, Any]]:
+    """Load all rows of ``table`` for a team and refresh the name -> UUID registry."""
+    result = get_supabase_client().table(table) \
+        .select("*") \
         .eq("team_id", team_id) \
         .execute()
-
-    registry.load_from_supabase(
-        rooms_result.data or [],
-        products_result.data or []
-    )
+    rows = result.data or []
+    registry = get_entity_registry()
+    if table == "rooms":
+        registry.load_from_supabase(rows, [])
+    else:
+        registry.load_from_supabase([], rows)
+    return rows
 
 
 # =============================================================================
@@ -163,6 +174,14 @@ def upsert_client(
     team_id = get_team_id()
     user_id = get_system_user_id()
     email_normalized = normalize_email(email)
+    work = current_unit_of_work()
+
+    # Reuse the record looked up or created earlier in this unit of work
+    known = work.recall(("clients", team_id, email_normalized)) if work else None
+    if known is not None:
+        if name and not known.get("name"):
+            known.update(work.update("clients", known["id"], {"name": name}, team_id=team_id))
+        return dict(known)
 
     # Try to find existing client
     existing = client.table("clients") \
@@ -174,13 +193,19 @@ def upsert_client(
 
     if existing.data:
         # Update if name was provided and client has no name
-        if name and not existing.data.get("name"):
+        if name and not existing.data.get("name") and work is not None:
+            work.update("clients", existing.data["id"], {"name": name}, team_id=team_id)
+            existing.data["name"] = name
+        elif name and not existing.data.get("name"):
             client.table("clients") \
                 .update({"name": name}) \
                 .eq("id", existing.data["id"]) \
                 .eq("team_id", team_id) \
                 .execute()
             existing.data["name"] = name
+        if work is not None:
+            work.remember(("clients", team_id, email_normalized), dict(existing.data))
+        _remember_client(team_id, existing.data)
         return existing.data
 
     # Create new client
@@ -194,7 +219,12 @@ def upsert_client(
         "status": "lead",
     }
 
+    if work is not None:
+        # Not cached until the unit of work is written; only drop a negative entry
+        invalidate_read_cache(team_id, "clients", email_normalized)
+        return dict(work.remember(("clients", team_id, email_normalized), work.insert("clients", new_client)))
     result = client.table("clients").insert(new_client).execute()
+    _remember_client(team_id, result.data[0])
     return result.data[0]
 
 
@@ -252,6 +282,9 @@ def create_event_entry(event_data: Dict[str, Any]) -> str:
     # Remove None values
     supabase_event = {k: v for k, v in supabase_event.items() if v is not None}
 
+    work = current_unit_of_work()
+    if work is not None:
+        return work.insert("events", supabase_event)["id"]
     result = client.table("events").insert(supabase_event).execute()
     return result.data[0]["id"]
 
@@ -269,6 +302,14 @@ def find_event_by_id(event_id: str) -> Optional[Dict[str, Any]]:
     client = get_supabase_client()
     team_id = get_team_id()
 
+    work = current_unit_of_work()
+    if work is not None:
+        inserted, updated = work.pending("events", event_id)
+        if inserted is not None:
+            return _convert_event_to_internal(inserted)
+        stored = _stored_event_row(event_id, team_id)
+        return _convert_event_to_internal({**stored, **updated}) if stored else None
+
     result = client.table("events") \
         .select("*") \
         .eq("id", event_id) \
@@ -281,6 +322,22 @@ def find_event_by_id(event_id: str) -> Optional[Dict[str, Any]]:
     return None
 
 
+def _stored_event_row(event_id: str, team_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Return the stored row of ``event_id``, fetched once per unit of work."""
+    work = current_unit_of_work()
+    key = ("events", team_id, event_id)
+    row = work.recall(key)
+    if row is None:
+        result = get_supabase_client().table("events") \
+            .select("*") \
+            .eq("id", event_id) \
+            .eq("team_id", team_id) \
+            .maybe_single() \
+            .execute()
+        row = work.remember(key, dict(result.data) if result.data else {})
+    return dict(row)
+
+
 def find_event_by_email(email: str) -> Optional[Dict[str, Any]]:
     """
     Find the most recent event for a client email.
@@ -294,19 +351,11 @@ def find_event_by_email(email: str) -> Optional[Dict[str, Any]]:
     client = get_supabase_client()
     team_id = get_team_id()
 
-    # First find the client
-    client_result = client.table("clients") \
-        .select("id") \
-        .eq("email", normalize_email(email)) \
-        .eq("team_id", team_id) \
-        .maybe_single() \
-        .execute()
-
-    if not client_result.data:
+    # First find the client (cached, including unknown emails)
+    client_id = _lookup_client_by_email(email, team_id)
+    if not client_id:
         return None
 
-    client_id = client_result.data["id"]
-
     # Find most recent event for this client
     # Note: This requires a client_id field on events, which may need to be added
     # For now, we search by contact email in the notes or a join
@@ -350,6 +399,14 @@ def update_event_metadata(event_id: str, **fields: Any) -> Dict[str, Any]:
             supabase_fields[key] = value
 
     team_id = get_team_id()
+    work = current_unit_of_work()
+    if work is not None:
+        pending = work.update("events", event_id, supabase_fields, team_id=team_id)
+        if work.pending("events", event_id)[0] is not None:
+            return pending
+        # Like the write-through path, return the whole row with the update applied
+        stored = _stored_event_row(event_id, team_id)
+        return {**stored, **pending} if stored else {}
     result = client.table("events") \
         .update(supabase_fields) \
         .eq("id", event_id) \
@@ -394,7 +451,8 @@ def update_event_room(
     Returns:
         Updated event record
     """
-    # Convert room name to UUID if needed
+    # Convert room name to UUID if needed (registry refreshed with the rooms cache)
+    _load_entity_registries()
     registry = get_entity_registry()
     room_uuid = registry.get_room_uuid(selected_room) or selected_room
 
@@ -433,7 +491,6 @@ def create_hil_task(
     Returns:
         Task UUID
     """
-    client = get_supabase_client()
     team_id = get_team_id()
     user_id = get_system_user_id()
 
@@ -451,8 +508,7 @@ def create_hil_task(
         # For now, include key fields directly
     }
 
-    result = client.table("tasks").insert(task).execute()
-    return result.data[0]["id"]
+    return _insert_row("tasks", task)["id"]
 
 
 def create_message_approval(
@@ -475,7 +531,6 @@ def create_message_approval(
     Returns:
         Task UUID
     """
-    client = get_supabase_client()
     team_id = get_team_id()
     user_id = get_system_user_id()
 
@@ -489,8 +544,7 @@ def create_message_approval(
         subject=subject,
     )
 
-    result = client.table("tasks").insert(task).execute()
-    return result.data[0]["id"]
+    return _insert_row("tasks", task)["id"]
 
 
 # =============================================================================
@@ -523,7 +577,6 @@ def store_email(
     Returns:
         Email UUID
     """
-    client = get_supabase_client()
     team_id = get_team_id()
     user_id = get_system_user_id()
 
@@ -540,8 +593,7 @@ def store_email(
         thread_id=thread_id,
     )
 
-    result = client.table("emails").insert(email_record).execute()
-    return result.data[0]["id"]
+    return _insert_row("emails", email_record)["id"]
 
 
 # =============================================================================
@@ -558,15 +610,19 @@ def get_rooms(date_iso: Optional[str] = None) -> List[Dict[str, Any]]:
     Returns:
         List of room records
     """
-    client = get_supabase_client()
     team_id = get_team_id()
+    return cached(team_id, "rooms", "*", lambda: _fetch_team_rows("rooms", team_id))
 
-    result = client.table("rooms") \
-        .select("*") \
-        .eq("team_id", team_id) \
-        .execute()
 
-    return result.data or []
+def get_products() -> List[Dict[str, Any]]:
+    """
+    Get all products of the team.
+
+    Returns:
+        List of product records
+    """
+    team_id = get_team_id()
+    return cached(team_id, "products", "*", lambda: _fetch_team_rows("products", team_id))
 
 
 def get_room_by_id(room_id: str) -> Optional[Dict[str, Any]]:
@@ -579,6 +635,11 @@ def get_room_by_id(room_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Room record or None
     """
+    for room in get_rooms():
+        if room.get("id") == room_id:
+            return room
+
+    # Not in the cached list (e.g. added since it was loaded)
     client = get_supabase_client()
     team_id = get_team_id()
 
@@ -644,14 +705,16 @@ def create_offer(
         ]
     }
 
-    result = client.table("offers").insert(offer).execute()
-    offer_id = result.data[0]["id"]
+    offer_id = _insert_row("offers", offer)["id"]
 
-    # Insert line items
-    for item in line_items:
-        item["offer_id"] = offer_id
-        item["team_id"] = team_id
-        client.table("offer_line_items").insert(item).execute()
+    # Insert all line items in one request
+    rows = [{**item, "offer_id": offer_id, "team_id": team_id} for item in line_items]
+    work = current_unit_of_work()
+    if work is not None:
+        for row in rows:
+            work.insert("offer_line_items", row)
+    elif rows:
+        client.table("offer_line_items").insert(rows).execute()
 
     return offer_id
 
@@ -660,6 +723,15 @@ def create_offer(
 # Helper Functions
 # =============================================================================
 
+def _insert_row(table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Insert one row now, or queue it in the current unit of work."""
+    work = current_unit_of_work()
+    if work is not None:
+        return work.insert(table, row)
+    result = get_supabase_client().table(table).insert(row).execute()
+    return result.data[0]
+
+
 def _convert_date_to_iso(date_str: Optional[str]) -> Optional[str]:
     """Convert various date formats to ISO (YYYY-MM-DD)."""
     if not date_str or date_str == "Not specified":
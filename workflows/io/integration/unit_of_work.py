@@ -0,0 +1,433 @@
+"""
+Unit of work for Supabase writes.
+
+Each adapter write is one PostgREST round trip made inside the synchronous
+workflow turn. Inside ``unit_of_work()`` the Supabase adapter queues its
+writes instead and they are sent together when the block exits:
+
+- Inserts get a client-side UUID so callers have the id immediately. They
+  are sent as one bulk insert per table, in first-use order (events before
+  offers before offer line items).
+- Updates to the same row are merged into one request. An update to a row
+  inserted in the same unit of work is folded into the insert.
+- Reads see the pending rows (``pending()``), and ``remember()``/``recall()``
+  let the adapter skip repeated lookups within the turn.
+
+Flushing is write-through (at block exit, errors propagate) unless
+write-behind is enabled. In that case the batch is spooled to disk and
+handed to a background worker that retries it with backoff. A spooled
+batch survives restarts until it has been written; progress is recorded
+per request, so a retry never repeats an insert. Each spool file is claimed
+with a lock next to it (``<name>.lock``) while a worker owns it, so a
+process starting up only replays the batches no live worker is writing.
+
+Usage:
+    with adapter.unit_of_work():
+        client = adapter.upsert_client(email, name)
+        event_id = adapter.create_event(event_data)
+        adapter.update_event_billing(event_id, products, total)
+
+Environment:
+    OE_WRITE_BEHIND=1|0            flush on a background worker (default: 0)
+    OE_WRITE_BEHIND_DIR=<path>     spool directory (default: tmp-cache/write_behind)
+    OE_WRITE_BEHIND_RETRIES=<n>    attempts per batch before it waits for a restart (default: 8)
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:  # POSIX advisory locks; other platforms fall back to O_EXCL lock files.
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+from .uuid_adapter import generate_uuid
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPOOL_DIR = Path(__file__).resolve().parents[3] / "tmp-cache" / "write_behind"
+DEFAULT_RETRIES = 8
+_BACKOFF_BASE_S = 0.5
+_BACKOFF_MAX_S = 30.0
+
+
+@dataclass
+class WriteRequest:
+    """One PostgREST request: a bulk insert or a filtered update."""
+
+    table: str
+    method: str  # "insert" | "update"
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    filters: Dict[str, Any] = field(default_factory=dict)
+
+    def execute(self, client: Any) -> Any:
+        query = client.table(self.table)
+        if self.method == "insert":
+            return query.insert(self.rows).execute()
+        query = query.update(self.rows[0])
+        for column, value in self.filters.items():
+            query = query.eq(column, value)
+        return query.execute()
+
+
+class UnitOfWork:
+    """Pending writes of one turn."""
+
+    def __init__(self) -> None:
+        self._inserts: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._inserted: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._updates: "OrderedDict[Tuple[str, str], WriteRequest]" = OrderedDict()
+        self._memo: Dict[Any, Any] = {}
+
+    def insert(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue ``row`` (with a generated ``id`` if missing) and return it."""
+
+        row = dict(row)
+        row.setdefault("id", generate_uuid())
+        self._inserts.setdefault(table, []).append(row)
+        self._inserted[(table, row["id"])] = row
+        return dict(row)
+
+    def update(self, table: str, row_id: str, fields: Dict[str, Any], **filters: Any) -> Dict[str, Any]:
+        """Queue an update of ``row_id``; return the row's pending fields."""
+
+        pending = self._inserted.get((table, row_id))
+        if pending is not None:
+            pending.update(fields)
+            return dict(pending)
+        request = self._updates.get((table, row_id))
+        if request is None:
+            request = WriteRequest(table, "update", [{}], {"id": row_id, **filters})
+            self._updates[(table, row_id)] = request
+        request.rows[0].update(fields)
+        return {"id": row_id, **request.rows[0]}
+
+    def pending(self, table: str, row_id: str) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Return ``(inserted_row, updated_fields)`` queued for ``row_id``."""
+
+        inserted = self._inserted.get((table, row_id))
+        request = self._updates.get((table, row_id))
+        return (dict(inserted) if inserted else None), (dict(request.rows[0]) if request else {})
+
+    def remember(self, key: Any, value: Any) -> Any:
+        self._memo[key] = value
+        return value
+
+    def recall(self, key: Any) -> Any:
+        return self._memo.get(key)
+
+    def requests(self) -> List[WriteRequest]:
+        """Requests in flush order: bulk inserts per table, then updates."""
+
+        batch = [WriteRequest(table, "insert", rows) for table, rows in self._inserts.items() if rows]
+        batch.extend(self._updates.values())
+        return batch
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self._inserts.values()) + len(self._updates)
+
+    def flush(self, client: Any) -> int:
+        """Send the pending writes; return the number of requests made."""
+
+        batch = self.requests()
+        for request in batch:
+            request.execute(client)
+        self.clear()
+        return len(batch)
+
+    def clear(self) -> None:
+        self._inserts.clear()
+        self._inserted.clear()
+        self._updates.clear()
+        self._memo.clear()
+
+
+_CURRENT: ContextVar[Optional[UnitOfWork]] = ContextVar("supabase_unit_of_work", default=None)
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    """Return the unit of work of the current turn, if one is open."""
+    return _CURRENT.get()
+
+
+@contextmanager
+def unit_of_work(client_factory: Callable[[], Any]) -> Iterator[UnitOfWork]:
+    """Collect writes made in the block and flush them on exit.
+
+    Nested blocks join the outer unit of work. When the block raises, the
+    pending writes are discarded, like an unsaved JSON database.
+    """
+
+    outer = _CURRENT.get()
+    if outer is not None:
+        yield outer
+        return
+    work = UnitOfWork()
+    token = _CURRENT.set(work)
+    try:
+        yield work
+    except BaseException:
+        work.clear()
+        raise
+    finally:
+        _CURRENT.reset(token)
+    if not len(work):
+        return
+    if write_behind_enabled():
+        get_write_behind_queue(client_factory).submit(work.requests())
+        work.clear()
+    else:
+        work.flush(client_factory())
+
+
+# =============================================================================
+# Write-behind worker
+# =============================================================================
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        logger.warning("[WRITE_BEHIND] Ignoring invalid %s=%r", name, raw)
+        return default
+
+
+def write_behind_enabled() -> bool:
+    return os.getenv("OE_WRITE_BEHIND", "0").strip().lower() in ("1", "true", "yes")
+
+
+class WriteBehindQueue:
+    """Background writer for flushed batches, spooled to disk until written."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        *,
+        spool_dir: Optional[Path] = None,
+        max_attempts: int = DEFAULT_RETRIES,
+        backoff_base: float = _BACKOFF_BASE_S,
+    ) -> None:
+        self.client_factory = client_factory
+        self.spool_dir = spool_dir
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self._queue: "queue.Queue[Optional[Tuple[Optional[Path], List[WriteRequest], int]]]" = queue.Queue()
+        self._counters: Dict[str, int] = {"batches": 0, "requests": 0, "retries": 0, "stranded": 0}
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._claims: Dict[Path, int] = {}
+        if spool_dir is not None:
+            spool_dir.mkdir(parents=True, exist_ok=True)
+            for path in sorted(spool_dir.glob("*.json")):
+                # Skip batches another worker holds, or finished since the glob
+                if self._claim(path):
+                    self._enqueue(*self._load_spool(path))
+        self._thread = threading.Thread(target=self._run, name="supabase-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, batch: List[WriteRequest]) -> None:
+        path = None
+        if self.spool_dir is not None:
+            path = self.spool_dir / f"{time.time_ns()}_{generate_uuid()[:8]}.json"
+            self._claim(path, new=True)
+            self._save_spool(path, batch, 0)
+        self._enqueue(path, batch, 0)
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Wait until every submitted batch is written (or stranded)."""
+
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"pending": self._pending, **self._counters}
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        self.flush(timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _enqueue(self, path: Optional[Path], batch: List[WriteRequest], done: int) -> None:
+        with self._idle:
+            self._pending += 1
+        self._queue.put((path, batch, done))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, batch, done = item
+            try:
+                self._write(path, batch, done)
+            finally:
+                if path is not None:
+                    self._release(path)
+                with self._idle:
+                    self._pending -= 1
+                    self._idle.notify_all()
+
+    def _write(self, path: Optional[Path], batch: List[WriteRequest], done: int) -> None:
+        attempt = 0
+        while done < len(batch):
+            try:
+                batch[done].execute(self.client_factory())
+            except Exception as exc:
+                attempt += 1
+                if attempt >= self.max_attempts:
+                    self._counters["stranded"] += 1
+                    logger.error(
+                        "[WRITE_BEHIND] Giving up on batch after %d attempts (%s); %s",
+                        attempt,
+                        exc,
+                        f"kept in {path} for the next start" if path else "batch lost",
+                    )
+                    return
+                self._counters["retries"] += 1
+                time.sleep(min(_BACKOFF_MAX_S, self.backoff_base * 2 ** (attempt - 1)))
+                continue
+            done += 1
+            self._counters["requests"] += 1
+            if path is not None and done < len(batch):
+                self._save_spool(path, batch, done)
+        self._counters["batches"] += 1
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def _claim(self, path: Path, *, new: bool = False) -> bool:
+        """Lock ``path`` for this worker; False if another worker holds it.
+
+        A stranded batch's claim is dropped with the rest (see ``_release``),
+        so the next start picks it up again. ``flock`` claims die with their
+        process; the O_EXCL fallback leaves a crashed worker's lock in place.
+        """
+
+        lock = path.with_name(path.name + ".lock")
+        if fcntl is None:
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                return False
+        else:
+            fd = os.open(lock, os.O_CREAT | os.O_RDWR, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+        self._claims[path] = fd
+        if not new and not path.exists():
+            self._release(path)
+            return False
+        return True
+
+    def _release(self, path: Path) -> None:
+        """Drop the claim on ``path``; remove the lock once the batch is written.
+
+        The lock file is unlinked while still held, and claimants re-check
+        that the batch exists after locking, so a late claimant of the old
+        lock inode skips the finished batch instead of writing it again.
+        """
+
+        fd = self._claims.pop(path, None)
+        if fd is None:
+            return
+        try:
+            if not path.exists() or fcntl is None:
+                path.with_name(path.name + ".lock").unlink(missing_ok=True)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _save_spool(path: Path, batch: List[WriteRequest], done: int) -> None:
+        write_spool_file(path, {"done": done, "requests": [asdict(request) for request in batch]})
+
+    @staticmethod
+    def _load_spool(path: Path) -> Tuple[Path, List[WriteRequest], int]:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return path, [WriteRequest(**request) for request in payload["requests"]], int(payload.get("done", 0))
+
+
+def spool_directory() -> Path:
+    """Directory of the write-behind spool (``OE_WRITE_BEHIND_DIR``)."""
+
+    spool = os.getenv("OE_WRITE_BEHIND_DIR", "").strip()
+    return Path(spool) if spool else DEFAULT_SPOOL_DIR
+
+
+def write_spool_file(path: Path, payload: Any) -> None:
+    """Write ``payload`` as JSON to ``path`` atomically (synced temp file + rename)."""
+
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(tmp_fd, "w", encoding="utf-8") as fh:
+            fh.write(json.dumps(payload, default=str))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+_QUEUE: Optional[WriteBehindQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_write_behind_queue(client_factory: Callable[[], Any]) -> WriteBehindQueue:
+    """Return the process-wide write-behind queue (replays the spool on start)."""
+
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            _QUEUE = WriteBehindQueue(
+                client_factory,
+                spool_dir=spool_directory(),
+                max_attempts=_env_int("OE_WRITE_BEHIND_RETRIES", DEFAULT_RETRIES),
+            )
+        return _QUEUE
+
+
+def shutdown_write_behind() -> None:
+    """Drain and stop the write-behind queue (no-op if it was never started)."""
+
+    global _QUEUE
+    with _QUEUE_LOCK:
+        pending, _QUEUE = _QUEUE, None
+    if pending is not None:
+        pending.shutdown()
+
+
+atexit.register(shutdown_write_behind)
+
+
+__all__ = [
+    "UnitOfWork",
+    "WriteBehindQueue",
+    "WriteRequest",
+    "current_unit_of_work",
+    "get_write_behind_queue",
+    "shutdown_write_behind",
+    "spool_directory",
+    "unit_of_work",
+    "write_behind_enabled",
+    "write_spool_file",
+]
@@ -0,0 +1,491 @@
+"""
+Optimistic concurrency for the workflow database.
+
+``process_msg`` loads the database, runs a turn (LLM calls included) and
+saves at the end. The file lock only covers the individual load and save, so
+two turns that overlap used to load the same snapshot and the last writer
+silently dropped the other turn's changes.
+
+Saves are now compare-and-swap per record:
+
+- ``load_db`` remembers the bytes of every event/client/task (and config) it
+  handed out, plus the file signature it read them from. The baseline is
+  built from the loaded file text on first use (normally the save), so
+  read-only loads never encode a record. A load of the file this process
+  last wrote reuses the baseline of that save instead.
+- ``save_db`` re-checks the file under the lock. If nobody wrote since the
+  load, the turn's db is written as before. Otherwise only the records this
+  turn changed are applied onto the current on-disk state; records another
+  worker changed concurrently are merged three-way (``merge_record``).
+- Every saved change bumps the record's ``_rev`` counter, so a revision
+  mismatch is visible to any reader (API, debugger, other processes).
+
+Merge rules (per field, recursively for dicts):
+    only one side changed  -> take that side
+    both appended to list  -> keep theirs, then append our new items
+    both changed the field -> ours wins (the later commit), counted as conflict
+
+Contention is measurable via ``get_write_stats()`` (also served at
+``GET /api/workflow/storage``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from utils import json_io
+
+logger = logging.getLogger(__name__)
+
+REVISION_FIELD = "_rev"
+
+_MISSING = object()
+_WAIT_SAMPLES = 512
+
+FileSignature = Tuple[str, int, int, int]
+
+# path -> (signature of the file this process last wrote, baseline of that write)
+_COMMITTED: Dict[str, Tuple[FileSignature, Dict[str, bytes]]] = {}
+_COMMITTED_LOCK = threading.Lock()
+
+
+class TrackedDB(dict):
+    """Database dict that remembers what it was loaded from.
+
+    Behaves exactly like the plain dict it replaces; the baseline only lets
+    ``save_db`` tell this turn's changes apart from concurrent ones.
+    """
+
+    __slots__ = ("_baseline", "_baseline_source", "source_signature")
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._baseline: Optional[Dict[str, bytes]] = {}
+        self._baseline_source: Optional[Callable[[], Dict[str, bytes]]] = None
+        self.source_signature: Optional[FileSignature] = None
+
+    @property
+    def record_baseline(self) -> Dict[str, bytes]:
+        if self._baseline is None:
+            source, self._baseline_source = self._baseline_source, None
+            self._baseline = source() if source is not None else {}
+        return self._baseline
+
+    @record_baseline.setter
+    def record_baseline(self, baseline: Dict[str, bytes]) -> None:
+        self._baseline = baseline
+        self._baseline_source = None
+
+    def defer_baseline(self, source: Callable[[], Dict[str, bytes]]) -> None:
+        """Build the baseline with ``source()`` when it is first needed."""
+
+        self._baseline = None
+        self._baseline_source = source
+
+
+# ---------------------------------------------------------------------------
+# Record identity / encoding
+# ---------------------------------------------------------------------------
+
+
+def encode_record(record: Any) -> bytes:
+    """Deterministic bytes for change detection (not the on-disk format)."""
+
+    try:
+        return json_io.dumps(record).encode("utf-8")
+    except TypeError:
+        # orjson rejects non-str keys; the stdlib coerces them like the save
+        # does. Compact separators keep the bytes equal to the orjson encoding
+        # of the record as read back from disk.
+        return json_io.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _keyed(records: Iterable[Dict[str, Any]], id_field: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """Pair list records with stable keys (id, or content hash for id-less records)."""
+
+    keyed: List[Tuple[str, Dict[str, Any]]] = []
+    seen: Dict[str, int] = {}
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        record_id = record.get(id_field)
+        if record_id:
+            key = str(record_id)
+        else:
+            key = "anon-" + hashlib.sha1(encode_record(record)).hexdigest()
+        count = seen.get(key, 0) + 1
+        seen[key] = count
+        keyed.append((key if count == 1 else f"{key}~{count}", record))
+    return keyed
+
+
+def snapshot(db: Dict[str, Any]) -> Dict[str, bytes]:
+    """Encode every record of ``db`` for later change detection."""
+
+    baseline: Dict[str, bytes] = {}
+    for key, event in _keyed(db.get("events") or [], "event_id"):
+        baseline[f"events/{key}"] = encode_record(event)
+    for email, client in (db.get("clients") or {}).items():
+        baseline[f"clients/{email}"] = encode_record(client)
+    for key, task in _keyed(db.get("tasks") or [], "task_id"):
+        baseline[f"tasks/{key}"] = encode_record(task)
+    if "config" in db:
+        baseline["config"] = encode_record(db.get("config") or {})
+    return baseline
+
+
+def baseline_for(db: "TrackedDB") -> Optional[Dict[str, bytes]]:
+    """Committed baseline for a freshly loaded ``db``, if there is one.
+
+    When this process wrote the file ``db`` was read from, the baseline it
+    committed is returned (a copy); otherwise None, and the caller has to
+    snapshot the loaded records.
+    """
+
+    signature = db.source_signature
+    with _COMMITTED_LOCK:
+        cached = _COMMITTED.get(signature[0]) if signature is not None else None
+    if cached is not None and cached[0] == signature:
+        return dict(cached[1])
+    return None
+
+
+def remember_baseline(db: "TrackedDB") -> None:
+    """Keep ``db``'s baseline for the next load of the file it just wrote."""
+
+    signature = db.source_signature
+    if signature is None:
+        return
+    with _COMMITTED_LOCK:
+        _COMMITTED[signature[0]] = (signature, dict(db.record_baseline))
+
+
+def bump_revision(record: Dict[str, Any]) -> int:
+    """Increment and return the record's revision counter."""
+
+    try:
+        rev = int(record.get(REVISION_FIELD) or 0) + 1
+    except (TypeError, ValueError):
+        rev = 1
+    record[REVISION_FIELD] = rev
+    return rev
+
+
+# ---------------------------------------------------------------------------
+# Three-way merge
+# ---------------------------------------------------------------------------
+
+
+def _merge_value(base: Any, ours: Any, theirs: Any, conflicts: List[str], path: str) -> Any:
+    if ours == theirs:
+        return ours
+    if ours == base:
+        return theirs
+    if theirs == base:
+        return ours
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        base_dict = base if isinstance(base, dict) else {}
+        merged: Dict[str, Any] = {}
+        for key in list(theirs.keys()) + [k for k in ours.keys() if k not in theirs]:
+            value = _merge_value(
+                base_dict.get(key, _MISSING),
+                ours.get(key, _MISSING),
+                theirs.get(key, _MISSING),
+                conflicts,
+                f"{path}.{key}" if path else str(key),
+            )
+            if value is not _MISSING:
+                merged[key] = value
+        return merged
+    if isinstance(ours, list) and isinstance(theirs, list):
+        base_list = base if isinstance(base, list) else []
+        n = len(base_list)
+        if ours[:n] == base_list and theirs[:n] == base_list:
+            # Both sides appended (msgs, audit, history): keep both.
+            # Merged by position, so equal items appended by both sides (or
+            # twice by one side) are all kept.
+            return list(theirs) + ours[n:]
+    conflicts.append(path or "<record>")
+    return ours
+
+
+def merge_record(
+    base: Optional[Dict[str, Any]],
+    ours: Dict[str, Any],
+    theirs: Dict[str, Any],
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Three-way merge of one record; returns (merged, conflicting field paths)."""
+
+    conflicts: List[str] = []
+    merged = _merge_value(base if base is not None else {}, ours, theirs, conflicts, "")
+    if not isinstance(merged, dict):  # pragma: no cover - records are dicts
+        merged = dict(ours)
+    if REVISION_FIELD in ours or REVISION_FIELD in theirs:
+        merged[REVISION_FIELD] = max(
+            int(theirs.get(REVISION_FIELD) or 0), int(ours.get(REVISION_FIELD) or 0)
+        )
+    return merged, conflicts
+
+
+def _replace_in_place(record: Dict[str, Any], merged: Dict[str, Any]) -> None:
+    # Handlers hold references to the record (state.event_entry); keep identity.
+    record.clear()
+    record.update(merged)
+
+
+def merge_into(key: str, record: Dict[str, Any], base_raw: Optional[bytes], current: Dict[str, Any]) -> None:
+    """Fold a concurrently committed version of ``record`` into it, in place."""
+
+    base = json_io.loads(base_raw) if base_raw is not None else None
+    merged, conflicts = merge_record(base, record, current)
+    _record_conflict(key, conflicts)
+    _replace_in_place(record, merged)
+
+
+# ---------------------------------------------------------------------------
+# Commit (monolithic backend)
+# ---------------------------------------------------------------------------
+
+
+def _commit_record(
+    key: str,
+    record: Dict[str, Any],
+    baseline: Dict[str, bytes],
+    current: Optional[Dict[str, Any]],
+    bump: bool,
+) -> bool:
+    """Prepare ``record`` for writing; returns False when the turn did not touch it."""
+
+    raw = encode_record(record)
+    base_raw = baseline.get(key)
+    if base_raw == raw:
+        return False
+    if current is not None:
+        current_raw = encode_record(current)
+        if current_raw != base_raw and current_raw != raw:
+            # Someone else committed this record after our load.
+            merge_into(key, record, base_raw, current)
+    if bump:
+        bump_revision(record)
+    baseline[key] = encode_record(record)
+    return True
+
+
+def _rebase_records(
+    prefix: str,
+    ours: List[Tuple[str, Dict[str, Any]]],
+    current: List[Tuple[str, Dict[str, Any]]],
+    baseline: Dict[str, bytes],
+    bump: bool,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Apply our changed records onto ``current``; the result becomes our new view.
+
+    Our record objects are kept (updated in place) wherever both sides have
+    the record, so references held by the turn stay valid.
+    """
+
+    ours_by_key = dict(ours)
+    current_by_key = dict(current)
+    result: List[Tuple[str, Dict[str, Any]]] = []
+    for key, theirs in current:
+        bkey = f"{prefix}/{key}"
+        record = ours_by_key.get(key)
+        if record is None:
+            if bkey in baseline:
+                continue  # loaded by this turn and then removed
+            baseline[bkey] = encode_record(theirs)  # created by another worker
+            result.append((key, theirs))
+            continue
+        if not _commit_record(bkey, record, baseline, theirs, bump):
+            theirs_raw = encode_record(theirs)
+            if theirs_raw != baseline.get(bkey):
+                _replace_in_place(record, theirs)
+                baseline[bkey] = theirs_raw
+        result.append((key, record))
+    for key, record in ours:
+        if key not in current_by_key:
+            # New in this turn (or removed concurrently while we changed it).
+            _commit_record(f"{prefix}/{key}", record, baseline, None, bump)
+            result.append((key, record))
+    live = {f"{prefix}/{key}" for key, _ in result}
+    for bkey in [k for k in baseline if k.startswith(prefix + "/") and k not in live]:
+        baseline.pop(bkey, None)
+    return result
+
+
+def rebase(
+    db: TrackedDB,
+    current: Dict[str, Any],
+    normalize_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> None:
+    """Apply this turn's changes onto ``current`` (the database on disk).
+
+    ``db`` is updated in place to the committed state, so it can be written
+    out as-is and later saves of the same turn start from what is on disk.
+    """
+
+    baseline = db.record_baseline
+    current_events = [e for e in current.get("events") or [] if isinstance(e, dict)]
+    if normalize_event is not None:
+        for event in current_events:
+            normalize_event(event)
+
+    events = _rebase_records(
+        "events", _keyed(db.get("events") or [], "event_id"), _keyed(current_events, "event_id"), baseline, True
+    )
+    tasks = _rebase_records(
+        "tasks", _keyed(db.get("tasks") or [], "task_id"), _keyed(current.get("tasks") or [], "task_id"), baseline, False
+    )
+    clients = _rebase_records(
+        "clients",
+        list((db.get("clients") or {}).items()),
+        list((current.get("clients") or {}).items()),
+        baseline,
+        False,
+    )
+
+    db.setdefault("events", [])[:] = [record for _, record in events]
+    db.setdefault("tasks", [])[:] = [record for _, record in tasks]
+    db_clients = db.setdefault("clients", {})
+    db_clients.clear()
+    db_clients.update(clients)
+
+    current_config = current.get("config")
+    if "config" in db:
+        config = db.get("config") or {}
+        if not _commit_record("config", config, baseline, current_config or {}, False):
+            if current_config is not None and encode_record(current_config) != baseline.get("config"):
+                _replace_in_place(config, current_config)
+                baseline["config"] = encode_record(config)
+        db["config"] = config
+    elif current_config is not None:
+        db["config"] = current_config
+        baseline["config"] = encode_record(current_config)
+
+
+def mark_committed(db: TrackedDB) -> None:
+    """Uncontended save: bump revisions of changed events and refresh the baseline."""
+
+    baseline = db.record_baseline
+    live: set[str] = set()
+    for key, event in _keyed(db.get("events") or [], "event_id"):
+        live.add(f"events/{key}")
+        _commit_record(f"events/{key}", event, baseline, None, True)
+    for email, client in (db.get("clients") or {}).items():
+        live.add(f"clients/{email}")
+        _commit_record(f"clients/{email}", client, baseline, None, False)
+    for key, task in _keyed(db.get("tasks") or [], "task_id"):
+        live.add(f"tasks/{key}")
+        _commit_record(f"tasks/{key}", task, baseline, None, False)
+    if "config" in db:
+        live.add("config")
+        _commit_record("config", db.get("config") or {}, baseline, None, False)
+    for key in [k for k in baseline if k not in live]:
+        baseline.pop(key, None)
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+_STATS_LOCK = threading.Lock()
+_STATS: Dict[str, int] = {}
+_LOCK_WAIT_MS: Deque[float] = deque(maxlen=_WAIT_SAMPLES)
+
+
+def _zero_stats() -> Dict[str, int]:
+    return {
+        "saves": 0,
+        "saves_uncontended": 0,
+        "saves_rebased": 0,
+        "record_conflicts": 0,
+        "field_conflicts": 0,
+        "lock_acquisitions": 0,
+        "lock_contended": 0,
+        "lock_timeouts": 0,
+        "bytes_read": 0,
+        "bytes_written": 0,
+    }
+
+
+_STATS.update(_zero_stats())
+
+
+def record_save(rebased: bool) -> None:
+    with _STATS_LOCK:
+        _STATS["saves"] += 1
+        _STATS["saves_rebased" if rebased else "saves_uncontended"] += 1
+
+
+def record_io(read: int = 0, written: int = 0) -> None:
+    """Count database bytes read from and written to disk (both backends)."""
+    with _STATS_LOCK:
+        _STATS["bytes_read"] += read
+        _STATS["bytes_written"] += written
+
+
+def _record_conflict(key: str, conflicts: List[str]) -> None:
+    with _STATS_LOCK:
+        _STATS["record_conflicts"] += 1
+        _STATS["field_conflicts"] += len(conflicts)
+    if conflicts:
+        logger.warning(
+            "[DB][CAS] Concurrent update of %s; kept this turn's value for %s", key, ", ".join(conflicts[:5])
+        )
+    else:
+        logger.info("[DB][CAS] Merged concurrent update of %s", key)
+
+
+def record_lock_wait(wait_ms: float, contended: bool, timed_out: bool = False) -> None:
+    with _STATS_LOCK:
+        if timed_out:
+            _STATS["lock_timeouts"] += 1
+            return
+        _STATS["lock_acquisitions"] += 1
+        if contended:
+            _STATS["lock_contended"] += 1
+            _LOCK_WAIT_MS.append(wait_ms)
+
+
+def get_write_stats() -> Dict[str, Any]:
+    """Save/merge counters and lock wait percentiles (contended waits only)."""
+
+    with _STATS_LOCK:
+        stats: Dict[str, Any] = dict(_STATS)
+        waits = sorted(_LOCK_WAIT_MS)
+
+    def _pct(pct: float) -> Optional[float]:
+        if not waits:
+            return None
+        return round(waits[min(len(waits) - 1, int(round(pct / 100.0 * (len(waits) - 1))))], 2)
+
+    stats["lock_wait_ms"] = {"p50": _pct(50), "p95": _pct(95), "max": round(waits[-1], 2) if waits else None}
+    return stats
+
+
+def reset_write_stats() -> None:
+    with _STATS_LOCK:
+        _STATS.clear()
+        _STATS.update(_zero_stats())
+        _LOCK_WAIT_MS.clear()
+
+
+__all__ = [
+    "REVISION_FIELD",
+    "TrackedDB",
+    "baseline_for",
+    "bump_revision",
+    "encode_record",
+    "get_write_stats",
+    "merge_into",
+    "merge_record",
+    "rebase",
+    "record_io",
+    "remember_baseline",
+    "reset_write_stats",
+    "snapshot",
+]
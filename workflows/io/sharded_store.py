@@ -0,0 +1,760 @@
+"""
+Per-record sharded storage engine for the workflow events database.
+
+The monolithic backend keeps every event, client and task in one JSON file,
+so each turn re-reads and rewrites the whole venue history. The sharded
+backend stores one file per record next to the legacy path:
+
+    events_database.json            (legacy file, imported once on first use)
+    events_database.d/
+        _index.json                 event/task order + email -> event_id index
+        config.json                 db["config"]
+        events/<event_id>.json      one file per event
+        clients/<sha1(email)>.json  one file per client
+        tasks/<task_id>.json        one file per task
+
+A load only reads the index: every record is a ``LazyRecord`` whose shard is
+read (through a process-wide raw-bytes cache validated by (mtime_ns, size))
+and parsed the first time the turn touches it. Saves skip records that were
+never parsed and only rewrite parsed ones whose bytes changed. A touched shard that another worker
+rewrote since the load is merged three-way instead of overwritten, and event
+shards carry a ``_rev`` counter (see workflows/io/revisions.py).
+
+The assembled ``db`` dict keeps the exact shape of the monolithic backend
+(``events`` list, ``clients`` dict, ``tasks`` list, ``config`` dict), so
+WorkflowState and the step handlers do not need to know which backend runs.
+
+Enable with OE_DB_BACKEND=sharded (default: json).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils import json_io
+from workflows.io import revisions
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "_index.json"
+CONFIG_FILE = "config.json"
+INDEX_VERSION = 1
+
+_SAFE_KEY = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+
+
+def shard_root_for(path: Path) -> Path:
+    """Return the shard directory that backs a legacy JSON database path."""
+
+    path = Path(path)
+    return path.with_name(f"{path.stem}.d")
+
+
+def _encode(record: Any) -> bytes:
+    # Stdlib semantics (same as the monolithic save) so non-str keys and
+    # unicode round-trip exactly like before.
+    return json_io.dumps(record, ensure_ascii=False).encode("utf-8")
+
+
+def _record_key(record_id: Any, record: Dict[str, Any]) -> str:
+    """Derive a filesystem-safe shard key for an event/task identifier."""
+
+    if isinstance(record_id, str) and _SAFE_KEY.match(record_id):
+        return record_id
+    if record_id:
+        return "h-" + hashlib.sha1(str(record_id).encode("utf-8")).hexdigest()
+    # Records without an identifier are keyed by content (legacy/test data).
+    return "anon-" + hashlib.sha1(_encode(record)).hexdigest()
+
+
+def _client_key(email: str) -> str:
+    return hashlib.sha1((email or "").encode("utf-8")).hexdigest()
+
+
+def _event_email(event: Dict[str, Any]) -> str:
+    data = event.get("event_data") or {}
+    return str(data.get("Email") or "").lower()
+
+
+_UNPARSED = object()
+
+
+class LazyRecord(dict):
+    """Record dict whose shard is read and parsed on first access.
+
+    Until then the dict only holds a private placeholder entry, so C fast
+    paths that merely check the size (e.g. the stdlib JSON encoder) still go
+    through the overridden accessors, which parse the shard first. Copies and
+    pickles are plain dicts.
+    """
+
+    __slots__ = ("shard_key", "missing", "_source")
+
+    def __init__(self, shard_key: str, source: Callable[[], Optional[Dict[str, Any]]]) -> None:
+        dict.__init__(self)
+        dict.__setitem__(self, _UNPARSED, None)
+        self.shard_key = shard_key
+        self.missing = False
+        self._source: Optional[Callable[[], Optional[Dict[str, Any]]]] = source
+
+    @property
+    def loaded(self) -> bool:
+        return self._source is None
+
+    def _load(self) -> None:
+        source = self._source
+        if source is None:
+            return
+        self._source = None
+        record = source()
+        dict.clear(self)
+        if record is None:
+            # Shard removed by another worker after our load.
+            self.missing = True
+        else:
+            dict.update(self, record)
+
+    def __eq__(self, other: Any) -> bool:
+        self._load()
+        if isinstance(other, LazyRecord):
+            other._load()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: Any) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        self._load()
+        return (dict, (dict(self),))
+
+
+def _parsing(name: str) -> Callable[..., Any]:
+    method = getattr(dict, name)
+
+    def wrapper(self: LazyRecord, *args: Any, **kwargs: Any) -> Any:
+        self._load()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in (
+    "__getitem__", "__setitem__", "__delitem__", "__contains__", "__iter__", "__len__",
+    "__reversed__", "__repr__", "__or__", "__ror__", "__ior__",
+    "get", "setdefault", "pop", "popitem", "update", "keys", "values", "items", "copy", "clear",
+):
+    setattr(LazyRecord, _name, _parsing(_name))
+del _name
+
+
+class ShardedDB(dict):
+    """Database dict that remembers the shard bytes it was assembled from.
+
+    Behaves exactly like the plain dict returned by the monolithic backend;
+    the baseline only lets ``ShardedStore.save`` skip untouched records, and
+    the index snapshot lets lookups skip shards that cannot match.
+    """
+
+    __slots__ = ("shard_baseline", "shard_emails", "shard_task_events")
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # path -> bytes the record was parsed from (None while unparsed)
+        self.shard_baseline: Dict[str, Optional[bytes]] = {}
+        # event key -> lowercased client email, task key -> event_id
+        self.shard_emails: Dict[str, str] = {}
+        self.shard_task_events: Dict[str, Any] = {}
+
+
+def _unparsed(record: Any) -> bool:
+    return isinstance(record, LazyRecord) and not record.loaded
+
+
+def _key_matches(key: str, wanted: str) -> bool:
+    return key == wanted or key.startswith(f"{wanted}~")
+
+
+def iter_event_candidates(
+    db: Dict[str, Any],
+    *,
+    email: Optional[str] = None,
+    event_id: Optional[str] = None,
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(idx, event)`` pairs of ``db["events"]`` that may match.
+
+    For a sharded db, unparsed events that the index rules out are skipped
+    without reading their shard; callers still apply their own checks.
+    """
+
+    events = db.get("events", [])
+    emails: Optional[Dict[str, str]] = getattr(db, "shard_emails", None)
+    if emails is None:
+        yield from enumerate(events)
+        return
+    id_key = _record_key(event_id, {}) if event_id else None
+    for idx, event in enumerate(events):
+        if _unparsed(event):
+            if email is not None and emails.get(event.shard_key, "") != email:
+                continue
+            if id_key is not None and not _key_matches(event.shard_key, id_key):
+                continue
+        yield idx, event
+
+
+def iter_task_candidates(
+    db: Dict[str, Any],
+    *,
+    task_id: Optional[str] = None,
+    event_id: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield tasks of ``db["tasks"]`` that may match (see ``iter_event_candidates``)."""
+
+    tasks = db.get("tasks", [])
+    task_events: Optional[Dict[str, Any]] = getattr(db, "shard_task_events", None)
+    if task_events is None:
+        yield from tasks
+        return
+    id_key = _record_key(task_id, {}) if task_id else None
+    for task in tasks:
+        if _unparsed(task):
+            if id_key is not None and not _key_matches(task.shard_key, id_key):
+                continue
+            if event_id is not None and task.shard_key in task_events and task_events[task.shard_key] != event_id:
+                continue
+        yield task
+
+
+class ShardedStore:
+    """[OpenEvent Database] One-file-per-record store with an email/event index."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.events_dir = self.root / "events"
+        self.clients_dir = self.root / "clients"
+        self.tasks_dir = self.root / "tasks"
+        self.index_path = self.root / INDEX_FILE
+        self.config_path = self.root / CONFIG_FILE
+        # path -> (mtime_ns, size, raw bytes)
+        self._cache: Dict[str, Tuple[int, int, bytes]] = {}
+        # path -> (raw bytes, bytes after the load-time normaliser ran)
+        self._normalized: Dict[str, Tuple[bytes, bytes]] = {}
+        self._cache_lock = threading.Lock()
+        self._normalize_event: Optional[Callable[[Dict[str, Any]], None]] = None
+        self.stats: Dict[str, int] = {
+            "shard_reads": 0,
+            "shard_cache_hits": 0,
+            "shard_writes": 0,
+            "shard_deletes": 0,
+            "bytes_read": 0,
+            "bytes_written": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Raw shard I/O
+    # ------------------------------------------------------------------
+
+    def exists(self) -> bool:
+        return self.index_path.exists()
+
+    def _read_raw(self, path: Path) -> Optional[bytes]:
+        """Read a shard, reusing cached bytes while (mtime_ns, size) match."""
+
+        key = str(path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            with self._cache_lock:
+                self._cache.pop(key, None)
+            return None
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            self.stats["shard_cache_hits"] += 1
+            return cached[2]
+        with open(path, "rb") as fh:
+            raw = fh.read()
+        self.stats["shard_reads"] += 1
+        self.stats["bytes_read"] += len(raw)
+        revisions.record_io(read=len(raw))
+        with self._cache_lock:
+            self._cache[key] = (st.st_mtime_ns, st.st_size, raw)
+        return raw
+
+    def _write_raw(self, path: Path, raw: bytes) -> None:
+        """Atomically replace a shard and refresh its cache entry."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(tmp_fd, "wb") as fh:
+                fh.write(raw)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        st = os.stat(path)
+        with self._cache_lock:
+            self._cache[str(path)] = (st.st_mtime_ns, st.st_size, raw)
+            self._normalized.pop(str(path), None)
+        self.stats["shard_writes"] += 1
+        self.stats["bytes_written"] += len(raw)
+        revisions.record_io(written=len(raw))
+
+    def _delete(self, path: Path) -> None:
+        try:
+            path.unlink()
+            self.stats["shard_deletes"] += 1
+        except FileNotFoundError:
+            pass
+        with self._cache_lock:
+            self._cache.pop(str(path), None)
+            self._normalized.pop(str(path), None)
+
+    def _event_path(self, key: str) -> Path:
+        return self.events_dir / f"{key}.json"
+
+    def _client_path(self, key: str) -> Path:
+        return self.clients_dir / f"{key}.json"
+
+    def _task_path(self, key: str) -> Path:
+        return self.tasks_dir / f"{key}.json"
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def read_index(self) -> Dict[str, Any]:
+        raw = self._read_raw(self.index_path)
+        if raw is None:
+            return self._empty_index()
+        index = json_io.loads(raw)
+        for field, default in self._empty_index().items():
+            index.setdefault(field, default)
+        return index
+
+    @staticmethod
+    def _empty_index() -> Dict[str, Any]:
+        return {"version": INDEX_VERSION, "events": [], "clients": {}, "tasks": [], "emails": {}, "task_events": {}}
+
+    def _write_index(self, index: Dict[str, Any]) -> None:
+        raw = _encode(index)
+        current = self._read_raw(self.index_path)
+        if current != raw:
+            self._write_raw(self.index_path, raw)
+
+    # ------------------------------------------------------------------
+    # Whole-database view
+    # ------------------------------------------------------------------
+
+    def _normalized_event(
+        self,
+        path: Path,
+        raw: bytes,
+        normalize_event: Optional[Callable[[Dict[str, Any]], None]],
+    ) -> bytes:
+        """Return the shard bytes as they look after the load-time normaliser.
+
+        Baselining against normalised bytes keeps default backfilling from
+        marking every legacy record dirty (and rewriting it) on save.
+        """
+
+        if normalize_event is None:
+            return raw
+        key = str(path)
+        cached = self._normalized.get(key)
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+        event = json_io.loads(raw)
+        normalize_event(event)
+        normalized = _encode(event)
+        if normalized == raw:
+            normalized = raw
+        self._normalized[key] = (raw, normalized)
+        return normalized
+
+    def _parse_shard(
+        self,
+        path: Path,
+        baseline: Dict[str, Optional[bytes]],
+        normalize_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        raw = self._read_raw(path)
+        if raw is None:
+            baseline.pop(str(path), None)
+            return None
+        if normalize_event is not None:
+            raw = self._normalized_event(path, raw, normalize_event)
+        baseline[str(path)] = raw
+        return json_io.loads(raw)
+
+    def _lazy(
+        self,
+        key: str,
+        path: Path,
+        baseline: Dict[str, Optional[bytes]],
+        normalize_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> LazyRecord:
+        baseline[str(path)] = None
+        return LazyRecord(key, lambda: self._parse_shard(path, baseline, normalize_event))
+
+    def load(
+        self,
+        normalize_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> ShardedDB:
+        """Assemble the ``db`` dict from the index without reading record shards.
+
+        Events, clients and tasks are ``LazyRecord`` placeholders: a shard is
+        only read (through the cache) and parsed when the turn touches that
+        record, and events are normalised at that point.
+        """
+
+        self._normalize_event = normalize_event
+        index = self.read_index()
+        db = ShardedDB()
+        baseline = db.shard_baseline
+
+        db["events"] = [
+            self._lazy(key, self._event_path(key), baseline, normalize_event) for key in index["events"]
+        ]
+        db["clients"] = {
+            email: self._lazy(key, self._client_path(key), baseline) for email, key in index["clients"].items()
+        }
+        db["tasks"] = [self._lazy(key, self._task_path(key), baseline) for key in index["tasks"]]
+        db.shard_emails = {key: email for email, keys in index["emails"].items() for key in keys}
+        db.shard_task_events = dict(index["task_events"])
+        config_raw = self._read_raw(self.config_path)
+        if config_raw is not None:
+            baseline[str(self.config_path)] = config_raw
+            db["config"] = json_io.loads(config_raw)
+        return db
+
+    def save(self, db: Dict[str, Any]) -> None:
+        """Persist only the records that differ from the loaded baseline.
+
+        Records that this ``db`` never loaded (e.g. created by another worker
+        after our load) are left untouched, and shards are only deleted when
+        the turn actually removed a record it had loaded.
+        """
+
+        baseline: Optional[Dict[str, bytes]] = getattr(db, "shard_baseline", None)
+        index = self.read_index()
+
+        def _changed(path: Path, raw: bytes) -> bool:
+            if baseline is not None and str(path) in baseline:
+                return baseline[str(path)] != raw
+            return self._read_raw(path) != raw
+
+        merged_any = False
+
+        def _commit(path: Path, record: Dict[str, Any], is_event: bool) -> bool:
+            """Compare-and-swap one shard; returns True when it was written."""
+
+            nonlocal merged_any
+            raw = _encode(record)
+            if not _changed(path, raw):
+                return False
+            base_raw = baseline.get(str(path)) if baseline is not None else None
+            if base_raw is not None:
+                current = self._read_raw(path)
+                if current is not None and current != base_raw and is_event:
+                    current = self._normalized_event(path, current, self._normalize_event)
+                if current is not None and current != base_raw and current != raw:
+                    # Another worker rewrote this shard after our load.
+                    revisions.merge_into(str(path), record, base_raw, json_io.loads(current))
+                    merged_any = True
+            if is_event:
+                revisions.bump_revision(record)
+            raw = _encode(record)
+            self._write_raw(path, raw)
+            if baseline is not None:
+                baseline[str(path)] = raw
+            return True
+
+        seen_paths: set[str] = set()
+        vanished: set[str] = set()
+
+        def _skip(record: Any, path: Path) -> bool:
+            """True for loaded records the turn never parsed (or that vanished)."""
+
+            if not isinstance(record, LazyRecord):
+                return False
+            if not record.loaded:
+                seen_paths.add(str(path))
+                return True
+            if record.missing and not record:
+                vanished.add(str(path))
+                return True
+            return False
+
+        # Events ---------------------------------------------------------
+        events = db.get("events", []) or []
+        event_order: List[str] = list(index["events"])
+        known_events = set(event_order)
+        emails: Dict[str, List[str]] = {k: list(v) for k, v in index["emails"].items()}
+        used_keys: set[str] = {e.shard_key for e in events if isinstance(e, LazyRecord)}
+        for event in events:
+            if isinstance(event, LazyRecord):
+                key = event.shard_key
+            else:
+                key = _record_key(event.get("event_id"), event)
+                # Duplicate identifiers must not overwrite each other.
+                suffix = 1
+                base_key = key
+                while key in used_keys:
+                    suffix += 1
+                    key = f"{base_key}~{suffix}"
+                used_keys.add(key)
+            path = self._event_path(key)
+            if _skip(event, path):
+                continue
+            seen_paths.add(str(path))
+            written = _commit(path, event, True)
+            email = _event_email(event)
+            if written:
+                # The email may have been edited; drop stale index entries.
+                for other_email, keys in emails.items():
+                    if other_email != email and key in keys:
+                        keys.remove(key)
+            if key not in known_events:
+                event_order.append(key)
+                known_events.add(key)
+            if email:
+                bucket = emails.setdefault(email, [])
+                if key not in bucket:
+                    bucket.append(key)
+
+        # Clients --------------------------------------------------------
+        client_keys: Dict[str, str] = dict(index["clients"])
+        for email, client in (db.get("clients") or {}).items():
+            key = client_keys.get(email) or _client_key(email)
+            client_keys[email] = key
+            path = self._client_path(key)
+            if _skip(client, path):
+                continue
+            seen_paths.add(str(path))
+            _commit(path, client, False)
+
+        # Tasks ----------------------------------------------------------
+        tasks = db.get("tasks", []) or []
+        task_order: List[str] = list(index["tasks"])
+        known_tasks = set(task_order)
+        task_events: Dict[str, Any] = dict(index["task_events"])
+        used_keys = {t.shard_key for t in tasks if isinstance(t, LazyRecord)}
+        for task in tasks:
+            if isinstance(task, LazyRecord):
+                key = task.shard_key
+            else:
+                key = _record_key(task.get("task_id"), task)
+                suffix = 1
+                base_key = key
+                while key in used_keys:
+                    suffix += 1
+                    key = f"{base_key}~{suffix}"
+                used_keys.add(key)
+            path = self._task_path(key)
+            if _skip(task, path):
+                continue
+            seen_paths.add(str(path))
+            _commit(path, task, False)
+            task_events[key] = task.get("event_id")
+            if key not in known_tasks:
+                task_order.append(key)
+                known_tasks.add(key)
+
+        # Removals: only records this db loaded and then dropped ----------
+        removed: set[str] = set(vanished)
+        if baseline is not None:
+            for path_str in list(baseline):
+                if path_str in seen_paths or path_str == str(self.config_path):
+                    continue
+                self._delete(Path(path_str))
+                baseline.pop(path_str, None)
+                removed.add(path_str)
+        else:
+            # Plain dict (no baseline): the dict is the full truth, like the
+            # monolithic backend.
+            for key in event_order:
+                if str(self._event_path(key)) not in seen_paths:
+                    removed.add(str(self._event_path(key)))
+            for key in client_keys.values():
+                if str(self._client_path(key)) not in seen_paths:
+                    removed.add(str(self._client_path(key)))
+            for key in task_order:
+                if str(self._task_path(key)) not in seen_paths:
+                    removed.add(str(self._task_path(key)))
+            for path_str in removed:
+                self._delete(Path(path_str))
+
+        if removed:
+            event_order = [k for k in event_order if str(self._event_path(k)) not in removed]
+            task_order = [k for k in task_order if str(self._task_path(k)) not in removed]
+            client_keys = {
+                e: k for e, k in client_keys.items() if str(self._client_path(k)) not in removed
+            }
+        live_events = set(event_order)
+        emails = {
+            email: [k for k in keys if k in live_events]
+            for email, keys in emails.items()
+        }
+        emails = {email: keys for email, keys in emails.items() if keys}
+        live_tasks = set(task_order)
+        task_events = {k: v for k, v in task_events.items() if k in live_tasks}
+
+        # Config ---------------------------------------------------------
+        if "config" in db:
+            raw = _encode(db.get("config") or {})
+            if _changed(self.config_path, raw):
+                self._write_raw(self.config_path, raw)
+                if baseline is not None:
+                    baseline[str(self.config_path)] = raw
+
+        self._write_index(
+            {
+                "version": INDEX_VERSION,
+                "events": event_order,
+                "clients": client_keys,
+                "tasks": task_order,
+                "emails": emails,
+                "task_events": task_events,
+            }
+        )
+        if baseline is not None:
+            revisions.record_save(merged_any)
+
+    # ------------------------------------------------------------------
+    # Scoped reads (touch only the records a caller needs)
+    # ------------------------------------------------------------------
+
+    def load_event(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """Read a single event by identifier without assembling the full db."""
+
+        index = self.read_index()
+        key = _record_key(event_id, {})
+        if key in index["events"]:
+            raw = self._read_raw(self._event_path(key))
+            if raw is not None:
+                event = json_io.loads(raw)
+                if event.get("event_id") == event_id:
+                    return event
+        # Fallback for duplicate/suffixed keys.
+        for candidate in index["events"]:
+            if candidate.startswith(f"{key}~"):
+                raw = self._read_raw(self._event_path(candidate))
+                if raw is not None:
+                    event = json_io.loads(raw)
+                    if event.get("event_id") == event_id:
+                        return event
+        return None
+
+    def load_events_for_email(self, email: str) -> List[Dict[str, Any]]:
+        """Read all events linked to a client email via the email index."""
+
+        index = self.read_index()
+        events: List[Dict[str, Any]] = []
+        for key in index["emails"].get((email or "").lower(), []):
+            raw = self._read_raw(self._event_path(key))
+            if raw is not None:
+                events.append(json_io.loads(raw))
+        return events
+
+    def load_client(self, email: str) -> Optional[Dict[str, Any]]:
+        """Read one client profile by (lowercased) email."""
+
+        index = self.read_index()
+        key = index["clients"].get((email or "").lower())
+        if not key:
+            return None
+        raw = self._read_raw(self._client_path(key))
+        return json_io.loads(raw) if raw is not None else None
+
+    def load_config(self) -> Dict[str, Any]:
+        raw = self._read_raw(self.config_path)
+        return json_io.loads(raw) if raw is not None else {}
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def import_monolithic(self, legacy_path: Path) -> bool:
+        """Split a legacy single-file database into shards (idempotent).
+
+        Returns True when an import happened. The legacy file is left in
+        place so switching OE_DB_BACKEND back to json stays possible.
+        """
+
+        if self.exists():
+            return False
+        legacy_path = Path(legacy_path)
+        self.root.mkdir(parents=True, exist_ok=True)
+        if not legacy_path.exists():
+            self._write_index(self._empty_index())
+            return False
+        with legacy_path.open("r", encoding="utf-8") as fh:
+            legacy = json_io.load(fh)
+        db = {
+            "events": legacy.get("events") if isinstance(legacy.get("events"), list) else [],
+            "clients": legacy.get("clients") if isinstance(legacy.get("clients"), dict) else {},
+            "tasks": legacy.get("tasks") if isinstance(legacy.get("tasks"), list) else [],
+            "config": legacy.get("config") or {},
+        }
+        self.save(db)
+        logger.info(
+            "Imported %d events, %d clients, %d tasks from %s into sharded store %s",
+            len(db["events"]), len(db["clients"]), len(db["tasks"]), legacy_path, self.root,
+        )
+        return True
+
+
+_STORES: Dict[str, ShardedStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_store(path: Path) -> ShardedStore:
+    """Return the process-wide store for a legacy database path."""
+
+    root = shard_root_for(path)
+    key = os.path.abspath(root)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = ShardedStore(root)
+            _STORES[key] = store
+        return store
+
+
+def reset_stores() -> None:
+    """Drop all cached stores (used by tests to reset state)."""
+
+    with _STORES_LOCK:
+        _STORES.clear()
+
+
+def iter_stores() -> Iterable[ShardedStore]:
+    with _STORES_LOCK:
+        return list(_STORES.values())
+
+
+__all__ = [
+    "LazyRecord",
+    "ShardedDB",
+    "ShardedStore",
+    "get_store",
+    "iter_event_candidates",
+    "iter_stores",
+    "iter_task_candidates",
+    "reset_stores",
+    "shard_root_for",
+]
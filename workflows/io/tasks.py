@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Union
 
 from domain import TaskStatus, TaskType
+from workflows.io.sharded_store import iter_task_candidates
 
 
 def enqueue_task(
@@ -60,7 +61,7 @@ def list_pending_tasks(db: Dict[str, Any]) -> List[Dict[str, Any]]:
 def _find_task(db: Dict[str, Any], task_id: str) -> Optional[Dict[str, Any]]:
     """[OpenEvent Action] Locate a task dictionary inside the database."""
 
-    for task in db.get("tasks", []):
+    for task in iter_task_candidates(db, task_id=task_id):
         if task.get("task_id") == task_id:
             return task
     return None
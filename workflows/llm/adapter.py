@@ -1,17 +1,16 @@
 from __future__ import annotations
 
 import datetime as dt
-import hashlib
 import json
 import logging
 import os
 import re
-from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 from adapters.agent_adapter import AgentAdapter, StubAgentAdapter, get_agent_adapter, reset_agent_adapter
 from domain import IntentLabel
 from llm.provider_registry import get_provider, reset_provider_for_tests
+from llm.response_cache import get_llm_cache
 from workflows.common.fallback_reason import create_fallback_reason
 
 from prefs.semantics import normalize_catering, normalize_products
@@ -36,11 +35,10 @@ from utils.dates import MONTH_INDEX_TO_NAME, from_hints
 adapter: AgentAdapter = get_agent_adapter()
 _LAST_CALL_METADATA: Dict[str, Any] = {}
 
-# Bounded LRU cache for analysis results.
-# Max entries configurable via env var; default 500 to limit memory.
-# Uses OrderedDict for LRU eviction when cache is full.
-_ANALYSIS_CACHE_MAX_SIZE = int(os.getenv("LLM_CACHE_MAX_SIZE", "500"))
-_ANALYSIS_CACHE: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+# Analysis results are cached in llm.response_cache: an in-process LRU
+# (LLM_CACHE_MAX_SIZE entries) backed by a SQLite file shared across workers.
+# Only real-provider results are persisted; stub/fallback output stays local.
+_ANALYSIS_CACHE_NAMESPACE = "analysis"
 
 logger = logging.getLogger(__name__)
 
@@ -256,8 +254,13 @@ def _analysis_cache_key(payload: Dict[str, str]) -> str:
     msg_id = payload.get("msg_id") or ""
     subject = payload.get("subject") or ""
     body = payload.get("body") or ""
-    fingerprint = f"{msg_id}::{subject}::{body}"
-    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+    # Entity prompts resolve relative dates against today, so the day is part of the key.
+    fingerprint = f"{msg_id}::{subject}::{body}::{dt.date.today().isoformat()}"
+    agent = _agent()
+    model = getattr(agent, "_entity_model", "") or ""
+    return get_llm_cache().make_key(
+        _ANALYSIS_CACHE_NAMESPACE, type(agent).__name__, model, fingerprint
+    )
 
 
 def _validated_analysis(result: Any) -> Optional[Dict[str, Any]]:
@@ -357,30 +360,32 @@ def _fallback_analysis(
 
 
 def _analyze_payload(payload: Dict[str, str]) -> Dict[str, Any]:
-    """Run LLM analysis with bounded LRU caching.
+    """Run LLM analysis through the shared response cache.
 
-    Cache is bounded to _ANALYSIS_CACHE_MAX_SIZE entries.
-    On cache hit, entry is moved to end (most recently used).
-    On cache miss + insert, oldest entries are evicted if over limit.
+    Hits are served from memory or the persistent SQLite tier. Misses call the
+    provider; only validated provider results from a real (non-stub) agent are
+    persisted, so heuristic fallbacks never outlive the process.
     """
+    cache = get_llm_cache()
     cache_key = _analysis_cache_key(payload)
-    cached = _ANALYSIS_CACHE.get(cache_key)
+    cached = cache.get(cache_key, namespace=_ANALYSIS_CACHE_NAMESPACE)
     if cached is not None:
-        # Move to end (mark as recently used)
-        _ANALYSIS_CACHE.move_to_end(cache_key)
-        return dict(cached)
+        try:
+            return json.loads(cached)
+        except ValueError:
+            logger.debug("Discarding undecodable cached analysis %s", cache_key[:12])
 
     analysis = _invoke_provider_with_retry(payload, phase="analysis")
+    persist = analysis is not None and not isinstance(_agent(), StubAgentAdapter)
     if analysis is None:
         analysis = _fallback_analysis(payload)
 
-    # Insert new entry
-    _ANALYSIS_CACHE[cache_key] = analysis
-
-    # Evict oldest entries if over limit
-    while len(_ANALYSIS_CACHE) > _ANALYSIS_CACHE_MAX_SIZE:
-        _ANALYSIS_CACHE.popitem(last=False)
-
+    cache.put(
+        cache_key,
+        json.dumps(analysis, ensure_ascii=False, default=str),
+        namespace=_ANALYSIS_CACHE_NAMESPACE,
+        persist=persist,
+    )
     return dict(analysis)
 
 
@@ -702,11 +707,10 @@ def reset_llm_adapter() -> None:
 
     global adapter
     global _LAST_CALL_METADATA
-    global _ANALYSIS_CACHE
     reset_agent_adapter()
     adapter = get_agent_adapter()
     _LAST_CALL_METADATA = {}
-    _ANALYSIS_CACHE = OrderedDict()
+    get_llm_cache().clear(persisted=False)
     reset_provider_for_tests()
 
 
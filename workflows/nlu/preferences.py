@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-import difflib
 import json
 import re
 from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
-from services.products import list_product_records
+from services.products import ProductCatalog, get_catalog
 from prefs.semantics import normalize_catering, normalize_products
+from workflows.common.fuzzy_index import FuzzyIndex
 
 PreferencePayload = Dict[str, Any]
 
@@ -236,15 +236,10 @@ def _score_rooms_by_products(
     recommendations: List[Dict[str, Any]] = []
 
     for room, data in catalog.items():
-        phrases = data["phrases"]
-        variants_map = data.get("product_variants") or {}
-        # Get room's native features, services, and layout types for direct matching
+        # Room's native features, services and layout types (workshop,
+        # theatre, u_shape, ...) are matched directly, before the catalog
         room_info = rooms_data.get(room, {})
-        room_features = set(_normalise_phrase(f) for f in (room_info.get("features") or []))
-        room_services = set(_normalise_phrase(s) for s in (room_info.get("services") or []))
-        # Include layout types (workshop, theatre, u_shape, etc.) as matchable features
-        room_layouts = set(_normalise_phrase(k) for k in (room_info.get("capacity_by_layout") or {}).keys())
-        room_all_features = room_features | room_services | room_layouts
+        room_all_features = data["feature_set"]
 
         score = 0.0
 
@@ -274,7 +269,7 @@ def _score_rooms_by_products(
             wish_normalized = _normalise_phrase(wish)
 
             # First, check direct match against room features/services
-            feature_match = _match_against_features(wish_normalized, room_all_features)
+            feature_match = _match_against_features(wish_normalized, room_all_features, data["feature_index"])
             if feature_match:
                 score += 1.0
                 feature_label = wish.title()
@@ -285,9 +280,9 @@ def _score_rooms_by_products(
                 continue
 
             # Then check product catalog matches
-            top_matches = _top_product_matches(wish, variants_map)
+            top_matches = _top_product_matches(wish, data["product_index"])
             if not top_matches:
-                ratio, label = _best_phrase_match(wish, phrases)
+                ratio, label = _best_phrase_match(wish, data["phrase_index"])
                 if ratio >= 0.65 and label:
                     score += 0.5
                     if label.lower() not in matched_lower:
@@ -347,81 +342,56 @@ def _score_rooms_by_products(
     return recommendations[:5]
 
 
-def _match_against_features(wish_normalized: str, features: Set[str]) -> bool:
-    """Check if a wish matches any room feature using fuzzy matching."""
+def _match_against_features(wish_normalized: str, features: Set[str], index: FuzzyIndex) -> bool:
+    """Check if a wish matches any room feature using fuzzy matching.
+
+    ``index`` holds the same features for the ratio >= 0.8 check.
+    """
     if not wish_normalized or not features:
         return False
     # Direct containment check
+    wish_no_space = wish_normalized.replace(" ", "")
     for feature in features:
         if wish_normalized in feature or feature in wish_normalized:
             return True
         # Handle common variations: "sound system" vs "sound_system"
-        wish_no_space = wish_normalized.replace(" ", "")
         feature_no_space = feature.replace(" ", "")
         if wish_no_space in feature_no_space or feature_no_space in wish_no_space:
             return True
     # Fuzzy match for close variations
-    for feature in features:
-        ratio = difflib.SequenceMatcher(a=wish_normalized, b=feature).ratio()
-        if ratio >= 0.8:
-            return True
-    return False
+    return index.best(wish_normalized, floor=0.8) is not None
 
 
-def _best_phrase_match(needle: str, phrases: Dict[str, str]) -> Tuple[float, Optional[str]]:
+def _best_phrase_match(needle: str, phrases: FuzzyIndex) -> Tuple[float, Optional[str]]:
+    """Best (ratio, label) over phrase variants; containment scores 0.92."""
     if not needle:
         return 0.0, None
     target = _normalise_phrase(needle)
     if not target:
         return 0.0, None
-    best_ratio = 0.0
-    best_label: Optional[str] = None
-    for variant, label in phrases.items():
-        if not variant:
-            continue
-        if target == variant:
-            return 1.0, label
-        if target in variant or variant in target:
-            ratio = 0.92
-        else:
-            ratio = difflib.SequenceMatcher(a=target, b=variant).ratio()
-        if ratio > best_ratio:
-            best_ratio = ratio
-            best_label = label
-    return best_ratio, best_label
+    best = phrases.best(target, containment_score=0.92)
+    if not best or best[0] <= 0.0:
+        return 0.0, None
+    return best[0], best[1]  # type: ignore[return-value]
 
 
 def _top_product_matches(
     wish: str,
-    variants_map: Dict[str, Sequence[str]],
+    products: FuzzyIndex,
     *,
     limit: int = 3,
 ) -> List[Tuple[float, str]]:
+    """Best ``limit`` (ratio, product) pairs, ratio being the product's best
+    variant score: 1.0 if equal, 0.92 if one contains the other and both have
+    at least 5 characters, else the SequenceMatcher ratio."""
     needle = _normalise_phrase(wish)
     if not needle:
         return []
-    scored: List[Tuple[float, str]] = []
-    for product, variants in variants_map.items():
-        ratios = [_similarity_ratio(needle, variant) for variant in variants if variant]
-        if not ratios:
-            continue
-        best_ratio = max(ratios)
-        scored.append((best_ratio, product))
-    scored.sort(key=lambda entry: entry[0], reverse=True)
-    return scored[:limit]
-
-
-def _similarity_ratio(a: str, b: str) -> float:
-    if not a or not b:
-        return 0.0
-    if a == b:
-        return 1.0
-    # Containment match only if both strings are long enough to be meaningful
-    # Avoid false positives like "art" in "flipchart" matching "latte art"
-    MIN_CONTAINMENT_LEN = 5
-    if (len(a) >= MIN_CONTAINMENT_LEN and len(b) >= MIN_CONTAINMENT_LEN) and (a in b or b in a):
-        return 0.92
-    return difflib.SequenceMatcher(a=a, b=b).ratio()
+    # Containment only counts when both strings are long enough to be
+    # meaningful: avoids "art" in "flipchart" matching "latte art"
+    return products.ranked(  # type: ignore[return-value]
+        needle, limit, containment_score=0.92, min_containment=5
+    )
 
 
 def _make_match_entry(wish: str, product: str, ratio: float) -> Dict[str, Any]:
@@ -436,8 +406,14 @@ def _normalise_phrase(value: str) -> str:
     return re.sub(r"[^a-z0-9]+", " ", value.lower()).strip()
 
 
-@lru_cache(maxsize=1)
 def _room_catalog() -> Dict[str, Dict[str, Any]]:
+    return _build_room_catalog(get_catalog())
+
+
+@lru_cache(maxsize=1)
+def _build_room_catalog(product_catalog: ProductCatalog) -> Dict[str, Dict[str, Any]]:
+    """Per-room phrases/variants plus their fuzzy indexes, built once per
+    product catalog version."""
     rooms = _load_rooms()
     room_products = {}
     for room in rooms:
@@ -455,9 +431,7 @@ def _room_catalog() -> Dict[str, Dict[str, Any]]:
         }
     room_ids = {room.get("id", "").strip().lower(): room["name"] for room in rooms if room.get("id")}
     room_aliases = {room["name"].strip().lower(): room["name"] for room in rooms}
-    product_records = list_product_records()
-
-    for record in product_records:
+    for record in product_catalog.record_list:
         variants = [record.name] + [syn for syn in record.synonyms if syn]
         variants = [variant for variant in variants if variant]
         base_tokens = set()
@@ -490,6 +464,12 @@ def _room_catalog() -> Dict[str, Dict[str, Any]]:
         variants_map = entry.get("product_variants") or {}
         for product_name, variants in list(variants_map.items()):
             variants_map[product_name] = sorted(variants)
+        entry["product_index"] = FuzzyIndex(
+            (variant, product) for product, variants in variants_map.items() for variant in variants
+        )
+        entry["phrase_index"] = FuzzyIndex(entry["phrases"].items())
+        entry["feature_set"] = {_normalise_phrase(feature) for feature in entry["features"]}
+        entry["feature_index"] = FuzzyIndex((feature, feature) for feature in entry["feature_set"])
 
     return room_products
 
@@ -18,9 +18,10 @@ Usage:
 from __future__ import annotations
 
 import re
-from difflib import SequenceMatcher
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
+from workflows.common.fuzzy_index import sequence_ratio
+
 from .shortcuts_types import (
     PlannerResult,
     _CLASS_KEYWORDS,
@@ -160,7 +161,7 @@ def parse_choice_selection(
         label = str(item.get("label") or "").lower()
         if not label:
             continue
-        ratio = SequenceMatcher(a=label, b=normalized).ratio()
+        ratio = sequence_ratio(label, normalized)
         similarity.append((ratio, item))
 
     if not similarity:
@@ -209,7 +210,7 @@ def choice_clarification_prompt(
         label = str(item.get("label") or "").lower()
         if not label:
             continue
-        ratio = SequenceMatcher(a=label, b=normalized).ratio()
+        ratio = sequence_ratio(label, normalized)
         similarity.append((ratio, item))
 
     if not similarity:
@@ -1,19 +1,23 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
 from typing import Any, Dict, Optional
 
 from llm.client import get_openai_client, is_llm_available
+from llm.response_cache import get_llm_cache
 from workflows.common.types import WorkflowState
 # MIGRATED: from workflows.nlu.general_qna_classifier -> backend.detection.qna.general_qna
-from detection.qna.general_qna import quick_general_qna_scan
+from workflows.common.message_features import message_features
 from workflows.common.fallback_reason import (
     create_fallback_reason,
     llm_disabled_reason,
     llm_exception_reason,
 )
 
+logger = logging.getLogger(__name__)
+
 QNA_EXTRACTION_MODEL = os.getenv("OPEN_EVENT_QNA_EXTRACTION_MODEL", "o3-mini")
 
 Q_VALUE_KEYS = (
@@ -155,7 +159,7 @@ def ensure_qna_extraction(
         return None
 
     if scan is None:
-        scan = quick_general_qna_scan(text)
+        scan = message_features(text).general_qna_scan
         state.extras["general_qna_scan"] = scan
 
     heuristics = scan.get("heuristics") or {}
@@ -212,6 +216,20 @@ def _run_qna_extraction(payload: Dict[str, Any]) -> Dict[str, Any]:
     if not is_llm_available():
         return _fallback_extraction(payload, reason="llm_disabled")
 
+    user_content = json.dumps(payload, ensure_ascii=False)
+    # temperature=0 + json_schema: identical payloads give identical answers, so
+    # repeats (retries, re-processed messages, other workers) come from the cache.
+    cache = get_llm_cache()
+    cache_key = cache.make_key("qna_extraction", "openai", QNA_EXTRACTION_MODEL, f"{SYSTEM_PROMPT}\n{user_content}")
+    cached = cache.get(cache_key, namespace="qna_extraction")
+    if cached is not None:
+        try:
+            return json.loads(cached)
+        except ValueError:
+            # A truncated or corrupt entry must not break the turn: drop it and ask again
+            logger.warning("Discarding undecodable cached Q&A extraction %s", cache_key[:12])
+            cache.discard(cache_key)
+
     client = get_openai_client()
     response = client.chat.completions.create(
         model=QNA_EXTRACTION_MODEL,
@@ -221,14 +239,16 @@ def _run_qna_extraction(payload: Dict[str, Any]) -> Dict[str, Any]:
         response_format={"type": "json_schema", "json_schema": {"name": "qna_extraction", "schema": QNA_EXTRACTION_SCHEMA}},
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": json.dumps(payload, ensure_ascii=False)},
+            {"role": "user", "content": user_content},
         ],
     )
     content = response.choices[0].message.content if response.choices else "{}"
     try:
-        return json.loads(content or "{}")
+        extraction = json.loads(content or "{}")
     except json.JSONDecodeError as exc:
         return _fallback_extraction(payload, reason="json_decode_error", error=str(exc))
+    cache.put(cache_key, content or "{}", namespace="qna_extraction")
+    return extraction
 
 
 def _fallback_extraction(
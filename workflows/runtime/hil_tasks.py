@@ -1111,7 +1111,11 @@ def _notify_hil_email(task: Dict[str, Any], event_entry: Dict[str, Any]) -> None
         result = notify_hil_task_created(task, event_entry)
         if result:
             if result.get("success"):
-                logger.info("[HIL_EMAIL] Notification sent for task %s", task.get('task_id'))
+                logger.info(
+                    "[HIL_EMAIL] Notification %s for task %s",
+                    "queued" if result.get("queued") else "sent",
+                    task.get('task_id'),
+                )
             else:
                 logger.warning("[HIL_EMAIL] Failed to send: %s", result.get('error'))
 
@@ -28,6 +28,7 @@ from workflows.io.tasks import enqueue_task
 from workflows.io.config_store import get_manager_names
 from workflows.common.billing_capture import capture_billing_anytime, add_billing_validation_draft
 from workflows.common.capture import capture_fields_anytime
+from utils.profiler import profile_step
 
 
 # =============================================================================
@@ -741,6 +742,7 @@ def correct_billing_flow_step(state: WorkflowState) -> None:
         logger.debug("[WF][BILLING_FLOW] Already at step 5, proceeding with billing flow")
 
 
+@profile_step("workflow.pre_route")
 def run_pre_route_pipeline(
     state: WorkflowState,
     intake_result: GroupResult,
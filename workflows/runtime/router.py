@@ -28,6 +28,7 @@ from workflows.steps.step4_offer.trigger import process as process_offer
 from workflows.steps.step5_negotiation import process as process_negotiation
 from workflows.steps.step6_transition import process as process_transition
 from workflows.steps.step7_confirmation.trigger import process as process_confirmation
+from utils.profiler import profile_step, span
 
 
 # Type aliases for callback functions
@@ -41,6 +42,11 @@ def dispatch_step(state: WorkflowState, step: int) -> Optional[GroupResult]:
 
     Returns the GroupResult from the step handler, or None if step is not recognized.
     """
+    with span("workflow.router.dispatch_step", step=step):
+        return _dispatch(state, step)
+
+
+def _dispatch(state: WorkflowState, step: int) -> Optional[GroupResult]:
     if step == 2:
         return date_confirmation.process(state)
     if step == 3:
@@ -56,6 +62,7 @@ def dispatch_step(state: WorkflowState, step: int) -> Optional[GroupResult]:
     return None
 
 
+@profile_step("workflow.router.routing_loop")
 def run_routing_loop(
     state: WorkflowState,
     initial_result: GroupResult,
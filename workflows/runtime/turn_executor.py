@@ -0,0 +1,244 @@
+"""Worker-pool execution for workflow turns.
+
+``process_msg`` is synchronous: it performs blocking LLM HTTP calls and waits
+on the DB file lock. Calling it directly from an ``async def`` FastAPI handler
+stalls the whole event loop (health checks included) for the duration of a
+turn. The executor runs turns on a small thread pool instead:
+
+- Turns of the same ``thread_id`` run strictly in submission order (FIFO),
+  one at a time; unrelated conversations progress in parallel.
+- Waiting turns of a busy thread do not occupy a worker; they are chained
+  and submitted when the previous turn finishes.
+- The total number of queued + running turns is bounded. Beyond that,
+  ``submit`` raises ``TurnQueueFull`` so the API can answer 503 instead of
+  piling up work.
+- Request-scoped contextvars (tenant/auth) are copied into the worker.
+
+Environment:
+    OE_TURN_EXECUTOR=pool|inline   pool (default) or run on the caller (legacy)
+    OE_TURN_WORKERS=<n>            worker threads (default: 4)
+    OE_TURN_QUEUE_MAX=<n>          max queued + running turns (default: 64)
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_WORKERS = 4
+DEFAULT_QUEUE_MAX = 64
+_LATENCY_SAMPLES = 512
+
+
+class TurnQueueFull(RuntimeError):
+    """Raised when the executor is at capacity and cannot accept another turn."""
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        logger.warning("[TURN_EXECUTOR] Ignoring invalid %s=%r", name, raw)
+        return default
+
+
+def pool_mode_enabled() -> bool:
+    return os.getenv("OE_TURN_EXECUTOR", "pool").strip().lower() != "inline"
+
+
+def _percentile(samples: Deque[float], pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return round(ordered[idx], 2)
+
+
+class TurnExecutor:
+    """Thread pool with per-thread FIFO ordering and a bounded queue."""
+
+    def __init__(self, max_workers: int, max_queue: int = DEFAULT_QUEUE_MAX) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wf-turn")
+        self._lock = threading.Lock()
+        # thread_id -> pending jobs waiting for the running turn of that thread
+        self._chains: Dict[str, Deque[Callable[[], None]]] = {}
+        self._pending = 0
+        self._running = 0
+        self._wait_ms: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self._run_ms: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self._counters: Dict[str, int] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "peak_depth": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def submit(self, thread_id: Optional[str], fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """Queue ``fn`` for ``thread_id``; raises TurnQueueFull at capacity."""
+
+        key = str(thread_id or "")
+        result: "Future[T]" = Future()
+        ctx = contextvars.copy_context()
+        enqueued_at = perf_counter()
+
+        def _job() -> None:
+            started_at = perf_counter()
+            with self._lock:
+                self._running += 1
+                self._wait_ms.append((started_at - enqueued_at) * 1000.0)
+            failed = False
+            try:
+                if result.set_running_or_notify_cancel():
+                    try:
+                        result.set_result(ctx.run(fn, *args, **kwargs))
+                    except BaseException as exc:  # propagate to the awaiting handler
+                        failed = True
+                        result.set_exception(exc)
+            finally:
+                self._finish(key, (perf_counter() - started_at) * 1000.0, failed)
+
+        with self._lock:
+            if self._pending >= self.max_queue:
+                self._counters["rejected"] += 1
+                raise TurnQueueFull(
+                    f"Workflow turn queue is full ({self._pending}/{self.max_queue})"
+                )
+            self._pending += 1
+            self._counters["submitted"] += 1
+            self._counters["peak_depth"] = max(self._counters["peak_depth"], self._pending)
+            chain = self._chains.get(key)
+            if chain is not None:
+                # A turn of this thread is running: wait behind it (FIFO).
+                chain.append(_job)
+                return result
+            self._chains[key] = deque()
+        self._pool.submit(_job)
+        return result
+
+    def _finish(self, key: str, run_ms: float, failed: bool) -> None:
+        next_job: Optional[Callable[[], None]] = None
+        with self._lock:
+            self._pending -= 1
+            self._running -= 1
+            self._run_ms.append(run_ms)
+            self._counters["failed" if failed else "completed"] += 1
+            chain = self._chains.get(key)
+            if chain:
+                next_job = chain.popleft()
+            else:
+                self._chains.pop(key, None)
+        if next_job is not None:
+            self._pool.submit(next_job)
+
+    async def run(self, thread_id: Optional[str], fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Await ``fn`` on the pool without blocking the event loop."""
+
+        # Shield: a disconnecting client must not drop a turn that was accepted.
+        return await asyncio.shield(asyncio.wrap_future(self.submit(thread_id, fn, *args, **kwargs)))
+
+    # ------------------------------------------------------------------
+    # Metrics / lifecycle
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = self._pending
+            running = self._running
+            active_threads = len(self._chains)
+            counters = dict(self._counters)
+            wait_ms = deque(self._wait_ms)
+            run_ms = deque(self._run_ms)
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queue_depth": pending - running,
+            "running": running,
+            "active_threads": active_threads,
+            **counters,
+            "wait_ms": {"p50": _percentile(wait_ms, 50), "p95": _percentile(wait_ms, 95)},
+            "run_ms": {"p50": _percentile(run_ms, 50), "p95": _percentile(run_ms, 95)},
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+_EXECUTOR: Optional[TurnExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_turn_executor() -> TurnExecutor:
+    """Return the process-wide executor, creating it from env on first use."""
+
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = TurnExecutor(
+                max_workers=_env_int("OE_TURN_WORKERS", DEFAULT_WORKERS),
+                max_queue=_env_int("OE_TURN_QUEUE_MAX", DEFAULT_QUEUE_MAX),
+            )
+            logger.info(
+                "[TURN_EXECUTOR] Started with %d worker(s), queue max %d",
+                _EXECUTOR.max_workers,
+                _EXECUTOR.max_queue,
+            )
+        return _EXECUTOR
+
+
+def shutdown_turn_executor(wait: bool = True) -> None:
+    """Stop the process-wide executor (app shutdown / tests)."""
+
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+async def run_turn(thread_id: Optional[str], fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a workflow turn off the event loop (or inline when OE_TURN_EXECUTOR=inline)."""
+
+    if not pool_mode_enabled():
+        return fn(*args, **kwargs)
+    return await get_turn_executor().run(thread_id, fn, *args, **kwargs)
+
+
+def turn_executor_stats() -> Dict[str, Any]:
+    """Queue depth / latency metrics; reports mode only when the pool is idle."""
+
+    with _EXECUTOR_LOCK:
+        executor = _EXECUTOR
+    stats: Dict[str, Any] = {"mode": "pool" if pool_mode_enabled() else "inline"}
+    if executor is not None:
+        stats.update(executor.stats())
+    return stats
+
+
+__all__ = [
+    "TurnExecutor",
+    "TurnQueueFull",
+    "get_turn_executor",
+    "run_turn",
+    "shutdown_turn_executor",
+    "turn_executor_stats",
+]
@@ -15,7 +15,8 @@ in step1_handler.py because they depend on linked_event workflow state.
 import re
 
 from .normalization import normalize_quotes
-from detection.keywords.buckets import is_confirmation, detect_language
+from detection.keywords.buckets import is_confirmation
+from workflows.common.message_features import message_features
 
 
 def looks_like_offer_acceptance(text: str) -> bool:
@@ -49,7 +50,7 @@ def looks_like_offer_acceptance(text: str) -> bool:
         return False  # This is a date confirmation, not offer acceptance
 
     # Use centralized multilingual confirmation detection
-    language = detect_language(text)
+    language = message_features(text).language
     return is_confirmation(text, language)
 
 
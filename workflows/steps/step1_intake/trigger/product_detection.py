@@ -10,7 +10,12 @@ import re
 from typing import Any, Dict, List, Optional
 
 from workflows.common.menu_options import DINNER_MENU_OPTIONS
-from services.products import list_product_records, merge_product_requests, normalise_product_payload
+from services.products import (
+    candidate_product_records,
+    list_product_records,
+    merge_product_requests,
+    normalise_product_payload,
+)
 
 from .keyword_matching import (
     PRODUCT_ADD_KEYWORDS,
@@ -171,7 +176,8 @@ def detect_product_update_request(
             if "menu" in cat or "catering" in cat:
                 removals.append(name)
 
-    for record in catalog:
+    # Only products with a name/synonym word in the message can match below
+    for record in candidate_product_records(text):
         tokens: List[str] = []
         primary = (record.name or "").strip().lower()
         if primary:
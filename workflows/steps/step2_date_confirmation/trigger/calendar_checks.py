@@ -5,6 +5,7 @@ Extracted from step2_handler.py for better modularity (D4 refactoring).
 
 Usage:
     from workflows.steps.step2_date_confirmation.trigger.calendar_checks import (
+        candidate_dates_calendar_free,
         candidate_is_calendar_free,
         future_fridays_in_may_june,
         maybe_fuzzy_friday_candidates,
@@ -14,9 +15,9 @@ Usage:
 from __future__ import annotations
 
 from datetime import date, time, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from services.availability import calendar_free
+from services.availability import availability_matrix, calendar_free
 from workflows.common.datetime_parse import build_window_iso
 from workflows.io.database import update_event_metadata  # D14a
 
@@ -89,6 +90,46 @@ def candidate_is_calendar_free(
     return calendar_free(preferred_room, {"date_iso": iso_date, "start": start_iso, "end": end_iso}, db=db)
 
 
+def candidate_dates_calendar_free(
+    preferred_room: Optional[str],
+    iso_dates: Iterable[str],
+    start_time: Optional[time],
+    end_time: Optional[time],
+    db: Optional[Dict[str, Any]] = None,
+) -> Dict[str, bool]:
+    """
+    Bulk ``candidate_is_calendar_free`` for many dates of one room and time window.
+
+    One ``availability_matrix`` query instead of one calendar lookup per date.
+
+    Returns:
+        {iso_date: is_free} for every input date
+    """
+    dates = list(dict.fromkeys(d for d in iso_dates if d))
+    free = {iso_date: True for iso_date in dates}
+    if not preferred_room:
+        return free
+    normalized = preferred_room.strip().lower()
+    if not normalized or normalized == "not specified":
+        return free
+    if not (start_time and end_time):
+        return free
+
+    windows: List[Dict[str, Any]] = []
+    checked: List[str] = []
+    for iso_date in dates:
+        try:
+            start_iso, end_iso = build_window_iso(iso_date, start_time, end_time)
+        except ValueError:
+            continue
+        windows.append({"date_iso": iso_date, "start": start_iso, "end": end_iso})
+        checked.append(iso_date)
+    if windows:
+        row = availability_matrix([preferred_room], windows, db=db)[preferred_room]
+        free.update(zip(checked, row))
+    return free
+
+
 # -----------------------------------------------------------------------------
 # Fuzzy Date Matching
 # -----------------------------------------------------------------------------
@@ -224,6 +265,7 @@ def calendar_conflict_reason(
 # -----------------------------------------------------------------------------
 
 __all__ = [
+    "candidate_dates_calendar_free",
     "candidate_is_calendar_free",
     "future_fridays_in_may_june",
     "maybe_fuzzy_friday_candidates",
@@ -45,7 +45,7 @@ from .date_parsing import (
     clean_weekdays_hint as _clean_weekdays_hint,
 )
 from .calendar_checks import (
-    candidate_is_calendar_free as _candidate_is_calendar_free,
+    candidate_dates_calendar_free as _candidate_dates_calendar_free,
     maybe_fuzzy_friday_candidates as _maybe_fuzzy_friday_candidates,
 )
 from .proposal_tracking import (
@@ -108,6 +108,7 @@ def _collect_preferred_weekday_alternatives(
     skip_lookup.update(existing)
     results: List[str] = []
     max_days = max(90, limit * 14)
+    scan: List[str] = []
     for offset in range(max_days):
         candidate = start_from + timedelta(days=offset)
         weekday_idx = candidate.weekday()
@@ -118,11 +119,12 @@ def _collect_preferred_weekday_alternatives(
             continue
         if _iso_date_is_past(iso_value):
             continue
-        if not _candidate_is_calendar_free(preferred_room, iso_value, start_time, end_time):
-            skip_lookup.add(iso_value)
+        scan.append(iso_value)
+    free = _candidate_dates_calendar_free(preferred_room, scan, start_time, end_time)
+    for iso_value in scan:
+        if not free[iso_value]:
             continue
         results.append(iso_value)
-        skip_lookup.add(iso_value)
         if len(results) >= limit:
             break
     return results
@@ -153,7 +155,9 @@ def collect_candidates_from_week_scope(
     if not week_scope:
         return formatted_dates, seen_iso, busy_skipped
 
-    for iso_value in week_scope.get("dates", []):
+    week_dates = week_scope.get("dates", [])
+    free = _candidate_dates_calendar_free(preferred_room, week_dates, start_time_obj, end_time_obj)
+    for iso_value in week_dates:
         if (
             not iso_value
             or iso_value in seen_iso
@@ -164,7 +168,7 @@ def collect_candidates_from_week_scope(
         candidate_dt = _safe_parse_iso_date(iso_value)
         if min_requested_date and candidate_dt and candidate_dt < min_requested_date:
             continue
-        if not _candidate_is_calendar_free(preferred_room, iso_value, start_time_obj, end_time_obj):
+        if not free[iso_value]:
             busy_skipped.add(iso_value)
             continue
         seen_iso.add(iso_value)
@@ -191,6 +195,7 @@ def collect_candidates_from_fuzzy(
     formatted_dates: List[str] = []
     busy_skipped: Set[str] = set()
 
+    free = _candidate_dates_calendar_free(preferred_room, fuzzy_candidates, start_time_obj, end_time_obj)
     for iso_value in fuzzy_candidates:
         if (
             not iso_value
@@ -202,7 +207,7 @@ def collect_candidates_from_fuzzy(
         candidate_dt = _safe_parse_iso_date(iso_value)
         if min_requested_date and candidate_dt and candidate_dt < min_requested_date:
             continue
-        if not _candidate_is_calendar_free(preferred_room, iso_value, start_time_obj, end_time_obj):
+        if not free[iso_value]:
             busy_skipped.add(iso_value)
             continue
         seen_iso.add(iso_value)
@@ -249,6 +254,7 @@ def collect_candidates_from_constraints(
             window_hints=window_hints,
             strict=attempt == 1,
         )
+        free = _candidate_dates_calendar_free(preferred_room, hinted_dates, start_time_obj, end_time_obj)
         for iso_value in hinted_dates:
             if (
                 not iso_value
@@ -260,7 +266,7 @@ def collect_candidates_from_constraints(
             candidate_dt = _safe_parse_iso_date(iso_value)
             if min_requested_date and candidate_dt and candidate_dt < min_requested_date:
                 continue
-            if not _candidate_is_calendar_free(preferred_room, iso_value, start_time_obj, end_time_obj):
+            if not free[iso_value]:
                 busy_skipped.add(iso_value)
                 continue
             seen_iso.add(iso_value)
@@ -313,6 +319,12 @@ def collect_candidates_from_suggestions(
         },
     )
 
+    free = _candidate_dates_calendar_free(
+        preferred_room,
+        (to_iso_date(raw) for raw in candidate_dates_ddmmyyyy),
+        start_time_obj,
+        end_time_obj,
+    )
     for raw in candidate_dates_ddmmyyyy:
         iso_value = to_iso_date(raw)
         if not iso_value:
@@ -326,7 +338,7 @@ def collect_candidates_from_suggestions(
         candidate_dt = _safe_parse_iso_date(iso_value)
         if min_requested_date and candidate_dt and candidate_dt < min_requested_date:
             continue
-        if not _candidate_is_calendar_free(preferred_room, iso_value, start_time_obj, end_time_obj):
+        if not free[iso_value]:
             busy_skipped.add(iso_value)
             continue
         seen_iso.add(iso_value)
@@ -376,8 +388,9 @@ def collect_supplemental_candidates(
         },
     )
 
-    for candidate in supplemental:
-        iso_candidate = candidate if isinstance(candidate, str) else candidate.isoformat()
+    supplemental_iso = [c if isinstance(c, str) else c.isoformat() for c in supplemental]
+    free = _candidate_dates_calendar_free(preferred_room, supplemental_iso, start_time_obj, end_time_obj)
+    for iso_candidate in supplemental_iso:
         if (
             iso_candidate in seen_iso
             or iso_candidate in skip_set
@@ -387,7 +400,7 @@ def collect_supplemental_candidates(
         candidate_dt = _safe_parse_iso_date(iso_candidate)
         if min_requested_date and candidate_dt and candidate_dt < min_requested_date:
             continue
-        if not _candidate_is_calendar_free(preferred_room, iso_candidate, start_time_obj, end_time_obj):
+        if not free[iso_candidate]:
             busy_skipped.add(iso_candidate)
             continue
         seen_iso.add(iso_candidate)
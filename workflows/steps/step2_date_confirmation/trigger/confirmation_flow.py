@@ -15,6 +15,7 @@ import logging
 from domain import TaskStatus, TaskType
 from debug.hooks import trace_marker
 from workflows.io.config_store import get_timezone
+from workflows.io.sharded_store import iter_task_candidates
 from workflows.common.datetime_parse import (
     build_window_iso,
     parse_time_range,
@@ -723,7 +724,7 @@ def clear_step2_hil_tasks(state: WorkflowState, event_entry: dict) -> None:
     if not tasks:
         return
     changed = False
-    for task in tasks:
+    for task in iter_task_candidates(state.db, event_id=event_entry.get("event_id")):
         if (
             task.get("event_id") == event_entry.get("event_id")
             and task.get("type") == TaskType.DATE_CONFIRMATION_MESSAGE.value
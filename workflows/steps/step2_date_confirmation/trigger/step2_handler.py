@@ -63,7 +63,7 @@ from .proposal_tracking import (
 # D4 refactoring: Calendar check utilities extracted to dedicated module
 # D13b: preferred_room added, D14a: calendar_conflict_reason added
 from .calendar_checks import (
-    candidate_is_calendar_free as _candidate_is_calendar_free,
+    candidate_dates_calendar_free as _candidate_dates_calendar_free,
     maybe_fuzzy_friday_candidates as _maybe_fuzzy_friday_candidates,
     preferred_room as _preferred_room,
     calendar_conflict_reason as _calendar_conflict_reason,
@@ -1052,12 +1052,9 @@ def _present_candidate_dates(
                 skip_dates={dt for dt in skip_parsed if dt is not None},
                 count=5,
             )
-            month_dates = []
-            for iso_candidate in supplemental_for_month:
-                if iso_candidate.startswith(target_month):
-                    if not _candidate_is_calendar_free(preferred_room, iso_candidate, start_time_obj, end_time_obj):
-                        continue
-                    month_dates.append(iso_candidate)
+            month_candidates = [iso for iso in supplemental_for_month if iso.startswith(target_month)]
+            free = _candidate_dates_calendar_free(preferred_room, month_candidates, start_time_obj, end_time_obj)
+            month_dates = [iso for iso in month_candidates if free[iso]]
             if month_dates:
                 formatted_dates = month_dates[:4]
                 prioritized_dates = []  # Clear - we're using target month dates now
@@ -13,7 +13,7 @@ from datetime import date
 from typing import Any, Dict, List, Optional
 
 from debug.hooks import trace_state
-from workflows.common.datetime_parse import parse_all_dates
+from workflows.common.message_features import message_features
 from workflows.common.menu_options import build_menu_payload
 from workflows.common.types import WorkflowState
 
@@ -102,7 +102,7 @@ def client_requested_dates(state: WorkflowState) -> List[str]:
     iso_values: List[str] = []
     if text and explicit_pattern.search(text):
         seen: set[str] = set()
-        for value in parse_all_dates(text, fallback_year=reference_day.year):
+        for value in message_features(text).parsed_dates(reference_day.year):
             iso = value.isoformat()
             if iso in seen:
                 continue
@@ -244,6 +244,22 @@ def room_capacity_ok(room: Dict[str, Any], participants: Optional[int]) -> bool:
     return capacity_min <= participants <= capacity_max
 
 
+def _buffer_minutes(value: Any, fallback: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return fallback
+
+
+def _room_buffers(room: Dict[str, Any]) -> Tuple[timedelta, timedelta]:
+    """Per-room buffer before/after a booking; default to 30 if missing/invalid."""
+
+    return (
+        timedelta(minutes=_buffer_minutes(room.get("buffer_before_min"), 30)),
+        timedelta(minutes=_buffer_minutes(room.get("buffer_after_min"), 30)),
+    )
+
+
 def collect_conflicts(
     room: Dict[str, Any],
     window: RequestedWindow,
@@ -251,33 +267,16 @@ def collect_conflicts(
 ) -> Tuple[bool, List[Dict[str, str]]]:
     """[Condition] Gather busy intervals overlapping the requested window."""
 
-    def _buffer_minutes(value: Any, fallback: int) -> int:
-        try:
-            return int(value)
-        except (TypeError, ValueError):
-            return fallback
-
-    # Respect per-room buffer settings; default to 30 if missing/invalid
-    buffer_before = timedelta(minutes=_buffer_minutes(room.get("buffer_before_min"), 30))
-    buffer_after = timedelta(minutes=_buffer_minutes(room.get("buffer_after_min"), 30))
-
-    start = window.start
-    end = window.end
-    expanded_start = to_utc(start - buffer_before)
-    expanded_end = to_utc(end + buffer_after)
-
-    busy = calendar_adapter.get_busy(
-        calendar_id=str(room.get("calendar_id") or ""),
-        start_iso=(start - buffer_before).isoformat(),
-        end_iso=(end + buffer_after).isoformat(),
-    )
+    buffer_before, buffer_after = _room_buffers(room)
+    expanded_start = to_utc(window.start - buffer_before)
+    expanded_end = to_utc(window.end + buffer_after)
 
-    conflicts: List[Dict[str, str]] = []
-    for slot in busy:
-        busy_start = to_utc(parse_iso_datetime(slot["start"]))
-        busy_end = to_utc(parse_iso_datetime(slot["end"]))
-        if overlaps(expanded_start, expanded_end, busy_start, busy_end):
-            conflicts.append({"start": busy_start.isoformat(), "end": busy_end.isoformat()})
+    # Busy slots are parsed once per calendar; the range query is a bisect
+    timeline = calendar_adapter.busy_timeline(str(room.get("calendar_id") or ""))
+    conflicts: List[Dict[str, str]] = [
+        {"start": timeline.utc_starts[i].isoformat(), "end": timeline.utc_ends[i].isoformat()}
+        for i in timeline.indices(expanded_start.timestamp(), expanded_end.timestamp())
+    ]
 
     return (len(conflicts) > 0, conflicts)
 
@@ -290,20 +289,27 @@ def near_miss_suggestions(
 ) -> List[Dict[str, str]]:
     """[LLM] Suggest nearby slots by shifting the requested time window."""
 
-    suggestions: List[Dict[str, str]] = []
+    buffer_before, buffer_after = _room_buffers(room)
+    shifted: List[Tuple[datetime, datetime, str]] = []
     for shift_minutes, label in TIME_SHIFTS:
-        if len(suggestions) >= 3:
-            break
         shifted_start = window.start + timedelta(minutes=shift_minutes)
         shifted_end = window.end + timedelta(minutes=shift_minutes)
         if shifted_start.date() != window.start.date():
             continue
-        conflict, _ = collect_conflicts(
-            room,
-            RequestedWindow(date=window.date, start=shifted_start, end=shifted_end),
-            calendar_adapter,
-        )
-        if conflict:
+        shifted.append((shifted_start, shifted_end, label))
+
+    # Every time shift checked against the calendar in one call
+    timeline = calendar_adapter.busy_timeline(str(room.get("calendar_id") or ""))
+    busy_flags = timeline.overlaps_many(
+        [
+            (to_utc(start - buffer_before).timestamp(), to_utc(end + buffer_after).timestamp())
+            for start, end, _ in shifted
+        ]
+    )
+
+    suggestions: List[Dict[str, str]] = []
+    for (shifted_start, shifted_end, label), busy in zip(shifted, busy_flags):
+        if busy:
             continue
         suggestions.append(
             {
@@ -313,7 +319,9 @@ def near_miss_suggestions(
                 "note": label,
             }
         )
-    return suggestions[:3]
+        if len(suggestions) >= 3:
+            break
+    return suggestions
 
 
 def evaluate_room(
@@ -542,14 +542,13 @@ def process(state: WorkflowState) -> GroupResult:
     # matches the already-confirmed chosen_date, skip the detour. This happens when
     # Step 2's finalize_confirmation internally calls Step 3 on the same message.
     if change_type == ChangeType.DATE and event_entry.get("date_confirmed"):
-        from workflows.common.datetime_parse import parse_all_dates
-        from datetime import date as dt_date
+        from workflows.common.message_features import message_features
 
         chosen_date_raw = event_entry.get("chosen_date")  # e.g., "21.02.2026"
         # Parse chosen_date (DD.MM.YYYY format) to ISO
         chosen_parsed = parse_ddmmyyyy(chosen_date_raw) if chosen_date_raw else None
         chosen_iso = chosen_parsed.isoformat() if chosen_parsed else None
-        message_dates = list(parse_all_dates(message_text or "", fallback_year=dt_date.today().year))
+        message_dates = message_features(message_text).dates
         # Check if ANY date in the message matches chosen_date (not just the first one)
         # This handles cases where today's date or other dates are also parsed
         if message_dates and chosen_iso:
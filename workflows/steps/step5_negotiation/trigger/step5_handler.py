@@ -2,12 +2,12 @@ from __future__ import annotations
 
 import logging
 import re
-from datetime import date as dt_date, datetime, timezone
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-from workflows.common.datetime_parse import parse_all_dates
+from workflows.common.message_features import message_features
 from workflows.common.timeutils import parse_ddmmyyyy
 
 from domain import TaskStatus, TaskType
@@ -787,7 +787,7 @@ def _detect_structural_change(
                     date_in_message = True
                 else:
                     # Parse dates from message directly and compare
-                    parsed_dates = list(parse_all_dates(message_text, fallback_year=dt_date.today().year))
+                    parsed_dates = message_features(message_text).dates
                     parsed_iso = {d.isoformat() for d in parsed_dates}
                     if new_iso_date and new_iso_date in parsed_iso:
                         date_in_message = True
@@ -810,7 +810,7 @@ def _detect_structural_change(
         if chosen_date_raw:
             chosen_parsed = parse_ddmmyyyy(chosen_date_raw)
             chosen_iso = chosen_parsed.isoformat() if chosen_parsed else None
-            message_dates = list(parse_all_dates(clean_text, fallback_year=dt_date.today().year))
+            message_dates = message_features(clean_text).dates
             # Check if any date in the message differs from the current chosen_date
             for msg_date in message_dates:
                 msg_iso = msg_date.isoformat()
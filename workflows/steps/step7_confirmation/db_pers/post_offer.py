@@ -16,6 +16,7 @@ except ImportError:  # pragma: no cover
 
 from domain import EventStatus, TaskStatus, TaskType
 from workflows.io.database import last_event_for_email
+from workflows.io.sharded_store import iter_task_candidates
 from workflows.io.tasks import enqueue_task as _enqueue_task
 # MIGRATED: from workflows.common.conflict -> backend.detection.special.room_conflict
 from detection.special.room_conflict import (
@@ -23,6 +24,7 @@ from detection.special.room_conflict import (
     detect_conflict_type,
     handle_hard_conflict,
 )
+from workflows.common.occupancy import note_event_changed
 from workflows.io.config_store import get_timezone
 
 from .. import OpenEventAction
@@ -360,7 +362,7 @@ _ACK_PATTERN = re.compile(r"\b(thanks|thank you|ok(?:ay)?|sounds good|great)\b",
 
 
 def _find_task(db: Dict[str, Any], task_id: str) -> Optional[Dict[str, Any]]:
-    for task in db.get("tasks", []):
+    for task in iter_task_candidates(db, task_id=task_id):
         if task.get("task_id") == task_id:
             return task
     return None
@@ -619,6 +621,7 @@ def _ensure_status(
         # Sync to canonical field (event["status"]) for cross-client conflict detection
         if event_entry is not None:
             event_entry["status"] = new_status
+            note_event_changed(event_entry)
         return True
     return False
 